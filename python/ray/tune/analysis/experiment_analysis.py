@@ -1,8 +1,12 @@
+import hashlib
+import io
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from numbers import Number
-from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ray.tune.utils import flatten_dict
 from ray.tune.utils.serialization import TuneFunctionDecoder
@@ -16,19 +20,33 @@ except ImportError:
     DataFrame = None
 
 from ray.tune.error import TuneError
-from ray.tune.result import DEFAULT_METRIC, EXPR_PROGRESS_FILE, \
-    EXPR_PARAM_FILE, CONFIG_PREFIX, TRAINING_ITERATION
+from ray.tune.result import DEFAULT_METRIC, EXPR_PARQUET_DIR, \
+    EXPR_PROGRESS_FILE, EXPR_PARAM_FILE, CONFIG_PREFIX, TRAINING_ITERATION
 from ray.tune.trial import Trial
+from ray.tune.trial_runner import load_experiment_state
 from ray.tune.utils.trainable import TrainableUtil
 from ray.tune.utils.util import unflattened_lookup
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of threads reading result files.
+MAX_READER_THREADS = 32
+
+# Index of the parsed progress files in an analysis cache dir.
+_CACHE_INDEX_FILE = "index.json"
+# Bump when the format of the analysis cache changes.
+_CACHE_VERSION = 2
+
 
 class Analysis:
     """Analyze all results from a directory of experiments.
 
     To use this class, the experiment must be executed with the JsonLogger.
+    Results logged with the ``ParquetLoggerCallback`` are loaded from its
+    Parquet files.
+
+    The results of the trials are loaded on first access (see
+    ``fetch_trial_dataframes``).
 
     Args:
         experiment_dir (str): Directory of the experiment to load.
@@ -39,12 +57,18 @@ class Analysis:
         default_mode (str): Default mode for comparing results. Has to be one
             of [min, max]. Can be overwritten with the ``mode`` parameter
             in the respective functions.
+        cache_dir (str): If set, the parsed progress files of the trials
+            are cached in this directory (as Parquet files), so that new
+            ``Analysis`` objects using the same directory only read the rows
+            appended since. Requires pyarrow. Defaults to None (no cache
+            on disk).
     """
 
     def __init__(self,
                  experiment_dir: str,
                  default_metric: Optional[str] = None,
-                 default_mode: Optional[str] = None):
+                 default_mode: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
         experiment_dir = os.path.expanduser(experiment_dir)
         if not os.path.isdir(experiment_dir):
             raise ValueError(
@@ -52,6 +76,11 @@ class Analysis:
         self._experiment_dir = experiment_dir
         self._configs = {}
         self._trial_dataframes = {}
+        self._fetched = False
+        # Parsed result files (see `fetch_trial_dataframes`).
+        self._progress_cache = None
+        self._parquet_cache = {}
+        self._cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
 
         self.default_metric = default_metric
         if default_mode and default_mode not in ["min", "max"]:
@@ -67,8 +96,6 @@ class Analysis:
             logger.warning(
                 "pandas not installed. Run `pip install pandas` for "
                 "Analysis utilities.")
-        else:
-            self.fetch_trial_dataframes()
 
     def _validate_metric(self, metric: str) -> str:
         if not metric and not self.default_metric:
@@ -168,19 +195,82 @@ class Analysis:
                                self._experiment_dir))
             return None
 
-    def fetch_trial_dataframes(self) -> Dict[str, DataFrame]:
-        fail_count = 0
-        for path in self._get_trial_paths():
+    def fetch_trial_dataframes(self, columns: Optional[List[str]] = None
+                               ) -> Dict[str, DataFrame]:
+        """Loads (or reloads) the results of all trials as dataframes.
+
+        If the experiment was run with the ``ParquetLoggerCallback``, the
+        results are read from its Parquet files. Otherwise, the
+        ``progress.csv`` file of each trial is read.
+
+        Files are read in parallel and the parsed results are cached, so
+        subsequent calls only read new files and the rows appended to
+        progress files since. If a ``cache_dir`` was passed, the parsed
+        progress files are also cached there for new ``Analysis`` objects.
+
+        Args:
+            columns (List[str]): If set, only load these result columns.
+                The projected dataframes are only returned and do not
+                replace the (complete) ``trial_dataframes``.
+
+        Returns:
+            Dict[str, DataFrame]: The results of each trial, indexed by
+                their trial dir.
+        """
+        if columns is None:
+            self._fetched = True
+            trial_dataframes = self._trial_dataframes
+        else:
+            trial_dataframes = {}
+        if os.path.isdir(os.path.join(self._experiment_dir,
+                                      EXPR_PARQUET_DIR)):
+            df = _load_parquet_results(self._experiment_dir, columns,
+                                       self._parquet_cache)
+            # Sort the results by trial once and slice the trial dataframes
+            # from the sorted dataframe (much faster than a groupby).
+            codes, paths = pd.factorize(df.pop("logdir"))
+            order = np.argsort(codes, kind="stable")
+            df = df.take(order).reset_index(drop=True)
+            bounds = np.searchsorted(codes[order], np.arange(len(paths) + 1))
+            for i, path in enumerate(paths):
+                trial_dataframes[path] = df.iloc[
+                    bounds[i]:bounds[i + 1]].reset_index(drop=True)
+            return trial_dataframes
+
+        if self._progress_cache is None:
+            self._progress_cache = self._load_progress_cache()
+
+        def read(path):
+            key = os.path.relpath(path, self._experiment_dir)
             try:
-                self.trial_dataframes[path] = pd.read_csv(
-                    os.path.join(path, EXPR_PROGRESS_FILE))
+                return _read_progress_file(
+                    os.path.join(path, EXPR_PROGRESS_FILE),
+                    self._progress_cache.get(key))
             except Exception:
+                return None
+
+        paths = self._get_trial_paths()
+        fail_count = 0
+        changed = []
+        for path, entry in zip(paths, _parallel_map(read, paths)):
+            if entry is None:
                 fail_count += 1
+                continue
+            key = os.path.relpath(path, self._experiment_dir)
+            if entry is not self._progress_cache.get(key):
+                self._progress_cache[key] = entry
+                changed.append(key)
+            df = entry["df"]
+            if columns is not None:
+                df = df[[c for c in df.columns if c in columns]]
+            trial_dataframes[path] = df
 
         if fail_count:
             logger.debug(
                 "Couldn't read results from {} paths".format(fail_count))
-        return self.trial_dataframes
+        if changed:
+            self._save_progress_cache(changed)
+        return trial_dataframes
 
     def get_all_configs(self, prefix: bool = False) -> Dict[str, Dict]:
         """Returns a list of all configurations.
@@ -193,17 +283,23 @@ class Analysis:
             Dict[str, Dict]: Dict of all configurations of trials, indexed by
                 their trial dir.
         """
-        fail_count = 0
-        for path in self._get_trial_paths():
+        def read(path):
             try:
                 with open(os.path.join(path, EXPR_PARAM_FILE)) as f:
-                    config = json.load(f)
-                    if prefix:
-                        for k in list(config):
-                            config[CONFIG_PREFIX + k] = config.pop(k)
-                    self._configs[path] = config
+                    return json.load(f)
             except Exception:
+                return None
+
+        paths = self._get_trial_paths()
+        fail_count = 0
+        for path, config in zip(paths, _parallel_map(read, paths)):
+            if config is None:
                 fail_count += 1
+                continue
+            if prefix:
+                for k in list(config):
+                    config[CONFIG_PREFIX + k] = config.pop(k)
+            self._configs[path] = config
 
         if fail_count:
             logger.warning(
@@ -328,17 +424,207 @@ class Analysis:
             if EXPR_PROGRESS_FILE in files:
                 _trial_paths += [trial_path]
 
+        if not _trial_paths and os.path.isdir(
+                os.path.join(self._experiment_dir, EXPR_PARQUET_DIR)):
+            # Results were only logged by the ParquetLoggerCallback.
+            _trial_paths = list(self.trial_dataframes)
+
         if not _trial_paths:
             raise TuneError("No trials found in {}.".format(
                 self._experiment_dir))
         return _trial_paths
 
+    def _load_progress_cache(self) -> Dict[str, Dict]:
+        if not self._cache_dir:
+            return {}
+        index_file = os.path.join(self._cache_dir, _CACHE_INDEX_FILE)
+        if not os.path.isfile(index_file):
+            return {}
+        try:
+            with open(index_file, "rt") as f:
+                index = json.load(f)
+            if index["version"] != _CACHE_VERSION or index[
+                    "experiment_dir"] != os.path.abspath(self._experiment_dir):
+                return {}
+
+            def read(item):
+                key, entry = item
+                entry = dict(entry)
+                entry["df"] = pd.read_parquet(
+                    os.path.join(self._cache_dir, entry.pop("file")))
+                return key, entry
+
+            return dict(_parallel_map(read, list(index["progress"].items())))
+        except Exception:
+            logger.debug(
+                "Couldn't read analysis cache {}.".format(self._cache_dir))
+        return {}
+
+    def _save_progress_cache(self, changed: List[str]):
+        if not self._cache_dir:
+            return
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            index_file = os.path.join(self._cache_dir, _CACHE_INDEX_FILE)
+            progress = {}
+            if os.path.isfile(index_file):
+                with open(index_file, "rt") as f:
+                    index = json.load(f)
+                if index["version"] == _CACHE_VERSION and index[
+                        "experiment_dir"] == os.path.abspath(
+                            self._experiment_dir):
+                    progress = index["progress"]
+            for key in changed:
+                entry = self._progress_cache[key]
+                file = hashlib.sha1(key.encode()).hexdigest() + ".parquet"
+                try:
+                    entry["df"].to_parquet(
+                        os.path.join(self._cache_dir, file))
+                except Exception:
+                    # E.g. columns with mixed types.
+                    progress.pop(key, None)
+                    continue
+                progress[key] = {k: v for k, v in entry.items() if k != "df"}
+                progress[key]["file"] = file
+            with open(index_file + ".tmp", "wt") as f:
+                json.dump({
+                    "version": _CACHE_VERSION,
+                    "experiment_dir": os.path.abspath(self._experiment_dir),
+                    "progress": progress
+                }, f)
+            os.replace(index_file + ".tmp", index_file)
+        except Exception:
+            logger.debug(
+                "Couldn't write analysis cache {}.".format(self._cache_dir))
+
     @property
     def trial_dataframes(self) -> Dict[str, DataFrame]:
-        """List of all dataframes of the trials."""
+        """List of all dataframes of the trials (loaded on first access)."""
+        if not self._fetched and pd:
+            self.fetch_trial_dataframes()
         return self._trial_dataframes
 
 
+def load_parquet_results(experiment_dir: str,
+                         columns: Optional[List[str]] = None) -> DataFrame:
+    """Loads the results logged by the ``ParquetLoggerCallback``.
+
+    Args:
+        experiment_dir (str): Directory of the experiment.
+        columns (List[str]): If set, only read these result columns from
+            the files (columns missing in a file are filled with NaN).
+
+    Returns:
+        pd.DataFrame: The results of all trials, in the order they were
+            logged. The ``logdir`` column contains the trial dirs.
+    """
+    return _load_parquet_results(experiment_dir, columns)
+
+
+def _load_parquet_results(experiment_dir: str,
+                          columns: Optional[List[str]] = None,
+                          cache: Optional[Dict[str, DataFrame]] = None
+                          ) -> DataFrame:
+    """Loads the Parquet results, reading only files missing in `cache`.
+
+    The Parquet files are never modified once written, so `cache` maps
+    file names to the (complete) dataframes read from them.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_dir = os.path.join(
+        os.path.expanduser(experiment_dir), EXPR_PARQUET_DIR)
+    files = sorted(
+        file for file in os.listdir(parquet_dir) if file.endswith(".parquet"))
+
+    def read(file):
+        if cache is not None:
+            if file not in cache:
+                cache[file] = pq.read_table(os.path.join(parquet_dir,
+                                                         file)).to_pandas()
+            df = cache[file]
+            if columns is not None:
+                df = df[[c for c in df.columns
+                         if c in columns or c == "logdir"]]
+            return df
+        file_columns = None
+        if columns is not None:
+            names = pq.read_schema(os.path.join(parquet_dir, file)).names
+            file_columns = [c for c in names if c in columns or c == "logdir"]
+        return pq.read_table(
+            os.path.join(parquet_dir, file), columns=file_columns).to_pandas()
+
+    dfs = _parallel_map(read, files)
+    if not dfs:
+        return pd.DataFrame(columns=list(columns or []) + ["logdir"])
+    df = pd.concat(dfs, ignore_index=True, sort=False)
+    # Trial dirs are stored relative to the experiment dir.
+    df["logdir"] = df["logdir"].map({
+        logdir: os.path.join(os.path.dirname(parquet_dir), logdir)
+        for logdir in df["logdir"].unique()
+    })
+    return df
+
+
+def _read_progress_file(progress_file: str,
+                        entry: Optional[Dict] = None) -> Dict:
+    """Reads a progress.csv file into a cache entry.
+
+    If `entry` (the cache entry of a previous read) is passed, only the rows
+    appended to the file since are read and `entry` itself is returned if the
+    file is unchanged. Files that don't start with the same header and first
+    row anymore (or shrank) were rewritten and are read completely.
+    """
+    stat = os.stat(progress_file)
+    if (entry and stat.st_size == entry["size"]
+            and stat.st_mtime_ns == entry["mtime"]):
+        return entry
+    with open(progress_file, "rb") as f:
+        if (entry and stat.st_size >= entry["offset"]
+                and hashlib.sha1(f.read(entry["prefix_size"])).hexdigest() ==
+                entry["prefix_hash"]):
+            offset = entry["offset"]
+        else:
+            entry = None
+            offset = 0
+        f.seek(offset)
+        data = f.read()
+    # Only parse complete rows, the last one may still be written.
+    data = data[:data.rfind(b"\n") + 1]
+    if entry is None:
+        df = pd.read_csv(io.BytesIO(data))
+        # The header and the first row (if complete).
+        header_end = data.find(b"\n") + 1
+        prefix = data[:data.find(b"\n", header_end) + 1 or header_end]
+        prefix_size = len(prefix)
+        prefix_hash = hashlib.sha1(prefix).hexdigest()
+    else:
+        df = entry["df"]
+        prefix_size = entry["prefix_size"]
+        prefix_hash = entry["prefix_hash"]
+        if data:
+            new_rows = pd.read_csv(
+                io.BytesIO(data), header=None, names=list(df.columns))
+            df = pd.concat([df, new_rows], ignore_index=True)
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "offset": offset + len(data),
+        "prefix_size": prefix_size,
+        "prefix_hash": prefix_hash,
+        "df": df,
+    }
+
+
+def _parallel_map(fn: Callable, items: List) -> List:
+    """Returns ``[fn(item) for item in items]``, computed by threads."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(
+            max_workers=min(MAX_READER_THREADS, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
 class ExperimentAnalysis(Analysis):
     """Analyze results from a Tune experiment.
 
@@ -356,6 +642,8 @@ class ExperimentAnalysis(Analysis):
         default_mode (str): Default mode for comparing results. Has to be one
             of [min, max]. Can be overwritten with the ``mode`` parameter
             in the respective functions.
+        cache_dir (str): If set, the parsed progress files of the trials
+            are cached in this directory. See ``Analysis``.
 
     Example:
         >>> tune.run(my_trainable, name="my_exp", local_dir="~/tune_results")
@@ -367,15 +655,15 @@ class ExperimentAnalysis(Analysis):
                  experiment_checkpoint_path: str,
                  trials: Optional[List[Trial]] = None,
                  default_metric: Optional[str] = None,
-                 default_mode: Optional[str] = None):
+                 default_mode: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
         experiment_checkpoint_path = os.path.expanduser(
             experiment_checkpoint_path)
         if not os.path.isfile(experiment_checkpoint_path):
             raise ValueError(
                 "{} is not a valid file.".format(experiment_checkpoint_path))
-        with open(experiment_checkpoint_path) as f:
-            _experiment_state = json.load(f, cls=TuneFunctionDecoder)
-            self._experiment_state = _experiment_state
+        _experiment_state = load_experiment_state(experiment_checkpoint_path)
+        self._experiment_state = _experiment_state
 
         if "checkpoints" not in _experiment_state:
             raise TuneError("Experiment state invalid; no checkpoints found.")
@@ -388,7 +676,7 @@ class ExperimentAnalysis(Analysis):
 
         super(ExperimentAnalysis, self).__init__(
             os.path.dirname(experiment_checkpoint_path), default_metric,
-            default_mode)
+            default_mode, cache_dir)
 
     @property
     def best_trial(self) -> Trial:
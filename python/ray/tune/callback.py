@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, Dict, List
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from ray.tune.checkpoint_manager import Checkpoint
+from ray.tune.error import TrialResultsError, call_for_each_result
 
 if TYPE_CHECKING:
     from ray.tune.trial import Trial
@@ -124,6 +125,32 @@ class Callback:
         """
         pass
 
+    def on_trial_results(self, iteration: int, trials: List["Trial"],
+                         trial_results: List[Tuple["Trial", Dict]], **info):
+        """Called after receiving results from multiple trials at once.
+
+        By default, ``on_trial_result`` is called for each trial. Override
+        this to handle all results of one step of the tuning loop at once.
+        If ``on_trial_result`` raises for some of the results, the other
+        results are still processed and a ``TrialResultsError`` is raised
+        afterwards, so only these trials fail. If an override raises any
+        other error, all trials of the batch fail.
+
+        Arguments:
+            iteration (int): Number of iterations of the tuning loop.
+            trials (List[Trial]): List of trials.
+            trial_results (List[Tuple[Trial, Dict]]): Trials that just sent
+                a result and their results.
+            **info: Kwargs dict for forward compatibility.
+        """
+        call_for_each_result(
+            lambda trial, result: self.on_trial_result(
+                iteration=iteration,
+                trials=trials,
+                trial=trial,
+                result=result,
+                **info), trial_results)
+
     def on_trial_complete(self, iteration: int, trials: List["Trial"],
                           trial: "Trial", **info):
         """Called after a trial instance completed.
@@ -203,6 +230,31 @@ class CallbackList:
         for callback in self._callbacks:
             callback.on_trial_result(**info)
 
+    def on_trial_results(self, trial_results: List[Tuple["Trial", Dict]],
+                         **info):
+        # Results failing in one callback are not passed to the following
+        # ones. Results are never passed to a callback twice.
+        errors = {}
+        for callback in self._callbacks:
+            indices = [
+                i for i in range(len(trial_results)) if i not in errors
+            ]
+            if not indices:
+                break
+            try:
+                callback.on_trial_results(
+                    trial_results=[trial_results[i] for i in indices],
+                    **info)
+            except TrialResultsError as e:
+                for i, error in e.errors.items():
+                    errors[indices[i]] = error
+            except Exception as e:
+                # Unknown which of the results were processed.
+                for i in indices:
+                    errors[i] = e
+        if errors:
+            raise TrialResultsError(errors)
+
     def on_trial_complete(self, **info):
         for callback in self._callbacks:
             callback.on_trial_complete(**info)
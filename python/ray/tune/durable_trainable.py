@@ -4,6 +4,7 @@ import inspect
 import logging
 import os
 
+import ray
 from ray.tune.function_runner import wrap_function
 from ray.tune.registry import get_trainable_cls
 from ray.tune.trainable import Trainable, TrainableUtil
@@ -66,6 +67,18 @@ class DurableTrainable(Trainable):
         self.storage_client.wait()
         return checkpoint_path
 
+    @ray.method(num_returns=2)
+    def save_snapshot(self):
+        """Takes a snapshot of the current model state to persist it later.
+
+        The snapshot is persisted remotely after it has been written to disk
+        (see ``Trainable.save_snapshot()``).
+        """
+        info, checkpoint = super(DurableTrainable, self).save_snapshot()
+        info["storage"] = (self._create_storage_client(), self.logdir,
+                           self.remote_checkpoint_dir)
+        return info, checkpoint
+
     def restore(self, checkpoint_path):
         """Restores training state from a given checkpoint persisted remotely.
 
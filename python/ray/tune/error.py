@@ -6,3 +6,43 @@ class TuneError(Exception):
 class AbortTrialExecution(TuneError):
     """Error that indicates a trial should not be retried."""
     pass
+
+
+class TrialResultsError(TuneError):
+    """Error raised by batched ``on_trial_results`` hooks.
+
+    Raised after all results of the batch were processed, if processing
+    some of them failed. Only the trials of these results fail.
+
+    Args:
+        errors (Dict[int, Exception]): The exception raised for each failed
+            result, keyed by the result's index in the batch.
+        outputs (list): The hook's output for each result (None for failed
+            ones), if the hook has outputs.
+    """
+
+    def __init__(self, errors, outputs=None):
+        self.errors = errors
+        self.outputs = outputs
+        super().__init__("Processing {} of the results failed: {}".format(
+            len(errors), list(errors.values())))
+
+
+def call_for_each_result(fn, results):
+    """Calls `fn(*result)` for each of the batched `results`.
+
+    Returns the outputs of `fn`. If `fn` raises for some of the results,
+    the other results are still processed and a TrialResultsError is raised
+    afterwards.
+    """
+    outputs = []
+    errors = {}
+    for i, result in enumerate(results):
+        try:
+            outputs.append(fn(*result))
+        except Exception as e:
+            outputs.append(None)
+            errors[i] = e
+    if errors:
+        raise TrialResultsError(errors, outputs)
+    return outputs
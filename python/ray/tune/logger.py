@@ -1,8 +1,12 @@
+import atexit
 import csv
+from datetime import datetime
 import json
 import logging
 import numpy as np
 import os
+import time
+import uuid
 import yaml
 
 from typing import Iterable, TYPE_CHECKING, Dict, List, Optional, TextIO, Type
@@ -14,7 +18,8 @@ from ray.tune.utils.util import SafeFallbackEncoder
 from ray.util.debug import log_once
 from ray.tune.result import (TRAINING_ITERATION, TIME_TOTAL_S, TIMESTEPS_TOTAL,
                              EXPR_PARAM_FILE, EXPR_PARAM_PICKLE_FILE,
-                             EXPR_PROGRESS_FILE, EXPR_RESULT_FILE)
+                             EXPR_PARQUET_DIR, EXPR_PROGRESS_FILE,
+                             EXPR_RESULT_FILE)
 from ray.tune.utils import flatten_dict
 
 if TYPE_CHECKING:
@@ -703,6 +708,141 @@ class TBXLoggerCallback(LoggerCallback):
                              "in the hyperparameter values.")
 
 
+class ParquetLoggerCallback(LoggerCallback):
+    """Logs the results of all trials to shared, compressed Parquet files.
+
+    Instead of one file per trial, results are buffered and written to
+    ``<experiment_dir>/parquet_results/results-<session>-<index>.parquet``
+    in chunks of at most ``max_rows_per_file`` results. Like in the
+    CSVLoggerCallback, nested dicts are flattened and the config is dropped
+    (it is logged to params.json by the JsonLoggerCallback). Non-scalar
+    values are stored as JSON strings.
+
+    The ``Analysis`` and ``ExperimentAnalysis`` classes load these files
+    instead of the ``progress.csv`` files of the trials, if present.
+
+    Buffered results are also written when a trial is paused, saved or
+    ended, and when the process exits.
+
+    Args:
+        max_rows_per_file (int): Number of results after which the
+            buffered results are written to a new file.
+        flush_period_s (float): Results are written to a new file at least
+            this often (if there are buffered results).
+        compression (str): Parquet compression codec.
+    """
+
+    def __init__(self,
+                 max_rows_per_file: int = 100000,
+                 flush_period_s: float = 10.,
+                 compression: str = "snappy"):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            self._pa = pyarrow
+            self._pq = pyarrow.parquet
+        except ImportError:
+            if log_once("parquet-install"):
+                logger.info("pip install pyarrow to log results to "
+                            "Parquet files.")
+            raise
+        self._max_rows_per_file = max_rows_per_file
+        self._flush_period_s = flush_period_s
+        self._compression = compression
+        self._session = "{}_{}".format(
+            datetime.today().strftime("%Y-%m-%d_%H-%M-%S"),
+            uuid.uuid4().hex[:8])
+        self._num_files = 0
+        self._last_flush = time.monotonic()
+        # Buffered (flattened) results per experiment dir.
+        self._experiment_rows: Dict[str, List[Dict]] = {}
+        self._live_trials = set()
+        atexit.register(self.flush)
+
+    def on_step_end(self, iteration: int, trials: List["Trial"], **info):
+        from ray.tune.trial import Trial
+
+        paused = [t for t in self._live_trials if t.status == Trial.PAUSED]
+        # Paused trials are started again when they are resumed.
+        self._live_trials.difference_update(paused)
+        if paused or (time.monotonic() - self._last_flush >=
+                      self._flush_period_s):
+            self.flush()
+
+    def log_trial_start(self, trial: "Trial"):
+        trial.init_logdir()
+        self._live_trials.add(trial)
+
+    def log_trial_result(self, iteration: int, trial: "Trial", result: Dict):
+        if trial not in self._live_trials:
+            self.log_trial_start(trial)
+
+        tmp = result.copy()
+        tmp.pop("config", None)
+        row = {
+            k: _to_parquet_value(v)
+            for k, v in flatten_dict(tmp, delimiter="/").items()
+        }
+        # Trial dirs are stored relative to the experiment dir, which is
+        # the parent dir of the trial dirs.
+        experiment_dir, row["logdir"] = os.path.split(
+            os.path.normpath(trial.logdir))
+        rows = self._experiment_rows.setdefault(experiment_dir, [])
+        rows.append(row)
+        if len(rows) >= self._max_rows_per_file:
+            self._write_rows(experiment_dir)
+
+    def log_trial_save(self, trial: "Trial"):
+        self.flush()
+
+    def log_trial_end(self, trial: "Trial", failed: bool = False):
+        self._live_trials.discard(trial)
+        self.flush()
+
+    def flush(self):
+        """Writes all buffered results to Parquet files."""
+        for experiment_dir in list(self._experiment_rows):
+            self._write_rows(experiment_dir)
+        self._last_flush = time.monotonic()
+
+    def _write_rows(self, experiment_dir: str):
+        rows = self._experiment_rows.pop(experiment_dir)
+        if not rows:
+            return
+        # Columns in order of appearance (results may differ in keys).
+        names = list(dict.fromkeys(k for row in rows for k in row))
+        arrays = []
+        for name in names:
+            values = [row.get(name) for row in rows]
+            try:
+                arrays.append(self._pa.array(values))
+            except (self._pa.ArrowInvalid, self._pa.ArrowTypeError):
+                # Mixed types, e.g. a metric that is sometimes a string.
+                arrays.append(
+                    self._pa.array(
+                        [None if v is None else str(v) for v in values]))
+        table = self._pa.Table.from_arrays(arrays, names=names)
+
+        parquet_dir = os.path.join(experiment_dir, EXPR_PARQUET_DIR)
+        os.makedirs(parquet_dir, exist_ok=True)
+        path = os.path.join(
+            parquet_dir, "results-{}-{:06d}.parquet".format(
+                self._session, self._num_files))
+        self._num_files += 1
+        # Write to a temporary file first so that readers never see
+        # partially written files.
+        tmp_path = path + ".tmp"
+        self._pq.write_table(table, tmp_path, compression=self._compression)
+        os.replace(tmp_path, path)
+
+
+def _to_parquet_value(value):
+    if value is None or isinstance(value, (bool, int, float, str, np.bool_,
+                                           np.number)):
+        return value
+    return json.dumps(value, cls=SafeFallbackEncoder)
+
+
 # Maintain backwards compatibility.
 from ray.tune.integration.mlflow import MLflowLogger as _MLflowLogger  # noqa: E402, E501
 MLflowLogger = _MLflowLogger
@@ -1,13 +1,14 @@
 # coding: utf-8
 import copy
 from functools import partial
+import json
 import logging
 import os
 import random
 import time
 import traceback
 from contextlib import contextmanager
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 import ray
 from ray.actor import ActorHandle
@@ -16,11 +17,13 @@ from ray import ray_constants
 from ray.resource_spec import ResourceSpec
 from ray.tune.durable_trainable import DurableTrainable
 from ray.tune.error import AbortTrialExecution, TuneError
+from ray.tune.function_runner import FunctionRunner
 from ray.tune.logger import NoopLogger
-from ray.tune.result import TRIAL_INFO, STDOUT_FILE, STDERR_FILE
+from ray.tune.result import NODE_IP, TIME_THIS_ITER_S, TRIAL_INFO, \
+    STDOUT_FILE, STDERR_FILE
 from ray.tune.resources import Resources
-from ray.tune.utils.placement_groups import PlacementGroupManager, \
-    get_tune_pg_prefix
+from ray.tune.utils.placement_groups import PlacementGroupFactory, \
+    PlacementGroupManager, get_tune_pg_prefix
 from ray.tune.utils.trainable import TrainableUtil
 from ray.tune.trial import Trial, Checkpoint, Location, TrialInfo
 from ray.tune.trial_executor import TrialExecutor
@@ -35,6 +38,11 @@ DEFAULT_GET_TIMEOUT = 60.0  # seconds
 TRIAL_CLEANUP_THRESHOLD = 100
 
 
+@ray.remote(num_cpus=0)
+def _persist_snapshot(info, checkpoint):
+    return TrainableUtil.persist_snapshot(info, checkpoint)
+
+
 class _ActorClassCache:
     """Caches actor classes.
 
@@ -128,6 +136,119 @@ class _TrialCleanup:
                 del self._cleanup_map[done]
 
 
+class _ActorCache:
+    """Caches the actors of stopped trials, so that new trials can reuse them.
+
+    Actors are cached by the trainable and the resources of their trial,
+    and are only reused by trials with the same trainable and resources.
+    If more than ``max_size`` actors are cached, the least recently cached
+    actors are evicted.
+
+    This also keeps track of the actor start time saved by reusing actors.
+    The start time of an actor is measured as the time from creating it
+    until its first result, minus the training time of this result.
+
+    Args:
+        max_size (int): Maximum number of cached actors.
+    """
+
+    def __init__(self, max_size: int = 1):
+        self.max_size = max_size
+        # (key, actor, placement group, resources), least recent first.
+        # Resources are only set for trials not using placement groups.
+        self._entries = []
+        # Key -> (total measured start time, number of measurements)
+        self._start_times = {}
+        self.num_started = 0
+        self.num_reused = 0
+        self.time_saved = 0.
+
+    @staticmethod
+    def get_key(trial: Trial) -> Tuple:
+        if trial.uses_placement_groups:
+            return trial.trainable_name, trial.placement_group_factory
+        return trial.trainable_name, json.dumps(
+            trial.resources.to_json(), sort_keys=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, trial: Trial, actor: ActorHandle, pg) -> List[Tuple]:
+        """Caches the actor of the trial.
+
+        Returns:
+            List of (actor, placement group) tuples evicted from the cache.
+        """
+        resources = None
+        if not trial.uses_placement_groups:
+            resources = Resources(
+                cpu=trial.resources.cpu_total(),
+                gpu=trial.resources.gpu_total(),
+                custom_resources={
+                    k: trial.resources.get_res_total(k)
+                    for k in trial.resources.custom_resources
+                })
+        self._entries.append((self.get_key(trial), actor, pg, resources))
+        return self.evict(max_num=len(self._entries) - self.max_size)
+
+    def pop(self, trial: Trial) -> Optional[Tuple]:
+        """Removes the most recently cached actor the trial can reuse.
+
+        Returns:
+            (actor, placement group) tuple or None if no actor is cached.
+        """
+        key = self.get_key(trial)
+        for i in reversed(range(len(self._entries))):
+            if self._entries[i][0] == key:
+                _, actor, pg, _ = self._entries.pop(i)
+                return actor, pg
+        return None
+
+    def evict(self,
+              should_evict: Optional[Callable[[Tuple], bool]] = None,
+              max_num: Optional[int] = None) -> List[Tuple]:
+        """Removes cached actors, least recently cached first.
+
+        Args:
+            should_evict (Callable[[Tuple], bool]): Only actors for whose
+                key this returns True are evicted. Defaults to all actors.
+            max_num (int): Maximum number of actors to evict.
+
+        Returns:
+            List of (actor, placement group) tuples evicted from the cache.
+        """
+        evicted = []
+        for entry in list(self._entries):
+            if max_num is not None and len(evicted) >= max_num:
+                break
+            if should_evict is None or should_evict(entry[0]):
+                self._entries.remove(entry)
+                evicted.append(entry[1:3])
+        return evicted
+
+    def get_cached_resources(self) -> List[Resources]:
+        """Returns the resources of cached actors without placement group."""
+        return [
+            resources for _, _, _, resources in self._entries
+            if resources is not None
+        ]
+
+    def on_actor_started(self, trial: Trial, start_time: float):
+        total, num = self._start_times.get(self.get_key(trial), (0., 0))
+        self._start_times[self.get_key(trial)] = (total + start_time, num + 1)
+
+    def on_actor_reused(self, trial: Trial, reset_time: float):
+        self.num_reused += 1
+        total, num = self._start_times.get(self.get_key(trial), (0., 0))
+        if num:
+            self.time_saved += max(0., total / num - reset_time)
+
+    def debug_string(self) -> str:
+        return (f"Reused actors for {self.num_reused}/"
+                f"{self.num_reused + self.num_started} started trials, "
+                f"saving about {self.time_saved:.1f} s of actor start time")
+
+
 def noop_logger_creator(config, logdir):
     # Set the working dir in the remote process, for user file writes
     os.makedirs(logdir, exist_ok=True)
@@ -157,7 +278,15 @@ class RayTrialExecutor(TrialExecutor):
         self._trial_cleanup = _TrialCleanup()
         self._has_cleaned_up_pgs = False
         self._reuse_actors = reuse_actors
-        self._cached_actor_pg = (None, None)
+        self._actor_cache = _ActorCache(
+            max_size=int(os.getenv("TUNE_MAX_CACHED_ACTORS", "1")))
+        # Trial -> creation time of its new actor, until its first result.
+        self._actor_creation_times = {}
+        # Trial -> size in bytes of its last checkpoint saved for transfer,
+        # and the reference to the size of a newer one (see
+        # `save_for_transfer()`).
+        self._transfer_sizes = {}
+        self._pending_transfer_sizes = {}
 
         self._avail_resources = Resources(cpu=0, gpu=0)
         self._committed_resources = Resources(cpu=0, gpu=0)
@@ -190,6 +319,15 @@ class RayTrialExecutor(TrialExecutor):
         self._buffer_max_time_s = float(
             os.getenv("TUNE_RESULT_BUFFER_MAX_TIME_S", 100.))
 
+        # Persist checkpoints in a separate task while the trial continues
+        # training, keeping at most `_max_pending_checkpoints` per trial.
+        self._persist_checkpoints_async = bool(
+            int(os.getenv("TUNE_PERSIST_CHECKPOINTS_ASYNC", "0")))
+        self._max_pending_checkpoints = int(
+            os.getenv("TUNE_MAX_PENDING_CHECKPOINTS", "2"))
+        # Persist task ObjectRef -> (Trial, Checkpoint), in order of saving.
+        self._persisting = {}
+
         self._last_resource_refresh = float("-inf")
         self._last_ip_refresh = float("-inf")
         self._last_ip_addresses = set()
@@ -255,34 +393,29 @@ class RayTrialExecutor(TrialExecutor):
         self.try_checkpoint_metadata(trial)
         logger_creator = partial(noop_logger_creator, logdir=trial.logdir)
 
-        if self._reuse_actors and self._cached_actor_pg[0] is not None:
+        cached = self._actor_cache.pop(trial) if self._reuse_actors else None
+        if cached:
+            existing_runner, pg = cached
             logger.debug(f"Trial {trial}: Reusing cached runner "
-                         f"{self._cached_actor_pg[0]}")
-            existing_runner, pg = self._cached_actor_pg
-            self._cached_actor_pg = (None, None)
+                         f"{existing_runner}")
 
             trial.set_runner(existing_runner)
             if pg and trial.uses_placement_groups:
                 self._pg_manager.assign_cached_pg(pg, trial)
 
+            start_time = time.monotonic()
             if not self.reset_trial(trial, trial.config, trial.experiment_tag,
                                     logger_creator):
                 raise AbortTrialExecution(
                     "Trainable runner reuse requires reset_config() to be "
                     "implemented and return True.")
+            self._actor_cache.on_actor_reused(trial,
+                                              time.monotonic() - start_time)
             return existing_runner
 
-        if self._cached_actor_pg[0]:
-            logger.debug("Cannot reuse cached runner {} for new trial".format(
-                self._cached_actor_pg[0]))
-            existing_runner, pg = self._cached_actor_pg
-
-            if pg:
-                self._pg_manager.return_or_clean_cached_pg(pg)
-
-            with self._change_working_directory(trial):
-                self._trial_cleanup.add(trial, actor=existing_runner)
-            self._cached_actor_pg = (None, None)
+        trial_key = _ActorCache.get_key(trial)
+        if not trial.uses_placement_groups:
+            self._evict_cached_actors_for_resources()
 
         trainable_cls = trial.get_trainable_cls()
         if not trainable_cls:
@@ -293,6 +426,11 @@ class RayTrialExecutor(TrialExecutor):
 
         if trial.uses_placement_groups:
             if not self._pg_manager.has_ready(trial, update=True):
+                # Cached actors of other trainables or placement group
+                # factories might block the resources of this trial.
+                self._evict_cached_actors(
+                    lambda key: key != trial_key, max_num=1)
+
                 if trial not in self._staged_trials:
                     if self._pg_manager.stage_trial_pg(trial):
                         self._staged_trials.add(trial)
@@ -357,9 +495,59 @@ class RayTrialExecutor(TrialExecutor):
         if issubclass(trial.get_trainable_cls(), DurableTrainable):
             kwargs["remote_checkpoint_dir"] = trial.remote_checkpoint_dir
 
+        self._actor_cache.num_started += 1
+        self._actor_creation_times[trial] = time.monotonic()
         with self._change_working_directory(trial):
             return full_actor_class.remote(**kwargs)
 
+    def _evict_cached_actors(self,
+                             should_evict: Optional[Callable] = None,
+                             max_num: Optional[int] = None) -> int:
+        """Destroys cached actors. See ``_ActorCache.evict()``.
+
+        Returns:
+            Number of evicted actors.
+        """
+        evicted = self._actor_cache.evict(should_evict, max_num)
+        for actor, pg in evicted:
+            self._destroy_cached_actor(actor, pg)
+        return len(evicted)
+
+    def _destroy_cached_actor(self, actor: ActorHandle, pg):
+        logger.debug(f"Destroying cached runner {actor}")
+        if pg:
+            self._pg_manager.return_or_clean_cached_pg(pg)
+        self._trial_cleanup.add(None, actor=actor)
+
+    def _evict_cached_actors_for_resources(self):
+        """Evicts cached actors until all committed resources are available.
+
+        Cached actors without placement groups keep their resources, which
+        are not counted as committed resources.
+        """
+        while True:
+            available = Resources.subtract(self._avail_resources,
+                                           self._committed_resources)
+            for resources in self._actor_cache.get_cached_resources():
+                available = Resources.subtract(available, resources)
+            if available.is_nonnegative():
+                return
+            if not self._evict_cached_actors(
+                    lambda key: not isinstance(key[1], PlacementGroupFactory),
+                    max_num=1):
+                return
+
+    def _evict_unneeded_cached_actors(self, trials: List[Trial]):
+        """Evicts cached actors that no pending or paused trial can reuse."""
+        if not len(self._actor_cache):
+            return
+        keys = {
+            _ActorCache.get_key(trial)
+            for trial in trials
+            if trial.status in [Trial.PENDING, Trial.PAUSED]
+        }
+        self._evict_cached_actors(lambda key: key not in keys)
+
     def _train(self, trial):
         """Start one iteration of training and save remote id."""
         if self._find_item(self._paused, trial):
@@ -458,18 +646,21 @@ class RayTrialExecutor(TrialExecutor):
         self.set_status(trial, Trial.ERROR if error else Trial.TERMINATED)
         self._trial_just_finished = True
         trial.set_location(Location())
+        self._actor_creation_times.pop(trial, None)
 
         try:
             trial.write_error_log(error_msg)
             if hasattr(trial, "runner") and trial.runner:
                 if (not error and self._reuse_actors
-                        and self._cached_actor_pg[0] is None):
+                        and self._actor_cache.max_size > 0):
                     logger.debug("Reusing actor for %s", trial.runner)
                     # Move PG into cache (disassociate from trial)
                     pg = self._pg_manager.cache_trial_pg(trial)
                     if pg or not trial.uses_placement_groups:
                         # True if a placement group was replaced
-                        self._cached_actor_pg = (trial.runner, pg)
+                        for actor, evicted_pg in self._actor_cache.add(
+                                trial, trial.runner, pg):
+                            self._destroy_cached_actor(actor, evicted_pg)
                         should_destroy_actor = False
                     else:
                         # False if no placement group was replaced. This should
@@ -645,8 +836,16 @@ class RayTrialExecutor(TrialExecutor):
         return None
 
     def get_next_available_trial(self, timeout: Optional[float] = None):
+        trials = self.get_next_available_trials(timeout=timeout)
+        return trials[0] if trials else None
+
+    def get_next_available_trials(self, timeout: Optional[float] = None):
+        """Returns all trials with a ready result.
+
+        Blocks (up to `timeout` seconds) until at least one result is ready.
+        """
         if not self._running:
-            return None
+            return []
         shuffled_results = list(self._running.keys())
         random.shuffle(shuffled_results)
 
@@ -655,10 +854,14 @@ class RayTrialExecutor(TrialExecutor):
         # trials (i.e. trials that run remotely) also get fairly reported.
         # See https://github.com/ray-project/ray/issues/4211 for details.
         start = time.time()
-        ready, _ = ray.wait(shuffled_results, timeout=timeout)
+        # Under load, usually many results are ready at once: Fetch all of
+        # them without blocking and only wait for one if none is ready.
+        ready, _ = ray.wait(
+            shuffled_results, num_returns=len(shuffled_results), timeout=0)
+        if not ready:
+            ready, _ = ray.wait(shuffled_results, timeout=timeout)
         if not ready:
-            return None
-        result_id = ready[0]
+            return []
         wait_time = time.time() - start
         if wait_time > NONTRIVIAL_WAIT_TIME_THRESHOLD_S:
             self._last_nontrivial_wait = time.time()
@@ -670,7 +873,7 @@ class RayTrialExecutor(TrialExecutor):
                     BOTTLENECK_WARN_PERIOD_S))
 
             self._last_nontrivial_wait = time.time()
-        return self._running[result_id]
+        return [self._running[result_id] for result_id in ready]
 
     def fetch_result(self, trial):
         """Fetches result list of the running trials.
@@ -690,7 +893,13 @@ class RayTrialExecutor(TrialExecutor):
             result = result.unwrap()
 
         if not isinstance(result, list):
-            return [result]
+            result = [result]
+        if trial in self._actor_creation_times and result and isinstance(
+                result[0], dict):
+            train_time = sum(r.get(TIME_THIS_ITER_S) or 0. for r in result)
+            start_time = time.monotonic() - self._actor_creation_times.pop(
+                trial) - train_time
+            self._actor_cache.on_actor_started(trial, max(0., start_time))
         return result
 
     def _commit_resources(self, resources):
@@ -797,6 +1006,36 @@ class RayTrialExecutor(TrialExecutor):
 
         return self.has_resources(trial.resources)
 
+    def get_free_trial_slots(self, trial: Trial) -> int:
+        """Returns how many more trials like this trial fit into the cluster.
+
+        Only the free CPUs and GPUs are considered.
+
+        Args:
+            trial: Trial object whose resource requirements are used.
+
+        Returns:
+            int
+        """
+        self._update_avail_resources()
+        used = self._pg_manager.total_used_resources(self._committed_resources)
+        if trial.uses_placement_groups:
+            required = trial.placement_group_factory.required_resources
+        else:
+            required = {
+                "CPU": trial.resources.cpu_total(),
+                "GPU": trial.resources.gpu_total()
+            }
+        free = {
+            "CPU": self._avail_resources.cpu - used.get("CPU", 0),
+            "GPU": self._avail_resources.gpu - used.get("GPU", 0)
+        }
+        slots = [
+            int(free[key] // required[key]) for key in free
+            if required.get(key, 0) > 0
+        ]
+        return max(min(slots), 0) if slots else 0
+
     def has_resources(self, resources):
         """Returns whether this runner has at least the specified resources.
 
@@ -865,6 +1104,8 @@ class RayTrialExecutor(TrialExecutor):
             ])
             if customs:
                 status += " ({})".format(customs)
+            if self._reuse_actors:
+                status += "\n" + self._actor_cache.debug_string()
             return status
         else:
             return "Resources requested: ?"
@@ -900,6 +1141,7 @@ class RayTrialExecutor(TrialExecutor):
         if time.time() > self.last_pg_recon + self.pg_recon_interval:
             # Only do this every now and then - usually the placement groups
             # should not get out of sync, and calling this often is inefficient
+            self._evict_unneeded_cached_actors(trial_runner.get_trials())
             self._pg_manager.reconcile_placement_groups(
                 trial_runner.get_trials())
             self.last_pg_recon = time.time()
@@ -909,6 +1151,14 @@ class RayTrialExecutor(TrialExecutor):
     def save(self, trial, storage=Checkpoint.PERSISTENT, result=None):
         """Saves the trial's state to a checkpoint asynchronously.
 
+        If ``TUNE_PERSIST_CHECKPOINTS_ASYNC=1``, persistent checkpoints of
+        class trainables are persisted in a separate task, so that the
+        trial doesn't wait for it: The task writes checkpoint dicts and the
+        metadata to disk and uploads durable checkpoints to remote storage
+        (files written by ``save_checkpoint()`` are written by the trial
+        itself). Such checkpoints are returned by
+        ``get_persisted_checkpoints()`` once they have been persisted.
+
         Args:
             trial (Trial): The trial to be saved.
             storage (str): Where to store the checkpoint. Defaults to
@@ -925,6 +1175,14 @@ class RayTrialExecutor(TrialExecutor):
                 value = trial.runner.save_to_object.remote()
                 checkpoint = Checkpoint(storage, value, result)
                 trial.on_checkpoint(checkpoint)
+            elif self._can_save_async(trial, result):
+                info, snapshot = trial.runner.save_snapshot.remote()
+                node = "node:{}".format(result[NODE_IP])
+                value = _persist_snapshot.options(resources={
+                    node: 0.01
+                }).remote(info, snapshot)
+                checkpoint = Checkpoint(storage, None, result)
+                self._persisting[value] = (trial, checkpoint)
             else:
                 value = trial.runner.save.remote()
                 checkpoint = Checkpoint(storage, value, result)
@@ -932,6 +1190,112 @@ class RayTrialExecutor(TrialExecutor):
                 self._running[value] = trial
         return checkpoint
 
+    def _can_save_async(self, trial, result):
+        """Returns whether a persistent checkpoint can be saved async.
+
+        Checkpoints of function trainables are always saved synchronously.
+        If too many checkpoints of the trial are still being persisted, it
+        saves synchronously as well, which bounds the memory held by them.
+        """
+        if not self._persist_checkpoints_async or NODE_IP not in result:
+            return False
+        if issubclass(trial.get_trainable_cls(), FunctionRunner):
+            return False
+        num_pending = sum(
+            1 for t, _ in self._persisting.values() if t is trial)
+        return num_pending < self._max_pending_checkpoints
+
+    def has_persisting_checkpoints(self):
+        """Returns whether checkpoints are still being persisted."""
+        return bool(self._persisting)
+
+    def get_persisted_checkpoints(self, timeout=0):
+        """Returns the checkpoints that have been persisted asynchronously.
+
+        Checkpoints of each trial are returned in the order they were saved.
+        Checkpoints that failed to persist are logged and dropped.
+
+        Args:
+            timeout (float): Maximum time to wait for pending checkpoints.
+
+        Returns:
+            List of (Trial, Checkpoint) tuples.
+        """
+        if not self._persisting:
+            return []
+        ready, _ = ray.wait(
+            list(self._persisting),
+            num_returns=len(self._persisting),
+            timeout=timeout)
+        ready = set(ready)
+        blocked = set()
+        persisted = []
+        for value, (trial, checkpoint) in list(self._persisting.items()):
+            if trial in blocked or value not in ready:
+                blocked.add(trial)
+                continue
+            del self._persisting[value]
+            try:
+                checkpoint.value = ray.get(value)
+            except Exception:
+                logger.exception("Trial %s: Error persisting checkpoint.",
+                                 trial)
+                continue
+            persisted.append((trial, checkpoint))
+        return persisted
+
+    def save_for_transfer(self, trial, result=None, max_object_size=None):
+        """Saves the trial's state to a checkpoint for restoring other trials.
+
+        The checkpoint is transferred via the object store (as in-memory
+        checkpoint), unless the trial's previous checkpoint saved for
+        transfer was larger than ``max_object_size`` bytes. Then a
+        PERSISTENT checkpoint is saved instead, which is synced and kept
+        like any other persistent checkpoint of the trial.
+
+        Args:
+            trial (Trial): The trial to be saved.
+            result (dict): The state of this trial as a dictionary to be saved.
+                If result is None, the trial's last result will be used.
+            max_object_size (int): Maximum size in bytes of checkpoints
+                transferred via the object store.
+
+        Returns:
+            Checkpoint object.
+        """
+        if max_object_size is not None and \
+                self._get_transfer_size(trial) > max_object_size:
+            logger.debug(
+                "Trial %s: Saving a persistent checkpoint for transfer, as "
+                "its last one had more than %d bytes.", trial,
+                max_object_size)
+            return self.save(trial, Checkpoint.PERSISTENT, result)
+
+        result = result or trial.last_result
+        with self._change_working_directory(trial):
+            size, value = trial.runner.save_to_transfer_object.remote()
+        self._pending_transfer_sizes[trial] = size
+        checkpoint = Checkpoint(Checkpoint.MEMORY, value, result)
+        trial.on_checkpoint(checkpoint)
+        return checkpoint
+
+    def _get_transfer_size(self, trial):
+        """Returns the size of the last known checkpoint saved for transfer.
+
+        Doesn't wait for checkpoints that are still being saved.
+        """
+        pending = self._pending_transfer_sizes.get(trial)
+        if pending is not None:
+            ready, _ = ray.wait([pending], timeout=0)
+            if ready:
+                del self._pending_transfer_sizes[trial]
+                try:
+                    self._transfer_sizes[trial] = ray.get(pending)
+                except Exception:
+                    logger.debug("Trial %s: Saving for transfer failed.",
+                                 trial)
+        return self._transfer_sizes.get(trial, 0)
+
     def restore(self, trial, checkpoint=None, block=False):
         """Restores training state from a given model checkpoint.
 
@@ -1006,6 +1370,7 @@ class RayTrialExecutor(TrialExecutor):
             return self._avail_resources.gpu > 0
 
     def cleanup(self, trial_runner):
+        self._evict_cached_actors()
         self._trial_cleanup.cleanup(partial=False)
         self._pg_manager.reconcile_placement_groups(trial_runner.get_trials())
         self._pg_manager.cleanup(force=True)
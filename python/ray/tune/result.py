@@ -125,5 +125,9 @@ EXPR_PROGRESS_FILE = "progress.csv"
 # File that stores results of the trial.
 EXPR_RESULT_FILE = "result.json"
 
+# Directory under the experiment directory that stores the results of all
+# trials logged by the ParquetLoggerCallback.
+EXPR_PARQUET_DIR = "parquet_results"
+
 # Config prefix when using Analysis.
 CONFIG_PREFIX = "config/"
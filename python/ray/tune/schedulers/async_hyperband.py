@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Optional, Union
+from typing import Dict, Optional
 
 import numpy as np
 import pickle
@@ -7,6 +7,7 @@ import pickle
 from ray.tune import trial_runner
 from ray.tune.result import DEFAULT_METRIC
 from ray.tune.schedulers.trial_scheduler import FIFOScheduler, TrialScheduler
+from ray.tune.schedulers.util import SortedValues
 from ray.tune.trial import Trial
 
 logger = logging.getLogger(__name__)
@@ -177,6 +178,8 @@ class _Bracket():
 
     Rungs are created in reversed order so that we can more easily find
     the correct rung corresponding to the current iteration of the result.
+    The results recorded in each rung are kept sorted, so that computing
+    the cutoff of a rung does not require a pass over all its results.
 
     Example:
         >>> b = _Bracket(1, 10, 2, 0)
@@ -191,14 +194,13 @@ class _Bracket():
                  s: int):
         self.rf = reduction_factor
         MAX_RUNGS = int(np.log(max_t / min_t) / np.log(self.rf) - s + 1)
-        self._rungs = [(min_t * self.rf**(k + s), {})
+        self._rungs = [(min_t * self.rf**(k + s), SortedValues())
                        for k in reversed(range(MAX_RUNGS))]
 
-    def cutoff(self, recorded) -> Union[None, int, float, complex, np.ndarray]:
+    def cutoff(self, recorded: SortedValues) -> Optional[float]:
         if not recorded:
             return None
-        return np.nanpercentile(
-            list(recorded.values()), (1 - 1 / self.rf) * 100)
+        return recorded.nanpercentile((1 - 1 / self.rf) * 100)
 
     def on_result(self, trial: Trial, cur_iter: int,
                   cur_rew: Optional[float]) -> str:
@@ -234,4 +236,7 @@ if __name__ == "__main__":
         grace_period=1, max_t=10, reduction_factor=2)
     print(sched.debug_string())
     bracket = sched._brackets[0]
-    print(bracket.cutoff({str(i): i for i in range(20)}))
+    recorded = SortedValues()
+    for i in range(20):
+        recorded[str(i)] = i
+    print(bracket.cutoff(recorded))
@@ -1,3 +1,4 @@
+import bisect
 import collections
 import logging
 from typing import Dict, List, Optional
@@ -8,6 +9,7 @@ from ray.tune import trial_runner
 from ray.tune.result import DEFAULT_METRIC
 from ray.tune.trial import Trial
 from ray.tune.schedulers.trial_scheduler import FIFOScheduler, TrialScheduler
+from ray.tune.schedulers.util import SortedValues
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +81,14 @@ class MedianStoppingRule(FIFOScheduler):
         self._trial_state = {}
         self._last_pause = collections.defaultdict(lambda: float("-inf"))
         self._results = collections.defaultdict(list)
+        # Incrementally maintained running means (from the grace period
+        # onwards): The times and cumulative metric sums of the results of
+        # each trial, and the (sorted) running means of all trials that
+        # reported a result at a given time. Only valid while the time
+        # attribute of every trial increases monotonically.
+        self._cumulative_sums = collections.defaultdict(lambda: ([], []))
+        self._running_means = collections.defaultdict(SortedValues)
+        self._times_monotonic = True
 
     def set_search_properties(self, metric: Optional[str],
                               mode: Optional[str]) -> bool:
@@ -130,7 +140,7 @@ class MedianStoppingRule(FIFOScheduler):
             return TrialScheduler.CONTINUE
 
         time = result[self._time_attr]
-        self._results[trial].append(result)
+        self._record_result(trial, result)
 
         if time < self._grace_period:
             return TrialScheduler.CONTINUE
@@ -151,7 +161,7 @@ class MedianStoppingRule(FIFOScheduler):
                     len(trials), trial.trial_id, time, action_str))
             return action
 
-        median_result = self._median_result(trials, time)
+        median_result = self._median_result(trials, time, exclude=trial)
         best_result = self._best_result(trial)
         logger.debug("Trial {} best res={} vs median res={} at t={}".format(
             trial, best_result, median_result, time))
@@ -168,7 +178,7 @@ class MedianStoppingRule(FIFOScheduler):
 
     def on_trial_complete(self, trial_runner: "trial_runner.TrialRunner",
                           trial: Trial, result: Dict):
-        self._results[trial].append(result)
+        self._record_result(trial, result)
 
     def debug_string(self) -> str:
         return "Using MedianStoppingRule: num_stopped={}.".format(
@@ -184,6 +194,23 @@ class MedianStoppingRule(FIFOScheduler):
         ]
         return TrialScheduler.PAUSE if pause else TrialScheduler.CONTINUE
 
+    def _record_result(self, trial: Trial, result: Dict):
+        results = self._results[trial]
+        if self._time_attr not in result or self._metric not in result:
+            results.append(result)
+            return
+        time = result[self._time_attr]
+        if results and time < results[-1].get(self._time_attr, time):
+            self._times_monotonic = False
+        results.append(result)
+        if time < self._grace_period or not self._times_monotonic:
+            return
+
+        times, sums = self._cumulative_sums[trial]
+        times.append(time)
+        sums.append((sums[-1] if sums else 0) + result[self._metric])
+        self._running_means[time][trial] = sums[-1] / len(sums)
+
     def _trials_beyond_time(self, time: float) -> List[Trial]:
         trials = [
             trial for trial in self._results
@@ -191,10 +218,30 @@ class MedianStoppingRule(FIFOScheduler):
         ]
         return trials
 
-    def _median_result(self, trials: List[Trial], time: float):
+    def _median_result(self,
+                       trials: List[Trial],
+                       time: float,
+                       exclude: Optional[Trial] = None):
+        running_means = self._running_means.get(time)
+        # If all `trials` (and `exclude`) reported a result at exactly
+        # `time`, their sorted running means are already available.
+        if (self._times_monotonic and running_means is not None
+                and not running_means.num_nan and exclude in running_means
+                and len(running_means) == len(trials) + 1):
+            excluded = running_means.pop(exclude)
+            median = running_means.nanpercentile(50)
+            running_means[exclude] = excluded
+            return median
         return np.median([self._running_mean(trial, time) for trial in trials])
 
     def _running_mean(self, trial: Trial, time: float) -> np.ndarray:
+        if self._times_monotonic:
+            times, sums = self._cumulative_sums[trial]
+            num_results = bisect.bisect_right(times, time)
+            if not num_results:
+                return np.nan
+            return sums[num_results - 1] / num_results
+
         results = self._results[trial]
         # TODO(ekl) we could do interpolation to be more precise, but for now
         # assume len(results) is large and the time diffs are roughly equal
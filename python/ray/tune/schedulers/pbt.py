@@ -5,6 +5,7 @@ import math
 import os
 import random
 import shutil
+import time
 from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from ray.tune import trial_runner
@@ -189,6 +190,12 @@ class PopulationBasedTraining(FIFOScheduler):
             synced at the same time_attr every perturbation_interval.
             Defaults to False. See Appendix A.1 here
             https://arxiv.org/pdf/1711.09846.pdf.
+        max_object_checkpoint_size (int): Checkpoints of top trials of up
+            to this many bytes are transferred to the exploiting trials via
+            the object store. Once a trial's checkpoint is larger, its next
+            checkpoints are saved as persistent checkpoints instead (which
+            are synced like any other persistent checkpoint). Defaults to
+            512 MiB.
 
     .. code-block:: python
 
@@ -231,7 +238,8 @@ class PopulationBasedTraining(FIFOScheduler):
                  custom_explore_fn: Optional[Callable] = None,
                  log_config: bool = True,
                  require_attrs: bool = True,
-                 synch: bool = False):
+                 synch: bool = False,
+                 max_object_checkpoint_size: int = 512 * 1024 * 1024):
         hyperparam_mutations = hyperparam_mutations or {}
         for value in hyperparam_mutations.values():
             if not (isinstance(value,
@@ -290,10 +298,12 @@ class PopulationBasedTraining(FIFOScheduler):
         self._require_attrs = require_attrs
         self._synch = synch
         self._next_perturbation_sync = self._perturbation_interval
+        self._max_object_checkpoint_size = max_object_checkpoint_size
 
         # Metrics
         self._num_checkpoints = 0
         self._num_perturbations = 0
+        self._exploit_time_s = 0.
 
     def set_search_properties(self, metric: Optional[str],
                               mode: Optional[str]) -> bool:
@@ -475,8 +485,11 @@ class PopulationBasedTraining(FIFOScheduler):
                 # Paused trial will always have an in-memory checkpoint.
                 state.last_checkpoint = trial.checkpoint
             else:
-                state.last_checkpoint = trial_runner.trial_executor.save(
-                    trial, Checkpoint.MEMORY, result=state.last_result)
+                state.last_checkpoint = (
+                    trial_runner.trial_executor.save_for_transfer(
+                        trial,
+                        result=state.last_result,
+                        max_object_size=self._max_object_checkpoint_size))
             self._num_checkpoints += 1
         else:
             state.last_checkpoint = None  # not a top trial
@@ -485,10 +498,17 @@ class PopulationBasedTraining(FIFOScheduler):
             logger.debug("Trial {} is in lower quantile".format(trial))
             trial_to_clone = random.choice(upper_quantile)
             assert trial is not trial_to_clone
-            if not self._trial_state[trial_to_clone].last_checkpoint:
+            last_checkpoint = self._trial_state[trial_to_clone].last_checkpoint
+            if not last_checkpoint:
                 logger.info("[pbt]: no checkpoint for trial."
                             " Skip exploit for Trial {}".format(trial))
                 return
+            if last_checkpoint.storage == Checkpoint.PERSISTENT and \
+                    not isinstance(last_checkpoint.value, str):
+                logger.info("[pbt]: checkpoint of trial {} not saved yet."
+                            " Skip exploit for Trial {}".format(
+                                trial_to_clone, trial))
+                return
             self._exploit(trial_runner.trial_executor, trial, trial_to_clone)
 
     def _log_config_on_step(self, trial_state: PBTTrialState,
@@ -535,6 +555,7 @@ class PopulationBasedTraining(FIFOScheduler):
 
         If specified, also logs the updated hyperparam state.
         """
+        start = time.time()
         trial_state = self._trial_state[trial]
         new_state = self._trial_state[trial_to_clone]
         logger.info("[exploit] transferring weights from trial "
@@ -605,6 +626,11 @@ class PopulationBasedTraining(FIFOScheduler):
         trial_state.last_perturbation_time = new_state.last_perturbation_time
         trial_state.last_train_time = new_state.last_train_time
 
+        exploit_time = time.time() - start
+        self._exploit_time_s += exploit_time
+        logger.debug("[exploit] took {:.3f}s for trial {}".format(
+            exploit_time, trial))
+
     def _quantiles(self) -> Tuple[List[Trial], List[Trial]]:
         """Returns trials in the lower and upper `quantile` of the population.
 
@@ -652,6 +678,7 @@ class PopulationBasedTraining(FIFOScheduler):
     def reset_stats(self):
         self._num_perturbations = 0
         self._num_checkpoints = 0
+        self._exploit_time_s = 0.
 
     def last_scores(self, trials: List[Trial]) -> List[float]:
         scores = []
@@ -662,8 +689,12 @@ class PopulationBasedTraining(FIFOScheduler):
         return scores
 
     def debug_string(self) -> str:
-        return "PopulationBasedTraining: {} checkpoints, {} perturbs".format(
-            self._num_checkpoints, self._num_perturbations)
+        mean_exploit_time = self._exploit_time_s / max(
+            1, self._num_perturbations)
+        return ("PopulationBasedTraining: {} checkpoints, {} perturbs, "
+                "{:.3f}s mean exploit time".format(
+                    self._num_checkpoints, self._num_perturbations,
+                    mean_exploit_time))
 
 
 class PopulationBasedTrainingReplay(FIFOScheduler):
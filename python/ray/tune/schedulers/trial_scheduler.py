@@ -1,6 +1,7 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ray.tune import trial_runner
+from ray.tune.error import call_for_each_result
 from ray.tune.result import DEFAULT_METRIC
 from ray.tune.trial import Trial
 
@@ -64,6 +65,26 @@ class TrialScheduler:
 
         raise NotImplementedError
 
+    def on_trial_results(self, trial_runner: "trial_runner.TrialRunner",
+                         trial_results: List[Tuple[Trial, Dict]]) -> List[str]:
+        """Called on a batch of intermediate results of different trials.
+
+        The TrialRunner passes all results that became available at the
+        same time in one call. By default, ``on_trial_result`` is called for
+        each trial. Override this to make decisions for the whole batch at
+        once. If ``on_trial_result`` raises for some of the trials, the
+        other trials are still processed and a ``TrialResultsError`` is
+        raised afterwards, so only these trials fail. If an override raises
+        any other error, all trials of the batch fail.
+
+        Returns:
+            List[str]: The decision (CONTINUE, PAUSE or STOP) for each
+                trial, in the order of `trial_results`.
+        """
+        return call_for_each_result(
+            lambda trial, result: self.on_trial_result(
+                trial_runner, trial, result), trial_results)
+
     def on_trial_complete(self, trial_runner: "trial_runner.TrialRunner",
                           trial: Trial, result: Dict):
         """Notification for the completion of trial.
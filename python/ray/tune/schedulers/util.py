@@ -0,0 +1,75 @@
+import bisect
+import math
+from typing import Any, Hashable
+
+
+class SortedValues:
+    """Mapping of keys to numbers that keeps its (non-NaN) values sorted.
+
+    Used by schedulers to look up percentiles of the results of many trials
+    (e.g. ASHA rung cutoffs) without sorting all results on every decision.
+    Percentiles are computed like ``np.nanpercentile`` with linear
+    interpolation.
+
+    Example:
+        >>> values = SortedValues()
+        >>> for i in range(5):
+        >>>     values["trial_{}".format(i)] = i
+        >>> values.nanpercentile(50)
+        2.0
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._sorted = []
+        self._num_nan = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._values[key]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        if key in self._values:
+            self.pop(key)
+        self._values[key] = value
+        if math.isnan(value):
+            self._num_nan += 1
+        else:
+            bisect.insort(self._sorted, value)
+
+    def pop(self, key: Hashable) -> Any:
+        value = self._values.pop(key)
+        if math.isnan(value):
+            self._num_nan -= 1
+        else:
+            del self._sorted[bisect.bisect_left(self._sorted, value)]
+        return value
+
+    def values(self):
+        return self._values.values()
+
+    @property
+    def num_nan(self) -> int:
+        """The number of NaN values (which are ignored for percentiles)."""
+        return self._num_nan
+
+    def nanpercentile(self, q: float) -> float:
+        """Returns the q-th percentile of all non-NaN values.
+
+        Returns NaN if there are no (non-NaN) values.
+        """
+        if not self._sorted:
+            return float("nan")
+        index = q / 100 * (len(self._sorted) - 1)
+        lower = int(index)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        fraction = index - lower
+        if fraction == 0:
+            return float(self._sorted[lower])
+        return float(self._sorted[lower] +
+                     (self._sorted[upper] - self._sorted[lower]) * fraction)
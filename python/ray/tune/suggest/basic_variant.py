@@ -4,55 +4,67 @@ import itertools
 import os
 import uuid
 from typing import Dict, List, Optional, Union
-import warnings
 
 from ray.tune.error import TuneError
 from ray.tune.experiment import Experiment, convert_to_experiment_list
 from ray.tune.config_parser import make_parser, create_trial_from_spec
 from ray.tune.suggest.variant_generator import (
-    count_variants, count_spec_samples, generate_variants, format_vars,
-    flatten_resolved_vars, get_preset_variants)
+    count_variants, format_vars, flatten_resolved_vars, _get_preset_spec,
+    _generate_indexed_variants)
 from ray.tune.suggest.search import SearchAlgorithm
 from ray.tune.utils.util import atomic_save, load_newest_checkpoint
 
-SERIALIZATION_THRESHOLD = 1e6
-
 
 class _VariantIterator:
     """Iterates over generated variants from the search space.
 
-    This object also toggles between lazy evaluation and
-    eager evaluation of samples. If lazy evaluation is enabled,
-    this object cannot be serialized.
+    Variants are generated lazily. Only the position of the iterator is
+    serialized, so that the remaining variants are generated again when
+    it is restored (with newly sampled values).
+
+    Args:
+        spec (dict): Experiment specification
+            that might have unresolved distributions.
     """
 
-    def __init__(self, iterable, lazy_eval=False):
-        self.lazy_eval = lazy_eval
-        self.iterable = iterable
-        self._has_next = True
-        if lazy_eval:
-            self._load_value()
-        else:
-            self.iterable = list(iterable)
-            self._has_next = bool(self.iterable)
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        # Grid point of the last variant and the number of its variants
+        # that have been returned.
+        self.grid_index = 0
+        self.num_returned = 0
+        self._variants = None
+        self._next_value = None
 
     def _load_value(self):
-        try:
-            self.next_value = next(self.iterable)
-        except StopIteration:
-            self._has_next = False
+        if self._variants is None:
+            self._variants = _generate_indexed_variants(
+                self.spec, start=self.grid_index)
+            for _ in range(self.num_returned):
+                next(self._variants, None)
+        self._next_value = next(self._variants, None)
 
     def has_next(self):
-        return self._has_next
+        if self._next_value is None:
+            self._load_value()
+        return self._next_value is not None
 
     def __next__(self):
-        if self.lazy_eval:
-            current_value = self.next_value
-            self._load_value()
-            return current_value
-        current_value = self.iterable.pop(0)
-        self._has_next = bool(self.iterable)
-        return current_value
+        if not self.has_next():
+            raise StopIteration
+        grid_index, resolved_vars, spec = self._next_value
+        if grid_index != self.grid_index:
+            self.grid_index = grid_index
+            self.num_returned = 0
+        self.num_returned += 1
+        self._next_value = None
+        return resolved_vars, spec
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_variants"] = None
+        state["_next_value"] = None
+        return state
 
 
 class _TrialIterator:
@@ -66,9 +78,6 @@ class _TrialIterator:
             that might have unresolved distributions.
         output_path (str): A specific output path within the local_dir.
         points_to_evaluate (list): Same as tune.run.
-        lazy_eval (bool): Whether variants should be generated
-            lazily or eagerly. This is toggled depending
-            on the size of the grid search.
         start (int): index at which to start counting trials.
     """
 
@@ -78,7 +87,6 @@ class _TrialIterator:
                  unresolved_spec: dict,
                  output_path: str = "",
                  points_to_evaluate: Optional[List] = None,
-                 lazy_eval: bool = False,
                  start: int = 0):
         self.parser = make_parser()
         self.num_samples = num_samples
@@ -89,7 +97,6 @@ class _TrialIterator:
         self.points_to_evaluate = points_to_evaluate or []
         self.num_points_to_evaluate = len(self.points_to_evaluate)
         self.counter = start
-        self.lazy_eval = lazy_eval
         self.variants = None
 
     def create_trial(self, resolved_vars, spec):
@@ -110,8 +117,9 @@ class _TrialIterator:
     def __next__(self):
         """Generates Trial objects with the variant generation process.
 
-        Uses a fixed point iteration to resolve variants. All trials
-        should be able to be generated at once.
+        Uses a fixed point iteration to resolve variants. Variants are
+        generated one at a time, so that large grid searches don't have to
+        be expanded up front.
 
         See also: `ray.tune.suggest.variant_generator`.
 
@@ -133,14 +141,11 @@ class _TrialIterator:
             config = self.points_to_evaluate.pop(0)
             self.num_samples_left -= 1
             self.variants = _VariantIterator(
-                get_preset_variants(self.unresolved_spec, config),
-                lazy_eval=self.lazy_eval)
+                _get_preset_spec(self.unresolved_spec, config))
             resolved_vars, spec = next(self.variants)
             return self.create_trial(resolved_vars, spec)
         elif self.num_samples_left > 0:
-            self.variants = _VariantIterator(
-                generate_variants(self.unresolved_spec),
-                lazy_eval=self.lazy_eval)
+            self.variants = _VariantIterator(self.unresolved_spec)
             self.num_samples_left -= 1
             resolved_vars, spec = next(self.variants)
             return self.create_trial(resolved_vars, spec)
@@ -266,16 +271,6 @@ class BasicVariantGenerator(SearchAlgorithm):
         """
         experiment_list = convert_to_experiment_list(experiments)
         for experiment in experiment_list:
-            grid_vals = count_spec_samples(experiment.spec, num_samples=1)
-            lazy_eval = grid_vals > SERIALIZATION_THRESHOLD
-            if lazy_eval:
-                warnings.warn(
-                    f"The number of pre-generated samples ({grid_vals}) "
-                    "exceeds the serialization threshold "
-                    f"({int(SERIALIZATION_THRESHOLD)}). Resume ability is "
-                    "disabled. To fix this, reduce the number of "
-                    "dimensions/size of the provided grid search.")
-
             previous_samples = self._total_samples
             points_to_evaluate = copy.deepcopy(self._points_to_evaluate)
             self._total_samples += count_variants(experiment.spec,
@@ -286,7 +281,6 @@ class BasicVariantGenerator(SearchAlgorithm):
                 unresolved_spec=experiment.spec,
                 output_path=experiment.dir_name,
                 points_to_evaluate=points_to_evaluate,
-                lazy_eval=lazy_eval,
                 start=previous_samples)
             self._iterators.append(iterator)
             self._trial_generator = itertools.chain(self._trial_generator,
@@ -321,8 +315,6 @@ class BasicVariantGenerator(SearchAlgorithm):
             self._live_trials.remove(trial_id)
 
     def get_state(self):
-        if any(iterator.lazy_eval for iterator in self._iterators):
-            return False
         state = self.__dict__.copy()
         del state["_trial_generator"]
         return state
@@ -334,8 +326,6 @@ class BasicVariantGenerator(SearchAlgorithm):
                                                     iterator)
 
     def save_to_dir(self, dirpath, session_str):
-        if any(iterator.lazy_eval for iterator in self._iterators):
-            return False
         state_dict = self.get_state()
         atomic_save(
             state=state_dict,
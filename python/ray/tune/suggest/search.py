@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+from ray.tune.error import call_for_each_result
 from ray.tune.experiment import Experiment
 
 
@@ -68,6 +69,26 @@ class SearchAlgorithm:
         """
         raise NotImplementedError
 
+    def next_trials(self, num_trials: int) -> List:
+        """Returns up to ``num_trials`` Trial objects to be queued.
+
+        By default, ``next_trial`` is called until it doesn't return a
+        trial.
+
+        Arguments:
+            num_trials (int): Maximum number of trials to return.
+
+        Returns:
+            trials (list): List of Trial objects.
+        """
+        trials = []
+        while len(trials) < num_trials:
+            trial = self.next_trial()
+            if not trial:
+                break
+            trials.append(trial)
+        return trials
+
     def on_trial_result(self, trial_id: str, result: Dict):
         """Called on each intermediate result returned by a trial.
 
@@ -79,6 +100,20 @@ class SearchAlgorithm:
         """
         pass
 
+    def on_trial_results(self, trial_results: List[Tuple[str, Dict]]):
+        """Called on a batch of intermediate results of different trials.
+
+        By default, ``on_trial_result`` is called for each result. If it
+        raises for some of the results, the other results are still
+        processed and a ``TrialResultsError`` is raised afterwards, so only
+        these trials fail. If an override raises any other error, all trials
+        of the batch fail.
+
+        Arguments:
+            trial_results: Tuples of trial identifier and result dictionary.
+        """
+        call_for_each_result(self.on_trial_result, trial_results)
+
     def on_trial_complete(self,
                           trial_id: str,
                           result: Optional[Dict] = None,
@@ -1,6 +1,6 @@
 import copy
 import logging
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from ray.tune.error import TuneError
 from ray.tune.experiment import Experiment, convert_to_experiment_list
@@ -88,18 +88,49 @@ class SearchGenerator(SearchAlgorithm):
                                                  self._experiment.dir_name)
         return None
 
+    def next_trials(self, num_trials: int) -> List[Trial]:
+        """Provides up to ``num_trials`` Trial objects to be queued.
+
+        The configurations of all trials are requested from the searcher
+        at once (see ``Searcher.suggest_batch()``).
+
+        Returns:
+            List[Trial]: Returns a list of trials.
+        """
+        if self.is_finished():
+            return []
+        num_trials = min(num_trials, self._total_samples - self._counter)
+        return self.create_trials_if_possible(
+            self._experiment.spec, self._experiment.dir_name, num_trials)
+
     def create_trial_if_possible(self, experiment_spec: Dict,
                                  output_path: str) -> Optional[Trial]:
-        logger.debug("creating trial")
-        trial_id = Trial.generate_id()
-        suggested_config = self.searcher.suggest(trial_id)
-        if suggested_config == Searcher.FINISHED:
-            self._finished = True
-            logger.debug("Searcher has finished.")
-            return
-
-        if suggested_config is None:
-            return
+        trials = self.create_trials_if_possible(experiment_spec, output_path,
+                                                1)
+        return trials[0] if trials else None
+
+    def create_trials_if_possible(self, experiment_spec: Dict,
+                                  output_path: str,
+                                  num_trials: int) -> List[Trial]:
+        logger.debug("creating %s trials", num_trials)
+        trial_ids = [Trial.generate_id() for _ in range(num_trials)]
+        suggested_configs = self.searcher.suggest_batch(trial_ids)
+        trials = []
+        for trial_id, suggested_config in zip(trial_ids, suggested_configs):
+            if suggested_config == Searcher.FINISHED:
+                self._finished = True
+                logger.debug("Searcher has finished.")
+                break
+
+            if suggested_config is None:
+                break
+            trials.append(
+                self._create_trial(experiment_spec, output_path, trial_id,
+                                   suggested_config))
+        return trials
+
+    def _create_trial(self, experiment_spec: Dict, output_path: str,
+                      trial_id: str, suggested_config: Dict) -> Trial:
         spec = copy.deepcopy(experiment_spec)
         spec["config"] = merge_dicts(spec["config"],
                                      copy.deepcopy(suggested_config))
@@ -122,6 +153,10 @@ class SearchGenerator(SearchAlgorithm):
         """Notifies the underlying searcher."""
         self.searcher.on_trial_result(trial_id, result)
 
+    def on_trial_results(self, trial_results: List[Tuple[str, Dict]]):
+        """Notifies the underlying searcher."""
+        self.searcher.on_trial_results(trial_results)
+
     def on_trial_complete(self,
                           trial_id: str,
                           result: Optional[Dict] = None,
@@ -255,6 +255,39 @@ class SkOptSearch(Searcher):
         self._live_trial_mapping[trial_id] = skopt_config
         return unflatten_dict(suggested_config)
 
+    def suggest_batch(self, trial_ids: List[str]) -> List[Optional[Dict]]:
+        """Suggests configurations for several trials at once.
+
+        Points are asked from the optimizer in one call, which fits its
+        model only once and proposes distinct points (using its ``ask()``
+        strategy for multiple points, "constant liar" by default).
+        """
+        if not self._skopt_opt or not self._metric or not self._mode:
+            # Raises the respective error
+            return super(SkOptSearch, self).suggest_batch(trial_ids)
+
+        num_points = len(trial_ids)
+        if self.max_concurrent:
+            num_points = min(
+                num_points,
+                self.max_concurrent - len(self._live_trial_mapping))
+
+        suggestions = []
+        while self._initial_points and len(suggestions) < num_points:
+            suggestions.append(self.suggest(trial_ids[len(suggestions)]))
+
+        num_asked = num_points - len(suggestions)
+        if num_asked > 1:
+            trial_ids = trial_ids[len(suggestions):num_points]
+            skopt_configs = self._skopt_opt.ask(n_points=num_asked)
+            for trial_id, skopt_config in zip(trial_ids, skopt_configs):
+                self._live_trial_mapping[trial_id] = skopt_config
+                suggestions.append(
+                    unflatten_dict(dict(zip(self._parameters, skopt_config))))
+        elif num_asked == 1:
+            suggestions.append(self.suggest(trial_ids[len(suggestions)]))
+        return suggestions
+
     def on_trial_complete(self,
                           trial_id: str,
                           result: Optional[Dict] = None,
@@ -2,8 +2,9 @@ import copy
 import glob
 import logging
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
+from ray.tune.error import call_for_each_result
 from ray.util.debug import log_once
 
 logger = logging.getLogger(__name__)
@@ -145,6 +146,21 @@ class Searcher:
         """
         pass
 
+    def on_trial_results(self, trial_results: List[Tuple[str, Dict]]):
+        """Optional notification for a batch of results of different trials.
+
+        By default, ``on_trial_result`` is called for each result. Override
+        this to e.g. update a model only once per batch. If
+        ``on_trial_result`` raises for some of the results, the other results
+        are still processed and a ``TrialResultsError`` is raised afterwards,
+        so only these trials fail. If an override raises any other error,
+        all trials of the batch fail.
+
+        Args:
+            trial_results (list): Tuples of trial ID and result dict.
+        """
+        call_for_each_result(self.on_trial_result, trial_results)
+
     def on_trial_complete(self,
                           trial_id: str,
                           result: Optional[Dict] = None,
@@ -183,6 +199,35 @@ class Searcher:
         """
         raise NotImplementedError
 
+    def suggest_batch(self, trial_ids: List[str]) -> List[Optional[Dict]]:
+        """Queries the algorithm to retrieve parameters for several trials.
+
+        By default, ``suggest`` is called for each trial ID until it doesn't
+        return a configuration. Override this if the underlying optimizer
+        can propose several configurations at once, e.g. to fit its model
+        only once per batch.
+
+        Arguments:
+            trial_ids (list): Trial IDs used for subsequent notifications.
+
+        Returns:
+            list: Configurations for the first trial IDs, in order. Fewer
+                configurations are returned if no more suggestions are
+                possible for this step. If the last item is FINISHED, Tune
+                will be notified that no more suggestions/configurations
+                will be provided.
+
+        """
+        suggestions = []
+        for trial_id in trial_ids:
+            suggestion = self.suggest(trial_id)
+            if suggestion is None:
+                break
+            suggestions.append(suggestion)
+            if suggestion == Searcher.FINISHED:
+                break
+        return suggestions
+
     def save(self, checkpoint_path: str):
         """Save state to path for this search algorithm.
 
@@ -367,6 +412,22 @@ class ConcurrencyLimiter(Searcher):
             self.live_trials.add(trial_id)
         return suggestion
 
+    def suggest_batch(self, trial_ids: List[str]) -> List[Optional[Dict]]:
+        for trial_id in trial_ids:
+            assert trial_id not in self.live_trials, (
+                f"Trial ID {trial_id} must be unique: already found in set.")
+        num_free = max(self.max_concurrent - len(self.live_trials), 0)
+        if num_free < len(trial_ids):
+            logger.debug(
+                "Providing at most %s of %s suggestions due to concurrency "
+                "limit: %s/%s.", num_free, len(trial_ids),
+                len(self.live_trials), self.max_concurrent)
+        suggestions = self.searcher.suggest_batch(trial_ids[:num_free])
+        for trial_id, suggestion in zip(trial_ids, suggestions):
+            if suggestion not in (None, Searcher.FINISHED):
+                self.live_trials.add(trial_id)
+        return suggestions
+
     def on_trial_complete(self,
                           trial_id: str,
                           result: Optional[Dict] = None,
@@ -1,4 +1,5 @@
 import copy
+import itertools
 import logging
 from collections.abc import Mapping
 from typing import Any, Dict, Generator, List, Optional, Tuple
@@ -44,9 +45,9 @@ def generate_variants(
     Yields:
         (Dict of resolved variables, Spec object)
     """
-    for resolved_vars, spec in _generate_variants(unresolved_spec):
-        assert not _unresolved_values(spec)
-        yield resolved_vars, spec
+    # `_generate_variants()` only yields fully resolved specs. Checking the
+    # full spec of each variant again would be slow for large specs.
+    yield from _generate_variants(unresolved_spec)
 
 
 def grid_search(values: List) -> Dict[str, List]:
@@ -149,8 +150,9 @@ def count_spec_samples(spec: Dict, num_samples=1) -> int:
 
 
 def count_variants(spec: Dict, presets: Optional[List[Dict]] = None) -> int:
-    # Helper function: Deep update dictionary
+    # Helper function: Deep update dictionary, copying only updated dicts
     def deep_update(d, u):
+        d = dict(d)
         for k, v in u.items():
             if isinstance(v, Mapping):
                 d[k] = deep_update(d.get(k, {}), v)
@@ -163,8 +165,8 @@ def count_variants(spec: Dict, presets: Optional[List[Dict]] = None) -> int:
     # For each preset, overwrite the spec and count the samples generated
     # for this preset
     for preset in presets:
-        preset_spec = copy.deepcopy(spec)
-        deep_update(preset_spec["config"], preset)
+        preset_spec = dict(spec)
+        preset_spec["config"] = deep_update(spec["config"], preset)
         total_samples += count_spec_samples(preset_spec, 1)
         total_num_samples -= 1
 
@@ -175,16 +177,43 @@ def count_variants(spec: Dict, presets: Optional[List[Dict]] = None) -> int:
 
 
 def _generate_variants(spec: Dict) -> Tuple[Dict, Dict]:
+    for _, resolved_vars, variant in _generate_indexed_variants(spec):
+        yield resolved_vars, variant
+
+
+def _generate_indexed_variants(
+        spec: Dict,
+        start: int = 0) -> Generator[Tuple[int, Dict, Dict], None, None]:
+    """Lazily generates variants, starting at the ``start``-th grid point.
+
+    Yields the index of the grid point with each variant (nested search
+    spaces can result in several variants per grid point).
+
+    Variants only copy the dicts and lists holding unresolved values and
+    share all other parts of the spec.
+    """
     spec = copy.deepcopy(spec)
     _, domain_vars, grid_vars = parse_spec_vars(spec)
 
     if not domain_vars and not grid_vars:
-        yield {}, spec
+        if start == 0:
+            yield 0, {}, spec
         return
 
-    grid_search = _grid_search_generator(spec, grid_vars)
-    for resolved_spec in grid_search:
+    unresolved_paths = [path for path, _ in grid_vars + domain_vars]
+    copy_tree = _containers_tree(unresolved_paths)
+    grid_search = _grid_search_generator(spec, grid_vars, copy_tree, start)
+    for index, resolved_spec in enumerate(grid_search, start):
         resolved_vars = _resolve_domain_vars(resolved_spec, domain_vars)
+        if not any(
+                _contains_unresolved(_get_value(resolved_spec, path))
+                for path in unresolved_paths):
+            for path, value in grid_vars:
+                resolved_vars[path] = _get_value(resolved_spec, path)
+            yield index, resolved_vars, resolved_spec
+            continue
+
+        # Resolve values that were unresolved in the sampled values
         for resolved, spec in _generate_variants(resolved_spec):
             for path, value in grid_vars:
                 resolved_vars[path] = _get_value(spec, path)
@@ -196,7 +225,7 @@ def _generate_variants(spec: Dict) -> Tuple[Dict, Dict]:
                         "resolved to a single value. Consider simplifying "
                         "your configuration.".format(k))
                 resolved_vars[k] = v
-            yield resolved_vars, spec
+            yield index, resolved_vars, spec
 
 
 def get_preset_variants(spec: Dict, config: Dict):
@@ -208,6 +237,10 @@ def get_preset_variants(spec: Dict, config: Dict):
     This function also checks if values used to overwrite search space
     parameters are valid, and logs a warning if not.
     """
+    return _generate_variants(_get_preset_spec(spec, config))
+
+
+def _get_preset_spec(spec: Dict, config: Dict) -> Dict:
     spec = copy.deepcopy(spec)
 
     resolved, _, _ = parse_spec_vars(config)
@@ -235,7 +268,7 @@ def get_preset_variants(spec: Dict, config: Dict):
                 f"parameter `{'/'.join(path)}`: {domain.domain_str}")
         assign_value(spec["config"], path, val)
 
-    return _generate_variants(spec)
+    return spec
 
 
 def assign_value(spec: Dict, path: Tuple, value: Any):
@@ -278,32 +311,46 @@ def _resolve_domain_vars(spec: Dict,
 
 
 def _grid_search_generator(unresolved_spec: Dict,
-                           grid_vars: List) -> Generator[Dict, None, None]:
-    value_indices = [0] * len(grid_vars)
-
-    def increment(i):
-        value_indices[i] += 1
-        if value_indices[i] >= len(grid_vars[i][1]):
-            value_indices[i] = 0
-            if i + 1 < len(value_indices):
-                return increment(i + 1)
-            else:
-                return True
-        return False
+                           grid_vars: List,
+                           copy_tree: Dict,
+                           start: int = 0) -> Generator[Dict, None, None]:
+    """Yields a spec per grid point, starting at the ``start``-th one.
+
+    The first grid variable changes fastest. Each spec is a copy of the
+    containers in ``copy_tree`` (see ``_copy_containers()``), which must
+    include the containers of all grid variables.
+    """
+    value_indices = itertools.product(
+        *[range(len(values)) for _, values in reversed(grid_vars)])
+    for indices in itertools.islice(value_indices, start, None):
+        spec = _copy_containers(unresolved_spec, copy_tree)
+        for (path, values), i in zip(grid_vars, reversed(indices)):
+            assign_value(spec, path, values[i])
+        yield spec
 
-    if not grid_vars:
-        yield unresolved_spec
-        return
 
-    while value_indices[-1] < len(grid_vars[-1][1]):
-        spec = copy.deepcopy(unresolved_spec)
-        for i, (path, values) in enumerate(grid_vars):
-            assign_value(spec, path, values[value_indices[i]])
-        yield spec
-        if grid_vars:
-            done = increment(0)
-            if done:
-                break
+def _containers_tree(paths: List[Tuple]) -> Dict:
+    """Returns the nested keys of the containers along the given paths."""
+    tree = {}
+    for path in paths:
+        node = tree
+        for k in path[:-1]:
+            node = node.setdefault(k, {})
+    return tree
+
+
+def _copy_containers(spec: Dict, tree: Dict) -> Dict:
+    """Shallow-copies the spec and the nested containers in ``tree``."""
+    spec = spec.copy()
+    for k, subtree in tree.items():
+        spec[k] = _copy_containers(spec[k], subtree)
+    return spec
+
+
+def _contains_unresolved(value: Any) -> bool:
+    if isinstance(value, (dict, list, Domain)):
+        return bool(_unresolved_values({0: value}))
+    return False
 
 
 def _is_resolved(v) -> bool:
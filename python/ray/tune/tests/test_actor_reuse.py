@@ -9,7 +9,9 @@ from ray import tune, logger
 from ray.tune import Trainable, run_experiments, register_trainable
 from ray.tune.error import TuneError
 from ray.tune.function_runner import wrap_function
+from ray.tune.resources import Resources
 from ray.tune.schedulers.trial_scheduler import FIFOScheduler, TrialScheduler
+from ray.tune.suggest import BasicVariantGenerator
 
 
 class FrequentPausesScheduler(FIFOScheduler):
@@ -92,6 +94,8 @@ class ActorReuseTest(unittest.TestCase):
 
     def tearDown(self):
         ray.shutdown()
+        os.environ.pop("TUNE_MAX_CACHED_ACTORS", None)
+        os.environ.pop("TUNE_PLACEMENT_GROUP_AUTO_DISABLED", None)
 
     def _run_trials_with_frequent_pauses(self, trainable, reuse=False):
         trials = run_experiments(
@@ -143,6 +147,41 @@ class ActorReuseTest(unittest.TestCase):
         self.assertEqual([num_resets[t.trial_id] for t in trials],
                          [0, 0, 0, 0])
 
+    def _run_trials_with_different_resources(self):
+        class MyResourceClass(create_resettable_class()):
+            @classmethod
+            def default_resource_request(cls, config):
+                return Resources(cpu=config["cpu"], gpu=0)
+
+        # Trials run one after another and alternate between two resource
+        # requests.
+        return tune.run(
+            MyResourceClass,
+            config={
+                "cpu": tune.grid_search([1, 0.5]),
+                "id": tune.grid_search([0, 1])
+            },
+            search_alg=BasicVariantGenerator(max_concurrent=1),
+            reuse_actors=True,
+            verbose=0).trials
+
+    def testTrialReuseDifferentResources(self):
+        ray.shutdown()
+        ray.init(num_cpus=2, num_gpus=0)
+        os.environ["TUNE_PLACEMENT_GROUP_AUTO_DISABLED"] = "1"
+
+        # Only the actor of the last trial is cached
+        trials = self._run_trials_with_different_resources()
+        self.assertEqual([t.last_result["num_resets"] for t in trials],
+                         [0, 0, 0, 0])
+
+        # Actors for both resource requests are cached
+        os.environ["TUNE_MAX_CACHED_ACTORS"] = "2"
+        trials = self._run_trials_with_different_resources()
+        self.assertEqual([t.config["cpu"] for t in trials], [1, 0.5, 1, 0.5])
+        self.assertEqual([t.last_result["num_resets"] for t in trials],
+                         [0, 0, 1, 1])
+
     def testReuseEnabledError(self):
         def run():
             run_experiments(
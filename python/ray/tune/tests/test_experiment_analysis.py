@@ -8,6 +8,8 @@ from numpy import nan
 
 import ray
 from ray import tune
+from ray.tune import Analysis
+from ray.tune.result import EXPR_PROGRESS_FILE
 from ray.tune.utils.mock import MyTrainableClass
 
 
@@ -249,6 +251,77 @@ class ExperimentAnalysisPropertySuite(unittest.TestCase):
                           309)
 
 
+class AnalysisLoadingSuite(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _append_rows(self, trial_dir, rows, header=False):
+        os.makedirs(trial_dir, exist_ok=True)
+        with open(os.path.join(trial_dir, EXPR_PROGRESS_FILE), "at") as f:
+            if header:
+                f.write("training_iteration,score\n")
+            for row in rows:
+                f.write("{},{}\n".format(*row))
+
+    def testIncrementalRefresh(self):
+        trial_dirs = [
+            os.path.join(self.test_dir, "trial_{}".format(i))
+            for i in range(3)
+        ]
+        for i, trial_dir in enumerate(trial_dirs):
+            self._append_rows(trial_dir, [(1, i), (2, i)], header=True)
+
+        # Nothing is written to disk without a cache dir.
+        self.assertEqual(len(Analysis(self.test_dir).trial_dataframes), 3)
+        self.assertEqual(
+            sorted(os.listdir(self.test_dir)),
+            ["trial_{}".format(i) for i in range(3)])
+
+        analysis = Analysis(self.test_dir, cache_dir=self.cache_dir)
+        # Results are loaded on first access.
+        self.assertFalse(analysis._trial_dataframes)
+        self.assertEqual(len(analysis.trial_dataframes), 3)
+        self.assertIn("index.json", os.listdir(self.cache_dir))
+
+        # Only appended rows are read; incomplete rows are ignored.
+        self._append_rows(trial_dirs[0], [(3, 10)])
+        with open(os.path.join(trial_dirs[0], EXPR_PROGRESS_FILE), "at") as f:
+            f.write("4,")
+        cached = analysis.trial_dataframes[trial_dirs[1]]
+        dfs = analysis.fetch_trial_dataframes()
+        self.assertEqual(list(dfs[trial_dirs[0]]["score"]), [0, 0, 10])
+        self.assertIs(dfs[trial_dirs[1]], cached)
+
+        # New analysis objects start from the cache dir.
+        with open(os.path.join(trial_dirs[0], EXPR_PROGRESS_FILE), "at") as f:
+            f.write("11\n")
+        analysis = Analysis(self.test_dir, cache_dir=self.cache_dir)
+        dfs = analysis.fetch_trial_dataframes(columns=["score"])
+        self.assertEqual(list(dfs[trial_dirs[0]]["score"]), [0, 0, 10, 11])
+        self.assertEqual(list(dfs[trial_dirs[2]].columns), ["score"])
+        # Projections don't replace the complete trial dataframes.
+        self.assertEqual(
+            list(analysis.trial_dataframes[trial_dirs[2]].columns),
+            ["training_iteration", "score"])
+
+        # Rewritten files are read completely.
+        os.remove(os.path.join(trial_dirs[1], EXPR_PROGRESS_FILE))
+        self._append_rows(trial_dirs[1], [(1, 5)], header=True)
+        # Also if they start with the same header and grew.
+        os.remove(os.path.join(trial_dirs[2], EXPR_PROGRESS_FILE))
+        self._append_rows(
+            trial_dirs[2], [(1, 7), (2, 7), (3, 7)], header=True)
+        dfs = Analysis(
+            self.test_dir, cache_dir=self.cache_dir).trial_dataframes
+        self.assertEqual(list(dfs[trial_dirs[1]]["score"]), [5])
+        self.assertEqual(list(dfs[trial_dirs[2]]["score"]), [7, 7, 7])
+
+
 if __name__ == "__main__":
     import pytest
     import sys
@@ -9,16 +9,19 @@ import shutil
 import numpy as np
 from ray.cloudpickle import cloudpickle
 
+from ray.tune.analysis import Analysis
 from ray.tune.logger import CSVLoggerCallback, JsonLoggerCallback, \
     JsonLogger, CSVLogger, \
-    TBXLoggerCallback, TBXLogger
+    TBXLoggerCallback, TBXLogger, ParquetLoggerCallback
 from ray.tune.result import EXPR_PARAM_FILE, EXPR_PARAM_PICKLE_FILE, \
-    EXPR_PROGRESS_FILE, \
+    EXPR_PARQUET_DIR, EXPR_PROGRESS_FILE, \
     EXPR_RESULT_FILE
 
 
 class Trial(
         namedtuple("MockTrial", ["evaluated_params", "trial_id", "logdir"])):
+    status = "RUNNING"
+
     @property
     def config(self):
         return self.evaluated_params
@@ -137,6 +140,92 @@ class LoggerSuite(unittest.TestCase):
 
         self.assertEqual(loaded_config, config)
 
+    def testParquet(self):
+        config = {"a": 2, "b": 5, "c": {"c": {"D": 123}, "e": None}}
+        trials = [
+            Trial(
+                evaluated_params=config,
+                trial_id="parquet_{}".format(i),
+                logdir=os.path.join(self.test_dir, "trial_{}".format(i)))
+            for i in range(2)
+        ]
+        logger = ParquetLoggerCallback(max_rows_per_file=2)
+        for t in trials:
+            logger.on_trial_start(0, [], t)
+        for i, t in enumerate(trials):
+            logger.on_trial_result(0, [], t, result(0, 4 + i))
+            logger.on_trial_result(1, [], t, result(1, 5 + i))
+            logger.on_trial_result(
+                2, [], t,
+                result(2, 6 + i, score=[1, 2, 3], hello={"world": 1}))
+        logger.on_trial_complete(3, [], trials[0])
+        logger.on_trial_complete(3, [], trials[1])
+
+        # Results are written in chunks of 2 rows.
+        parquet_dir = os.path.join(self.test_dir, EXPR_PARQUET_DIR)
+        self.assertEqual(len(os.listdir(parquet_dir)), 3)
+
+        analysis = Analysis(self.test_dir)
+        self.assertEqual(
+            sorted(analysis.trial_dataframes),
+            [t.logdir for t in trials])
+        for i, t in enumerate(trials):
+            df = analysis.trial_dataframes[t.logdir]
+            self.assertSequenceEqual(
+                list(df["episode_reward_mean"]), [4 + i, 5 + i, 6 + i])
+            self.assertEqual(df["hello/world"].iloc[-1], 1)
+            self.assertEqual(json.loads(df["score"].iloc[-1]), [1, 2, 3])
+
+        # Column projection
+        dfs = analysis.fetch_trial_dataframes(columns=["mean_accuracy"])
+        self.assertEqual(
+            list(dfs[trials[0].logdir].columns), ["mean_accuracy"])
+
+    def testParquetFlush(self):
+        trials = [
+            Trial(
+                evaluated_params={},
+                trial_id="parquet_{}".format(i),
+                logdir=os.path.join(self.test_dir, "trial_{}".format(i)))
+            for i in range(2)
+        ]
+        parquet_dir = os.path.join(self.test_dir, EXPR_PARQUET_DIR)
+
+        def num_files():
+            if not os.path.isdir(parquet_dir):
+                return 0
+            return len(os.listdir(parquet_dir))
+
+        logger = ParquetLoggerCallback(flush_period_s=1e9)
+        for t in trials:
+            logger.on_trial_start(0, trials, t)
+            logger.on_trial_result(0, trials, t, result(0, 4))
+        logger.on_step_end(0, trials)
+        self.assertEqual(num_files(), 0)
+
+        # Results are written when a trial is paused ...
+        trials[0].status = "PAUSED"
+        logger.on_step_end(1, trials)
+        self.assertEqual(num_files(), 1)
+        # ... saved ...
+        logger.on_trial_result(2, trials, trials[1], result(1, 5))
+        logger.on_trial_save(2, trials, trials[1])
+        self.assertEqual(num_files(), 2)
+        # ... or ended, even if other trials are still running.
+        trials[0].status = "RUNNING"
+        logger.on_trial_result(3, trials, trials[0], result(1, 5))
+        logger.on_trial_complete(3, trials, trials[0])
+        self.assertEqual(num_files(), 3)
+        logger.on_trial_result(4, trials, trials[1], result(2, 6))
+        logger.flush()
+        self.assertEqual(num_files(), 4)
+
+        dfs = Analysis(self.test_dir).trial_dataframes
+        self.assertEqual(
+            list(dfs[trials[0].logdir]["episode_reward_mean"]), [4, 5])
+        self.assertEqual(
+            list(dfs[trials[1].logdir]["episode_reward_mean"]), [4, 5, 6])
+
     def testLegacyTBX(self):
         config = {
             "a": 2,
@@ -63,6 +63,36 @@ class RayTrialExecutorTest(unittest.TestCase):
         self.trial_executor.stop_trial(trial)
         self.assertEqual(Trial.TERMINATED, trial.status)
 
+    def testSaveForTransfer(self):
+        """Tests that checkpoints too large for transfer are persisted."""
+        trial = Trial("__fake")
+        self.trial_executor.start_trial(trial)
+        trial.last_result = self.trial_executor.fetch_result(trial)[-1]
+        # The size of the trial's checkpoints isn't known yet.
+        checkpoint = self.trial_executor.save_for_transfer(
+            trial, max_object_size=0)
+        self.assertEqual(checkpoint.storage, Checkpoint.MEMORY)
+        ray.get(checkpoint.value)
+        checkpoint = self.trial_executor.save_for_transfer(
+            trial, max_object_size=1024**3)
+        self.assertEqual(checkpoint.storage, Checkpoint.MEMORY)
+        ray.get(checkpoint.value)
+        # The last checkpoint exceeds the limit.
+        checkpoint = self.trial_executor.save_for_transfer(
+            trial, max_object_size=0)
+        self.assertEqual(checkpoint.storage, Checkpoint.PERSISTENT)
+        self.assertEqual(checkpoint, trial.saving_to)
+        self.process_trial_save(trial)
+        self.assertEqual(checkpoint, trial.checkpoint)
+
+        # Restore another trial from the persistent checkpoint.
+        other = Trial("__fake")
+        self.trial_executor.start_trial(other)
+        self.trial_executor.restore(other, checkpoint, block=True)
+        for t in [trial, other]:
+            self.trial_executor.stop_trial(t)
+            self.assertEqual(Trial.TERMINATED, t.status)
+
     def testPauseResume(self):
         """Tests that pausing works for trials in flight."""
         trial = Trial("__fake")
@@ -1,4 +1,5 @@
 import os
+import pickle
 import sys
 import unittest
 from unittest.mock import patch
@@ -6,7 +7,7 @@ from unittest.mock import patch
 import ray
 from ray.rllib import _register_all
 
-from ray.tune import TuneError
+from ray.tune import TuneError, Trainable
 from ray.tune.schedulers import FIFOScheduler
 from ray.tune.result import DONE
 from ray.tune.registry import _global_registry, TRAINABLE_CLASS
@@ -340,6 +341,57 @@ class TrialRunnerTest2(unittest.TestCase):
         runner.step()  # Process save
         self.assertEqual(trials[0].has_checkpoint(), True)
 
+    @patch.dict(os.environ, {"TUNE_PERSIST_CHECKPOINTS_ASYNC": "1"})
+    def testPersistCheckpointsAsync(self):
+        class DictTrainable(Trainable):
+            def step(self):
+                return {"score": self.iteration}
+
+            def save_checkpoint(self, checkpoint_dir):
+                return {"iteration": self.iteration}
+
+            def load_checkpoint(self, checkpoint):
+                pass
+
+        # Writes its checkpoint files itself (only the metadata is written
+        # asynchronously).
+        class FileTrainable(DictTrainable):
+            def save_checkpoint(self, checkpoint_dir):
+                path = os.path.join(checkpoint_dir, "model.pkl")
+                with open(path, "wb") as f:
+                    pickle.dump({"iteration": self.iteration}, f)
+                return path
+
+        ray.init(num_cpus=1)
+        for trainable_cls in [DictTrainable, FileTrainable]:
+            _global_registry.register(TRAINABLE_CLASS, "snapshot",
+                                      trainable_cls)
+            runner = TrialRunner()
+            runner.add_trial(
+                Trial(
+                    "snapshot",
+                    stopping_criterion={"training_iteration": 3},
+                    checkpoint_freq=1))
+            trials = runner.get_trials()
+
+            runner.step()  # Start trial
+            runner.step()  # Process result, dispatch snapshot
+            # The trial continues training while the checkpoint is
+            # persisted.
+            self.assertIsNone(trials[0].saving_to)
+            while not runner.is_finished():
+                runner.step()
+
+            self.assertFalse(
+                runner.trial_executor.has_persisting_checkpoints())
+            self.assertEqual(trials[0].status, Trial.TERMINATED)
+            checkpoint = trials[0].checkpoint
+            self.assertEqual(checkpoint.result["training_iteration"], 3)
+            self.assertTrue(
+                os.path.exists(checkpoint.value + ".tune_metadata"))
+            with open(checkpoint.value, "rb") as f:
+                self.assertEqual(pickle.load(f), {"iteration": 3})
+
     def testResultDone(self):
         """Tests that last_result is marked `done` after trial is complete."""
         ray.init(num_cpus=1, num_gpus=1)
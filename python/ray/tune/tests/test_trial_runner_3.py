@@ -1,12 +1,13 @@
 import time
 from collections import Counter
+import json
 import os
 import pickle
 import shutil
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import ray
 from ray.rllib import _register_all
@@ -16,8 +17,10 @@ from ray.tune.result import TRAINING_ITERATION
 from ray.tune.schedulers import TrialScheduler, FIFOScheduler
 from ray.tune.experiment import Experiment
 from ray.tune.suggest import BasicVariantGenerator
-from ray.tune.trial import Trial
-from ray.tune.trial_runner import TrialRunner
+from ray.tune.trial import Checkpoint, Trial
+from ray.tune.trial_executor import TrialExecutor
+from ray.tune.trial_runner import TrialRunner, load_experiment_state, \
+    _ExperimentCheckpointManager
 from ray.tune.resources import Resources, json_to_resources, resources_to_json
 from ray.tune.suggest.repeater import Repeater
 from ray.tune.suggest._mock import _MockSuggestionAlgorithm
@@ -731,6 +734,105 @@ class TrialRunnerTest3(unittest.TestCase):
         self.assertGreaterEqual(runner._checkpoint_manager._checkpoint_period,
                                 38.)
 
+    def testCheckpointIncremental(self):
+        ray.init(num_cpus=3)
+
+        runner = TrialRunner(
+            local_checkpoint_dir=self.tmpdir, checkpoint_period=0)
+        for i in range(3):
+            runner.add_trial(
+                Trial(
+                    "__fake",
+                    trial_id="trial_{}".format(i),
+                    stopping_criterion={"training_iteration": i + 1}))
+        while not runner.get_trial("trial_0").status == Trial.TERMINATED:
+            runner.step()
+
+        # Only changed trials were appended to the log since the snapshot.
+        log_file = runner.checkpoint_file + ".log"
+        with open(log_file) as f:
+            entries = [json.loads(line) for line in f.readlines()[1:]]
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertTrue(entry["checkpoints"])
+            self.assertLessEqual(
+                set(entry["checkpoints"]),
+                {"trial_0", "trial_1", "trial_2"})
+        state = load_experiment_state(runner.checkpoint_file)
+        self.assertEqual(len(state["checkpoints"]), 3)
+
+        runner2 = TrialRunner(resume="LOCAL", local_checkpoint_dir=self.tmpdir)
+        self.assertEqual(
+            runner2.get_trial("trial_0").status, Trial.TERMINATED)
+        self.assertEqual(
+            runner2.get_trial("trial_0").last_result[TRAINING_ITERATION], 1)
+
+        # Forced checkpoints compact the log into the snapshot.
+        runner.checkpoint(force=True)
+        with open(log_file) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(
+            len(load_experiment_state(runner.checkpoint_file)["checkpoints"]),
+            3)
+
+    def testCheckpointIncrementalLog(self):
+        class _StateTrial:
+            def __init__(self, trial_id):
+                self.trial_id = trial_id
+                self.checkpoint = Checkpoint(Checkpoint.PERSISTENT, None)
+                self.iteration = 0
+
+            def get_json_state(self):
+                return json.dumps({
+                    "trial_id": self.trial_id,
+                    "iteration": self.iteration
+                })
+
+        class _Runner:
+            def __getstate__(self):
+                return {}
+
+        trials = [_StateTrial("trial_{}".format(i)) for i in range(3)]
+        executor = TrialExecutor()
+        trial_runner = _Runner()
+        manager = _ExperimentCheckpointManager(
+            checkpoint_dir=self.tmpdir,
+            checkpoint_period=0,
+            start_time=0,
+            session_str="session",
+            syncer=MagicMock())
+        checkpoint_file = os.path.join(self.tmpdir, "experiment_state.json")
+        log_file = checkpoint_file + ".log"
+
+        def checkpoint(*updated):
+            for trial in updated:
+                trial.iteration += 1
+                executor.try_checkpoint_metadata(trial)
+            manager.checkpoint(checkpoint_file, trial_runner, executor,
+                               MagicMock())
+            with open(log_file) as f:
+                return [
+                    sorted(json.loads(line)["checkpoints"])
+                    for line in f.readlines()[1:]
+                ]
+
+        # The first checkpoint writes a snapshot.
+        self.assertEqual(checkpoint(*trials), [])
+        self.assertEqual(checkpoint(trials[0]), [["trial_0"]])
+        # Nothing is appended if no trial changed.
+        self.assertEqual(checkpoint(), [["trial_0"]])
+        self.assertEqual(
+            checkpoint(trials[1], trials[2]),
+            [["trial_0"], ["trial_1", "trial_2"]])
+        # The log would hold more trial states than the snapshot.
+        self.assertEqual(checkpoint(trials[0]), [])
+
+        state = load_experiment_state(checkpoint_file)
+        self.assertEqual(
+            sorted((cp["trial_id"], cp["iteration"])
+                   for cp in map(json.loads, state["checkpoints"])),
+            [("trial_0", 3), ("trial_1", 2), ("trial_2", 2)])
+
 
 class SearchAlgorithmTest(unittest.TestCase):
     @classmethod
@@ -881,6 +983,49 @@ class SearchAlgorithmTest(unittest.TestCase):
         limiter2.on_trial_complete("test_2", {"result": 3})
         assert limiter2.suggest("test_3")["score"] == 3
 
+    def testSuggestBatch(self):
+        class TestSuggestion(Searcher):
+            def __init__(self, index, limit):
+                self.index = index
+                self.limit = limit
+                super().__init__(metric="result", mode="max")
+
+            def suggest(self, trial_id):
+                if self.index >= self.limit:
+                    return Searcher.FINISHED
+                self.index += 1
+                return {"score": self.index}
+
+            def on_trial_complete(self, trial_id, result=None, **kwargs):
+                pass
+
+        searcher = TestSuggestion(0, limit=5)
+        suggestions = searcher.suggest_batch(["a", "b"])
+        self.assertEqual(suggestions, [{"score": 1}, {"score": 2}])
+
+        limiter = ConcurrencyLimiter(searcher, max_concurrent=2)
+        suggestions = limiter.suggest_batch(["c", "d", "e"])
+        self.assertEqual(suggestions, [{"score": 3}, {"score": 4}])
+        self.assertEqual(limiter.suggest_batch(["f"]), [])
+        limiter.on_trial_complete("c")
+        suggestions = limiter.suggest_batch(["f", "g"])
+        self.assertEqual(suggestions, [{"score": 5}])
+        limiter.on_trial_complete("d")
+        limiter.on_trial_complete("f")
+        self.assertEqual(
+            limiter.suggest_batch(["h", "i"]), [Searcher.FINISHED])
+        self.assertEqual(limiter.live_trials, set())
+
+        search_alg = SearchGenerator(TestSuggestion(0, limit=3))
+        experiment_spec = {"run": "__fake", "num_samples": 10}
+        search_alg.add_configurations({"test": experiment_spec})
+        trials = search_alg.next_trials(2)
+        self.assertEqual([t.config["score"] for t in trials], [1, 2])
+        trials = search_alg.next_trials(2)
+        self.assertEqual([t.config["score"] for t in trials], [3])
+        self.assertTrue(search_alg.is_finished())
+        self.assertEqual(search_alg.next_trials(2), [])
+
     def testBasicVariantLimiter(self):
         search_alg = BasicVariantGenerator(max_concurrent=2)
 
@@ -1,3 +1,4 @@
+import collections
 import os
 import shutil
 import sys
@@ -13,6 +14,7 @@ from ray.tune.logger import DEFAULT_LOGGERS, LoggerCallback, \
     LegacyLoggerCallback
 from ray.tune.ray_trial_executor import RayTrialExecutor
 from ray.tune.result import TRAINING_ITERATION
+from ray.tune.schedulers import FIFOScheduler
 from ray.tune.syncer import SyncConfig, SyncerCallback
 
 from ray.tune.trial import Trial
@@ -47,6 +49,10 @@ class TestCallback(Callback):
         assert result.get(TRAINING_ITERATION, None) != trial.last_result.get(
             TRAINING_ITERATION, None)
 
+    def on_trial_results(self, **info):
+        self.state["trial_results"] = info
+        super().on_trial_results(**info)
+
     def on_trial_complete(self, **info):
         self.state["trial_complete"] = info
 
@@ -54,18 +60,53 @@ class TestCallback(Callback):
         self.state["trial_fail"] = info
 
 
+class _FailingResultCallback(Callback):
+    def __init__(self, trial_id):
+        self.trial_id = trial_id
+
+    def on_trial_result(self, trial, **info):
+        if trial.trial_id == self.trial_id:
+            raise RuntimeError("Failing on purpose.")
+
+
+class _ResultCountingCallback(Callback):
+    def __init__(self):
+        self.counts = collections.Counter()
+
+    def on_trial_result(self, trial, **info):
+        self.counts[trial.trial_id] += 1
+
+
+class _FailingResultScheduler(FIFOScheduler):
+    def __init__(self, trial_id):
+        super().__init__()
+        self.trial_id = trial_id
+        self.counts = collections.Counter()
+
+    def on_trial_result(self, trial_runner, trial, result):
+        self.counts[trial.trial_id] += 1
+        if trial.trial_id == self.trial_id:
+            raise RuntimeError("Failing on purpose.")
+        return super().on_trial_result(trial_runner, trial, result)
+
+
 class _MockTrialExecutor(RayTrialExecutor):
     def __init__(self):
         super().__init__()
         self.results = {}
         self.next_trial = None
+        self.next_trials = None
         self.failed_trial = None
 
     def fetch_result(self, trial):
         return [self.results.get(trial, {})]
 
-    def get_next_available_trial(self, timeout=None):
-        return self.next_trial or super().get_next_available_trial()
+    def get_next_available_trials(self, timeout=None):
+        if self.next_trials:
+            return self.next_trials
+        if self.next_trial:
+            return [self.next_trial]
+        return super().get_next_available_trials()
 
     def get_next_failed_trial(self):
         return self.failed_trial or super().get_next_failed_trial()
@@ -177,6 +218,105 @@ class TrialRunnerCallbacks(unittest.TestCase):
         self.assertEqual(self.callback.state["trial_fail"]["trial"].trial_id,
                          "one")
 
+    def testCallbackBatchedResults(self):
+        trials = [
+            Trial("__fake", trial_id="one"),
+            Trial("__fake", trial_id="two")
+        ]
+        for t in trials:
+            self.trial_runner.add_trial(t)
+
+        self.executor.next_trial = trials[0]
+        self.trial_runner.step()
+        self.executor.next_trial = trials[1]
+        self.trial_runner.step()
+
+        # Both trials send a result at the same time
+        for i, t in enumerate(trials):
+            self.executor.results[t] = {
+                TRAINING_ITERATION: 1,
+                "metric": i,
+                "done": False
+            }
+        self.executor.next_trials = trials
+        self.trial_runner.step()
+
+        trial_results = self.callback.state["trial_results"]["trial_results"]
+        self.assertEqual([t.trial_id for t, _ in trial_results],
+                         ["one", "two"])
+        self.assertEqual([r["metric"] for _, r in trial_results], [0, 1])
+        self.assertEqual(self.callback.state["trial_result"]["iteration"], 2)
+        self.assertEqual([t.last_result["metric"] for t in trials], [0, 1])
+
+    def testCallbackBatchedResultsError(self):
+        self.trial_runner = TrialRunner(
+            trial_executor=self.executor,
+            callbacks=[self.callback,
+                       _FailingResultCallback("two")])
+        trials = [
+            Trial("__fake", trial_id="one"),
+            Trial("__fake", trial_id="two")
+        ]
+        for t in trials:
+            self.trial_runner.add_trial(t)
+
+        self.executor.next_trial = trials[0]
+        self.trial_runner.step()
+        self.executor.next_trial = trials[1]
+        self.trial_runner.step()
+
+        # Both trials send a result at the same time, but the callback
+        # fails for the second one. Only that trial should fail.
+        for i, t in enumerate(trials):
+            self.executor.results[t] = {
+                TRAINING_ITERATION: 1,
+                "metric": i,
+                "done": False
+            }
+        self.executor.next_trials = trials
+        self.trial_runner.step()
+
+        self.assertEqual(trials[0].status, Trial.RUNNING)
+        self.assertEqual(trials[0].last_result["metric"], 0)
+        self.assertEqual(trials[1].status, Trial.ERROR)
+        self.assertEqual(self.callback.state["trial_fail"]["trial"].trial_id,
+                         "two")
+
+    def testBatchedResultsErrorNoReplay(self):
+        scheduler = _FailingResultScheduler("one")
+        before, after = _ResultCountingCallback(), _ResultCountingCallback()
+        self.trial_runner = TrialRunner(
+            trial_executor=self.executor,
+            scheduler=scheduler,
+            callbacks=[before, _FailingResultCallback("two"), after])
+        trials = [
+            Trial("__fake", trial_id="one"),
+            Trial("__fake", trial_id="two"),
+            Trial("__fake", trial_id="three")
+        ]
+        for t in trials:
+            self.trial_runner.add_trial(t)
+        for t in trials:
+            self.executor.next_trial = t
+            self.trial_runner.step()
+
+        for t in trials:
+            self.executor.results[t] = {
+                TRAINING_ITERATION: 1,
+                "metric": 0,
+                "done": False
+            }
+        self.executor.next_trials = trials
+        self.trial_runner.step()
+
+        # Each hook processed each result (of the trials that didn't fail
+        # in an earlier hook) exactly once.
+        self.assertEqual(scheduler.counts, {"one": 1, "two": 1, "three": 1})
+        self.assertEqual(before.counts, {"two": 1, "three": 1})
+        self.assertEqual(after.counts, {"three": 1})
+        self.assertEqual([t.status for t in trials],
+                         [Trial.ERROR, Trial.ERROR, Trial.RUNNING])
+
     def testCallbacksEndToEnd(self):
         def train(config):
             if config["do"] == "save":
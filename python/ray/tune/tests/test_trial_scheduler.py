@@ -20,6 +20,7 @@ from ray.tune.schedulers import (FIFOScheduler, HyperBandScheduler,
                                  PopulationBasedTraining, MedianStoppingRule,
                                  TrialScheduler, HyperBandForBOHB)
 
+from ray.tune.schedulers.async_hyperband import _Bracket
 from ray.tune.schedulers.pbt import explore, PopulationBasedTrainingReplay
 from ray.tune.suggest._mock import _MockSearcher
 from ray.tune.trial import Trial, Checkpoint
@@ -2050,6 +2051,25 @@ class AsyncHyperBandSuite(unittest.TestCase):
             scheduler.on_trial_result(None, t3, result(2, 260)),
             TrialScheduler.STOP)
 
+    def testAsyncHBSortedRungs(self):
+        bracket = _Bracket(min_t=1, max_t=10, reduction_factor=3, s=0)
+        recorded = bracket._rungs[-1][1]
+        self.assertIsNone(bracket.cutoff(recorded))
+
+        values = np.random.uniform(-10, 10, size=100)
+        values[5::10] = np.nan
+        for i, value in enumerate(values):
+            recorded[str(i)] = value
+            self.assertAlmostEqual(
+                bracket.cutoff(recorded),
+                np.nanpercentile(values[:i + 1], (1 - 1 / 3) * 100))
+
+        # Overwriting a value keeps the rung sorted
+        recorded["1"] = 100.
+        values[1] = 100.
+        self.assertAlmostEqual(
+            bracket.cutoff(recorded), np.nanpercentile(values, 200 / 3))
+
     def testAsyncHBSaveRestore(self):
         tmpfile = tempfile.mktemp()
 
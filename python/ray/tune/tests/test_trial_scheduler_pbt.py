@@ -71,6 +71,12 @@ class PopulationBasedTrainingMemoryTest(unittest.TestCase):
                 assert len(ray.state.objects()) <= 12
                 return checkpoint
 
+            def save_for_transfer(self, *args, **kwargs):
+                checkpoint = super(CustomExecutor, self).save_for_transfer(
+                    *args, **kwargs)
+                assert len(ray.state.objects()) <= 12
+                return checkpoint
+
         param_a = MockParam([1, -1])
 
         pbt = PopulationBasedTraining(
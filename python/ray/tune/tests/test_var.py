@@ -1,6 +1,8 @@
 import os
 import numpy as np
 import random
+import shutil
+import tempfile
 import unittest
 
 import ray
@@ -24,6 +26,9 @@ class VariantGeneratorTest(unittest.TestCase):
     def generate_trials(self, spec, name):
         suggester = BasicVariantGenerator()
         suggester.add_configurations({name: spec})
+        return self.generate_trials_from(suggester)
+
+    def generate_trials_from(self, suggester):
         trials = []
         while not suggester.is_finished():
             trial = suggester.next_trial()
@@ -269,6 +274,65 @@ class VariantGeneratorTest(unittest.TestCase):
             "z": 100
         })
 
+    def testLargeGridSearch(self):
+        suggester = BasicVariantGenerator()
+        suggester.add_configurations({
+            "large_grid_search": {
+                "run": "PPO",
+                "config": {
+                    "a": grid_search(list(range(1000))),
+                    "b": grid_search(list(range(1000))),
+                    "c": grid_search(list(range(1000))),
+                    "constant": {
+                        "x": [1, 2, 3]
+                    },
+                },
+            }
+        })
+        trials = [suggester.next_trial() for _ in range(1002)]
+        self.assertEqual(trials[0].config, {
+            "a": 0,
+            "b": 0,
+            "c": 0,
+            "constant": {
+                "x": [1, 2, 3]
+            }
+        })
+        self.assertEqual(trials[1001].evaluated_params, {
+            "a": 1,
+            "b": 1,
+            "c": 0,
+        })
+        self.assertFalse(suggester.is_finished())
+
+    def testGridSearchRestore(self):
+        spec = {
+            "run": "PPO",
+            "config": {
+                "bar": grid_search([True, False]),
+                "foo": grid_search([1, 2, 3]),
+                "baz": tune.uniform(0, 1),
+            },
+        }
+        suggester = BasicVariantGenerator()
+        suggester.add_configurations({"grid_search_restore": spec})
+        trials = [suggester.next_trial() for _ in range(2)]
+
+        tmpdir = tempfile.mkdtemp()
+        suggester.save_to_dir(tmpdir, session_str="session")
+        restored = BasicVariantGenerator()
+        restored.restore_from_dir(tmpdir)
+        trials += self.generate_trials_from(restored)
+        shutil.rmtree(tmpdir)
+
+        self.assertEqual(len(trials), 6)
+        self.assertEqual(
+            [(t.config["bar"], t.config["foo"]) for t in trials],
+            [(True, 1), (False, 1), (True, 2), (False, 2), (True, 3),
+             (False, 3)])
+        self.assertEqual([t.experiment_tag.split("_")[0] for t in trials],
+                         ["0", "1", "2", "3", "4", "5"])
+
     def testLogUniform(self):
         sampler = tune.loguniform(1e-10, 1e-1)
         results = sampler.sample(None, 1000)
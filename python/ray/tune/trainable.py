@@ -8,7 +8,7 @@ import shutil
 import sys
 import tempfile
 import time
-from typing import Any, Dict, Union
+from typing import Any, Dict, Tuple, Union
 import uuid
 
 import ray
@@ -347,6 +347,31 @@ class Trainable:
         shutil.rmtree(tmpdir)
         return obj
 
+    @ray.method(num_returns=2)
+    def save_snapshot(self) -> Tuple[Dict, Any]:
+        """Takes a snapshot of the current model state to persist it later.
+
+        Like ``save()``, but leaves writing the checkpoint metadata (and the
+        checkpoint, if ``save_checkpoint()`` returns a dict) to
+        ``TrainableUtil.persist_snapshot()``, which Tune runs in a task on
+        the same node while this trainable continues training (see
+        ``TUNE_PERSIST_CHECKPOINTS_ASYNC``). Checkpoint files written by
+        ``save_checkpoint()`` are still written here.
+
+        Returns:
+            The info to pass to ``TrainableUtil.persist_snapshot()`` and the
+            checkpoint returned by ``save_checkpoint()``.
+        """
+        checkpoint_dir = TrainableUtil.make_checkpoint_dir(
+            self.logdir, index=self.iteration)
+        checkpoint = self.save_checkpoint(checkpoint_dir)
+        info = {
+            "checkpoint_dir": checkpoint_dir,
+            "trainable_state": self.get_state(),
+            "storage": None,
+        }
+        return info, checkpoint
+
     def restore(self, checkpoint_path):
         """Restores training state from a given model checkpoint.
 
@@ -394,6 +419,20 @@ class Trainable:
         self.restore(checkpoint_path)
         shutil.rmtree(tmpdir)
 
+    @ray.method(num_returns=2)
+    def save_to_transfer_object(self) -> Tuple[int, bytes]:
+        """Saves the current model state for restoring it in another trainable.
+
+        Like ``save_to_object()``, but also returns the size of the object,
+        so that callers can decide how to transfer later checkpoints without
+        fetching the object (e.g. PBT when cloning trials).
+
+        Returns:
+            The size of the checkpoint object in bytes and the object.
+        """
+        obj = self.save_to_object()
+        return len(obj), obj
+
     def delete_checkpoint(self, checkpoint_path):
         """Deletes local copy of checkpoint.
 
@@ -27,6 +27,9 @@ class TrialExecutor:
         self._queue_trials = queue_trials
         self._cached_trial_state = {}
         self._trials_to_cache = set()
+        # IDs of trials whose cached state changed since the last
+        # incremental experiment checkpoint.
+        self._changed_trial_ids = set()
 
     def set_status(self, trial, status):
         """Sets status and checkpoints metadata if needed.
@@ -66,13 +69,31 @@ class TrialExecutor:
             logger.exception("Trial %s: Error checkpointing trial metadata.",
                              trial)
 
-    def get_checkpoints(self):
-        """Returns a copy of mapping of the trial ID to pickled metadata."""
+    def _update_cached_trial_state(self):
         for trial in self._trials_to_cache:
             self._cached_trial_state[trial.trial_id] = trial.get_json_state()
+            self._changed_trial_ids.add(trial.trial_id)
         self._trials_to_cache.clear()
+
+    def get_checkpoints(self):
+        """Returns a copy of mapping of the trial ID to pickled metadata."""
+        self._update_cached_trial_state()
         return self._cached_trial_state
 
+    def get_changed_checkpoints(self):
+        """Returns the metadata of trials changed since the last call.
+
+        Used for incremental experiment checkpoints, which only write the
+        state of these trials.
+        """
+        self._update_cached_trial_state()
+        changed = {
+            trial_id: self._cached_trial_state[trial_id]
+            for trial_id in self._changed_trial_ids
+        }
+        self._changed_trial_ids.clear()
+        return changed
+
     def has_resources(self, resources):
         """Returns whether this runner has at least the specified resources."""
         raise NotImplementedError("Subclasses of TrialExecutor must provide "
@@ -193,6 +214,13 @@ class TrialExecutor:
                 raise TuneError("There are paused trials, but no more pending "
                                 "trials with sufficient resources.")
 
+    def get_free_trial_slots(self, trial):
+        """Returns how many more trials like this trial fit into the cluster.
+
+        Used to request several trials from the search algorithm at once.
+        """
+        return 0
+
     def get_next_available_trial(self):
         """Blocking call that waits until one result is ready.
 
@@ -201,6 +229,19 @@ class TrialExecutor:
         """
         raise NotImplementedError
 
+    def get_next_available_trials(self, timeout=None):
+        """Blocking call that waits until at least one result is ready.
+
+        Subclasses should return all trials with a ready result, which
+        are then processed together in one step of the TrialRunner.
+
+        Returns:
+            List of Trial objects that are ready for intermediate
+            processing.
+        """
+        trial = self.get_next_available_trial()
+        return [trial] if trial else []
+
     def get_next_failed_trial(self):
         """Non-blocking call that detects and returns one failed trial.
 
@@ -262,6 +303,37 @@ class TrialExecutor:
         raise NotImplementedError("Subclasses of TrialExecutor must provide "
                                   "save() method")
 
+    def save_for_transfer(self, trial, result=None, max_object_size=None):
+        """Saves training state of this trial for restoring it in other trials.
+
+        Defaults to saving an in-memory checkpoint.
+
+        Args:
+            trial (Trial): The state of this trial to be saved.
+            result (dict): The state of this trial as a dictionary to be saved.
+            max_object_size (int): Maximum size in bytes of checkpoints
+                transferred as in-memory objects.
+
+        Returns:
+            A Checkpoint object.
+        """
+        return self.save(trial, Checkpoint.MEMORY, result)
+
+    def has_persisting_checkpoints(self):
+        """Returns whether checkpoints are still being persisted."""
+        return False
+
+    def get_persisted_checkpoints(self, timeout=0):
+        """Returns the checkpoints that have been persisted asynchronously.
+
+        Args:
+            timeout (float): Maximum time to wait for pending checkpoints.
+
+        Returns:
+            List of (Trial, Checkpoint) tuples.
+        """
+        return []
+
     def export_trial_if_needed(self, trial):
         """Exports model of this trial based on trial.export_formats.
 
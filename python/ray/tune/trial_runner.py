@@ -7,12 +7,14 @@ import logging
 import os
 import time
 import traceback
+import uuid
 import warnings
 
 import ray
 from ray.util import get_node_ip_address
 from ray.tune import TuneError
 from ray.tune.callback import CallbackList
+from ray.tune.error import TrialResultsError
 from ray.tune.stopper import NoopStopper
 from ray.tune.ray_trial_executor import RayTrialExecutor
 from ray.tune.result import (DEFAULT_METRIC, TIME_THIS_ITER_S,
@@ -42,6 +44,62 @@ def _find_newest_ckpt(ckpt_dir):
     return max(full_paths)
 
 
+def _trial_log_path(checkpoint_file):
+    """Returns the path of the trial log belonging to `checkpoint_file`."""
+    return checkpoint_file + ".log"
+
+
+def load_experiment_state(checkpoint_file: str) -> dict:
+    """Loads an experiment checkpoint written by the TrialRunner.
+
+    Applies all (complete) incremental updates from the trial log of
+    `checkpoint_file` to the full snapshot stored in `checkpoint_file`.
+
+    Args:
+        checkpoint_file (str): Path to an ``experiment_state-*.json`` file.
+
+    Returns:
+        dict: The experiment state, containing the (decoded) trial states
+            under "checkpoints", the "runner_data" and the "stats".
+    """
+    with open(checkpoint_file, "r") as f:
+        runner_state = json.load(f, cls=TuneFunctionDecoder)
+
+    log_file = _trial_log_path(checkpoint_file)
+    log_id = runner_state.get("trial_log_id")
+    if not log_id or not os.path.exists(log_file):
+        return runner_state
+
+    changed = {}
+    with open(log_file, "r") as f:
+        for i, line in enumerate(f):
+            try:
+                entry = json.loads(line, cls=TuneFunctionDecoder)
+            except ValueError:
+                # Incomplete last entry (e.g. the driver died while writing).
+                break
+            if i == 0:
+                # The log belongs to an older snapshot, which is
+                # superseded by (compacted into) `checkpoint_file`.
+                if entry.get("trial_log_id") != log_id:
+                    return runner_state
+                continue
+            changed.update(entry["checkpoints"])
+            runner_state["runner_data"] = entry["runner_data"]
+            runner_state["stats"] = entry["stats"]
+
+    if changed:
+        checkpoints = {}
+        for cp in runner_state["checkpoints"]:
+            if isinstance(cp, str):
+                cp = json.loads(cp, cls=TuneFunctionDecoder)
+            checkpoints[cp["trial_id"]] = cp
+        for trial_id, cp in changed.items():
+            checkpoints[trial_id] = json.loads(cp, cls=TuneFunctionDecoder)
+        runner_state["checkpoints"] = list(checkpoints.values())
+    return runner_state
+
+
 class _ExperimentCheckpointManager:
     """Helper class for managing experiment-level checkpoints.
 
@@ -55,6 +113,12 @@ class _ExperimentCheckpointManager:
     time (1/20) will be used for writing checkpoints, while 95% of the time
     (19/20) will be used to handle the rest of the training loop.
 
+    Checkpoints are incremental: Only the state of trials that changed since
+    the last checkpoint is appended to a trial log next to the checkpoint
+    file (see ``load_experiment_state()``). Nothing is appended if no trial
+    changed. The log is compacted into a full snapshot once it holds more
+    trial states than the snapshot, as well as on forced checkpoints.
+
     """
 
     def __init__(self, checkpoint_dir: str,
@@ -74,6 +138,11 @@ class _ExperimentCheckpointManager:
 
         self._last_checkpoint_time = 0.
 
+        # The checkpoint file with the current full snapshot and the number
+        # of trial states appended to its trial log since.
+        self._snapshot_file = None
+        self._num_logged_trials = 0
+
     @property
     def auto_checkpoint_enabled(self):
         return self._auto_checkpoint_enabled
@@ -104,20 +173,23 @@ class _ExperimentCheckpointManager:
             return
 
         def _serialize_and_write():
-            runner_state = {
-                "checkpoints": list(trial_executor.get_checkpoints().values()),
-                "runner_data": trial_runner.__getstate__(),
-                "stats": {
-                    "start_time": self._start_time,
-                    "timestamp": self._last_checkpoint_time
-                }
+            changed = trial_executor.get_changed_checkpoints()
+            checkpoints = trial_executor.get_checkpoints()
+            runner_data = trial_runner.__getstate__()
+            stats = {
+                "start_time": self._start_time,
+                "timestamp": self._last_checkpoint_time
             }
-            tmp_file_name = os.path.join(self._checkpoint_dir,
-                                         ".tmp_checkpoint")
-            with open(tmp_file_name, "w") as f:
-                json.dump(runner_state, f, indent=2, cls=TuneFunctionEncoder)
-
-            os.replace(tmp_file_name, checkpoint_file)
+            if force or checkpoint_file != self._snapshot_file or (
+                    self._num_logged_trials + len(changed) >
+                    len(checkpoints)):
+                self._write_snapshot(checkpoint_file, checkpoints,
+                                     runner_data, stats)
+            elif changed:
+                # The runner data is only written along with trial states,
+                # so every log entry counts towards the compaction.
+                self._append_to_log(checkpoint_file, changed, runner_data,
+                                    stats)
             search_alg.save_to_dir(
                 self._checkpoint_dir, session_str=self._session_str)
 
@@ -141,6 +213,41 @@ class _ExperimentCheckpointManager:
         self._last_checkpoint_time = time.time()
         return self._checkpoint_dir
 
+    def _write_snapshot(self, checkpoint_file, checkpoints, runner_data,
+                        stats):
+        """Writes the full experiment state and starts a new trial log."""
+        trial_log_id = uuid.uuid4().hex
+        runner_state = {
+            "checkpoints": list(checkpoints.values()),
+            "runner_data": runner_data,
+            "stats": stats,
+            "trial_log_id": trial_log_id,
+        }
+        tmp_file_name = os.path.join(self._checkpoint_dir, ".tmp_checkpoint")
+        with open(tmp_file_name, "w") as f:
+            json.dump(runner_state, f, indent=2, cls=TuneFunctionEncoder)
+        os.replace(tmp_file_name, checkpoint_file)
+
+        # Until this is replaced, the old log is ignored on load because of
+        # its outdated ID.
+        with open(tmp_file_name, "w") as f:
+            f.write(json.dumps({"trial_log_id": trial_log_id}) + "\n")
+        os.replace(tmp_file_name, _trial_log_path(checkpoint_file))
+
+        self._snapshot_file = checkpoint_file
+        self._num_logged_trials = 0
+
+    def _append_to_log(self, checkpoint_file, changed, runner_data, stats):
+        """Appends the changed trial states to the current trial log."""
+        entry = {
+            "checkpoints": changed,
+            "runner_data": runner_data,
+            "stats": stats,
+        }
+        with open(_trial_log_path(checkpoint_file), "a") as f:
+            f.write(json.dumps(entry, cls=TuneFunctionEncoder) + "\n")
+        self._num_logged_trials += len(changed)
+
 
 class TrialRunner:
     """A TrialRunner implements the event loop for scheduling trials on Ray.
@@ -439,9 +546,8 @@ class TrialRunner:
         all ongoing trials.
         """
         newest_ckpt_path = _find_newest_ckpt(self._local_checkpoint_dir)
-        with open(newest_ckpt_path, "r") as f:
-            runner_state = json.load(f, cls=TuneFunctionDecoder)
-            self.checkpoint_file = newest_ckpt_path
+        runner_state = load_experiment_state(newest_ckpt_path)
+        self.checkpoint_file = newest_ckpt_path
 
         logger.warning("".join([
             "Attempting to resume experiment from {}. ".format(
@@ -475,7 +581,8 @@ class TrialRunner:
     def is_finished(self):
         """Returns whether all trials have finished running."""
         trials_done = all(trial.is_finished() for trial in self._trials)
-        return trials_done and self._search_alg.is_finished()
+        return trials_done and self._search_alg.is_finished() and \
+            not self.trial_executor.has_persisting_checkpoints()
 
     def step(self):
         """Runs one step of the trial event loop.
@@ -501,10 +608,10 @@ class TrialRunner:
         if not self._updated_queue or (self._updated_queue and next_trial):
             num_pending_trials = len(
                 [t for t in self._trials if t.status == Trial.PENDING])
-            while num_pending_trials < self._max_pending_trials:
-                if not self._update_trial_queue(blocking=False):
-                    break
-                num_pending_trials += 1
+            if num_pending_trials < self._max_pending_trials:
+                self._update_trial_queue(
+                    blocking=False,
+                    num_trials=self._max_pending_trials - num_pending_trials)
 
         # Update status of staged placement groups
         self.trial_executor.stage_and_update_status(self._trials)
@@ -539,9 +646,12 @@ class TrialRunner:
                 if self.trial_executor.in_staging_grace_period():
                     timeout = 0.1
                 self._process_events(timeout=timeout)  # blocking
+            elif self.trial_executor.has_persisting_checkpoints():
+                self._process_persisted_checkpoints(timeout=1.)
             else:
                 self.trial_executor.on_no_available_trials(self)
 
+        self._process_persisted_checkpoints()
         self._stop_experiment_if_needed()
 
         try:
@@ -630,7 +740,14 @@ class TrialRunner:
         # Only fetch a new trial if we have no pending trial
         if not any(trial.status == Trial.PENDING for trial in self._trials) \
                 or wait_for_trial:
-            self._update_trial_queue(blocking=wait_for_trial)
+            # Request as many trials as fit into the free resources
+            num_trials = 1
+            if self._trials:
+                num_trials = max(
+                    1, self.trial_executor.get_free_trial_slots(
+                        self._trials[-1]))
+            self._update_trial_queue(
+                blocking=wait_for_trial, num_trials=num_trials)
         with warn_if_slow("choose_trial_to_run"):
             trial = self._scheduler_alg.choose_trial_to_run(self)
             if trial:
@@ -648,169 +765,308 @@ class TrialRunner:
             with warn_if_slow("process_failed_trial"):
                 self._process_trial_failure(failed_trial, error_msg=error_msg)
         else:
-            # TODO(ujvl): Consider combining get_next_available_trial and
+            # TODO(ujvl): Consider combining get_next_available_trials and
             #  fetch_result functionality so that we don't timeout on fetch.
-            trial = self.trial_executor.get_next_available_trial(
+            trials = self.trial_executor.get_next_available_trials(
                 timeout=timeout)  # blocking
-            if not trial:
-                return
-            if trial.is_restoring:
-                with warn_if_slow("process_trial_restore"):
-                    self._process_trial_restore(trial)
-                with warn_if_slow("callbacks.on_trial_restore"):
-                    self._callbacks.on_trial_restore(
-                        iteration=self._iteration,
-                        trials=self._trials,
-                        trial=trial)
-            elif trial.is_saving:
-                with warn_if_slow("process_trial_save") as _profile:
-                    self._process_trial_save(trial)
-                with warn_if_slow("callbacks.on_trial_save"):
-                    self._callbacks.on_trial_save(
-                        iteration=self._iteration,
-                        trials=self._trials,
-                        trial=trial)
-                if _profile.too_slow and trial.sync_on_checkpoint:
-                    # TODO(ujvl): Suggest using DurableTrainable once
-                    #  API has converged.
-
-                    msg = (
-                        "Consider turning off forced head-worker trial "
-                        "checkpoint syncs by setting sync_on_checkpoint=False"
-                        ". Note that this may result in faulty trial "
-                        "restoration if a failure occurs while the checkpoint "
-                        "is being synced from the worker to the head node.")
-
-                    if trial.location.hostname and (trial.location.hostname !=
-                                                    get_node_ip_address()):
-                        if log_once("tune_head_worker_checkpoint"):
-                            logger.warning(msg)
-
-            else:
+            result_trials = []
+            for trial in trials:
+                if trial.is_restoring:
+                    with warn_if_slow("process_trial_restore"):
+                        self._process_trial_restore(trial)
+                    with warn_if_slow("callbacks.on_trial_restore"):
+                        self._callbacks.on_trial_restore(
+                            iteration=self._iteration,
+                            trials=self._trials,
+                            trial=trial)
+                elif trial.is_saving:
+                    with warn_if_slow("process_trial_save") as _profile:
+                        self._process_trial_save(trial)
+                    with warn_if_slow("callbacks.on_trial_save"):
+                        self._callbacks.on_trial_save(
+                            iteration=self._iteration,
+                            trials=self._trials,
+                            trial=trial)
+                    if _profile.too_slow and trial.sync_on_checkpoint:
+                        # TODO(ujvl): Suggest using DurableTrainable once
+                        #  API has converged.
+
+                        msg = (
+                            "Consider turning off forced head-worker trial "
+                            "checkpoint syncs by setting "
+                            "sync_on_checkpoint=False. Note that this may "
+                            "result in faulty trial restoration if a failure "
+                            "occurs while the checkpoint is being synced "
+                            "from the worker to the head node.")
+
+                        if trial.location.hostname and (
+                                trial.location.hostname !=
+                                get_node_ip_address()):
+                            if log_once("tune_head_worker_checkpoint"):
+                                logger.warning(msg)
+                else:
+                    result_trials.append(trial)
+
+            if result_trials:
                 with warn_if_slow("process_trial"):
-                    self._process_trial(trial)
-
-            # `self._queued_trial_decisions` now contains a final decision
-            # based on all results
-            if trial not in self._cached_trial_decisions:
-                final_decision = self._queued_trial_decisions.pop(
-                    trial.trial_id, None)
-                if final_decision:
-                    self._execute_action(trial, final_decision)
-
-    def _process_trial(self, trial):
-        """Processes a trial result.
-
-        Fetches the trial's latest result and makes a scheduling decision
-        regarding its next action. If a checkpoint is taken, the decided
-        action is cached and acted on only after the checkpoint is later
-        processed (see `_process_trial_save`). Otherwise the decision is
-        acted on immediately.
-
-        If multiple results are received (e.g. because of buffering), all
-        results are processed and the final action is determined. STOP
-        takes precedence over PAUSE, which takes precedence over CONTINUE.
+                    self._process_trials(result_trials)
+
+            for trial in trials:
+                # `self._queued_trial_decisions` now contains a final
+                # decision based on all results
+                if trial not in self._cached_trial_decisions:
+                    final_decision = self._queued_trial_decisions.pop(
+                        trial.trial_id, None)
+                    if final_decision:
+                        self._execute_action(trial, final_decision)
+
+    def _process_trials(self, trials):
+        """Processes the results of trials.
+
+        Fetches the trials' latest results and makes a scheduling decision
+        regarding each trial's next action. If a checkpoint is taken, the
+        decided action is cached and acted on only after the checkpoint is
+        later processed (see `_process_trial_save`). Otherwise the decision
+        is acted on immediately.
+
+        If multiple results are received for a trial (e.g. because of
+        buffering), all results are processed and the final action is
+        determined. STOP takes precedence over PAUSE, which takes precedence
+        over CONTINUE.
+
+        The results of all trials are processed as a batch: the i-th
+        results of all trials are passed to the scheduler, search algorithm
+        and callbacks at once (see `_process_trial_results`).
 
         Args:
-            trial (Trial): Trial with a result ready to be processed.
+            trials (List[Trial]): Trials with a result ready to be processed.
         """
-        try:
-            results = self.trial_executor.fetch_result(trial)
-            with warn_if_slow(
-                    "process_trial_results",
-                    message="Processing trial results took {duration:.3f} s, "
-                    "which may be a performance bottleneck. Please consider "
-                    "reporting results less frequently to Ray Tune."):
-                for i, result in enumerate(results):
-                    with warn_if_slow("process_trial_result"):
-                        decision = self._process_trial_result(trial, result)
-                    if decision is None:
-                        # If we didn't get a decision, this means a
-                        # non-training future (e.g. a save) was scheduled.
-                        # We do not allow processing more results then.
-                        if i < len(results) - 1:
+        results = {}
+        for trial in trials:
+            try:
+                results[trial] = self.trial_executor.fetch_result(trial)
+            except Exception:
+                self._process_trial_event_error(trial)
+
+        with warn_if_slow(
+                "process_trial_results",
+                message="Processing trial results took {duration:.3f} s, "
+                "which may be a performance bottleneck. Please consider "
+                "reporting results less frequently to Ray Tune."):
+            i = 0
+            while results:
+                decisions = self._process_trial_results(
+                    [(trial, trial_results[i])
+                     for trial, trial_results in results.items()])
+                remaining = {}
+                for trial, trial_results in results.items():
+                    # Trials that failed processing their result are skipped.
+                    if trial not in decisions or i == len(trial_results) - 1:
+                        continue
+                    try:
+                        if decisions[trial] is None:
+                            # If we didn't get a decision, this means a
+                            # non-training future (e.g. a save) was
+                            # scheduled. We do not allow processing more
+                            # results then.
                             raise RuntimeError(
                                 f"Trial {trial} has a non-training future "
-                                f"scheduled but {len(results)-i} results "
-                                f"left to process. This should never "
+                                f"scheduled but {len(trial_results)-i} "
+                                f"results left to process. This should never "
                                 f"happen - please file an issue at "
                                 f"https://github.com/ray-project/ray/issues")
-                    elif decision == TrialScheduler.STOP:
-                        # If the decision is to stop the trial,
-                        # ignore all results that came after that.
-                        break
-        except Exception:
-            error_msg = "Trial %s: Error processing event." % trial
-            if self._fail_fast == TrialRunner.RAISE:
-                logger.error(error_msg)
-                raise
-            else:
-                logger.exception(error_msg)
-            self._process_trial_failure(trial, traceback.format_exc())
+                    except RuntimeError:
+                        self._process_trial_event_error(trial)
+                        continue
+                    # If the decision is to stop the trial,
+                    # ignore all results that came after that.
+                    if decisions[trial] != TrialScheduler.STOP:
+                        remaining[trial] = trial_results
+                results = remaining
+                i += 1
+
+    def _process_trial_event_error(self, trial, error=None):
+        """Handles an exception raised while processing a trial's event.
+
+        Handles the exception currently being handled, or `error` if set.
+        """
+        error_msg = "Trial %s: Error processing event." % trial
+        if self._fail_fast == TrialRunner.RAISE:
+            logger.error(error_msg)
+            if error is not None:
+                raise error
+            raise
+        if error is None:
+            logger.exception(error_msg)
+            error_str = traceback.format_exc()
+        else:
+            logger.error(error_msg, exc_info=error)
+            error_str = "".join(
+                traceback.format_exception(
+                    type(error), error, error.__traceback__))
+        self._process_trial_failure(trial, error_str)
 
-    def _process_trial_result(self, trial, result):
-        result.update(trial_id=trial.trial_id)
-        is_duplicate = RESULT_DUPLICATE in result
-        force_checkpoint = result.get(SHOULD_CHECKPOINT, False)
-        # TrialScheduler and SearchAlgorithm still receive a
-        # notification because there may be special handling for
-        # the `on_trial_complete` hook.
-        if is_duplicate:
-            logger.debug("Trial finished without logging 'done'.")
-            result = trial.last_result
-            result.update(done=True)
-
-        self._total_time += result.get(TIME_THIS_ITER_S, 0)
-
-        flat_result = flatten_dict(result)
-        self._validate_result_metrics(flat_result)
-
-        if self._stopper(trial.trial_id,
-                         result) or trial.should_stop(flat_result):
-            result.update(done=True)
-
-            # Hook into scheduler
-            self._scheduler_alg.on_trial_complete(self, trial, flat_result)
-            self._search_alg.on_trial_complete(
-                trial.trial_id, result=flat_result)
-
-            # If this is not a duplicate result, the callbacks should
-            # be informed about the result.
-            if not is_duplicate:
-                with warn_if_slow("callbacks.on_trial_result"):
-                    self._callbacks.on_trial_result(
-                        iteration=self._iteration,
-                        trials=self._trials,
-                        trial=trial,
-                        result=result.copy())
+    def _process_trial_results(self, trial_results):
+        """Processes one result for each of the given trials.
 
-            self._callbacks.on_trial_complete(
-                iteration=self._iteration, trials=self._trials, trial=trial)
-            decision = TrialScheduler.STOP
-        else:
-            with warn_if_slow("scheduler.on_trial_result"):
-                decision = self._scheduler_alg.on_trial_result(
-                    self, trial, flat_result)
-            if decision == TrialScheduler.STOP:
-                result.update(done=True)
-            with warn_if_slow("search_alg.on_trial_result"):
-                self._search_alg.on_trial_result(trial.trial_id, flat_result)
-            with warn_if_slow("callbacks.on_trial_result"):
-                self._callbacks.on_trial_result(
-                    iteration=self._iteration,
-                    trials=self._trials,
-                    trial=trial,
-                    result=result.copy())
-            if decision == TrialScheduler.STOP:
-                with warn_if_slow("search_alg.on_trial_complete"):
+        Args:
+            trial_results (List[Tuple[Trial, Dict]]): Trials and results.
+
+        Returns:
+            Dict[Trial, Optional[str]]: The scheduling decision per trial
+                (None if a non-training future was scheduled). Trials that
+                failed while processing their result are left out.
+        """
+        decisions = {}
+        # Results of trials that continue (unless the scheduler decides
+        # otherwise) are passed to the batched hooks below.
+        to_schedule = []
+        for trial, result in trial_results:
+            try:
+                result.update(trial_id=trial.trial_id)
+                is_duplicate = RESULT_DUPLICATE in result
+                force_checkpoint = result.get(SHOULD_CHECKPOINT, False)
+                # TrialScheduler and SearchAlgorithm still receive a
+                # notification because there may be special handling for
+                # the `on_trial_complete` hook.
+                if is_duplicate:
+                    logger.debug("Trial finished without logging 'done'.")
+                    result = trial.last_result
+                    result.update(done=True)
+
+                self._total_time += result.get(TIME_THIS_ITER_S, 0)
+
+                flat_result = flatten_dict(result)
+                self._validate_result_metrics(flat_result)
+
+                if self._stopper(trial.trial_id,
+                                 result) or trial.should_stop(flat_result):
+                    result.update(done=True)
+
+                    # Hook into scheduler
+                    self._scheduler_alg.on_trial_complete(
+                        self, trial, flat_result)
                     self._search_alg.on_trial_complete(
                         trial.trial_id, result=flat_result)
-                with warn_if_slow("callbacks.on_trial_complete"):
+
+                    # If this is not a duplicate result, the callbacks should
+                    # be informed about the result.
+                    if not is_duplicate:
+                        with warn_if_slow("callbacks.on_trial_result"):
+                            self._callbacks.on_trial_result(
+                                iteration=self._iteration,
+                                trials=self._trials,
+                                trial=trial,
+                                result=result.copy())
+
                     self._callbacks.on_trial_complete(
                         iteration=self._iteration,
                         trials=self._trials,
                         trial=trial)
+                    decisions[trial] = self._finish_trial_result(
+                        trial, result, TrialScheduler.STOP, is_duplicate,
+                        force_checkpoint)
+                else:
+                    to_schedule.append((trial, result, flat_result,
+                                        is_duplicate, force_checkpoint))
+            except Exception:
+                self._process_trial_event_error(trial)
+
+        if not to_schedule:
+            return decisions
+
+        # Trials whose result fails in one of the hooks are left out of the
+        # following ones.
+        scheduler_decisions = self._call_trial_result_hooks(
+            "scheduler",
+            lambda batch: self._scheduler_alg.on_trial_results(self, batch),
+            [(trial, flat_result)
+             for trial, _, flat_result, _, _ in to_schedule])
+        to_schedule = [
+            entry for entry in to_schedule if entry[0] in scheduler_decisions
+        ]
+        for trial, result, _, _, _ in to_schedule:
+            if scheduler_decisions[trial] == TrialScheduler.STOP:
+                result.update(done=True)
+
+        processed = self._call_trial_result_hooks(
+            "search_alg", lambda batch: self._search_alg.on_trial_results(
+                [(trial.trial_id, result) for trial, result in batch]),
+            [(trial, flat_result)
+             for trial, _, flat_result, _, _ in to_schedule])
+        to_schedule = [entry for entry in to_schedule if entry[0] in processed]
+
+        processed = self._call_trial_result_hooks(
+            "callbacks", lambda batch: self._callbacks.on_trial_results(
+                iteration=self._iteration,
+                trials=self._trials,
+                trial_results=batch),
+            [(trial, result.copy()) for trial, result, _, _, _ in to_schedule])
+        to_schedule = [entry for entry in to_schedule if entry[0] in processed]
+
+        for (trial, result, flat_result, is_duplicate,
+             force_checkpoint) in to_schedule:
+            decision = scheduler_decisions[trial]
+            try:
+                if decision == TrialScheduler.STOP:
+                    with warn_if_slow("search_alg.on_trial_complete"):
+                        self._search_alg.on_trial_complete(
+                            trial.trial_id, result=flat_result)
+                    with warn_if_slow("callbacks.on_trial_complete"):
+                        self._callbacks.on_trial_complete(
+                            iteration=self._iteration,
+                            trials=self._trials,
+                            trial=trial)
+                decisions[trial] = self._finish_trial_result(
+                    trial, result, decision, is_duplicate, force_checkpoint)
+            except Exception:
+                self._process_trial_event_error(trial)
+        return decisions
+
+    def _call_trial_result_hooks(self, name, batched_hook, trial_results):
+        """Passes a batch of results to a batched hook.
 
+        If the hook raises a TrialResultsError, only the trials whose results
+        failed fail. If it raises any other error, it's unknown which
+        results were processed, so all trials of the batch fail (instead of
+        processing results twice).
+
+        Args:
+            name (str): Name of the hook's owner (for logging).
+            batched_hook (Callable[[List[Tuple[Trial, Dict]]], Any]): Hook
+                receiving all results at once. Returns a list with one
+                output per result, or None.
+            trial_results (List[Tuple[Trial, Dict]]): Trials and results.
+
+        Returns:
+            Dict[Trial, Any]: The hook's output per trial (None if the hook
+                has no outputs). Trials that failed are left out.
+        """
+        if not trial_results:
+            return {}
+        errors = {}
+        try:
+            with warn_if_slow(f"{name}.on_trial_results"):
+                outputs = batched_hook(trial_results)
+        except TrialResultsError as e:
+            outputs, errors = e.outputs, e.errors
+        except Exception:
+            for trial, _ in trial_results:
+                self._process_trial_event_error(trial)
+            return {}
+        if outputs is None:
+            outputs = [None] * len(trial_results)
+        processed = {}
+        for i, ((trial, _), output) in enumerate(zip(trial_results,
+                                                     outputs)):
+            if i in errors:
+                self._process_trial_event_error(trial, errors[i])
+            else:
+                processed[trial] = output
+        return processed
+
+    def _finish_trial_result(self, trial, result, decision, is_duplicate,
+                             force_checkpoint):
         if not is_duplicate:
             trial.update_last_result(
                 result, terminate=(decision == TrialScheduler.STOP))
@@ -902,26 +1158,46 @@ class TrialRunner:
             self._process_trial_failure(trial, traceback.format_exc())
 
         if checkpoint_value:
-            try:
-                trial.saving_to.value = checkpoint_value
-                self._callbacks.on_checkpoint(
-                    iteration=self._iteration,
-                    trials=self._trials,
-                    trial=trial,
-                    checkpoint=trial.saving_to)
-                trial.on_checkpoint(trial.saving_to)
-                self.trial_executor.try_checkpoint_metadata(trial)
-            except Exception:
-                logger.exception("Trial %s: Error handling checkpoint %s",
-                                 trial, checkpoint_value)
-                if self._fail_fast == TrialRunner.RAISE:
-                    raise
+            trial.saving_to.value = checkpoint_value
+            self._commit_checkpoint(trial, trial.saving_to)
 
         trial.saving_to = None
         decision = self._cached_trial_decisions.pop(trial.trial_id, None)
         if decision and checkpoint_value:
             self._queue_decision(trial, decision)
 
+    def _process_persisted_checkpoints(self, timeout=0):
+        """Commits the checkpoints that have been persisted asynchronously.
+
+        Args:
+            timeout (float): Maximum time to wait for pending checkpoints.
+        """
+        for trial, checkpoint in self.trial_executor.get_persisted_checkpoints(
+                timeout=timeout):
+            logger.debug("Trial %s: Processing persisted checkpoint.", trial)
+            self._commit_checkpoint(trial, checkpoint)
+
+    def _commit_checkpoint(self, trial, checkpoint):
+        """Registers a persistent checkpoint with the trial and callbacks.
+
+        Args:
+            trial (Trial): Trial that has been saved.
+            checkpoint (Checkpoint): The checkpoint, with its path as value.
+        """
+        try:
+            self._callbacks.on_checkpoint(
+                iteration=self._iteration,
+                trials=self._trials,
+                trial=trial,
+                checkpoint=checkpoint)
+            trial.on_checkpoint(checkpoint)
+            self.trial_executor.try_checkpoint_metadata(trial)
+        except Exception:
+            logger.exception("Trial %s: Error handling checkpoint %s", trial,
+                             checkpoint.value)
+            if self._fail_fast == TrialRunner.RAISE:
+                raise
+
     def _process_trial_restore(self, trial):
         """Processes a trial restore.
 
@@ -1071,8 +1347,10 @@ class TrialRunner:
         with warn_if_slow("scheduler.on_trial_add"):
             self._scheduler_alg.on_trial_add(self, trial)
 
-    def _update_trial_queue(self, blocking: bool = False,
-                            timeout: int = 600) -> bool:
+    def _update_trial_queue(self,
+                            blocking: bool = False,
+                            timeout: int = 600,
+                            num_trials: int = 1) -> bool:
         """Adds next trials to queue if possible.
 
         Note that the timeout is currently unexposed to the user.
@@ -1081,29 +1359,29 @@ class TrialRunner:
             blocking (bool): Blocks until either a trial is available
                 or is_finished (timeout or search algorithm finishes).
             timeout (int): Seconds before blocking times out.
+            num_trials (int): Maximum number of trials to request from the
+                search algorithm at once.
 
         Returns:
             Boolean indicating if a new trial was created or not.
         """
         self._updated_queue = True
 
-        trial = self._search_alg.next_trial()
-        if blocking and not trial:
+        trials = self._search_alg.next_trials(num_trials)
+        if blocking and not trials:
             start = time.time()
             # Checking `is_finished` instead of _search_alg.is_finished
             # is fine because blocking only occurs if all trials are
             # finished and search_algorithm is not yet finished
-            while (not trial and not self.is_finished()
+            while (not trials and not self.is_finished()
                    and time.time() - start < timeout):
                 logger.info("Blocking for next trial...")
-                trial = self._search_alg.next_trial()
+                trials = self._search_alg.next_trials(num_trials)
                 time.sleep(1)
 
-        if trial:
+        for trial in trials:
             self.add_trial(trial)
-            return True
-
-        return False
+        return bool(trials)
 
     def request_stop_trial(self, trial):
         self._stop_queue.append(trial)
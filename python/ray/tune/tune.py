@@ -266,8 +266,10 @@ def run(
             automatic scale-up.
         reuse_actors (bool): Whether to reuse actors between different trials
             when possible. This can drastically speed up experiments that start
-            and stop actors often (e.g., PBT in time-multiplexing mode). This
-            requires trials to have the same resource requirements.
+            and stop actors often (e.g., PBT in time-multiplexing mode). Actors
+            are only reused by trials with the same trainable and resource
+            requirements. Set ``TUNE_MAX_CACHED_ACTORS`` to keep more than
+            one actor for reuse.
         trial_executor (TrialExecutor): Manage the execution of trials.
         raise_on_failed_trial (bool): Raise TuneError if there exists failed
             trial (of ERROR state) when the experiments complete.
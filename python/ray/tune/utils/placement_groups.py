@@ -122,6 +122,15 @@ class PlacementGroupFactory:
     def head_cpus(self):
         return self._bundles[0].get("CPU", None)
 
+    @property
+    def required_resources(self) -> Dict[str, float]:
+        """Returns the summed resources of all bundles."""
+        resources = {}
+        for bundle in self._bundles:
+            for key, val in bundle.items():
+                resources[key] = resources.get(key, 0) + val
+        return resources
+
     def _bind(self):
         sig = signature(placement_group)
         try:
@@ -48,6 +48,26 @@ class TrainableUtil:
             pickle.dump(trainable_state, f)
         return checkpoint_path
 
+    @staticmethod
+    def persist_snapshot(info, checkpoint):
+        """Persists a snapshot taken by ``Trainable.save_snapshot()``.
+
+        Writes the checkpoint and its metadata to the checkpoint dir and,
+        for durable trainables, syncs it up to remote storage.
+
+        Returns:
+            Checkpoint path or prefix that may be passed to restore().
+        """
+        checkpoint_path = TrainableUtil.process_checkpoint(
+            checkpoint,
+            parent_dir=info["checkpoint_dir"],
+            trainable_state=info["trainable_state"])
+        if info["storage"]:
+            storage_client, local_dir, remote_dir = info["storage"]
+            storage_client.sync_up(local_dir, remote_dir)
+            storage_client.wait()
+        return checkpoint_path
+
     @staticmethod
     def pickle_checkpoint(checkpoint_path):
         """Pickles checkpoint data."""
@@ -0,0 +1,86 @@
+"""Result throughput of the driver event loop (1 node)
+
+In this run, we will start 96 trials concurrently that report results as
+fast as possible (every 5 ms). The trials thus produce many more results
+than the driver can process, so the measured number of results processed
+per second is the throughput of the Tune event loop on the driver (fetching
+results and invoking the scheduler, search algorithm and callbacks).
+
+Cluster: cluster_1x96.yaml
+
+Test owner: krfricke
+
+Acceptance criteria: Should process at least 5000 results per second.
+"""
+import os
+import time
+
+import ray
+from ray.tune import Callback
+
+from _trainable import timed_tune_run
+
+
+class ResultThroughputCallback(Callback):
+    """Counts the results processed on the driver."""
+
+    def __init__(self):
+        self.num_results = 0
+        self.num_steps = 0
+        self.start_time = None
+        self.end_time = None
+
+    def on_trial_results(self, iteration, trials, trial_results, **info):
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        self.num_results += len(trial_results)
+        self.num_steps += 1
+        self.end_time = time.monotonic()
+
+    def on_trial_result(self, iteration, trials, trial, result, **info):
+        # Results of stopping trials are not passed as a batch.
+        self.num_results += 1
+
+
+def main():
+    os.environ["TUNE_DISABLE_AUTO_CALLBACK_LOGGERS"] = "1"  # Tweak
+
+    ray.init(address="auto")
+
+    num_samples = 96
+    results_per_second = 200
+    trial_length_s = 100
+
+    max_runtime = 300
+    min_results_per_second = 5000
+
+    callback = ResultThroughputCallback()
+    timed_tune_run(
+        name="result throughput driver",
+        num_samples=num_samples,
+        results_per_second=results_per_second,
+        trial_length_s=trial_length_s,
+        max_runtime=max_runtime,
+        callbacks=[callback])
+
+    time_taken = callback.end_time - callback.start_time
+    results_per_second = callback.num_results / time_taken
+    print(f"Processed {callback.num_results} results in "
+          f"{callback.num_steps} batches in {time_taken:.2f} seconds: "
+          f"{results_per_second:.2f} results per second, "
+          f"{callback.num_results / callback.num_steps:.2f} results per "
+          f"batch.")
+
+    assert results_per_second >= min_results_per_second, \
+        f"The driver processed {results_per_second:.2f} results per " \
+        f"second, but should process at least {min_results_per_second}. " \
+        f"Test failed. \n\n" \
+        f"--- FAILED: RESULT THROUGHPUT DRIVER ::: " \
+        f"{results_per_second:.2f} < {min_results_per_second} ---"
+
+    print(f"--- PASSED: RESULT THROUGHPUT DRIVER ::: "
+          f"{results_per_second:.2f} >= {min_results_per_second} ---")
+
+
+if __name__ == "__main__":
+    main()
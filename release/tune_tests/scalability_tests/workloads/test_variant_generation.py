@@ -0,0 +1,115 @@
+"""Variant generation of a large grid search (1 node, 1M variants)
+
+In this run, we will create a search space with a grid of 1 million points
+(three grid search variables with 100 values each) and a config containing
+larger constant values. We measure the time and memory it takes the
+BasicVariantGenerator to create the first trials of this grid, and the
+throughput of generating all variants of the grid.
+
+Variants are generated lazily, so creating the first trials should neither
+depend on the size of the grid nor keep all variants in memory.
+
+Cluster: cluster_1x16.yaml
+
+Test owner: krfricke
+
+Acceptance criteria: Should create the first 1000 trials in less than
+10 seconds using less than 100 MB of memory, and should generate all
+variants in less than 120 seconds.
+"""
+import time
+import tracemalloc
+
+import ray
+from ray import tune
+from ray.tune.suggest import BasicVariantGenerator
+from ray.tune.suggest.variant_generator import generate_variants
+
+
+def train(config):
+    tune.report(score=config["a"] + config["b"] + config["c"])
+
+
+def main():
+    ray.init(address="auto")
+
+    grid_size = 100
+    num_trials = 1000
+
+    max_trials_runtime = 10
+    max_trials_memory_mb = 100
+    max_variants_runtime = 120
+
+    tune.register_trainable("variant_generation", train)
+
+    config = {
+        "a": tune.grid_search(list(range(grid_size))),
+        "b": tune.grid_search(list(range(grid_size))),
+        "c": tune.grid_search(list(range(grid_size))),
+        "lr": tune.loguniform(1e-4, 1e-1),
+        "layers": [{
+            "units": 64,
+            "activation": "relu"
+        } for _ in range(50)],
+        "constants": {f"key_{i}": i
+                      for i in range(50)},
+    }
+    num_variants = grid_size**3
+
+    tracemalloc.start()
+    start_time = time.monotonic()
+    searcher = BasicVariantGenerator()
+    searcher.add_configurations({
+        "variant_generation": {
+            "run": "variant_generation",
+            "config": config
+        }
+    })
+    trials = [searcher.next_trial() for _ in range(num_trials)]
+    trials_time_taken = time.monotonic() - start_time
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    trials_memory_mb = peak_memory / 1024**2
+
+    assert all(trials)
+    print(f"Created the first {num_trials} trials of {num_variants} "
+          f"variants in {trials_time_taken:.2f} seconds using "
+          f"{trials_memory_mb:.2f} MB of memory.")
+
+    start_time = time.monotonic()
+    count = sum(1 for _ in generate_variants({"config": config}))
+    variants_time_taken = time.monotonic() - start_time
+
+    assert count == num_variants, count
+    print(f"Generated {count} variants in {variants_time_taken:.2f} "
+          f"seconds: {count / variants_time_taken:.2f} variants per second.")
+
+    assert trials_time_taken <= max_trials_runtime, \
+        f"Creating the first trials took {trials_time_taken:.2f} seconds, " \
+        f"but should not have exceeded {max_trials_runtime} seconds. " \
+        f"Test failed. \n\n" \
+        f"--- FAILED: VARIANT GENERATION TRIALS ::: " \
+        f"{trials_time_taken:.2f} > {max_trials_runtime} ---"
+
+    assert trials_memory_mb <= max_trials_memory_mb, \
+        f"Creating the first trials used {trials_memory_mb:.2f} MB of " \
+        f"memory, but should not have exceeded {max_trials_memory_mb} MB. " \
+        f"Test failed. \n\n" \
+        f"--- FAILED: VARIANT GENERATION MEMORY ::: " \
+        f"{trials_memory_mb:.2f} > {max_trials_memory_mb} ---"
+
+    assert variants_time_taken <= max_variants_runtime, \
+        f"Generating all variants took {variants_time_taken:.2f} seconds, " \
+        f"but should not have exceeded {max_variants_runtime} seconds. " \
+        f"Test failed. \n\n" \
+        f"--- FAILED: VARIANT GENERATION THROUGHPUT ::: " \
+        f"{variants_time_taken:.2f} > {max_variants_runtime} ---"
+
+    print(f"--- PASSED: VARIANT GENERATION ::: "
+          f"{trials_time_taken:.2f} <= {max_trials_runtime}, "
+          f"{trials_memory_mb:.2f} <= {max_trials_memory_mb}, "
+          f"{variants_time_taken:.2f} <= {max_variants_runtime} ---")
+
+
+if __name__ == "__main__":
+    main()
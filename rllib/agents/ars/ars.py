@@ -11,7 +11,8 @@ import ray
 from ray.rllib.agents import Trainer, with_common_config
 from ray.rllib.agents.ars.ars_tf_policy import ARSTFPolicy
 from ray.rllib.agents.es import optimizers, utils
-from ray.rllib.agents.es.es import validate_config
+from ray.rllib.agents.es.es import Aggregator, apply_compact_update, \
+    CompactUpdate, tree_weighted_noise_sum, validate_config
 from ray.rllib.agents.es.es_tf_policy import rollout
 from ray.rllib.env.env_context import EnvContext
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
@@ -39,6 +40,14 @@ DEFAULT_CONFIG = with_common_config({
     "eval_prob": 0.03,  # probability of evaluating the parameter rewards
     "report_length": 10,  # how many of the last rewards we average over
     "offset": 0,
+    # Send weight updates to the workers as compact (noise index, weight)
+    # pairs instead of the full flat weight vector (see ES).
+    "compact_weight_updates": True,
+    # Still send the full weights every this many iterations.
+    "full_weights_sync_interval": 100,
+    # Number of aggregator actors computing the gradient estimate in a tree
+    # reduction (0 = compute it on the driver).
+    "num_aggregation_workers": 0,
     # ARS will use Trainer's evaluation WorkerSet (if evaluation_interval > 0).
     # Therefore, we must be careful not to use more than 1 env per eval worker
     # (would break ARSPolicy's compute_action method) and to not do obs-
@@ -97,6 +106,9 @@ class Worker:
         policy_cls = get_policy_class(config)
         self.policy = policy_cls(self.env.observation_space,
                                  self.env.action_space, config)
+        # Replica of the driver's optimizer for applying CompactUpdates.
+        self.optimizer = optimizers.SGD(self.policy, config["sgd_stepsize"])
+        self.params = None
 
     @property
     def filters(self):
@@ -123,7 +135,17 @@ class Worker:
             offset=self.config["offset"])
         return rollout_rewards, rollout_fragment_length
 
-    def do_rollouts(self, params, timestep_limit=None):
+    def do_rollouts(self, params, timestep_limit=None, optimizer_state=None):
+        if optimizer_state is not None:
+            self.optimizer.set_state(optimizer_state)
+        # `params` are either new weights, a CompactUpdate to apply to the
+        # current ones, or None (keep the current ones).
+        if isinstance(params, CompactUpdate):
+            self.params = apply_compact_update(self.policy, self.optimizer,
+                                               self.noise, self.params, params)
+        elif params is not None:
+            self.params = params
+        params = self.params
         # Set the network weights.
         self.policy.set_flat_weights(params)
 
@@ -210,6 +232,12 @@ class ARSTrainer(Trainer):
             Worker.remote(config, env_creator, noise_id, idx + 1)
             for idx in range(config["num_workers"])
         ]
+        self.aggregators = [
+            Aggregator.remote(noise_id)
+            for _ in range(config["num_aggregation_workers"])
+        ]
+        # The last update, to be sent to the workers as CompactUpdate.
+        self._last_update = None
 
         self.episodes_so_far = 0
         self.reward_list = []
@@ -230,12 +258,15 @@ class ARSTrainer(Trainer):
         assert theta.dtype == np.float32
         assert len(theta.shape) == 1
 
-        # Put the current policy weights in the object store.
-        theta_id = ray.put(theta)
+        # Put the current policy weights (or the last update to them) in
+        # the object store.
+        params_id, optimizer_state_id, broadcast_bytes = \
+            utils.get_worker_params(theta, self._last_update, self.optimizer,
+                                    self.iteration, config)
         # Use the actors to do rollouts, note that we pass in the ID of the
         # policy weights.
         results, num_episodes, num_timesteps = self._collect_results(
-            theta_id, config["num_rollouts"])
+            params_id, config["num_rollouts"], optimizer_state_id)
 
         all_noise_indices = []
         all_training_returns = []
@@ -278,17 +309,20 @@ class ARSTrainer(Trainer):
         noisy_returns = noisy_returns[idx, :]
 
         # Compute and take a step.
-        g, count = utils.batched_weighted_sum(
-            noisy_returns[:, 0] - noisy_returns[:, 1],
-            (self.noise.get(index, self.policy.num_params)
-             for index in noise_idx),
-            batch_size=min(500, noisy_returns[:, 0].size))
-        g /= noise_idx.size
+        weights = (noisy_returns[:, 0] - noisy_returns[:, 1]) / noise_idx.size
         # scale the returns by their standard deviation
         if not np.isclose(np.std(noisy_returns), 0.0):
-            g /= np.std(noisy_returns)
+            weights /= np.std(noisy_returns)
+        weights = weights.astype(np.float32)
+        if self.aggregators:
+            g = tree_weighted_noise_sum(self.aggregators, noise_idx, weights,
+                                        self.policy.num_params)
+        else:
+            g = utils.weighted_noise_sum(self.noise.noise, noise_idx, weights,
+                                         self.policy.num_params)
         assert (g.shape == (self.policy.num_params, )
                 and g.dtype == np.float32)
+        self._last_update = CompactUpdate(noise_idx, weights, 0.0)
         # Compute the new weights theta.
         theta, update_ratio = self.optimizer.update(-g)
         # Set the new weights in the local copy of the policy.
@@ -309,6 +343,7 @@ class ARSTrainer(Trainer):
             "update_ratio": update_ratio,
             "episodes_this_iter": noisy_lengths.size,
             "episodes_so_far": self.episodes_so_far,
+            "weights_broadcast_bytes": broadcast_bytes,
         }
         result = dict(
             episode_reward_mean=np.mean(
@@ -322,7 +357,7 @@ class ARSTrainer(Trainer):
     @override(Trainer)
     def cleanup(self):
         # workaround for https://github.com/ray-project/ray/issues/1516
-        for w in self.workers:
+        for w in self.workers + self.aggregators:
             w.__ray_terminate__.remote()
 
     @override(Trainer)
@@ -341,7 +376,10 @@ class ARSTrainer(Trainer):
         worker_set.foreach_policy(
             lambda p, pid: p.set_flat_weights(ray.get(weights)))
 
-    def _collect_results(self, theta_id, min_episodes):
+    def _collect_results(self,
+                         params_id,
+                         min_episodes,
+                         optimizer_state_id=None):
         num_episodes, num_timesteps = 0, 0
         results = []
         while num_episodes < min_episodes:
@@ -349,8 +387,12 @@ class ARSTrainer(Trainer):
                 "Collected {} episodes {} timesteps so far this iter".format(
                     num_episodes, num_timesteps))
             rollout_ids = [
-                worker.do_rollouts.remote(theta_id) for worker in self.workers
+                worker.do_rollouts.remote(
+                    params_id, optimizer_state=optimizer_state_id)
+                for worker in self.workers
             ]
+            # The workers keep using these weights for the following rounds.
+            params_id, optimizer_state_id = None, None
             # Get the results of the rollouts.
             for result in ray.get(rollout_ids):
                 results.append(result)
@@ -373,6 +415,8 @@ class ARSTrainer(Trainer):
     def __setstate__(self, state):
         self.episodes_so_far = state["episodes_so_far"]
         self.policy.set_flat_weights(state["weights"])
+        # Send the full restored weights on the next iteration.
+        self._last_update = None
         self.policy.observation_filter = state["filter"]
         FilterManager.synchronize({
             DEFAULT_POLICY_ID: self.policy.observation_filter
@@ -18,6 +18,9 @@ class TestARS(unittest.TestCase):
         # Test eval workers ("normal" Trainer eval WorkerSet, unusual for ARS).
         config["evaluation_interval"] = 1
         config["evaluation_num_workers"] = 1
+        # Test tree aggregation (weights are sent as compact updates in the
+        # 2nd iteration).
+        config["num_aggregation_workers"] = 2
 
         num_iterations = 2
 
@@ -14,7 +14,9 @@ https://docs.ray.io/en/master/rllib-algorithms.html#distributed-prioritized-expe
 
 import collections
 import copy
-from typing import Tuple
+import logging
+import time
+from typing import Any, List, Tuple, Union
 
 import ray
 from ray.actor import ActorHandle
@@ -23,14 +25,16 @@ from ray.rllib.agents.dqn.dqn import calculate_rr_weights, \
 from ray.rllib.agents.dqn.learner_thread import LearnerThread
 from ray.rllib.agents.trainer import Trainer
 from ray.rllib.evaluation.worker_set import WorkerSet
-from ray.rllib.execution.common import (STEPS_TRAINED_COUNTER,
-                                        _get_global_vars, _get_shared_metrics)
+from ray.rllib.execution.common import (
+    AGENT_STEPS_SAMPLED_COUNTER, REPLAY_BYTES_COUNTER, STEPS_SAMPLED_COUNTER,
+    STEPS_TRAINED_COUNTER, _get_global_vars, _get_shared_metrics)
 from ray.rllib.execution.concurrency_ops import Concurrently, Dequeue, Enqueue
 from ray.rllib.execution.metric_ops import StandardMetricsReporting
 from ray.rllib.execution.replay_buffer import ReplayActor
 from ray.rllib.execution.replay_ops import Replay, StoreToReplayBuffer
 from ray.rllib.execution.rollout_ops import ParallelRollouts
 from ray.rllib.execution.train_ops import UpdateTargetNetwork
+from ray.rllib.policy.sample_batch import MultiAgentBatch
 from ray.rllib.utils import merge_dicts
 from ray.rllib.utils.actors import create_colocated
 from ray.rllib.utils.annotations import override
@@ -38,6 +42,9 @@ from ray.rllib.utils.typing import SampleBatchType
 from ray.tune.trainable import Trainable
 from ray.tune.utils.placement_groups import PlacementGroupFactory
 from ray.util.iter import LocalIterator
+from ray.util.placement_group import get_current_placement_group
+
+logger = logging.getLogger(__name__)
 
 # yapf: disable
 # __sphinx_doc_begin__
@@ -48,6 +55,17 @@ APEX_DEFAULT_CONFIG = merge_dicts(
             DQN_CONFIG["optimizer"], {
                 "max_weight_sync_delay": 400,
                 "num_replay_buffer_shards": 4,
+                # Whether all replay buffer shards are co-located with the
+                # learner (driver). If False, the shards are spread over the
+                # nodes of the rollout workers instead (within the rollout
+                # workers' placement group bundles, if any), and each rollout
+                # worker stores its batches directly into a shard on its own
+                # node. Only the step counts then travel to the driver.
+                "replay_buffer_shards_colocated_with_driver": True,
+                # Number of replay shards to request replay batches from in
+                # a single (batched) request. All of these batches reach the
+                # learner as one single object.
+                "replay_shards_per_request": 1,
                 "debug": False
             }),
         "n_step": 3,
@@ -91,7 +109,10 @@ class OverrideDefaultResourceRequest:
                 # Replay buffer actors each contain one shard of the total
                 # replay buffer and use 1 CPU each.
                 "CPU": cf["num_cpus_for_driver"] +
-                cf["optimizer"]["num_replay_buffer_shards"],
+                (cf["optimizer"]["num_replay_buffer_shards"]
+                 if cf["optimizer"].get(
+                     "replay_buffer_shards_colocated_with_driver", True)
+                 else 0),
                 "GPU": cf["num_gpus"]
             }] + [
                 {
@@ -122,9 +143,12 @@ class UpdateWorkerWeights:
         self.max_weight_sync_delay = max_weight_sync_delay
         self.weights = None
 
-    def __call__(self, item: Tuple[ActorHandle, SampleBatchType]):
+    def __call__(self, item: Tuple[ActorHandle, Union[SampleBatchType,
+                                                      int]]):
         actor, batch = item
-        self.steps_since_update[actor] += batch.count
+        # Batches stored directly by the rollout workers: Only the count.
+        count = batch if isinstance(batch, int) else batch.count
+        self.steps_since_update[actor] += count
         if self.steps_since_update[actor] >= self.max_weight_sync_delay:
             # Note that it's important to pull new weights once
             # updated to avoid excessive correlation between actors.
@@ -139,11 +163,83 @@ class UpdateWorkerWeights:
             metrics.counters["num_weight_syncs"] += 1
 
 
+def create_replay_shards_near_workers(workers: WorkerSet, args: List[Any],
+                                      count: int) -> List[ActorHandle]:
+    """Creates `count` ReplayActors, spread over the rollout workers' nodes.
+
+    Inside a placement group (e.g. when run by Tune), shard i is placed into
+    the bundle of rollout worker (i % num_workers). Otherwise, the shards are
+    pinned round-robin to the (distinct) nodes of the rollout workers via
+    the nodes' `node:[ip]` resources.
+    """
+    num_workers = len(workers.remote_workers())
+    pg = get_current_placement_group()
+    if pg is not None:
+        # Bundle 0 is the driver's, followed by one bundle per rollout
+        # worker (see `OverrideDefaultResourceRequest`).
+        return [
+            ReplayActor.options(
+                placement_group=pg,
+                placement_group_bundle_index=1 + i % num_workers).remote(
+                    *args) for i in range(count)
+        ]
+    ips = ray.get(
+        [w.get_node_ip.remote() for w in workers.remote_workers()])
+    nodes = list(collections.OrderedDict.fromkeys(ips))
+    logger.info("Spreading {} replay shards over nodes {}".format(
+        count, nodes))
+    return [
+        ReplayActor.options(resources={
+            "node:{}".format(nodes[i % len(nodes)]): 0.01
+        }).remote(*args) for i in range(count)
+    ]
+
+
+def _report_stored_steps(counts: Tuple[int, int]) -> int:
+    """Updates the sampled step counters from a rollout worker's store."""
+    env_steps, agent_steps = counts
+    metrics = _get_shared_metrics()
+    metrics.counters[STEPS_SAMPLED_COUNTER] += env_steps
+    metrics.counters[AGENT_STEPS_SAMPLED_COUNTER] += agent_steps
+    return env_steps
+
+
+def _store_rollouts_op(workers: WorkerSet, replay_actors: List[ActorHandle],
+                       learner_thread: LearnerThread, store_on_workers: bool,
+                       max_weight_sync_delay: int) -> LocalIterator:
+    """Generates rollouts and stores them in the replay actors.
+
+    If `store_on_workers`, the rollout workers store their batches
+    themselves (into a shard on the same node) and only send the step counts
+    to the driver. Workers' weights are updated by `UpdateWorkerWeights`.
+    """
+    if store_on_workers:
+        store_op = ParallelRollouts(workers, mode="raw") \
+            .for_each(StoreToReplayBuffer(
+                actors=replay_actors, prefer_colocated=True)) \
+            .for_each(lambda batch: (batch.count, batch.agent_steps()
+                                     if isinstance(batch, MultiAgentBatch)
+                                     else batch.count)) \
+            .gather_async(num_async=2) \
+            .for_each(_report_stored_steps)
+    else:
+        rollouts = ParallelRollouts(workers, mode="async", num_async=2)
+        store_op = rollouts \
+            .for_each(StoreToReplayBuffer(actors=replay_actors))
+    # Only need to update workers if there are remote workers.
+    if workers.remote_workers():
+        store_op = store_op.zip_with_source_actor() \
+            .for_each(UpdateWorkerWeights(
+                learner_thread, workers,
+                max_weight_sync_delay=max_weight_sync_delay))
+    return store_op
+
+
 def apex_execution_plan(workers: WorkerSet,
                         config: dict) -> LocalIterator[dict]:
     # Create a number of replay buffer actors.
     num_replay_buffer_shards = config["optimizer"]["num_replay_buffer_shards"]
-    replay_actors = create_colocated(ReplayActor, [
+    replay_actor_args = [
         num_replay_buffer_shards,
         config["learning_starts"],
         config["buffer_size"],
@@ -153,7 +249,16 @@ def apex_execution_plan(workers: WorkerSet,
         config["prioritized_replay_eps"],
         config["multiagent"]["replay_mode"],
         config.get("replay_sequence_length", 1),
-    ], num_replay_buffer_shards)
+    ]
+    store_on_workers = not config["optimizer"][
+        "replay_buffer_shards_colocated_with_driver"] and \
+        workers.remote_workers()
+    if store_on_workers:
+        replay_actors = create_replay_shards_near_workers(
+            workers, replay_actor_args, num_replay_buffer_shards)
+    else:
+        replay_actors = create_colocated(ReplayActor, replay_actor_args,
+                                         num_replay_buffer_shards)
 
     # Start the learner thread.
     learner_thread = LearnerThread(workers.local_worker())
@@ -174,22 +279,18 @@ def apex_execution_plan(workers: WorkerSet,
     # We execute the following steps concurrently:
     # (1) Generate rollouts and store them in one of our replay buffer
     # actors. Update the weights of the worker that generated the batch.
-    rollouts = ParallelRollouts(workers, mode="async", num_async=2)
-    store_op = rollouts \
-        .for_each(StoreToReplayBuffer(actors=replay_actors))
-    # Only need to update workers if there are remote workers.
-    if workers.remote_workers():
-        store_op = store_op.zip_with_source_actor() \
-            .for_each(UpdateWorkerWeights(
-                learner_thread, workers,
-                max_weight_sync_delay=(
-                    config["optimizer"]["max_weight_sync_delay"])
-            ))
+    store_op = _store_rollouts_op(
+        workers, replay_actors, learner_thread, bool(store_on_workers),
+        config["optimizer"]["max_weight_sync_delay"])
 
     # (2) Read experiences from one of the replay buffer actors and send to
     # the learner thread via its in-queue.
     post_fn = config.get("before_learn_on_batch") or (lambda b, *a: b)
-    replay_op = Replay(actors=replay_actors, num_async=4) \
+    replay_op = Replay(
+            actors=replay_actors,
+            num_async=4,
+            shards_per_request=config["optimizer"][
+                "replay_shards_per_request"]) \
         .for_each(lambda x: post_fn(x, workers, config)) \
         .zip_with_source_actor() \
         .for_each(Enqueue(learner_thread.inqueue))
@@ -218,9 +319,17 @@ def apex_execution_plan(workers: WorkerSet,
             [store_op, replay_op, update_op], mode="async", output_indexes=[2])
 
     # Add in extra replay and learner metrics to the training result.
+    last_replay_bytes = [0, time.time()]
+
     def add_apex_metrics(result: dict) -> dict:
         replay_stats = ray.get(replay_actors[0].stats.remote(
             config["optimizer"].get("debug")))
+        # Replay shards -> learner throughput since the last result.
+        replay_bytes = result["info"].get(REPLAY_BYTES_COUNTER, 0)
+        now = time.time()
+        replay_bytes_per_sec = (replay_bytes - last_replay_bytes[0]) / max(
+            now - last_replay_bytes[1], 1e-6)
+        last_replay_bytes[:] = [replay_bytes, now]
         exploration_infos = workers.foreach_trainable_policy(
             lambda p, _: p.get_exploration_info())
         result["info"].update({
@@ -228,6 +337,7 @@ def apex_execution_plan(workers: WorkerSet,
             "learner_queue": learner_thread.learner_queue_size.stats(),
             "learner": copy.deepcopy(learner_thread.stats),
             "replay_shard_0": replay_stats,
+            "replay_bytes_per_sec": round(replay_bytes_per_sec, 3),
         })
         return result
 
@@ -243,6 +353,8 @@ def apex_execution_plan(workers: WorkerSet,
 def apex_validate_config(config):
     if config["num_gpus"] > 1:
         raise ValueError("`num_gpus` > 1 not yet supported for APEX-DQN!")
+    if config["optimizer"].get("replay_shards_per_request", 1) < 1:
+        raise ValueError("`replay_shards_per_request` must be >= 1!")
     validate_config(config)
 
 
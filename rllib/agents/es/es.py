@@ -37,6 +37,19 @@ DEFAULT_CONFIG = with_common_config({
     "observation_filter": "MeanStdFilter",
     "noise_size": 250000000,
     "report_length": 10,
+    # Send weight updates to the workers as compact (noise index, weight)
+    # pairs instead of the full flat weight vector. Each worker then
+    # reconstructs the update from its view of the shared noise table and
+    # applies it with its own copy of the optimizer.
+    "compact_weight_updates": True,
+    # If `compact_weight_updates` is True, still send the full weights (and
+    # optimizer state) every this many iterations to undo any floating
+    # point drift between the driver's and the workers' weights.
+    "full_weights_sync_interval": 100,
+    # Number of aggregator actors computing the weighted sum of the noise
+    # slices (the gradient estimate) in a tree reduction. With 0, the sum is
+    # computed on the driver.
+    "num_aggregation_workers": 0,
     # ARS will use Trainer's evaluation WorkerSet (if evaluation_interval > 0).
     # Therefore, we must be careful not to use more than 1 env per eval worker
     # (would break ESPolicy's compute_action method) and to not do obs-
@@ -70,6 +83,79 @@ class SharedNoiseTable:
         return np.random.randint(0, len(self.noise) - dim + 1)
 
 
+# Compact representation of a weight update: The gradient estimate is
+# sum_i(weights[i] * noise[noise_indices[i]:noise_indices[i] + dim]), minus
+# `l2_coeff` times the current weights, from which the new weights are
+# computed by the optimizer.
+CompactUpdate = namedtuple("CompactUpdate",
+                           ["noise_indices", "weights", "l2_coeff"])
+
+
+def apply_compact_update(policy, optimizer, noise, theta, update):
+    """Returns the new flat weights after applying a CompactUpdate to `theta`.
+
+    Args:
+        policy (Policy): The policy the optimizer reads the current weights
+            from. Its weights are set to `theta` before the update.
+        optimizer (optimizers.Optimizer): The optimizer to update with.
+        noise (SharedNoiseTable): The shared noise table.
+        theta (np.ndarray): The current flat weights.
+        update (CompactUpdate): The update to apply.
+
+    Returns:
+        np.ndarray: The new flat weights.
+    """
+    g = utils.weighted_noise_sum(noise.noise, update.noise_indices,
+                                 update.weights, policy.num_params)
+    policy.set_flat_weights(theta)
+    theta, _ = optimizer.update(-g + update.l2_coeff * theta)
+    return theta
+
+
+@ray.remote
+class Aggregator:
+    """Computes (partial) weighted sums of noise slices."""
+
+    def __init__(self, noise):
+        self.noise = SharedNoiseTable(noise)
+
+    def weighted_noise_sum(self, noise_indices, weights, dim):
+        return utils.weighted_noise_sum(self.noise.noise, noise_indices,
+                                        weights, dim)
+
+    def sum(self, *partial_sums):
+        total = partial_sums[0].copy()
+        for partial_sum in partial_sums[1:]:
+            total += partial_sum
+        return total
+
+
+def tree_weighted_noise_sum(aggregators, noise_indices, weights, dim):
+    """Computes `utils.weighted_noise_sum` with a tree of Aggregator actors.
+
+    Each aggregator sums over one shard of the noise indices. The partial
+    sums are then reduced pairwise, each pair on the aggregator already
+    holding the left one, so that only the final sum reaches the caller.
+    """
+    shards = np.array_split(np.arange(len(noise_indices)), len(aggregators))
+    partial_sums = [(aggregator,
+                     aggregator.weighted_noise_sum.remote(
+                         noise_indices[shard], weights[shard], dim))
+                    for aggregator, shard in zip(aggregators, shards)]
+    while len(partial_sums) > 1:
+        reduced = []
+        for i in range(0, len(partial_sums), 2):
+            if i + 1 < len(partial_sums):
+                aggregator, left = partial_sums[i]
+                reduced.append((aggregator,
+                                aggregator.sum.remote(
+                                    left, partial_sums[i + 1][1])))
+            else:
+                reduced.append(partial_sums[i])
+        partial_sums = reduced
+    return ray.get(partial_sums[0][1])
+
+
 @ray.remote
 class Worker:
     def __init__(self,
@@ -94,6 +180,9 @@ class Worker:
         _policy_class = get_policy_class(config)
         self.policy = _policy_class(self.env.observation_space,
                                     self.env.action_space, config)
+        # Replica of the driver's optimizer for applying CompactUpdates.
+        self.optimizer = optimizers.Adam(self.policy, config["stepsize"])
+        self.params = None
 
     @property
     def filters(self):
@@ -119,7 +208,25 @@ class Worker:
             add_noise=add_noise)
         return rollout_rewards, rollout_fragment_length
 
-    def do_rollouts(self, params, timestep_limit=None):
+    def do_rollouts(self, params, timestep_limit=None, optimizer_state=None):
+        """Performs noisy (and evaluation) rollouts.
+
+        Args:
+            params (Optional[Union[np.ndarray, CompactUpdate]]): The new flat
+                weights, a CompactUpdate to apply to the current ones, or
+                None to keep using the current ones.
+            timestep_limit (Optional[int]): Max timesteps per rollout.
+            optimizer_state (Optional[dict]): If given, the driver's optimizer
+                state to continue applying CompactUpdates from.
+        """
+        if optimizer_state is not None:
+            self.optimizer.set_state(optimizer_state)
+        if isinstance(params, CompactUpdate):
+            self.params = apply_compact_update(self.policy, self.optimizer,
+                                               self.noise, self.params, params)
+        elif params is not None:
+            self.params = params
+        params = self.params
         # Set the network weights.
         self.policy.set_flat_weights(params)
 
@@ -223,6 +330,12 @@ class ESTrainer(Trainer):
             Worker.remote(config, {}, env_creator, noise_id, idx + 1)
             for idx in range(config["num_workers"])
         ]
+        self._aggregators = [
+            Aggregator.remote(noise_id)
+            for _ in range(config["num_aggregation_workers"])
+        ]
+        # The last update, to be sent to the workers as CompactUpdate.
+        self._last_update = None
 
         self.episodes_so_far = 0
         self.reward_list = []
@@ -243,12 +356,16 @@ class ESTrainer(Trainer):
         assert theta.dtype == np.float32
         assert len(theta.shape) == 1
 
-        # Put the current policy weights in the object store.
-        theta_id = ray.put(theta)
+        # Put the current policy weights (or the last update to them) in
+        # the object store.
+        params_id, optimizer_state_id, broadcast_bytes = \
+            utils.get_worker_params(theta, self._last_update, self.optimizer,
+                                    self.iteration, config)
         # Use the actors to do rollouts, note that we pass in the ID of the
         # policy weights.
         results, num_episodes, num_timesteps = self._collect_results(
-            theta_id, config["episodes_per_batch"], config["train_batch_size"])
+            params_id, config["episodes_per_batch"],
+            config["train_batch_size"], optimizer_state_id)
 
         all_noise_indices = []
         all_training_returns = []
@@ -285,14 +402,18 @@ class ESTrainer(Trainer):
             raise NotImplementedError(config["return_proc_mode"])
 
         # Compute and take a step.
-        g, count = utils.batched_weighted_sum(
-            proc_noisy_returns[:, 0] - proc_noisy_returns[:, 1],
-            (self.noise.get(index, self.policy.num_params)
-             for index in noise_indices),
-            batch_size=500)
-        g /= noisy_returns.size
-        assert (g.shape == (self.policy.num_params, ) and g.dtype == np.float32
-                and count == len(noise_indices))
+        weights = (proc_noisy_returns[:, 0] - proc_noisy_returns[:, 1]) / \
+            noisy_returns.size
+        if self._aggregators:
+            g = tree_weighted_noise_sum(self._aggregators, noise_indices,
+                                        weights, self.policy.num_params)
+        else:
+            g = utils.weighted_noise_sum(self.noise.noise, noise_indices,
+                                         weights, self.policy.num_params)
+        assert (g.shape == (self.policy.num_params, )
+                and g.dtype == np.float32)
+        self._last_update = CompactUpdate(noise_indices, weights,
+                                          config["l2_coeff"])
         # Compute the new weights theta.
         theta, update_ratio = self.optimizer.update(-g +
                                                     config["l2_coeff"] * theta)
@@ -313,6 +434,7 @@ class ESTrainer(Trainer):
             "update_ratio": update_ratio,
             "episodes_this_iter": noisy_lengths.size,
             "episodes_so_far": self.episodes_so_far,
+            "weights_broadcast_bytes": broadcast_bytes,
         }
 
         reward_mean = np.mean(self.reward_list[-self.report_length:])
@@ -343,10 +465,14 @@ class ESTrainer(Trainer):
     @override(Trainer)
     def cleanup(self):
         # workaround for https://github.com/ray-project/ray/issues/1516
-        for w in self._workers:
+        for w in self._workers + self._aggregators:
             w.__ray_terminate__.remote()
 
-    def _collect_results(self, theta_id, min_episodes, min_timesteps):
+    def _collect_results(self,
+                         params_id,
+                         min_episodes,
+                         min_timesteps,
+                         optimizer_state_id=None):
         num_episodes, num_timesteps = 0, 0
         results = []
         while num_episodes < min_episodes or num_timesteps < min_timesteps:
@@ -354,8 +480,12 @@ class ESTrainer(Trainer):
                 "Collected {} episodes {} timesteps so far this iter".format(
                     num_episodes, num_timesteps))
             rollout_ids = [
-                worker.do_rollouts.remote(theta_id) for worker in self._workers
+                worker.do_rollouts.remote(
+                    params_id, optimizer_state=optimizer_state_id)
+                for worker in self._workers
             ]
+            # The workers keep using these weights for the following rounds.
+            params_id, optimizer_state_id = None, None
             # Get the results of the rollouts.
             for result in ray.get(rollout_ids):
                 results.append(result)
@@ -378,6 +508,8 @@ class ESTrainer(Trainer):
     def __setstate__(self, state):
         self.episodes_so_far = state["episodes_so_far"]
         self.policy.set_flat_weights(state["weights"])
+        # Send the full restored weights on the next iteration.
+        self._last_update = None
         self.policy.observation_filter = state["filter"]
         FilterManager.synchronize({
             DEFAULT_POLICY_ID: self.policy.observation_filter
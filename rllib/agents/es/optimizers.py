@@ -10,6 +10,13 @@ class Optimizer:
         self.dim = policy.num_params
         self.t = 0
 
+    def get_state(self):
+        """Returns the optimizer state (all attributes but the policy)."""
+        return {k: v for k, v in self.__dict__.items() if k != "policy"}
+
+    def set_state(self, state):
+        self.__dict__.update(state)
+
     def update(self, globalg):
         self.t += 1
         step = self._compute_step(globalg)
@@ -1,11 +1,29 @@
+import numpy as np
 import unittest
 
 import ray
 import ray.rllib.agents.es as es
-from ray.rllib.utils.test_utils import check_compute_single_action, \
+from ray.rllib.agents.es import optimizers, utils
+from ray.rllib.agents.es.es import Aggregator, apply_compact_update, \
+    CompactUpdate, SharedNoiseTable, tree_weighted_noise_sum
+from ray.rllib.utils.test_utils import check, check_compute_single_action, \
     framework_iterator
 
 
+class _FlatWeightsPolicy:
+    """Stand-in for an ES policy, as far as the optimizers are concerned."""
+
+    def __init__(self, theta):
+        self.num_params = len(theta)
+        self.theta = theta
+
+    def get_flat_weights(self):
+        return self.theta
+
+    def set_flat_weights(self, theta):
+        self.theta = theta
+
+
 class TestES(unittest.TestCase):
     def test_es_compilation(self):
         """Test whether an ESTrainer can be built on all frameworks."""
@@ -21,8 +39,10 @@ class TestES(unittest.TestCase):
         # Test eval workers ("normal" Trainer eval WorkerSet).
         config["evaluation_interval"] = 1
         config["evaluation_num_workers"] = 2
+        # Test tree aggregation and compact weight updates (2nd iteration).
+        config["num_aggregation_workers"] = 2
 
-        num_iterations = 1
+        num_iterations = 2
 
         for _ in framework_iterator(config):
             plain_config = config.copy()
@@ -35,6 +55,63 @@ class TestES(unittest.TestCase):
             trainer.stop()
         ray.shutdown()
 
+    def test_compact_updates(self):
+        """Tests that workers rebuild the driver's weights from updates."""
+        rng = np.random.RandomState(0)
+        noise = SharedNoiseTable(rng.randn(10000).astype(np.float32))
+        dim = 50
+        theta = rng.randn(dim).astype(np.float32)
+        for make_optimizer, l2_coeff in [
+            (lambda p: optimizers.Adam(p, 0.01), 0.005),  # ES
+            (lambda p: optimizers.SGD(p, 0.02), 0.0),  # ARS
+        ]:
+            driver_policy = _FlatWeightsPolicy(theta)
+            driver_optimizer = make_optimizer(driver_policy)
+            worker_policy = _FlatWeightsPolicy(theta)
+            worker_optimizer = make_optimizer(worker_policy)
+            worker_optimizer.set_state(driver_optimizer.get_state())
+            driver_theta = worker_theta = theta
+            for _ in range(10):
+                noise_indices = rng.randint(0, 10000 - dim + 1, size=40)
+                weights = rng.randn(40).astype(np.float32)
+                # What the trainers do on the driver.
+                g = utils.weighted_noise_sum(noise.noise, noise_indices,
+                                             weights, dim)
+                driver_theta, _ = driver_optimizer.update(
+                    -g + l2_coeff * driver_theta)
+                driver_policy.set_flat_weights(driver_theta)
+                # What the workers do.
+                worker_theta = apply_compact_update(
+                    worker_policy, worker_optimizer, noise, worker_theta,
+                    CompactUpdate(noise_indices, weights, l2_coeff))
+                check(worker_theta, driver_theta)
+            check(worker_theta, theta, false=True)
+
+    def test_tree_weighted_noise_sum(self):
+        """Tests the tree aggregation against `utils.weighted_noise_sum`."""
+        ray.init(num_cpus=3)
+        rng = np.random.RandomState(0)
+        noise = rng.randn(10000).astype(np.float32)
+        noise_id = ray.put(noise)
+        dim = 50
+        noise_indices = rng.randint(0, 10000 - dim + 1, size=101)
+        weights = rng.randn(101).astype(np.float32)
+        expected = utils.weighted_noise_sum(noise, noise_indices, weights,
+                                            dim)
+        # An odd number of aggregators leaves an unpaired partial sum.
+        for num_aggregators in [1, 2, 3]:
+            aggregators = [
+                Aggregator.remote(noise_id) for _ in range(num_aggregators)
+            ]
+            check(
+                tree_weighted_noise_sum(aggregators, noise_indices, weights,
+                                        dim),
+                expected,
+                decimals=4)
+            for a in aggregators:
+                a.__ray_terminate__.remote()
+        ray.shutdown()
+
 
 if __name__ == "__main__":
     import pytest
@@ -3,6 +3,8 @@
 
 import numpy as np
 
+import ray
+
 
 def compute_ranks(x):
     """Returns ranks in [0, len(x))
@@ -46,3 +48,52 @@ def batched_weighted_sum(weights, vecs, batch_size):
             np.asarray(batch_vecs, dtype=np.float32))
         num_items_summed += len(batch_weights)
     return total, num_items_summed
+
+
+def weighted_noise_sum(noise, noise_indices, weights, dim, batch_size=500):
+    """Returns sum_i(weights[i] * noise[noise_indices[i]:][:dim]).
+
+    Vectorized version of `batched_weighted_sum` for slices of a noise
+    table: The slices are gathered `batch_size` at a time through a strided
+    (zero-copy) view of all length-`dim` windows of `noise`.
+    """
+    noise_indices = np.asarray(noise_indices, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float32)
+    assert noise_indices.shape == weights.shape and noise_indices.ndim == 1
+    stride = noise.strides[0]
+    windows = np.lib.stride_tricks.as_strided(
+        noise,
+        shape=(len(noise) - dim + 1, dim),
+        strides=(stride, stride),
+        writeable=False)
+    total = np.zeros(dim, dtype=np.float32)
+    for start in range(0, len(noise_indices), batch_size):
+        end = start + batch_size
+        total += np.dot(weights[start:end], windows[noise_indices[start:end]])
+    return total
+
+
+def get_worker_params(theta, last_update, optimizer, iteration, config):
+    """Returns what to send to the workers for them to get to `theta`.
+
+    Args:
+        theta (np.ndarray): The current flat weights.
+        last_update (Optional[CompactUpdate]): The update that led from the
+            workers' current weights to `theta` (if known).
+        optimizer (optimizers.Optimizer): The driver's optimizer.
+        iteration (int): The current training iteration.
+        config (TrainerConfigDict): The ES/ARS config.
+
+    Returns:
+        Tuple: The object store ID of either `theta` or a CompactUpdate,
+            the ID of the optimizer state to send along (if any) and the
+            size (in bytes) of the data to send to each worker.
+    """
+    if config["compact_weight_updates"] and last_update is not None and \
+            iteration % config["full_weights_sync_interval"] != 0:
+        return ray.put(last_update), None, \
+            last_update.noise_indices.nbytes + last_update.weights.nbytes
+    optimizer_state_id = None
+    if config["compact_weight_updates"]:
+        optimizer_state_id = ray.put(optimizer.get_state())
+    return ray.put(theta), optimizer_state_id, theta.nbytes
@@ -1,13 +1,19 @@
+import gym
+from types import SimpleNamespace
 import unittest
 
 import ray
 import ray.rllib.agents.impala as impala
-from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
-from ray.rllib.utils.framework import try_import_tf
+from ray.rllib.agents.impala.vtrace_torch_policy import VTraceTorchPolicy
+from ray.rllib.evaluation.rollout_worker import RolloutWorker
+from ray.rllib.execution.learner_thread import LearnerThread, _prepare_batch
+from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, SampleBatch
+from ray.rllib.utils.framework import try_import_tf, try_import_torch
 from ray.rllib.utils.test_utils import check, \
     check_compute_single_action, framework_iterator
 
 tf1, tf, tfv = try_import_tf()
+torch, _ = try_import_torch()
 
 
 class TestIMPALA(unittest.TestCase):
@@ -75,6 +81,73 @@ class TestIMPALA(unittest.TestCase):
             finally:
                 trainer.stop()
 
+    def test_learner_thread_loader(self):
+        """Tests whether the loader thread prepares batches for learning."""
+        config = impala.DEFAULT_CONFIG.copy()
+        config["framework"] = "torch"
+        config["num_gpus"] = 0
+        worker = RolloutWorker(
+            env_creator=lambda _: gym.make("CartPole-v0"),
+            policy_spec=VTraceTorchPolicy,
+            policy_config=config,
+            rollout_fragment_length=50)
+        learner = LearnerThread(
+            worker,
+            minibatch_buffer_size=1,
+            num_sgd_iter=1,
+            learner_queue_size=4,
+            learner_queue_timeout=30)
+        learner.start()
+        try:
+            for _ in range(3):
+                learner.inqueue.put(worker.sample())
+            for _ in range(3):
+                count, stats = learner.outqueue.get(timeout=30)
+                self.assertEqual(count, 50)
+                self.assertIn("policy_loss", stats[DEFAULT_POLICY_ID])
+        finally:
+            learner.stopped = True
+        # The loader thread notices `stopped` while waiting for batches.
+        learner.loader_thread.join(timeout=30)
+        self.assertFalse(learner.loader_thread.is_alive())
+        result = learner.add_learner_metrics({"info": {}})
+        timing = result["info"]["timing_breakdown"]
+        self.assertGreater(timing["learner_load_time_ms"], 0.0)
+        self.assertGreater(timing["learner_grad_time_ms"], 0.0)
+
+        # Batches get converted to torch tensors ahead of learning.
+        batch = _prepare_batch(worker, worker.sample())
+        self.assertTrue(torch.is_tensor(batch["obs"]))
+        self.assertTrue(batch.zero_padded)
+
+        # Errors of the loader thread are raised by the learner thread.
+        learner = LearnerThread(
+            worker,
+            minibatch_buffer_size=1,
+            num_sgd_iter=1,
+            learner_queue_size=4,
+            learner_queue_timeout=30)
+        learner.loader_thread.start()
+        try:
+            learner.inqueue.put("not a batch")
+            self.assertRaises(AttributeError, learner.step)
+        finally:
+            learner.stopped = True
+        learner.loader_thread.join(timeout=30)
+        self.assertFalse(learner.loader_thread.is_alive())
+
+    def test_prepare_lazy_batch(self):
+        """Tests whether lazily concatenated batches get concatenated."""
+        policy = SimpleNamespace(prepare_batch_for_learning=lambda b: b)
+        worker = SimpleNamespace(
+            policy_map={DEFAULT_POLICY_ID: policy},
+            policies_to_train=[DEFAULT_POLICY_ID])
+        batches = [SampleBatch({"rewards": [i, i + 1]}) for i in range(0, 4, 2)]
+        batch = _prepare_batch(
+            worker, SampleBatch.concat_samples(batches, lazy=True))
+        # Not yet concatenated columns would be None.
+        check(dict.__getitem__(batch, "rewards"), [0, 1, 2, 3])
+
 
 if __name__ == "__main__":
     import pytest
@@ -14,16 +14,21 @@ from typing import Optional, Type
 
 from ray.rllib.agents import with_common_config
 from ray.rllib.agents.ppo.ppo_tf_policy import PPOTFPolicy
+from ray.rllib.agents.trainer import Trainer
 from ray.rllib.agents.trainer_template import build_trainer
 from ray.rllib.evaluation.worker_set import WorkerSet
 from ray.rllib.execution.rollout_ops import ParallelRollouts, ConcatBatches, \
     StandardizeFields, SelectExperiences
-from ray.rllib.execution.train_ops import TrainOneStep, TrainTFMultiGPU
+from ray.rllib.execution.train_ops import TrainOneStep, TrainTFMultiGPU, \
+    TrainTorchDataParallel
 from ray.rllib.execution.metric_ops import StandardMetricsReporting
 from ray.rllib.policy.policy import LEARNER_STATS_KEY, Policy
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
+from ray.rllib.utils.annotations import override
 from ray.rllib.utils.deprecation import DEPRECATED_VALUE
 from ray.rllib.utils.typing import TrainerConfigDict
+from ray.tune.trainable import Trainable
+from ray.tune.utils.placement_groups import PlacementGroupFactory
 from ray.util.iter import LocalIterator
 
 logger = logging.getLogger(__name__)
@@ -86,6 +91,11 @@ DEFAULT_CONFIG = with_common_config({
     "batch_mode": "truncate_episodes",
     # Which observation filter to apply to the observation.
     "observation_filter": "NoFilter",
+    # Number of (single CPU) learner processes to run SGD in, data-parallel,
+    # all-reducing gradients via a gloo collective group (requires
+    # `pygloo`). 0 for learning in the trainer process itself. Only
+    # supported for framework=torch.
+    "num_torch_learners": 0,
 
     # Deprecated keys:
     # Share layers for value function. If you set this to True, it's important
@@ -98,6 +108,46 @@ DEFAULT_CONFIG = with_common_config({
 # yapf: enable
 
 
+class OverrideDefaultResourceRequest:
+    @classmethod
+    @override(Trainable)
+    def default_resource_request(cls, config):
+        cf = dict(cls._default_config, **config)
+        Trainer._validate_config(cf)
+
+        eval_config = cf["evaluation_config"]
+
+        # Return PlacementGroupFactory containing all needed resources
+        # (already properly defined as device bundles).
+        return PlacementGroupFactory(
+            bundles=[{
+                # Driver.
+                "CPU": cf["num_cpus_for_driver"],
+                "GPU": cf["num_gpus"],
+            }] + [
+                {
+                    # RolloutWorkers.
+                    "CPU": cf["num_cpus_per_worker"],
+                    "GPU": cf["num_gpus_per_worker"],
+                } for _ in range(cf["num_workers"])
+            ] + [
+                {
+                    # Torch (data-parallel) learners.
+                    "CPU": 1,
+                } for _ in range(cf["num_torch_learners"])
+            ] + ([
+                {
+                    # Evaluation workers.
+                    # Note: The local eval worker is located on the driver CPU.
+                    "CPU": eval_config.get("num_cpus_per_worker",
+                                           cf["num_cpus_per_worker"]),
+                    "GPU": eval_config.get("num_gpus_per_worker",
+                                           cf["num_gpus_per_worker"]),
+                } for _ in range(cf["evaluation_num_workers"])
+            ] if cf["evaluation_interval"] else []),
+            strategy=config.get("placement_strategy", "PACK"))
+
+
 def validate_config(config: TrainerConfigDict) -> None:
     """Validates the Trainer's config dict.
 
@@ -132,6 +182,21 @@ def validate_config(config: TrainerConfigDict) -> None:
             "function (to estimate the return at the end of the truncated "
             "trajectory). Consider setting batch_mode=complete_episodes.")
 
+    # Data-parallel torch learners.
+    if config["num_torch_learners"] > 0:
+        if config["framework"] != "torch":
+            raise ValueError("`num_torch_learners` > 0 requires "
+                             "framework=torch!")
+        if config["model"].get("use_lstm") or \
+                config["model"].get("use_attention"):
+            raise ValueError("`num_torch_learners` > 0 does not support "
+                             "recurrent models yet!")
+        if config["sgd_minibatch_size"] < config["num_torch_learners"]:
+            raise ValueError("`sgd_minibatch_size` ({}) must be >= "
+                             "`num_torch_learners` ({}).".format(
+                                 config["sgd_minibatch_size"],
+                                 config["num_torch_learners"]))
+
     # Multi-agent mode and multi-GPU optimizer.
     if config["multiagent"]["policies"] and not config["simple_optimizer"]:
         logger.info(
@@ -164,8 +229,9 @@ class UpdateKL:
     defined in ppo_[tf|torch]_policy.py.
     """
 
-    def __init__(self, workers):
+    def __init__(self, workers, learner_group=None):
         self.workers = workers
+        self.learner_group = learner_group
 
     def __call__(self, fetches):
         def update(pi, pi_id):
@@ -183,6 +249,10 @@ class UpdateKL:
         # Update KL on all trainable policies within the local (trainer)
         # Worker.
         self.workers.local_worker().foreach_trainable_policy(update)
+        # Keep the learner processes' KL coefficients in sync (these are not
+        # part of the policies' weights).
+        if self.learner_group is not None:
+            self.learner_group.foreach_policy(update)
 
 
 def warn_about_bad_reward_scales(config, result):
@@ -252,7 +322,16 @@ def execution_plan(workers: WorkerSet,
     rollouts = rollouts.for_each(StandardizeFields(["advantages"]))
 
     # Perform one training step on the combined + standardized batch.
-    if config["simple_optimizer"]:
+    learner_group = None
+    if config["num_torch_learners"] > 0:
+        train_step = TrainTorchDataParallel(
+            workers=workers,
+            num_learners=config["num_torch_learners"],
+            sgd_minibatch_size=config["sgd_minibatch_size"],
+            num_sgd_iter=config["num_sgd_iter"])
+        learner_group = train_step.learner_group
+        train_op = rollouts.for_each(train_step)
+    elif config["simple_optimizer"]:
         train_op = rollouts.for_each(
             TrainOneStep(
                 workers,
@@ -270,7 +349,8 @@ def execution_plan(workers: WorkerSet,
                 framework=config.get("framework")))
 
     # Update KL after each round of training.
-    train_op = train_op.for_each(lambda t: t[1]).for_each(UpdateKL(workers))
+    train_op = train_op.for_each(lambda t: t[1]).for_each(
+        UpdateKL(workers, learner_group))
 
     # Warn about bad reward scales and return training metrics.
     return StandardMetricsReporting(train_op, workers, config) \
@@ -286,4 +366,5 @@ PPOTrainer = build_trainer(
     default_policy=PPOTFPolicy,
     get_policy_class=get_policy_class,
     execution_plan=execution_plan,
+    mixins=[OverrideDefaultResourceRequest],
 )
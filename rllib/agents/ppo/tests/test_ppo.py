@@ -1,23 +1,28 @@
 import copy
+import gym
 import numpy as np
+import threading
 import unittest
+from unittest import mock
 
 import ray
 from ray.rllib.agents.callbacks import DefaultCallbacks
 import ray.rllib.agents.ppo as ppo
 from ray.rllib.agents.ppo.ppo_tf_policy import ppo_surrogate_loss as \
     ppo_surrogate_loss_tf
-from ray.rllib.agents.ppo.ppo_torch_policy import ppo_surrogate_loss as \
-    ppo_surrogate_loss_torch
+from ray.rllib.agents.ppo.ppo_torch_policy import PPOTorchPolicy, \
+    ppo_surrogate_loss as ppo_surrogate_loss_torch
 from ray.rllib.evaluation.postprocessing import compute_gae_for_sample_batch, \
     Postprocessing
+from ray.rllib.execution.torch_data_parallel import TorchLearner
 from ray.rllib.models.tf.tf_action_dist import Categorical
 from ray.rllib.models.torch.torch_modelv2 import TorchModelV2
 from ray.rllib.models.torch.torch_action_dist import TorchCategorical
-from ray.rllib.policy.sample_batch import SampleBatch
+from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, SampleBatch
 from ray.rllib.utils.numpy import fc
 from ray.rllib.utils.test_utils import check, framework_iterator, \
     check_compute_single_action
+from ray.util import collective
 
 # Fake CartPole episode of n time steps.
 FAKE_BATCH = SampleBatch({
@@ -138,6 +143,104 @@ class TestPPO(unittest.TestCase):
                 "PPO multi-GPU (with fake-GPUs) did not learn CartPole!"
             trainer.stop()
 
+    @unittest.skipIf(not collective.gloo_available(), "pygloo not installed")
+    def test_ppo_torch_data_parallel_learning(self):
+        """Test whether PPOTrainer can learn CartPole w/ 2 torch learners."""
+        config = copy.deepcopy(ppo.DEFAULT_CONFIG)
+        config["framework"] = "torch"
+        config["num_torch_learners"] = 2
+        config["num_workers"] = 1
+        config["lr"] = 0.0003
+        config["observation_filter"] = "MeanStdFilter"
+        config["num_sgd_iter"] = 6
+        config["vf_loss_coeff"] = 0.01
+        config["model"]["fcnet_hiddens"] = [32]
+        config["model"]["fcnet_activation"] = "linear"
+        config["model"]["vf_share_layers"] = True
+
+        trainer = ppo.PPOTrainer(config=config, env="CartPole-v0")
+        learnt = False
+        for i in range(200):
+            results = trainer.train()
+            print(results)
+            if results["episode_reward_mean"] > 65.0:
+                learnt = True
+                break
+        assert learnt, "PPO w/ torch data-parallel learners did not learn!"
+        trainer.stop()
+
+    def test_ppo_torch_data_parallel_sharding(self):
+        """Tests the torch learners' minibatch sharding and grad averaging.
+
+        Uses an in-process allreduce (instead of gloo) between learner
+        threads: 2 learners must end up with the same weights as 1 learner.
+        """
+        config = copy.deepcopy(ppo.DEFAULT_CONFIG)
+        config["framework"] = "torch"
+        config["model"]["fcnet_hiddens"] = [10]
+        env = gym.make("CartPole-v0")
+        policy_specs = {
+            DEFAULT_POLICY_ID: (PPOTorchPolicy, env.observation_space,
+                                env.action_space, config)
+        }
+        policy = PPOTorchPolicy(env.observation_space, env.action_space,
+                                config)
+        batch = SampleBatch.concat_samples(
+            [compute_gae_for_sample_batch(policy, FAKE_BATCH.copy())] * 4)
+        weights = {DEFAULT_POLICY_ID: policy.get_weights()}
+
+        def learn(num_learners):
+            barrier = threading.Barrier(num_learners)
+            tensors = []
+
+            def allreduce(tensor, group_name):
+                barrier.wait()
+                tensors.append(tensor.clone())
+                barrier.wait()
+                tensor.copy_(sum(tensors))
+                if barrier.wait() == 0:
+                    tensors.clear()
+
+            with mock.patch.object(collective, "init_collective_group"), \
+                    mock.patch.object(collective, "allreduce",
+                                      side_effect=allreduce) as allreduce_:
+                learners = [
+                    TorchLearner(policy_specs, rank, num_learners, "test")
+                    for rank in range(num_learners)
+                ]
+                results = [None] * num_learners
+
+                def run(rank):
+                    results[rank] = learners[rank].learn(
+                        batch, weights, {"timestep": 0}, num_sgd_iter=2,
+                        sgd_minibatch_size=4, seed=0)
+
+                threads = [
+                    threading.Thread(target=run, args=(rank, ))
+                    for rank in range(num_learners)
+                ]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+            # 3 minibatches (of 4 rows, 2 per learner) per SGD iteration.
+            self.assertEqual(allreduce_.call_count, num_learners * 2 * 3)
+            # Only rank 0 returns its weights.
+            self.assertTrue(all(r[1] is None for r in results[1:]))
+            return results[0][1][DEFAULT_POLICY_ID], [
+                learner.policy_map[DEFAULT_POLICY_ID].get_weights()
+                for learner in learners
+            ]
+
+        single, _ = learn(1)
+        parallel, learner_weights = learn(2)
+        self.assertFalse(
+            all(
+                np.allclose(single[k], weights[DEFAULT_POLICY_ID][k])
+                for k in single))
+        check(parallel, single, rtol=1e-4)
+        check(learner_weights[1], learner_weights[0])
+
     def test_ppo_exploration_setup(self):
         """Tests, whether PPO runs with different exploration setups."""
         config = copy.deepcopy(ppo.DEFAULT_CONFIG)
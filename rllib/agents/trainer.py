@@ -252,12 +252,27 @@ COMMON_CONFIG: TrainerConfigDict = {
     # The SampleCollector class to be used to collect and retrieve
     # environment-, model-, and sampler data. Override the SampleCollector base
     # class to implement your own collection/buffering/retrieval logic.
+    # Use `PreallocatedCollector` (from
+    # ray.rllib.evaluation.collectors.preallocated_collector) for vectorized
+    # envs with many sub-envs: It writes into preallocated numpy buffers
+    # instead of per-agent lists.
     "sample_collector": SimpleListCollector,
+    # Experimental: Whether to sample single-agent VectorEnvs with a single,
+    # non-recurrent policy (and a SimpleListCollector) through a vectorized
+    # fast path, which computes the actions for all sub-envs on one
+    # contiguous obs array (see rllib/benchmarks/sampler_fast_path.py for
+    # its speedup with many sub-envs). By default, the generic sampling loop
+    # is used.
+    "vectorized_sampling": False,
 
     # Element-wise observation filter, either "NoFilter" or "MeanStdFilter".
     "observation_filter": "NoFilter",
     # Whether to synchronize the statistics of remote filters.
     "synchronize_filters": True,
+    # Synchronize the (observation) filters of the workers only every n-th
+    # training iteration. The statistics of the local worker's filters then
+    # lag behind by up to n-1 iterations.
+    "filter_sync_interval": 1,
     # Configures TF for single-process operation by default.
     "tf_session_args": {
         # note: overridden by `local_tf_session_args`
@@ -281,6 +296,18 @@ COMMON_CONFIG: TrainerConfigDict = {
     },
     # Whether to LZ4 compress individual observations
     "compress_observations": False,
+    # Whether to only send the weight tensors that changed since the last
+    # weights sync to the remote workers. Workers that already hold the
+    # current weights are skipped entirely. This requires the driver to keep
+    # a copy of the last synced weights and to compare against it.
+    "weights_sync_delta": False,
+    # If set (e.g. to "float16"), cast floating point weights to this dtype
+    # before sending them to the remote workers, which cast them back.
+    "weights_sync_dtype": None,
+    # If > 0, the driver only sends weights to this many remote workers,
+    # each of which relays them to this many other workers, and so on
+    # (instead of the driver sending them to every remote worker).
+    "weights_sync_fanout": 0,
     # Wait for metric batches for at most this many seconds. Those that
     # have not returned in time will be collected in the next train iteration.
     "collect_metrics_timeout": 180,
@@ -290,6 +317,11 @@ COMMON_CONFIG: TrainerConfigDict = {
     # remote processes instead of in the same worker. This adds overheads, but
     # can make sense if your envs can take much time to step / reset
     # (e.g., for StarCraft). Use this cautiously; overheads are significant.
+    # Set to "subprocess" to instead step (single-agent gym) envs in
+    # (spawned) subprocesses of the worker that share an observation buffer
+    # with it.
+    # This has much lower overheads than one Ray actor per env and lets a
+    # single worker use all cores for CPU-heavy simulators.
     "remote_worker_envs": False,
     # Timeout that remote workers are waiting when polling environments.
     # 0 (continue when at least one env is ready) is a reasonable default,
@@ -371,6 +403,14 @@ COMMON_CONFIG: TrainerConfigDict = {
     # policy, not the *behavior* policy, which is typically undesirable for
     # on-policy algorithms.
     "postprocess_inputs": False,
+    # If positive, read, parse and decompress input batches on this many
+    # background threads (each with its own reader) into a bounded queue of
+    # `input_prefetch_queue_size` batches, so that training does not block
+    # on I/O. Only applies to file inputs (glob expressions or file lists).
+    # Queue depth and read throughput are reported under "input_reader" in
+    # the training results.
+    "input_prefetch_num_threads": 0,
+    "input_prefetch_queue_size": 16,
     # If positive, input batches will be shuffled via a sliding window buffer
     # of this number of batches. Use this if the input data is not in random
     # enough order. Input is delayed until the shuffle buffer is filled.
@@ -606,7 +646,8 @@ class Trainer(Trainable):
         if result is None:
             raise RuntimeError("Failed to recover from worker crash")
 
-        if hasattr(self, "workers") and isinstance(self.workers, WorkerSet):
+        if hasattr(self, "workers") and isinstance(self.workers, WorkerSet) \
+                and self.iteration % self.config["filter_sync_interval"] == 0:
             self._sync_filters_if_needed(self.workers)
 
         return result
@@ -1200,6 +1241,11 @@ class Trainer(Trainable):
             model_config["lstm_use_prev_action"] = prev_a_r
             model_config["lstm_use_prev_reward"] = prev_a_r
 
+        if config["filter_sync_interval"] < 1:
+            raise ValueError(
+                "`filter_sync_interval` must be >= 1! Got {}".format(
+                    config["filter_sync_interval"]))
+
         # Check batching/sample collection settings.
         if config["batch_mode"] not in [
                 "truncate_episodes", "complete_episodes"
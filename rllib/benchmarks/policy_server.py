@@ -0,0 +1,79 @@
+"""Benchmark of PolicyClient/PolicyServerInput throughput.
+
+Starts a policy server (in this process) for each transport and measures
+how many remote-inference CartPole steps (`get_action()` +
+`log_returns()`) a single client achieves per second.
+
+Example:
+    $ python policy_server.py --transports=http,tcp --duration=10
+"""
+
+import argparse
+import gym
+import time
+
+import ray
+from ray.rllib.agents.pg import DEFAULT_CONFIG, PGTFPolicy, PGTorchPolicy
+from ray.rllib.env.policy_client import PolicyClient
+from ray.rllib.env.policy_server_input import PolicyServerInput
+from ray.rllib.evaluation.rollout_worker import RolloutWorker
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--framework", choices=["tf", "tfe", "tf2", "torch"], default="torch")
+parser.add_argument(
+    "--transports",
+    type=str,
+    default="http,tcp",
+    help="Comma separated list of transports to benchmark.")
+parser.add_argument("--port", type=int, default=9900)
+parser.add_argument(
+    "--duration",
+    type=float,
+    default=5.0,
+    help="Seconds to run the client for per transport.")
+
+
+def actions_per_second(transport, port, args):
+    config = DEFAULT_CONFIG.copy()
+    config["framework"] = args.framework
+    server_worker = RolloutWorker(
+        env_creator=lambda _: gym.make("CartPole-v0"),
+        policy_spec=PGTorchPolicy
+        if args.framework == "torch" else PGTFPolicy,
+        policy_config=config,
+        input_creator=lambda ioctx: PolicyServerInput(
+            ioctx, "localhost", port, transport=transport))
+    client = PolicyClient(
+        "http://localhost:{}".format(port),
+        inference_mode="remote",
+        transport=transport)
+
+    env = gym.make("CartPole-v0")
+    eid = client.start_episode()
+    obs = env.reset()
+    steps = 0
+    start = time.time()
+    while time.time() - start < args.duration:
+        action = client.get_action(eid, obs)
+        obs, reward, done, info = env.step(action)
+        client.log_returns(eid, reward, info=info)
+        steps += 1
+        if done:
+            client.end_episode(eid, obs)
+            obs = env.reset()
+            eid = client.start_episode()
+    result = steps / (time.time() - start)
+    server_worker.input_reader.shutdown()
+    server_worker.input_reader.server_close()
+    return result
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    ray.init()
+
+    print("{:>10} {:>14}".format("transport", "actions/s"))
+    for i, transport in enumerate(args.transports.split(",")):
+        print("{:>10} {:>14.0f}".format(
+            transport, actions_per_second(transport, args.port + i, args)))
@@ -0,0 +1,130 @@
+"""Benchmark of `chop_into_sequences` (RNN sequence padding).
+
+Compares the vectorized implementation in `rllib/policy/rnn_sequencing.py`
+against the previous per-timestep python loop (reproduced below) on
+synthetic train batches of different sizes and max_seq_lens.
+
+Example:
+    $ python rnn_sequencing.py --batch-sizes=4000,32000 --max-seq-lens=20
+"""
+
+import argparse
+import numpy as np
+import time
+
+from ray.rllib.policy.rnn_sequencing import chop_into_sequences
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--batch-sizes",
+    type=str,
+    default="1000,4000,16000,64000",
+    help="Comma separated list of train batch sizes (timesteps).")
+parser.add_argument(
+    "--max-seq-lens",
+    type=str,
+    default="1,20,100",
+    help="Comma separated list of max_seq_len settings.")
+parser.add_argument(
+    "--obs-dim", type=int, default=64, help="Size of the observations.")
+parser.add_argument(
+    "--episode-len",
+    type=int,
+    default=200,
+    help="Mean episode length in the synthetic batches.")
+parser.add_argument(
+    "--repeat", type=int, default=5, help="Timed runs per setting.")
+
+
+def loop_chop_into_sequences(feature_columns, state_columns, max_seq_len,
+                             episode_ids, unroll_ids, agent_indices):
+    """The previous, loop based implementation (without shuffling)."""
+    prev_id = None
+    seq_lens = []
+    seq_len = 0
+    unique_ids = np.add(
+        np.add(episode_ids, agent_indices),
+        np.array(unroll_ids, dtype=np.int64) << 32)
+    for uid in unique_ids:
+        if (prev_id is not None and uid != prev_id) or \
+                seq_len >= max_seq_len:
+            seq_lens.append(seq_len)
+            seq_len = 0
+        seq_len += 1
+        prev_id = uid
+    if seq_len:
+        seq_lens.append(seq_len)
+    seq_lens = np.array(seq_lens, dtype=np.int32)
+    max_seq_len = max(seq_lens)
+
+    feature_sequences = []
+    for f in feature_columns:
+        length = len(seq_lens) * max_seq_len
+        f_pad = np.zeros((length, ) + np.shape(f)[1:], dtype=f.dtype)
+        seq_base = 0
+        i = 0
+        for len_ in seq_lens:
+            for seq_offset in range(len_):
+                f_pad[seq_base + seq_offset] = f[i]
+                i += 1
+            seq_base += max_seq_len
+        feature_sequences.append(f_pad)
+
+    initial_states = []
+    for s in state_columns:
+        s_init = []
+        i = 0
+        for len_ in seq_lens:
+            s_init.append(s[i])
+            i += len_
+        initial_states.append(np.array(s_init))
+    return feature_sequences, initial_states, seq_lens
+
+
+def make_batch(batch_size, args):
+    episode_lens = np.random.geometric(1.0 / args.episode_len, batch_size)
+    episode_ids = np.repeat(
+        np.arange(batch_size), episode_lens)[:batch_size].astype(np.int64)
+    return {
+        "feature_columns": [
+            np.random.random((batch_size, args.obs_dim)).astype(np.float32),
+            np.random.randint(0, 4, batch_size),
+            np.random.random(batch_size).astype(np.float32),
+            np.random.random(batch_size) < 0.01,
+        ],
+        "state_columns": [
+            np.random.random((batch_size, 256)).astype(np.float32),
+            np.random.random((batch_size, 256)).astype(np.float32),
+        ],
+        "episode_ids": episode_ids,
+        "unroll_ids": np.zeros(batch_size, dtype=np.int64),
+        "agent_indices": np.zeros(batch_size, dtype=np.int64),
+    }
+
+
+def time_ms(fn, repeat):
+    fn()  # Warm-up.
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    print("{:>10} {:>11} {:>10} {:>16} {:>8}".format(
+        "batch_size", "max_seq_len", "loop (ms)", "vectorized (ms)",
+        "speedup"))
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        batch = make_batch(batch_size, args)
+        for max_seq_len in [int(m) for m in args.max_seq_lens.split(",")]:
+            loop = time_ms(
+                lambda: loop_chop_into_sequences(
+                    max_seq_len=max_seq_len, **batch), args.repeat)
+            vectorized = time_ms(
+                lambda: chop_into_sequences(
+                    max_seq_len=max_seq_len, **batch), args.repeat)
+            print("{:>10} {:>11} {:>10.2f} {:>16.2f} {:>7.1f}x".format(
+                batch_size, max_seq_len, loop, vectorized,
+                loop / vectorized))
@@ -0,0 +1,259 @@
+"""Algorithm-independent throughput benchmarks of RLlib's components.
+
+Measures on a single node (independent of any algorithm's convergence):
+- sampler: env steps/s of a local RolloutWorker (sync and async sampler)
+  per envs-per-worker setting.
+- workers: env steps/s of n remote RolloutWorkers sampling in parallel.
+- inference: policy inference time per `compute_actions()` batch size.
+- postprocessing: `postprocess_trajectory()` time per sample batch.
+- replay: (prioritized) replay buffer add and sample rates in timesteps/s.
+- learner: SGD steps (`learn_on_batch()` calls) and timesteps per second.
+
+All results are written as a single JSON document, e.g. for tracking
+regressions across releases.
+
+Example:
+    $ python throughput.py --framework=torch --output=/tmp/rllib_perf.json
+"""
+
+import argparse
+import gym
+import json
+import os
+import platform
+import sys
+import time
+
+import ray
+from ray.rllib.agents.pg import DEFAULT_CONFIG, PGTFPolicy, PGTorchPolicy
+from ray.rllib.evaluation.rollout_worker import RolloutWorker
+from ray.rllib.execution.replay_buffer import LocalReplayBuffer
+from ray.rllib.policy.sample_batch import SampleBatch
+
+BENCHMARKS = [
+    "sampler", "workers", "inference", "postprocessing", "replay", "learner"
+]
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--framework", choices=["tf", "tfe", "tf2", "torch"], default="torch")
+parser.add_argument("--env", type=str, default="CartPole-v0")
+parser.add_argument(
+    "--benchmarks",
+    type=str,
+    default=",".join(BENCHMARKS),
+    help="Comma separated list of benchmarks to run.")
+parser.add_argument(
+    "--num-envs",
+    type=str,
+    default="1,8,64",
+    help="Comma separated list of envs-per-worker settings (also used as "
+    "inference batch sizes).")
+parser.add_argument(
+    "--num-workers",
+    type=str,
+    default="1,2,4",
+    help="Comma separated list of remote worker counts.")
+parser.add_argument(
+    "--rollout-fragment-length",
+    type=int,
+    default=200,
+    help="Env steps per env per `sample()` call.")
+parser.add_argument("--train-batch-size", type=int, default=4000)
+parser.add_argument("--replay-batch-size", type=int, default=32)
+parser.add_argument(
+    "--duration",
+    type=float,
+    default=5.0,
+    help="Seconds to run each single measurement for.")
+parser.add_argument(
+    "--output",
+    type=str,
+    default=None,
+    help="JSON file to write the results to (default: stdout).")
+
+
+def run_for(fn, duration):
+    """Calls `fn()` (returning a number of units) for `duration` seconds.
+
+    Returns:
+        Tuple[float, float]: The calls per second and units per second.
+    """
+    fn()  # Warm-up.
+    calls = units = 0
+    start = time.time()
+    while time.time() - start < duration:
+        units += fn()
+        calls += 1
+    elapsed = time.time() - start
+    return calls / elapsed, units / elapsed
+
+
+def worker_kwargs(args, num_envs=1, sample_async=False):
+    config = DEFAULT_CONFIG.copy()
+    config["framework"] = args.framework
+    return dict(
+        env_creator=lambda _: gym.make(args.env),
+        policy_spec=PGTorchPolicy
+        if args.framework == "torch" else PGTFPolicy,
+        policy_config=config,
+        rollout_fragment_length=args.rollout_fragment_length,
+        batch_mode="truncate_episodes",
+        num_envs=num_envs,
+        sample_async=sample_async)
+
+
+def bench_sampler(args):
+    results = []
+    for num_envs in args.num_envs:
+        for sample_async in [False, True]:
+            worker = RolloutWorker(
+                **worker_kwargs(args, num_envs, sample_async))
+            _, steps_per_sec = run_for(lambda: worker.sample().count,
+                                       args.duration)
+            worker.stop()
+            results.append({
+                "num_envs": num_envs,
+                "sampler": "async" if sample_async else "sync",
+                "env_steps_per_sec": steps_per_sec,
+            })
+    return results
+
+
+def bench_workers(args):
+    results = []
+    cls = RolloutWorker.as_remote()
+    for num_workers in args.num_workers:
+        workers = [
+            cls.remote(**worker_kwargs(args)) for _ in range(num_workers)
+        ]
+        _, steps_per_sec = run_for(
+            lambda: sum(b.count for b in ray.get(
+                [w.sample.remote() for w in workers])), args.duration)
+        for w in workers:
+            w.stop.remote()
+            w.__ray_terminate__.remote()
+        results.append({
+            "num_workers": num_workers,
+            "env_steps_per_sec": steps_per_sec,
+        })
+    return results
+
+
+def bench_inference(args, worker, batch):
+    policy = worker.get_policy()
+    results = []
+    for batch_size in args.num_envs:
+        obs = batch[SampleBatch.OBS][:batch_size]
+        calls_per_sec, _ = run_for(
+            lambda: policy.compute_actions(obs)[0].shape[0], args.duration)
+        results.append({
+            "batch_size": batch_size,
+            "mean_inference_ms": 1000 / calls_per_sec,
+        })
+    return results
+
+
+def bench_postprocessing(args, worker, batch):
+    policy = worker.get_policy()
+    calls_per_sec, steps_per_sec = run_for(
+        lambda: policy.postprocess_trajectory(batch.copy()).count,
+        args.duration)
+    return {
+        "batch_size": batch.count,
+        "mean_postprocessing_ms": 1000 / calls_per_sec,
+        "timesteps_per_sec": steps_per_sec,
+    }
+
+
+def bench_replay(args, batch):
+    buffer = LocalReplayBuffer(
+        learning_starts=0,
+        buffer_size=100000,
+        replay_batch_size=args.replay_batch_size)
+
+    def add():
+        buffer.add_batch(batch)
+        return batch.count
+
+    _, add_per_sec = run_for(add, args.duration)
+    _, sample_per_sec = run_for(lambda: buffer.replay().count, args.duration)
+    return {
+        "replay_batch_size": args.replay_batch_size,
+        "add_timesteps_per_sec": add_per_sec,
+        "sample_timesteps_per_sec": sample_per_sec,
+    }
+
+
+def bench_learner(args, worker, batch):
+    policy = worker.get_policy()
+
+    def learn():
+        policy.learn_on_batch(batch.copy())
+        return batch.count
+
+    sgd_steps_per_sec, steps_per_sec = run_for(learn, args.duration)
+    return {
+        "train_batch_size": batch.count,
+        "sgd_steps_per_sec": sgd_steps_per_sec,
+        "timesteps_per_sec": steps_per_sec,
+    }
+
+
+def main(args):
+    results = {
+        "meta": {
+            "ray_version": ray.__version__,
+            "ray_commit": getattr(ray, "__commit__", None),
+            "python_version": platform.python_version(),
+            "framework": args.framework,
+            "env": args.env,
+            "node": platform.node(),
+            "num_cpus": os.cpu_count(),
+            "duration_s": args.duration,
+            "timestamp": time.time(),
+        },
+    }
+    if "sampler" in args.benchmarks:
+        results["sampler"] = bench_sampler(args)
+    if "workers" in args.benchmarks:
+        ray.init(num_cpus=max(args.num_workers) + 1)
+        try:
+            results["workers"] = bench_workers(args)
+        finally:
+            ray.shutdown()
+
+    worker = RolloutWorker(**worker_kwargs(args))
+    batch = worker.sample()
+    while batch.count < args.train_batch_size:
+        batch = SampleBatch.concat_samples([batch, worker.sample()])
+    batch = batch.slice(0, args.train_batch_size)
+    if "inference" in args.benchmarks:
+        results["inference"] = bench_inference(args, worker, batch)
+    if "postprocessing" in args.benchmarks:
+        results["postprocessing"] = bench_postprocessing(
+            args, worker, batch.slice(0, args.rollout_fragment_length))
+    if "replay" in args.benchmarks:
+        results["replay"] = bench_replay(args, batch)
+    if "learner" in args.benchmarks:
+        results["learner"] = bench_learner(args, worker, batch)
+    worker.stop()
+    return results
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    args.benchmarks = args.benchmarks.split(",")
+    args.num_envs = [int(n) for n in args.num_envs.split(",")]
+    args.num_workers = [int(n) for n in args.num_workers.split(",")]
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error("Unknown benchmark(s): {}".format(sorted(unknown)))
+
+    results = main(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
@@ -6,6 +6,7 @@ from ray.rllib.env.multi_agent_env import MultiAgentEnv
 from ray.rllib.env.policy_client import PolicyClient
 from ray.rllib.env.policy_server_input import PolicyServerInput
 from ray.rllib.env.remote_vector_env import RemoteVectorEnv
+from ray.rllib.env.subproc_vector_env import SubprocVectorEnv
 from ray.rllib.env.vector_env import VectorEnv
 
 from ray.rllib.env.wrappers.dm_env_wrapper import DMEnv
@@ -27,6 +28,7 @@ __all__ = [
     "PolicyClient",
     "PolicyServerInput",
     "RemoteVectorEnv",
+    "SubprocVectorEnv",
     "Unity3DEnv",
     "VectorEnv",
 ]
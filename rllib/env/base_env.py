@@ -1,4 +1,5 @@
-from typing import Callable, Tuple, Optional, List, Dict, Any, TYPE_CHECKING
+from typing import Callable, Tuple, Optional, List, Dict, Any, \
+    TYPE_CHECKING, Union
 
 from ray.rllib.env.external_env import ExternalEnv
 from ray.rllib.env.external_multi_agent_env import ExternalMultiAgentEnv
@@ -84,21 +85,38 @@ class BaseEnv:
             env: EnvType,
             make_env: Callable[[int], EnvType] = None,
             num_envs: int = 1,
-            remote_envs: bool = False,
+            remote_envs: Union[bool, str] = False,
             remote_env_batch_wait_ms: int = 0,
             policy_config: PartialTrainerConfigDict = None,
     ) -> "BaseEnv":
-        """Wraps any env type as needed to expose the async interface."""
+        """Wraps any env type as needed to expose the async interface.
+
+        If `remote_envs` is True, sub-envs are created as Ray actors (see
+        RemoteVectorEnv). If it is "subprocess", gym sub-envs are stepped in
+        subprocesses sharing an observation buffer with this process (see
+        SubprocVectorEnv).
+        """
 
         from ray.rllib.env.remote_vector_env import RemoteVectorEnv
+        from ray.rllib.env.subproc_vector_env import SubprocVectorEnv
         if remote_envs and num_envs == 1:
             raise ValueError(
                 "Remote envs only make sense to use if num_envs > 1 "
                 "(i.e. vectorization is enabled).")
 
+        if remote_envs not in [False, True, "subprocess"]:
+            raise ValueError(
+                "`remote_envs` must be one of False, True or 'subprocess', "
+                "got {}!".format(remote_envs))
+
         if not isinstance(env, BaseEnv):
             if isinstance(env, MultiAgentEnv):
-                if remote_envs:
+                if remote_envs == "subprocess":
+                    raise ValueError(
+                        "`remote_envs=subprocess` is only supported for "
+                        "single-agent gym envs; use `remote_envs=True` for "
+                        "MultiAgentEnvs.")
+                elif remote_envs:
                     env = RemoteVectorEnv(
                         make_env,
                         num_envs,
@@ -120,7 +138,18 @@ class BaseEnv:
             elif isinstance(env, VectorEnv):
                 env = _VectorEnvToBaseEnv(env)
             else:
-                if remote_envs:
+                if remote_envs == "subprocess":
+                    vector_env = SubprocVectorEnv(
+                        make_env,
+                        num_envs,
+                        observation_space=env.observation_space,
+                        action_space=env.action_space)
+                    # All sub-envs live in the subprocesses: The given env
+                    # was only needed for its spaces.
+                    if hasattr(env, "close"):
+                        env.close()
+                    env = _VectorEnvToBaseEnv(vector_env)
+                elif remote_envs:
                     env = RemoteVectorEnv(
                         make_env,
                         num_envs,
@@ -376,6 +405,11 @@ class _VectorEnvToBaseEnv(BaseEnv):
         assert env_id is None or isinstance(env_id, int)
         return self.vector_env.try_render_at(env_id)
 
+    @override(BaseEnv)
+    def stop(self) -> None:
+        super().stop()
+        self.vector_env.stop()
+
 
 class _MultiAgentEnvToBaseEnv(BaseEnv):
     """Internal adapter of MultiAgentEnv to BaseEnv.
@@ -2,14 +2,21 @@
 
 This client supports both local and remote policy inference modes. Local
 inference is faster but causes more compute to be done on the client.
+
+Requests are either sent as HTTP POSTs ("http" transport) or as binary
+frames over a single persistent TCP connection ("tcp" transport).
 """
 
 import logging
+import select
+import socket
+import struct
 import threading
 import time
-from typing import Union, Optional
+from typing import Any, Union, Optional
 
 import ray.cloudpickle as pickle
+from ray.cloudpickle.compat import pickle as pickle5
 from ray.rllib.env import ExternalEnv, MultiAgentEnv, ExternalMultiAgentEnv
 from ray.rllib.policy.sample_batch import MultiAgentBatch
 from ray.rllib.utils.annotations import PublicAPI
@@ -26,6 +33,14 @@ except ImportError:
         "Couldn't import `requests` library. Be sure to install it on"
         " the client side.")
 
+# Frames of the "tcp" transport start with the size of the pickled payload
+# and the number of out-of-band (e.g. numpy array) buffers, followed by the
+# size of each of these buffers.
+_FRAME_HEADER = struct.Struct("!QI")
+_BUFFER_SIZE = struct.Struct("!Q")
+# Whether we can send numpy arrays as raw out-of-band buffers (pickle5).
+_OUT_OF_BAND_BUFFERS = pickle5.HIGHEST_PROTOCOL >= 5
+
 
 @PublicAPI
 class PolicyClient:
@@ -41,13 +56,19 @@ class PolicyClient:
     GET_ACTION = "GET_ACTION"
     LOG_ACTION = "LOG_ACTION"
     LOG_RETURNS = "LOG_RETURNS"
+    LOG_RETURNS_BATCH = "LOG_RETURNS_BATCH"
     END_EPISODE = "END_EPISODE"
 
+    # Max number of `log_returns()` calls to buffer with the "tcp"
+    # transport before sending them to the server.
+    MAX_BATCHED_RETURNS = 100
+
     @PublicAPI
     def __init__(self,
                  address: str,
                  inference_mode: str = "local",
-                 update_interval: float = 10.0):
+                 update_interval: float = 10.0,
+                 transport: str = "http"):
         """Create a PolicyClient instance.
 
         Args:
@@ -57,9 +78,26 @@ class PolicyClient:
             update_interval (float or None): If using 'local' inference mode,
                 the policy is refreshed after this many seconds have passed,
                 or None for manual control via client.
+            transport (str): Either 'http' to send each request as an HTTP
+                POST, or 'tcp' to send all requests as length-prefixed binary
+                frames over one persistent connection. With 'tcp', calls that
+                don't return anything (e.g. `log_returns()`) don't wait for
+                the server, consecutive `log_returns()` calls are sent as one
+                batch, and errors of such calls are raised by the next call
+                that waits for the server. The server must use the same
+                transport.
         """
+        if transport not in ["http", "tcp"]:
+            raise ValueError("transport must be either 'http' or 'tcp'")
         self.address = address
+        self.transport = transport
         self.env = None
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._batched_returns = []
+        # Errors of one-way requests, raised by the next request that waits
+        # for the server.
+        self._oneway_errors = []
         if inference_mode == "local":
             self.local = True
             self._setup_local_rollout_worker(update_interval)
@@ -142,12 +180,14 @@ class PolicyClient:
             self._update_local_policy()
             return self.env.log_action(episode_id, observation, action)
 
-        self._send({
-            "command": PolicyClient.LOG_ACTION,
-            "observation": observation,
-            "action": action,
-            "episode_id": episode_id,
-        })
+        self._send(
+            {
+                "command": PolicyClient.LOG_ACTION,
+                "observation": observation,
+                "action": action,
+                "episode_id": episode_id,
+            },
+            wait_for_response=False)
 
     @PublicAPI
     def log_returns(
@@ -177,13 +217,21 @@ class PolicyClient:
                                             multiagent_done_dict)
             return self.env.log_returns(episode_id, reward, info)
 
-        self._send({
+        returns = {
             "command": PolicyClient.LOG_RETURNS,
             "reward": reward,
             "info": info,
             "episode_id": episode_id,
             "done": multiagent_done_dict,
-        })
+        }
+        if self.transport == "tcp":
+            with self._conn_lock:
+                self._batched_returns.append(returns)
+                if len(self._batched_returns) >= \
+                        PolicyClient.MAX_BATCHED_RETURNS:
+                    self._flush_batched_returns()
+        else:
+            self._send(returns)
 
     @PublicAPI
     def end_episode(self, episode_id: str,
@@ -199,11 +247,13 @@ class PolicyClient:
             self._update_local_policy()
             return self.env.end_episode(episode_id, observation)
 
-        self._send({
-            "command": PolicyClient.END_EPISODE,
-            "observation": observation,
-            "episode_id": episode_id,
-        })
+        self._send(
+            {
+                "command": PolicyClient.END_EPISODE,
+                "observation": observation,
+                "episode_id": episode_id,
+            },
+            wait_for_response=False)
 
     @PublicAPI
     def update_policy_weights(self) -> None:
@@ -211,7 +261,11 @@ class PolicyClient:
         """
         self._update_local_policy(force=True)
 
-    def _send(self, data):
+    def _send(self, data, wait_for_response=True):
+        if self.transport == "tcp":
+            with self._conn_lock:
+                self._flush_batched_returns()
+                return self._send_frame(data, wait_for_response)
         payload = pickle.dumps(data)
         response = requests.post(self.address, data=payload)
         if response.status_code != 200:
@@ -220,6 +274,51 @@ class PolicyClient:
         parsed = pickle.loads(response.content)
         return parsed
 
+    def _flush_batched_returns(self):
+        if self._batched_returns:
+            returns, self._batched_returns = self._batched_returns, []
+            self._send_frame(
+                {
+                    "command": PolicyClient.LOG_RETURNS_BATCH,
+                    "returns": returns,
+                },
+                wait_for_response=False)
+
+    def _send_frame(self, data, wait_for_response):
+        if self._conn is None:
+            host, port = self.address.split("://")[-1].rsplit(":", 1)
+            self._conn = socket.create_connection((host, int(port)))
+            self._conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            _send_frame(self._conn, (wait_for_response, data))
+            if not wait_for_response:
+                # Read the errors the server sent so far, so that it never
+                # blocks on sending them (while we block on sending to it).
+                while select.select([self._conn], [], [], 0)[0]:
+                    _, error = _recv_frame(self._conn)
+                    self._oneway_errors.append(error)
+                return None
+            # The server handles the requests of a connection in order, so
+            # failures of earlier requests that we didn't wait for arrive
+            # before this request's response.
+            errors, self._oneway_errors = self._oneway_errors, []
+            while True:
+                status, response = _recv_frame(self._conn)
+                if status == "ok":
+                    break
+                errors.append(response)
+                if status == "error":
+                    break
+        except (OSError, EOFError):
+            self._conn.close()
+            self._conn = None
+            raise
+        if errors:
+            logger.error("Request failed {}: {}".format(errors, data))
+            raise RuntimeError("Request to policy server failed:\n{}".format(
+                "\n".join(errors)))
+        return response
+
     def _setup_local_rollout_worker(self, update_interval):
         self.update_interval = update_interval
         self.last_updated = 0
@@ -283,6 +382,52 @@ class _LocalInferenceThread(threading.Thread):
             logger.info("Error: inference worker thread died!", e)
 
 
+def _send_frame(sock: socket.socket, obj: Any) -> None:
+    """Sends `obj` as a length-prefixed frame of the "tcp" transport."""
+    buffers = []
+    if _OUT_OF_BAND_BUFFERS:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        buffers = [b.raw() for b in buffers]
+    else:
+        data = pickle.dumps(obj)
+    header = [_FRAME_HEADER.pack(len(data), len(buffers))]
+    header.extend(_BUFFER_SIZE.pack(b.nbytes) for b in buffers)
+    # Small frames (most requests) go out in a single send call.
+    sock.sendall(b"".join(header) + data)
+    for b in buffers:
+        sock.sendall(b)
+
+
+def _recv_frame(sock: socket.socket) -> Any:
+    """Receives an object sent with `_send_frame()`.
+
+    Raises:
+        EOFError: If the connection was closed.
+    """
+    size, num_buffers = _FRAME_HEADER.unpack(
+        _recv_exactly(sock, _FRAME_HEADER.size))
+    sizes = struct.unpack("!{}Q".format(num_buffers),
+                          _recv_exactly(sock,
+                                        num_buffers * _BUFFER_SIZE.size))
+    data = _recv_exactly(sock, size)
+    buffers = [_recv_exactly(sock, s) for s in sizes]
+    if buffers:
+        return pickle5.loads(data, buffers=buffers)
+    return pickle.loads(data)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise EOFError("Connection closed.")
+        received += n
+    return buf
+
+
 def _auto_wrap_external(real_env_creator):
     """Wrap an environment in the ExternalEnv interface if needed.
 
@@ -1,15 +1,16 @@
 import logging
 import queue
+import socket
 import threading
 import traceback
 
 from http.server import SimpleHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
+from socketserver import StreamRequestHandler, ThreadingMixIn
 
 import ray.cloudpickle as pickle
 from ray.rllib.offline.input_reader import InputReader
 from ray.rllib.env.policy_client import PolicyClient, \
-    _create_embedded_rollout_worker
+    _create_embedded_rollout_worker, _recv_frame, _send_frame
 from ray.rllib.utils.annotations import override, PublicAPI
 
 logger = logging.getLogger(__name__)
@@ -45,7 +46,7 @@ class PolicyServerInput(ThreadingMixIn, HTTPServer, InputReader):
     """
 
     @PublicAPI
-    def __init__(self, ioctx, address, port):
+    def __init__(self, ioctx, address, port, transport="http"):
         """Create a PolicyServerInput.
 
         This class implements rllib.offline.InputReader, and can be used with
@@ -62,7 +63,12 @@ class PolicyServerInput(ThreadingMixIn, HTTPServer, InputReader):
             ioctx (IOContext): IOContext provided by RLlib.
             address (str): Server addr (e.g., "localhost").
             port (int): Server port (e.g., 9900).
+            transport (str): Either 'http' for a REST server, or 'tcp' to
+                serve clients over persistent connections with binary frames
+                (see PolicyClient). Clients must use the same transport.
         """
+        if transport not in ["http", "tcp"]:
+            raise ValueError("transport must be either 'http' or 'tcp'")
 
         self.rollout_worker = ioctx.worker
         self.samples_queue = queue.Queue()
@@ -83,10 +89,13 @@ class PolicyServerInput(ThreadingMixIn, HTTPServer, InputReader):
         self.rollout_worker.sampler.get_metrics = get_metrics
 
         handler = _make_handler(self.rollout_worker, self.samples_queue,
-                                self.metrics_queue)
+                                self.metrics_queue, transport)
+        # Don't block shutdown on (persistent) client connections.
+        self.daemon_threads = transport == "tcp"
         HTTPServer.__init__(self, (address, port), handler)
         logger.info("")
-        logger.info("Starting connector server at {}:{}".format(address, port))
+        logger.info("Starting connector server ({}) at {}:{}".format(
+            transport, address, port))
         logger.info("")
         thread = threading.Thread(name="server", target=self.serve_forever)
         thread.daemon = True
@@ -97,7 +106,7 @@ class PolicyServerInput(ThreadingMixIn, HTTPServer, InputReader):
         return self.samples_queue.get()
 
 
-def _make_handler(rollout_worker, samples_queue, metrics_queue):
+def _make_handler(rollout_worker, samples_queue, metrics_queue, transport):
     # Only used in remote inference mode. We must create a new rollout worker
     # then since the original worker doesn't have the env properly wrapped in
     # an ExternalEnv interface.
@@ -130,6 +139,59 @@ def _make_handler(rollout_worker, samples_queue, metrics_queue):
             child_rollout_worker.set_weights(rollout_worker.get_weights(),
                                              rollout_worker.get_global_vars())
 
+    def log_returns(args):
+        if args["done"]:
+            child_rollout_worker.env.log_returns(
+                args["episode_id"], args["reward"], args["info"], args["done"])
+        else:
+            child_rollout_worker.env.log_returns(
+                args["episode_id"], args["reward"], args["info"])
+
+    def execute_command(args):
+        command = args["command"]
+        response = {}
+        # Local inference commands:
+        if command == PolicyClient.GET_WORKER_ARGS:
+            logger.info("Sending worker creation args to client.")
+            response["worker_args"] = rollout_worker.creation_args()
+        elif command == PolicyClient.GET_WEIGHTS:
+            logger.info("Sending worker weights to client.")
+            response["weights"] = rollout_worker.get_weights()
+            response["global_vars"] = rollout_worker.get_global_vars()
+        elif command == PolicyClient.REPORT_SAMPLES:
+            logger.info("Got sample batch of size {} from client.".format(
+                args["samples"].count))
+            report_data(args)
+        # Remote inference commands:
+        elif command == PolicyClient.START_EPISODE:
+            setup_child_rollout_worker()
+            assert inference_thread.is_alive()
+            response["episode_id"] = (
+                child_rollout_worker.env.start_episode(
+                    args["episode_id"], args["training_enabled"]))
+        elif command == PolicyClient.GET_ACTION:
+            assert inference_thread.is_alive()
+            response["action"] = child_rollout_worker.env.get_action(
+                args["episode_id"], args["observation"])
+        elif command == PolicyClient.LOG_ACTION:
+            assert inference_thread.is_alive()
+            child_rollout_worker.env.log_action(
+                args["episode_id"], args["observation"], args["action"])
+        elif command == PolicyClient.LOG_RETURNS:
+            assert inference_thread.is_alive()
+            log_returns(args)
+        elif command == PolicyClient.LOG_RETURNS_BATCH:
+            assert inference_thread.is_alive()
+            for returns in args["returns"]:
+                log_returns(returns)
+        elif command == PolicyClient.END_EPISODE:
+            assert inference_thread.is_alive()
+            child_rollout_worker.env.end_episode(args["episode_id"],
+                                                 args["observation"])
+        else:
+            raise ValueError("Unknown command: {}".format(command))
+        return response
+
     class Handler(SimpleHTTPRequestHandler):
         def __init__(self, *a, **kw):
             super().__init__(*a, **kw)
@@ -139,58 +201,33 @@ def _make_handler(rollout_worker, samples_queue, metrics_queue):
             raw_body = self.rfile.read(content_len)
             parsed_input = pickle.loads(raw_body)
             try:
-                response = self.execute_command(parsed_input)
+                response = execute_command(parsed_input)
                 self.send_response(200)
                 self.end_headers()
                 self.wfile.write(pickle.dumps(response))
             except Exception:
                 self.send_error(500, traceback.format_exc())
 
-        def execute_command(self, args):
-            command = args["command"]
-            response = {}
-            # Local inference commands:
-            if command == PolicyClient.GET_WORKER_ARGS:
-                logger.info("Sending worker creation args to client.")
-                response["worker_args"] = rollout_worker.creation_args()
-            elif command == PolicyClient.GET_WEIGHTS:
-                logger.info("Sending worker weights to client.")
-                response["weights"] = rollout_worker.get_weights()
-                response["global_vars"] = rollout_worker.get_global_vars()
-            elif command == PolicyClient.REPORT_SAMPLES:
-                logger.info("Got sample batch of size {} from client.".format(
-                    args["samples"].count))
-                report_data(args)
-            # Remote inference commands:
-            elif command == PolicyClient.START_EPISODE:
-                setup_child_rollout_worker()
-                assert inference_thread.is_alive()
-                response["episode_id"] = (
-                    child_rollout_worker.env.start_episode(
-                        args["episode_id"], args["training_enabled"]))
-            elif command == PolicyClient.GET_ACTION:
-                assert inference_thread.is_alive()
-                response["action"] = child_rollout_worker.env.get_action(
-                    args["episode_id"], args["observation"])
-            elif command == PolicyClient.LOG_ACTION:
-                assert inference_thread.is_alive()
-                child_rollout_worker.env.log_action(
-                    args["episode_id"], args["observation"], args["action"])
-            elif command == PolicyClient.LOG_RETURNS:
-                assert inference_thread.is_alive()
-                if args["done"]:
-                    child_rollout_worker.env.log_returns(
-                        args["episode_id"], args["reward"], args["info"],
-                        args["done"])
-                else:
-                    child_rollout_worker.env.log_returns(
-                        args["episode_id"], args["reward"], args["info"])
-            elif command == PolicyClient.END_EPISODE:
-                assert inference_thread.is_alive()
-                child_rollout_worker.env.end_episode(args["episode_id"],
-                                                     args["observation"])
-            else:
-                raise ValueError("Unknown command: {}".format(command))
-            return response
-
-    return Handler
+    class StreamHandler(StreamRequestHandler):
+        """Serves the requests of one persistent "tcp" client connection."""
+
+        def handle(self):
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY,
+                                    1)
+            while True:
+                try:
+                    wait_for_response, args = _recv_frame(self.request)
+                except (EOFError, ConnectionError):
+                    return
+                try:
+                    response = execute_command(args)
+                    if wait_for_response:
+                        _send_frame(self.request, ("ok", response))
+                except Exception:
+                    # Clients don't wait for the responses of one-way
+                    # requests, but raise their errors on the next request
+                    # they wait for.
+                    status = "error" if wait_for_response else "oneway_error"
+                    _send_frame(self.request, (status, traceback.format_exc()))
+
+    return StreamHandler if transport == "tcp" else Handler
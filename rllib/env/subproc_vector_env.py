@@ -0,0 +1,338 @@
+import ctypes
+import gym
+import logging
+import multiprocessing
+import numpy as np
+import os
+import traceback
+import tree
+from typing import Callable, List, Optional, Tuple
+
+from ray import cloudpickle
+from ray.rllib.env.vector_env import VectorEnv
+from ray.rllib.utils.annotations import override, PublicAPI
+from ray.rllib.utils.spaces.space_utils import get_base_struct_from_space
+from ray.rllib.utils.typing import EnvActionType, EnvInfoDict, EnvObsType, \
+    EnvType
+
+logger = logging.getLogger(__name__)
+
+# Commands sent from the driver process to the sub-env processes.
+_STEP = "step"
+_RESET = "reset"
+_RESET_AT = "reset_at"
+_RENDER_AT = "render_at"
+_CLOSE = "close"
+
+
+@PublicAPI
+class SubprocVectorEnv(VectorEnv):
+    """Vector env that steps its sub-envs in subprocesses.
+
+    The `num_envs` sub-envs are split into contiguous groups, one group per
+    subprocess. On each `vector_step()`, the actions for a group are sent in
+    a single message, all groups step their sub-envs in parallel, and the
+    resulting observations are written directly into a shared memory buffer
+    (one row per sub-env). Only rewards, dones and infos go back through the
+    pipes. Observation spaces whose leaves are not fixed-shape numeric spaces
+    (e.g. Text or Graph spaces) fall back to sending observations through the
+    pipes as well.
+
+    Compared to `RemoteVectorEnv`, this does not require one Ray actor per
+    sub-env and does not go through the object store, which makes it a good
+    fit for CPU-heavy simulators that should use all cores of a single
+    rollout worker.
+
+    The subprocesses are started with the "spawn" method by default, as
+    forking a (multi-threaded) Ray worker process is not safe.
+
+    You shouldn't need to instantiate this class directly. It's automatically
+    inserted when you set `remote_worker_envs="subprocess"` in the Trainer
+    config.
+
+    Examples:
+        >>> env = SubprocVectorEnv(
+        ...     lambda i: gym.make("CartPole-v0"), num_envs=8,
+        ...     observation_space=obs_space, action_space=action_space)
+        >>> obs = env.vector_reset()
+        >>> obs, rewards, dones, infos = env.vector_step([0] * 8)
+        >>> env.stop()
+    """
+
+    def __init__(self,
+                 make_env: Callable[[int], EnvType],
+                 num_envs: int,
+                 observation_space: gym.Space,
+                 action_space: gym.Space,
+                 num_processes: Optional[int] = None,
+                 start_method: str = "spawn"):
+        """Initializes a SubprocVectorEnv object.
+
+        Args:
+            make_env (Callable[[int], EnvType]): Factory that produces a new
+                gym env given the sub-env (vector) index. Called inside the
+                subprocesses.
+            num_envs (int): Total number of sub environments.
+            observation_space (gym.Space): The observation space of a single
+                sub-env.
+            action_space (gym.Space): The action space of a single sub-env.
+            num_processes (Optional[int]): Number of subprocesses to spread
+                the sub-envs over. Defaults to min(num_envs, number of CPUs).
+            start_method (str): The multiprocessing start method ("spawn",
+                "forkserver" or "fork") of the subprocesses.
+        """
+        super().__init__(
+            observation_space=observation_space,
+            action_space=action_space,
+            num_envs=num_envs)
+        if num_processes is None:
+            num_processes = os.cpu_count() or 1
+        self.num_processes = max(1, min(num_processes, num_envs))
+
+        self._obs_struct = get_base_struct_from_space(observation_space)
+        leaf_spaces = tree.flatten(self._obs_struct)
+        self._use_shared_obs = all(_is_shareable(s) for s in leaf_spaces)
+        self._shared_obs = []
+        ctx = multiprocessing.get_context(start_method)
+        if self._use_shared_obs:
+            for space in leaf_spaces:
+                dtype = np.dtype(space.dtype)
+                size = int(np.prod(space.shape, dtype=np.int64))
+                raw = ctx.RawArray(ctypes.c_byte,
+                                   num_envs * size * dtype.itemsize)
+                self._shared_obs.append((raw, dtype, space.shape))
+        else:
+            logger.info("Observation space {} can not be placed in shared "
+                        "memory; sending observations through pipes "
+                        "instead.".format(observation_space))
+        self._obs_buffers = self._make_obs_buffers()
+
+        # Contiguous groups of sub-env indices, one per process.
+        self._groups = [
+            list(g) for g in np.array_split(
+                np.arange(num_envs), self.num_processes)
+        ]
+        # Maps sub-env index to (process index, index within the group).
+        self._locations = []
+        for p, group in enumerate(self._groups):
+            for j in range(len(group)):
+                self._locations.append((p, j))
+
+        # `make_env` is usually a closure, which can't be sent to a
+        # (non-forked) process with the standard pickler.
+        make_env = cloudpickle.dumps(make_env)
+        self._pipes = []
+        self._processes = []
+        for group in self._groups:
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(child_conn, parent_conn, make_env, group,
+                      self._shared_obs, self._use_shared_obs),
+                daemon=True)
+            process.start()
+            child_conn.close()
+            self._pipes.append(parent_conn)
+            self._processes.append(process)
+        self._closed = False
+
+        # Wait for all sub-envs to be created, so that construction errors
+        # surface here rather than on the first reset.
+        self._recv_all()
+
+    @override(VectorEnv)
+    def vector_reset(self) -> List[EnvObsType]:
+        for pipe in self._pipes:
+            pipe.send((_RESET, None))
+        obs = []
+        for o in self._recv_all():
+            obs.extend(o)
+        return self._read_obs(list(range(self.num_envs)), obs)
+
+    @override(VectorEnv)
+    def reset_at(self, index: Optional[int] = None) -> EnvObsType:
+        if index is None:
+            index = 0
+        p, j = self._locations[index]
+        self._pipes[p].send((_RESET_AT, j))
+        obs = self._recv(p)
+        return self._read_obs([index], [obs])[0]
+
+    @override(VectorEnv)
+    def vector_step(
+            self, actions: List[EnvActionType]
+    ) -> Tuple[List[EnvObsType], List[float], List[bool], List[EnvInfoDict]]:
+        for p, group in enumerate(self._groups):
+            self._pipes[p].send((_STEP, [actions[i] for i in group]))
+        # Receive the replies of all processes before validating them, so
+        # that no reply is left in a pipe if the validation fails.
+        replies = self._recv_all()
+        obs, rew_batch, done_batch, info_batch = [], [], [], []
+        for group, (o, rewards, dones, infos) in zip(self._groups, replies):
+            for i, r, info in zip(group, rewards, infos):
+                if not np.isscalar(r) or not np.isreal(r) or \
+                        not np.isfinite(r):
+                    raise ValueError(
+                        "Reward should be finite scalar, got {} ({}). "
+                        "Actions={}.".format(r, type(r), actions[i]))
+                if not isinstance(info, dict):
+                    raise ValueError(
+                        "Info should be a dict, got {} ({})".format(
+                            info, type(info)))
+            obs.extend(o)
+            rew_batch.extend(rewards)
+            done_batch.extend(dones)
+            info_batch.extend(infos)
+        return self._read_obs(list(range(self.num_envs)), obs), rew_batch, \
+            done_batch, info_batch
+
+    @override(VectorEnv)
+    def get_unwrapped(self) -> List[EnvType]:
+        # The sub-envs live in the subprocesses.
+        return []
+
+    @override(VectorEnv)
+    def try_render_at(self, index: Optional[int] = None):
+        if index is None:
+            index = 0
+        p, j = self._locations[index]
+        self._pipes[p].send((_RENDER_AT, j))
+        return self._recv(p)
+
+    @override(VectorEnv)
+    def stop(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for pipe, process in zip(self._pipes, self._processes):
+            try:
+                if process.is_alive():
+                    pipe.send((_CLOSE, None))
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+        for pipe, process in zip(self._pipes, self._processes):
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            pipe.close()
+
+    def _make_obs_buffers(self) -> List[np.ndarray]:
+        return [
+            np.frombuffer(raw, dtype=dtype).reshape((self.num_envs, ) + shape)
+            for raw, dtype, shape in self._shared_obs
+        ]
+
+    def _read_obs(self, indices: List[int],
+                  obs: List[EnvObsType]) -> List[EnvObsType]:
+        if not self._use_shared_obs:
+            return obs
+        # Copy out of the shared buffers, as these are overwritten on the
+        # next step.
+        leaves = [buf[indices] for buf in self._obs_buffers]
+        return [
+            tree.unflatten_as(self._obs_struct, [leaf[k] for leaf in leaves])
+            for k in range(len(indices))
+        ]
+
+    def _recv_all(self) -> list:
+        """Receives one reply from each process.
+
+        Replies of all processes are received, even if some of them report
+        errors (the first of which is raised afterwards).
+        """
+        replies = []
+        error = None
+        for p in range(self.num_processes):
+            try:
+                replies.append(self._recv(p))
+            except RuntimeError as e:
+                replies.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    def _recv(self, p: int):
+        try:
+            status, payload = self._pipes[p].recv()
+        except EOFError:
+            raise RuntimeError(
+                "Sub-env process {} (pid={}) died unexpectedly.".format(
+                    p, self._processes[p].pid))
+        if status == "error":
+            raise RuntimeError("Error in sub-env process {}:\n{}".format(
+                p, payload))
+        return payload
+
+    def __del__(self):
+        try:
+            self.stop()
+        except Exception:
+            pass
+
+
+def _is_shareable(space: gym.Space) -> bool:
+    return isinstance(space, (gym.spaces.Box, gym.spaces.Discrete,
+                              gym.spaces.MultiDiscrete,
+                              gym.spaces.MultiBinary)) and \
+        space.shape is not None and \
+        np.issubdtype(np.dtype(space.dtype), np.number)
+
+
+def _worker(conn, parent_conn, make_env, indices, shared_obs,
+            use_shared_obs):
+    """Main loop of a sub-env process."""
+    # Forked processes inherit the driver's end of the pipe as well.
+    parent_conn.close()
+    make_env = cloudpickle.loads(make_env)
+    buffers = [
+        np.frombuffer(raw, dtype=dtype).reshape((-1, ) + shape)
+        for raw, dtype, shape in shared_obs
+    ]
+
+    def write_obs(i, obs):
+        if not use_shared_obs:
+            return obs
+        for buf, leaf in zip(buffers, tree.flatten(obs)):
+            buf[i] = leaf
+        return None
+
+    envs = []
+    try:
+        envs = [make_env(i) for i in indices]
+        conn.send(("ok", None))
+        while True:
+            command, data = conn.recv()
+            if command == _STEP:
+                obs, rewards, dones, infos = [], [], [], []
+                for i, env, action in zip(indices, envs, data):
+                    o, r, d, info = env.step(action)
+                    obs.append(write_obs(i, o))
+                    rewards.append(r)
+                    dones.append(d)
+                    infos.append(info)
+                conn.send(("ok", (obs, rewards, dones, infos)))
+            elif command == _RESET:
+                conn.send(("ok", [
+                    write_obs(i, env.reset()) for i, env in zip(indices, envs)
+                ]))
+            elif command == _RESET_AT:
+                conn.send(("ok", write_obs(indices[data], envs[data].reset())))
+            elif command == _RENDER_AT:
+                conn.send(("ok", envs[data].render()))
+            elif command == _CLOSE:
+                break
+            else:
+                raise ValueError("Unknown command {}".format(command))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        try:
+            conn.send(("error", traceback.format_exc()))
+        except (BrokenPipeError, OSError):
+            pass
+    finally:
+        for env in envs:
+            if hasattr(env, "close"):
+                env.close()
+        conn.close()
@@ -0,0 +1,91 @@
+import numpy as np
+import socket
+import threading
+import unittest
+
+from ray.rllib.env.policy_client import PolicyClient, _recv_frame, \
+    _send_frame
+
+
+def _serve(sock):
+    """Minimal "tcp" transport server: Fails all "fail" commands."""
+    while True:
+        try:
+            wait_for_response, data = _recv_frame(sock)
+        except (EOFError, OSError):
+            return
+        if data["command"] == "fail":
+            status = "error" if wait_for_response else "oneway_error"
+            # Errors fill up the (small) socket buffers unless read.
+            _send_frame(sock, (status, "error {}\n{}".format(
+                data["i"], "x" * 4096)))
+        elif wait_for_response:
+            _send_frame(sock, ("ok", data))
+
+
+class TestPolicyClient(unittest.TestCase):
+    def test_framing(self):
+        a, b = socket.socketpair()
+        objs = [
+            None,
+            {
+                "command": "x",
+                "obs": np.arange(10, dtype=np.float32)
+            },
+            # Larger than the socket buffers, with out-of-band buffers.
+            [np.random.random((1000, 1000)), "y", np.zeros(0)],
+        ]
+        sender = threading.Thread(
+            target=lambda: [_send_frame(a, obj) for obj in objs])
+        sender.start()
+        received = [_recv_frame(b) for _ in objs]
+        sender.join()
+        self.assertIsNone(received[0])
+        self.assertEqual(received[1]["command"], "x")
+        np.testing.assert_array_equal(received[1]["obs"], objs[1]["obs"])
+        np.testing.assert_array_equal(received[2][0], objs[2][0])
+        self.assertEqual(received[2][1:2], ["y"])
+        self.assertEqual(received[2][2].shape, (0, ))
+        a.close()
+        self.assertRaises(EOFError, lambda: _recv_frame(b))
+        b.close()
+
+    def test_error_propagation(self):
+        client_sock, server_sock = socket.socketpair()
+        for sock in [client_sock, server_sock]:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 8192)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8192)
+        server = threading.Thread(target=_serve, args=(server_sock, ))
+        server.start()
+        client = PolicyClient(
+            "localhost:0", inference_mode="remote", transport="tcp")
+        client._conn = client_sock
+        # Fail instead of hanging if the client and server deadlock.
+        client_sock.settimeout(30)
+
+        # Many failing one-way requests (whose errors would fill up the
+        # socket buffers if not read in between).
+        for i in range(100):
+            client._send({"command": "fail", "i": i}, wait_for_response=False)
+        # Their errors are raised by the next request that waits.
+        with self.assertLogs("ray.rllib.env.policy_client", "ERROR"):
+            with self.assertRaisesRegex(RuntimeError, "error 0\n") as ctx:
+                client._send({"command": "ok"})
+        self.assertIn("error 99\n", str(ctx.exception))
+        # ... and only once.
+        self.assertEqual(client._send({"command": "ok"}), {"command": "ok"})
+        # Errors of requests that wait are raised right away.
+        with self.assertLogs("ray.rllib.env.policy_client", "ERROR"):
+            with self.assertRaisesRegex(RuntimeError, "error 100\n"):
+                client._send({"command": "fail", "i": 100})
+        self.assertEqual(client._send({"command": "ok"}), {"command": "ok"})
+
+        client_sock.close()
+        server.join()
+        server_sock.close()
+
+
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main(["-v", __file__]))
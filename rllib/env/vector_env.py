@@ -103,6 +103,15 @@ class VectorEnv:
         """
         pass
 
+    @PublicAPI
+    def stop(self) -> None:
+        """Releases all resources used, other than the sub environments.
+
+        Sub environments returned by `get_unwrapped()` are closed by the
+        BaseEnv wrapping this VectorEnv.
+        """
+        pass
+
 
 class _VectorizedGymEnv(VectorEnv):
     """Internal wrapper to translate any gym envs into a VectorEnv object.
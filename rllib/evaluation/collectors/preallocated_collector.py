@@ -0,0 +1,383 @@
+import collections
+from gym.spaces import Space
+import logging
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple, TYPE_CHECKING, Union
+
+from ray.rllib.evaluation.collectors.simple_list_collector import \
+    SimpleListCollector, _AgentCollector
+from ray.rllib.evaluation.episode import MultiAgentEpisode
+from ray.rllib.policy.policy import Policy
+from ray.rllib.policy.sample_batch import SampleBatch, MultiAgentBatch
+from ray.rllib.utils.annotations import override
+from ray.rllib.utils.typing import EpisodeID, PolicyID, TensorType, \
+    ViewRequirementsDict
+
+if TYPE_CHECKING:
+    from ray.rllib.agents.callbacks import DefaultCallbacks
+
+logger = logging.getLogger(__name__)
+
+
+class _PolicyBuffers:
+    """Preallocated numpy buffers for all agent trajectories of one policy.
+
+    Each column is stored in one array of shape
+    [num_slots, capacity] + value shape. Every ongoing agent trajectory owns
+    one slot (row) and writes its timesteps along the second axis (using
+    the same layout as _AgentCollector's lists, including the 0-padded
+    "shift before" area at the beginning).
+
+    Incoming values are staged per column and written into the arrays with a
+    single vectorized (fancy-index) assignment per column on `flush()`, e.g.
+    once per env step before the next forward pass. Both slots and capacity
+    are doubled whenever they run out.
+    """
+
+    def __init__(self, num_slots: int, horizon: int):
+        """Initializes a _PolicyBuffers instance.
+
+        Args:
+            num_slots (int): The initial number of slots (concurrent agent
+                trajectories), e.g. the number of vectorized sub-envs.
+            horizon (int): The initial number of timesteps to allocate per
+                slot (on top of the "shift before" area).
+        """
+        self.num_slots = num_slots
+        self.horizon = horizon
+        # Allocated on the first `acquire_slot()` call (when we know the
+        # size of the "shift before" area).
+        self.capacity = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        self._fill_values: Dict[str, Any] = {}
+        self._free_slots = list(range(num_slots - 1, -1, -1))
+        # Staged writes: column -> list of (slot, position, value).
+        self._pending: Dict[str, List[Tuple[int, int, Any]]] = \
+            collections.defaultdict(list)
+
+    def acquire_slot(self, shift_before: int) -> int:
+        """Reserves a slot for a new agent trajectory.
+
+        Args:
+            shift_before (int): Size of the (reset) 0-padded area at the
+                beginning of the trajectory.
+
+        Returns:
+            int: The slot index.
+        """
+        if self.capacity < shift_before + 1:
+            self._resize(self.num_slots, shift_before + self.horizon)
+        if not self._free_slots:
+            self._resize(self.num_slots * 2, self.capacity)
+        slot = self._free_slots.pop()
+        # Reset the padding area, which may still hold data of a previous
+        # trajectory.
+        for col, arr in self.columns.items():
+            arr[slot, :shift_before] = self._fill_values.get(
+                col, None if arr.dtype == object else 0)
+        return slot
+
+    def release_slot(self, slot: int) -> None:
+        """Makes a slot available again for new agent trajectories."""
+        # Write out any staged rows first, so they can't overwrite the data
+        # of the slot's next owner.
+        self.flush()
+        self._free_slots.append(slot)
+
+    def stage(self, slot: int, position: int,
+              values: Dict[str, TensorType]) -> None:
+        """Stages a row of values to be written on the next `flush()`."""
+        for col, value in values.items():
+            self._pending[col].append((slot, position, value))
+
+    def flush(self) -> None:
+        """Writes all staged values into the buffers (one op per column)."""
+        for col, rows in self._pending.items():
+            slots, positions, values = zip(*rows)
+            max_position = max(positions)
+            if max_position >= self.capacity:
+                self._resize(self.num_slots,
+                             max(self.capacity * 2, max_position + 1))
+            if col not in self.columns:
+                self.add_column(col, values[0], constant=False)
+            self._write(col, np.array(slots), np.array(positions), values)
+        self._pending.clear()
+
+    def add_column(self, col: str, example: Any, constant: bool) -> None:
+        """Allocates a new column, based on an example value.
+
+        Numeric values are stored in arrays of their dtype, anything else
+        (e.g. info dicts) in object arrays.
+
+        Args:
+            col (str): The column name.
+            example (Any): An example value, determining dtype and shape.
+            constant (bool): Whether `example` is the constant value of the
+                column (e.g. a non-Space view requirement), which then also
+                fills the "shift before" area of all future trajectories.
+                Otherwise, the column is 0-filled.
+        """
+        example = np.asarray(example)
+        if example.dtype.kind in "biuf":
+            arr = np.zeros(
+                (self.num_slots, self.capacity) + example.shape,
+                dtype=example.dtype)
+            if constant and np.any(example != 0):
+                arr[:] = example
+                self._fill_values[col] = example
+        else:
+            arr = np.empty((self.num_slots, self.capacity), dtype=object)
+        self.columns[col] = arr
+
+    def _write(self, col: str, slots: np.ndarray, positions: np.ndarray,
+               values: Sequence[Any]) -> None:
+        arr = self.columns[col]
+        if arr.dtype == object:
+            for slot, position, value in zip(slots, positions, values):
+                arr[slot, position] = value
+            return
+        values = np.asarray(values)
+        # Upgrade the column's dtype, if necessary (e.g. int rewards
+        # followed by float ones).
+        if not np.can_cast(values.dtype, arr.dtype, casting="same_kind"):
+            dtype = np.result_type(arr.dtype, values.dtype)
+            arr = self.columns[col] = arr.astype(dtype)
+        arr[slots, positions] = values
+
+    def _resize(self, num_slots: int, capacity: int) -> None:
+        for col, arr in self.columns.items():
+            new_arr = np.zeros(
+                (num_slots, capacity) + arr.shape[2:], dtype=arr.dtype) \
+                if arr.dtype != object else \
+                np.empty((num_slots, capacity), dtype=object)
+            if col in self._fill_values:
+                new_arr[:] = self._fill_values[col]
+            new_arr[:self.num_slots, :self.capacity] = arr
+            self.columns[col] = new_arr
+        # New slots go to the front, so that existing free ones get
+        # reused first.
+        self._free_slots = list(range(num_slots - 1, self.num_slots - 1,
+                                      -1)) + self._free_slots
+        self.num_slots = num_slots
+        self.capacity = capacity
+
+
+class _PreallocatedAgentCollector(_AgentCollector):
+    """Collects samples for one agent trajectory in a _PolicyBuffers slot.
+
+    Keeps the same time layout as _AgentCollector (so that `build()` can be
+    reused), but instead of appending to per-agent lists, rows are staged in
+    and later written to the policy's shared, preallocated buffers.
+    """
+
+    def __init__(self, view_reqs: ViewRequirementsDict,
+                 policy_buffers: _PolicyBuffers):
+        super().__init__(view_reqs)
+        self.policy_buffers = policy_buffers
+        self.slot = policy_buffers.acquire_slot(self.shift_before)
+
+    @property
+    def end(self) -> int:
+        """Index one past the last written timestep in our slot."""
+        return self.shift_before + self.agent_steps
+
+    @override(_AgentCollector)
+    def add_init_obs(self, episode_id: EpisodeID, agent_index: int,
+                     env_id: int, t: int, init_obs: TensorType) -> None:
+        self.episode_id = episode_id
+        self.policy_buffers.stage(
+            self.slot, self.shift_before - 1, {
+                SampleBatch.OBS: init_obs,
+                SampleBatch.AGENT_INDEX: agent_index,
+                "env_id": env_id,
+                "t": t,
+            })
+
+    @override(_AgentCollector)
+    def add_action_reward_next_obs(self, values: Dict[str, TensorType]) -> \
+            None:
+        assert SampleBatch.OBS not in values
+        values[SampleBatch.OBS] = values[SampleBatch.NEXT_OBS]
+        del values[SampleBatch.NEXT_OBS]
+        if SampleBatch.EPS_ID in values:
+            assert values[SampleBatch.EPS_ID] == self.episode_id
+            del values[SampleBatch.EPS_ID]
+
+        self.policy_buffers.stage(self.slot, self.end, values)
+        self.agent_steps += 1
+
+    @override(_AgentCollector)
+    def build(self, view_requirements: ViewRequirementsDict) -> SampleBatch:
+        self.policy_buffers.flush()
+        end = self.end
+        # Expose our slot as (exact length) views for the generic build
+        # logic, which copies all data into the returned batch.
+        self.buffers = {
+            col: arr[self.slot, :end]
+            for col, arr in self.policy_buffers.columns.items()
+        }
+        done = self.buffers[SampleBatch.DONES][-1]
+        batch = super().build(view_requirements)
+        self.buffers = {}
+
+        if done:
+            self.release()
+        # This trajectory is continuing -> Copy the last `shift_before`
+        # timesteps to the beginning of our slot.
+        else:
+            for arr in self.policy_buffers.columns.values():
+                arr[self.slot, :self.shift_before] = \
+                    arr[self.slot, end - self.shift_before:end]
+        return batch
+
+    def release(self) -> None:
+        """Gives our slot back to the policy buffers."""
+        if self.slot is not None:
+            self.policy_buffers.release_slot(self.slot)
+            self.slot = None
+
+
+class PreallocatedCollector(SimpleListCollector):
+    """SimpleListCollector variant using preallocated per-policy buffers.
+
+    Instead of per-agent Python lists, all ongoing trajectories of a policy
+    are stored in one preallocated numpy array per column (initially sized
+    to `num_envs_per_worker` x `rollout_fragment_length`). Each env step's
+    data is written with one vectorized assignment per column, and the
+    inference input dicts are gathered with a single fancy-index op per
+    view column (instead of a Python loop over all agents). This pays off
+    for vectorized envs with many sub-envs.
+
+    Select this collector via the `sample_collector` config key:
+
+    Examples:
+        >>> config["sample_collector"] = PreallocatedCollector
+
+    Note: All (numeric) data columns must have fixed shapes.
+    """
+
+    def __init__(self,
+                 policy_map: Dict[PolicyID, Policy],
+                 clip_rewards: Union[bool, float],
+                 callbacks: "DefaultCallbacks",
+                 multiple_episodes_in_batch: bool = True,
+                 rollout_fragment_length: int = 200,
+                 count_steps_by: str = "env_steps"):
+        """Initializes a PreallocatedCollector instance."""
+
+        super().__init__(policy_map, clip_rewards, callbacks,
+                         multiple_episodes_in_batch, rollout_fragment_length,
+                         count_steps_by)
+
+        # Maps policy IDs to their preallocated buffers.
+        self.policy_buffers: Dict[PolicyID, _PolicyBuffers] = {}
+
+    @override(SimpleListCollector)
+    def get_inference_input_dict(self, policy_id: PolicyID) -> \
+            Dict[str, TensorType]:
+        policy = self.policy_map[policy_id]
+        collectors = [
+            self.agent_collectors[k]
+            for k in self.forward_pass_agent_keys[policy_id]
+        ]
+        buffers = self.policy_buffers[policy_id]
+        buffers.flush()
+        slots = np.array([c.slot for c in collectors])
+        ends = np.array([c.end for c in collectors])
+        view_reqs = policy.model.view_requirements if \
+            getattr(policy, "model", None) else policy.view_requirements
+
+        input_dict = {}
+        for view_col, view_req in view_reqs.items():
+            # Not used for action computations.
+            if not view_req.used_for_compute_actions:
+                continue
+
+            data_col = view_req.data_col or view_col
+            if data_col == SampleBatch.EPS_ID:
+                input_dict[view_col] = np.array(
+                    [c.episode_id for c in collectors])
+                continue
+            if data_col not in buffers.columns:
+                fill_value = np.zeros_like(view_req.space.sample()) \
+                    if isinstance(view_req.space, Space) else view_req.space
+                buffers.add_column(data_col, fill_value, constant=True)
+
+            delta = -1 if data_col in [
+                SampleBatch.OBS, "t", "env_id", SampleBatch.AGENT_INDEX
+            ] else 0
+            # Range of shifts, e.g. "-100:0". Note: This includes index 0!
+            if view_req.shift_from is not None:
+                time_indices = np.arange(view_req.shift_from + delta,
+                                         view_req.shift_to + delta + 1)
+            # Single shift (e.g. -1) or list of shifts, e.g. [-4, -1, 0].
+            else:
+                time_indices = view_req.shift + delta
+            input_dict[view_col] = self._gather(
+                buffers.columns[data_col], slots, ends, time_indices)
+
+        self._reset_inference_calls(policy_id)
+
+        return SampleBatch(input_dict)
+
+    @override(SimpleListCollector)
+    def postprocess_episode(
+            self,
+            episode: MultiAgentEpisode,
+            is_done: bool = False,
+            check_dones: bool = False,
+            build: bool = False) -> Union[None, SampleBatch, MultiAgentBatch]:
+        batch = super().postprocess_episode(episode, is_done, check_dones,
+                                            build)
+        # Free the slots of trajectories that ended without a done flag
+        # (e.g. `no_done_at_end=True`), so they can be reused.
+        if is_done:
+            for agent_key in [
+                    k for k in self.agent_collectors
+                    if k[0] == episode.episode_id
+            ]:
+                self.agent_collectors.pop(agent_key).release()
+        return batch
+
+    @override(SimpleListCollector)
+    def _create_agent_collector(
+            self, policy_id: PolicyID,
+            view_reqs: ViewRequirementsDict) -> _AgentCollector:
+        if policy_id not in self.policy_buffers:
+            config = self.policy_map[policy_id].config or {}
+            horizon = self.rollout_fragment_length if \
+                self.rollout_fragment_length != float("inf") else 1000
+            self.policy_buffers[policy_id] = _PolicyBuffers(
+                num_slots=config.get("num_envs_per_worker", 1),
+                horizon=int(horizon))
+        return _PreallocatedAgentCollector(view_reqs,
+                                           self.policy_buffers[policy_id])
+
+    @staticmethod
+    def _gather(column: np.ndarray, slots: np.ndarray, ends: np.ndarray,
+                time_indices: Union[int, np.ndarray]) -> np.ndarray:
+        """Gathers the given time indices for all given slots at once.
+
+        Negative time indices are relative to the end of each slot's
+        trajectory (like negative list indices), positive ones to the
+        beginning of the slot.
+
+        Args:
+            column (np.ndarray): The column's buffer.
+            slots (np.ndarray): The slots to gather data from.
+            ends (np.ndarray): The (per slot) index one past the last
+                written timestep.
+            time_indices (Union[int, np.ndarray]): A single time index
+                (resulting in a [B, ...] batch) or an array of indices
+                (resulting in a [B, T, ...] batch).
+
+        Returns:
+            np.ndarray: The gathered batch.
+        """
+        if isinstance(time_indices, np.ndarray):
+            positions = np.where(time_indices < 0,
+                                 ends[:, None] + time_indices, time_indices)
+            return column[slots[:, None], positions]
+        positions = ends + time_indices if time_indices < 0 else \
+            np.full_like(ends, time_indices)
+        return column[slots, positions]
@@ -225,7 +225,8 @@ class _AgentCollector:
                 # Shift is positive: We still need to 0-pad at the end.
                 elif shift > 0:
                     data = to_float_np_array(
-                        self.buffers[data_col][self.shift_before + shift:] + [
+                        list(self.buffers[data_col][self.shift_before +
+                                                    shift:]) + [
                             np.zeros(
                                 shape=view_req.space.shape,
                                 dtype=view_req.space.dtype)
@@ -493,7 +494,8 @@ class SimpleListCollector(SampleCollector):
         # Add initial obs to Trajectory.
         assert agent_key not in self.agent_collectors
         # TODO: determine exact shift-before based on the view-req shifts.
-        self.agent_collectors[agent_key] = _AgentCollector(view_reqs)
+        self.agent_collectors[agent_key] = self._create_agent_collector(
+            policy_id, view_reqs)
         self.agent_collectors[agent_key].add_init_obs(
             episode_id=episode.episode_id,
             agent_index=episode._agent_index(agent_id),
@@ -782,6 +784,21 @@ class SimpleListCollector(SampleCollector):
 
         return batches
 
+    def _create_agent_collector(
+            self, policy_id: PolicyID,
+            view_reqs: ViewRequirementsDict) -> _AgentCollector:
+        """Creates a new collector for a new agent trajectory.
+
+        Args:
+            policy_id (PolicyID): The ID of the policy controlling the agent.
+            view_reqs (ViewRequirementsDict): The view requirements of that
+                policy's model.
+
+        Returns:
+            _AgentCollector: The new (empty) agent collector.
+        """
+        return _AgentCollector(view_reqs)
+
     def _add_to_next_inference_call(
             self, agent_key: Tuple[EpisodeID, AgentID]) -> None:
         """Adds an Agent key (episode+agent IDs) to the next inference call.
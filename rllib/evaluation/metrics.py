@@ -8,6 +8,7 @@ from ray import ObjectRef
 from ray.actor import ActorHandle
 from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID
+from ray.rllib.offline.input_reader import InputReaderMetrics
 from ray.rllib.offline.off_policy_estimator import OffPolicyEstimate
 from ray.rllib.policy.policy import LEARNER_STATS_KEY
 from ray.rllib.utils.annotations import DeveloperAPI
@@ -118,8 +119,8 @@ def summarize_episodes(
     if new_episodes is None:
         new_episodes = episodes
 
-    episodes, estimates = _partition(episodes)
-    new_episodes, _ = _partition(new_episodes)
+    episodes, estimates, reader_stats = _partition(episodes)
+    new_episodes, _, _ = _partition(new_episodes)
 
     episode_rewards = []
     episode_lengths = []
@@ -195,6 +196,17 @@ def summarize_episodes(
             metrics[k] = np.mean(v_list)
         estimators[name] = dict(metrics)
 
+    input_reader = collections.defaultdict(
+        lambda: collections.defaultdict(list))
+    for r in reader_stats:
+        acc = input_reader[r.reader_name]
+        for k, v in r.metrics.items():
+            acc[k].append(v)
+    for name, metrics in input_reader.items():
+        for k, v_list in metrics.items():
+            metrics[k] = np.mean(v_list)
+        input_reader[name] = dict(metrics)
+
     return dict(
         episode_reward_max=max_reward,
         episode_reward_min=min_reward,
@@ -208,19 +220,25 @@ def summarize_episodes(
         custom_metrics=dict(custom_metrics),
         hist_stats=dict(hist_stats),
         sampler_perf=dict(perf_stats),
-        off_policy_estimator=dict(estimators))
+        off_policy_estimator=dict(estimators),
+        input_reader=dict(input_reader))
 
 
-def _partition(episodes: List[RolloutMetrics]
-               ) -> Tuple[List[RolloutMetrics], List[OffPolicyEstimate]]:
-    """Divides metrics data into true rollouts vs off-policy estimates."""
+def _partition(
+        episodes: List[RolloutMetrics]
+) -> Tuple[List[RolloutMetrics], List[OffPolicyEstimate],
+           List[InputReaderMetrics]]:
+    """Divides metrics data into true rollouts vs off-policy estimates vs
+    input reader stats."""
 
-    rollouts, estimates = [], []
+    rollouts, estimates, reader_stats = [], [], []
     for e in episodes:
         if isinstance(e, RolloutMetrics):
             rollouts.append(e)
         elif isinstance(e, OffPolicyEstimate):
             estimates.append(e)
+        elif isinstance(e, InputReaderMetrics):
+            reader_stats.append(e)
         else:
             raise ValueError("Unknown metric type: {}".format(e))
-    return rollouts, estimates
+    return rollouts, estimates, reader_stats
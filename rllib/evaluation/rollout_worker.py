@@ -21,7 +21,9 @@ from ray.rllib.evaluation.sampler import AsyncSampler, SyncSampler
 from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
 from ray.rllib.models import ModelCatalog
 from ray.rllib.models.preprocessors import NoPreprocessor, Preprocessor
-from ray.rllib.offline import NoopOutput, IOContext, OutputWriter, InputReader
+from ray.rllib.offline import NoopOutput, IOContext, OutputWriter, \
+    InputReader, PrefetchedInput
+from ray.rllib.offline.input_reader import InputReaderMetrics
 from ray.rllib.offline.off_policy_estimator import OffPolicyEstimator, \
     OffPolicyEstimate
 from ray.rllib.offline.is_estimator import ImportanceSamplingEstimator
@@ -48,6 +50,8 @@ from ray.util.iter import ParallelIteratorWorker
 
 if TYPE_CHECKING:
     from ray.rllib.evaluation.observation_function import ObservationFunction
+    from ray.rllib.evaluation.weights_broadcast import RelayTree, \
+        WeightsUpdate
     from ray.rllib.agents.callbacks import DefaultCallbacks
 
 # Generic type var for foreach_* methods.
@@ -171,7 +175,7 @@ class RolloutWorker(ParallelIteratorWorker):
             input_evaluation: List[str] = frozenset([]),
             output_creator: Callable[
                 [IOContext], OutputWriter] = lambda ioctx: NoopOutput(),
-            remote_worker_envs: bool = False,
+            remote_worker_envs: Union[bool, str] = False,
             remote_env_batch_wait_ms: int = 0,
             soft_horizon: bool = False,
             no_done_at_end: bool = False,
@@ -286,6 +290,9 @@ class RolloutWorker(ParallelIteratorWorker):
                 in the current process. This adds overheads, but can make sense
                 if your envs are expensive to step/reset (e.g., for StarCraft).
                 Use this cautiously, overheads are significant!
+                If "subprocess", step single-agent gym envs in subprocesses
+                sharing an observation buffer with this worker (see
+                SubprocVectorEnv), which has much lower overheads.
             remote_env_batch_wait_ms (float): Timeout that remote workers
                 are waiting when polling environments. 0 (continue when at
                 least one env is ready) is a reasonable default, but optimal
@@ -374,6 +381,9 @@ class RolloutWorker(ParallelIteratorWorker):
         self.last_batch: SampleBatchType = None
         self.global_vars: dict = None
         self.fake_sampler: bool = fake_sampler
+        # The weights version of each policy, as set by the last
+        # `apply_weights_update()` call (None if set by other means).
+        self._weights_seq_nos: Dict[PolicyID, int] = {}
 
         # No Env will be used in this particular worker (not needed).
         if worker_index == 0 and num_workers > 0 and \
@@ -644,8 +654,10 @@ class RolloutWorker(ParallelIteratorWorker):
                 no_done_at_end=no_done_at_end,
                 observation_fn=observation_fn,
                 sample_collector_class=policy_config.get(
-                    "sample_collector_class"),
+                    "sample_collector"),
                 render=render,
+                vectorized_sampling=policy_config.get(
+                    "vectorized_sampling", False),
             )
             # Start the Sampler thread.
             self.sampler.start()
@@ -669,8 +681,10 @@ class RolloutWorker(ParallelIteratorWorker):
                 no_done_at_end=no_done_at_end,
                 observation_fn=observation_fn,
                 sample_collector_class=policy_config.get(
-                    "sample_collector_class"),
+                    "sample_collector"),
                 render=render,
+                vectorized_sampling=policy_config.get(
+                    "vectorized_sampling", False),
             )
 
         self.input_reader: InputReader = input_creator(self.io_context)
@@ -788,9 +802,52 @@ class RolloutWorker(ParallelIteratorWorker):
         """
         for pid, w in weights.items():
             self.policy_map[pid].set_weights(w)
+            self._weights_seq_nos.pop(pid, None)
         if global_vars:
             self.set_global_vars(global_vars)
 
+    @DeveloperAPI
+    def apply_weights_update(self,
+                             update: "WeightsUpdate",
+                             global_vars: dict = None,
+                             relay_to: Optional["RelayTree"] = None) -> None:
+        """Applies a versioned weights update sent by a WeightsBroadcaster.
+
+        Full updates are always applied. Delta updates are skipped for
+        policies that already hold the update's version, and replaced by the
+        update's full weights if this worker doesn't hold their base version
+        (e.g. because its weights were set by other means since).
+
+        Args:
+            update (WeightsUpdate): The update to apply.
+            global_vars (dict): Optional global vars to set.
+            relay_to (Optional[RelayTree]): Workers to forward the update
+                to, each along with the workers it should forward to in turn.
+        """
+        if relay_to:
+            update_ref = ray.put(update)
+            for worker, children in relay_to:
+                worker.apply_weights_update.remote(update_ref, global_vars,
+                                                   children)
+
+        full_update = None
+        weights = {}
+        seq_nos = {}
+        for pid, policy_update in update.policies.items():
+            seq_no = self._weights_seq_nos.get(pid)
+            if policy_update.base_seq_no is not None:
+                if policy_update.seq_no == seq_no:
+                    continue
+                if policy_update.base_seq_no != seq_no:
+                    if full_update is None:
+                        full_update = ray.get(update.full_update)
+                    policy_update = full_update.policies[pid]
+            weights[pid] = policy_update.decode(
+                self.policy_map[pid].get_weights())
+            seq_nos[pid] = policy_update.seq_no
+        self.set_weights(weights, global_vars)
+        self._weights_seq_nos.update(seq_nos)
+
     @DeveloperAPI
     def compute_gradients(
             self, samples: SampleBatchType) -> Tuple[ModelGradients, dict]:
@@ -939,7 +996,8 @@ class RolloutWorker(ParallelIteratorWorker):
         return info, batch.count
 
     @DeveloperAPI
-    def get_metrics(self) -> List[Union[RolloutMetrics, OffPolicyEstimate]]:
+    def get_metrics(self) -> List[Union[RolloutMetrics, OffPolicyEstimate,
+                                        InputReaderMetrics]]:
         """Returns a list of new RolloutMetric objects from evaluation."""
 
         # Get metrics from sampler (if any).
@@ -950,6 +1008,9 @@ class RolloutWorker(ParallelIteratorWorker):
         # Get metrics from our reward-estimators (if any).
         for m in self.reward_estimators:
             out.extend(m.get_metrics())
+        # Get prefetching stats from our input reader (if any).
+        if isinstance(self.input_reader, PrefetchedInput):
+            out.extend(self.input_reader.get_metrics())
 
         return out
 
@@ -1060,6 +1121,7 @@ class RolloutWorker(ParallelIteratorWorker):
         self.sync_filters(objs["filters"])
         for pid, state in objs["state"].items():
             self.policy_map[pid].set_state(state)
+            self._weights_seq_nos.pop(pid, None)
 
     @DeveloperAPI
     def set_global_vars(self, global_vars: dict) -> None:
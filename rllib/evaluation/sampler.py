@@ -17,12 +17,14 @@ from ray.rllib.evaluation.episode import MultiAgentEpisode
 from ray.rllib.evaluation.rollout_metrics import RolloutMetrics
 from ray.rllib.evaluation.sample_batch_builder import \
     MultiAgentSampleBatchBuilder
-from ray.rllib.env.base_env import BaseEnv, ASYNC_RESET_RETURN
+from ray.rllib.env.base_env import BaseEnv, ASYNC_RESET_RETURN, \
+    _DUMMY_AGENT_ID, _VectorEnvToBaseEnv
 from ray.rllib.env.wrappers.atari_wrappers import get_wrapper_by_cls, \
     MonitorEnv
 from ray.rllib.models.preprocessors import Preprocessor
 from ray.rllib.offline import InputReader
 from ray.rllib.policy.policy import clip_action, Policy
+from ray.rllib.policy.sample_batch import SampleBatch
 from ray.rllib.utils.annotations import override, DeveloperAPI
 from ray.rllib.utils.debug import summarize
 from ray.rllib.utils.filter import Filter
@@ -146,6 +148,7 @@ class SyncSampler(SamplerInput):
             observation_fn: "ObservationFunction" = None,
             sample_collector_class: Optional[Type[SampleCollector]] = None,
             render: bool = False,
+            vectorized_sampling: bool = False,
     ):
         """Initializes a SyncSampler object.
 
@@ -188,6 +191,8 @@ class SyncSampler(SamplerInput):
                 and retrieve environment-, model-, and sampler data.
             render (bool): Whether to try to render the environment after each
                 step.
+            vectorized_sampling (bool): Whether to sample single-agent
+                VectorEnvs through the vectorized fast path, if possible.
         """
 
         self.base_env = BaseEnv.to_base_env(env)
@@ -217,7 +222,7 @@ class SyncSampler(SamplerInput):
             self.preprocessors, self.obs_filters, clip_rewards, clip_actions,
             multiple_episodes_in_batch, callbacks, tf_sess, self.perf_stats,
             soft_horizon, no_done_at_end, observation_fn,
-            self.sample_collector, self.render)
+            self.sample_collector, self.render, vectorized_sampling)
         self.metrics_queue = queue.Queue()
 
     @override(SamplerInput)
@@ -282,6 +287,7 @@ class AsyncSampler(threading.Thread, SamplerInput):
             observation_fn: "ObservationFunction" = None,
             sample_collector_class: Optional[Type[SampleCollector]] = None,
             render: bool = False,
+            vectorized_sampling: bool = False,
     ):
         """Initializes a AsyncSampler object.
 
@@ -328,6 +334,8 @@ class AsyncSampler(threading.Thread, SamplerInput):
                 and retrieve environment-, model-, and sampler data.
             render (bool): Whether to try to render the environment after each
                 step.
+            vectorized_sampling (bool): Whether to sample single-agent
+                VectorEnvs through the vectorized fast path, if possible.
         """
         for _, f in obs_filters.items():
             assert getattr(f, "is_concurrent", False), \
@@ -357,6 +365,7 @@ class AsyncSampler(threading.Thread, SamplerInput):
         self.shutdown = False
         self.observation_fn = observation_fn
         self.render = render
+        self.vectorized_sampling = vectorized_sampling
         if not sample_collector_class:
             sample_collector_class = SimpleListCollector
         self.sample_collector = sample_collector_class(
@@ -390,7 +399,7 @@ class AsyncSampler(threading.Thread, SamplerInput):
             self.clip_actions, self.multiple_episodes_in_batch, self.callbacks,
             self.tf_sess, self.perf_stats, self.soft_horizon,
             self.no_done_at_end, self.observation_fn, self.sample_collector,
-            self.render)
+            self.render, self.vectorized_sampling)
         while not self.shutdown:
             # The timeout variable exists because apparently, if one worker
             # dies, the other workers won't die with it, unless the timeout is
@@ -456,6 +465,7 @@ def _env_runner(
         observation_fn: "ObservationFunction",
         sample_collector: Optional[SampleCollector] = None,
         render: bool = None,
+        vectorized_sampling: bool = False,
 ) -> Iterable[SampleBatchType]:
     """This implements the common experience collection logic.
 
@@ -495,6 +505,8 @@ def _env_runner(
             SampleCollector object to use.
         render (bool): Whether to try to render the environment after each
             step.
+        vectorized_sampling (bool): Whether to use `_vectorized_env_runner`
+            for single-agent VectorEnvs, if possible.
 
     Yields:
         rollout (SampleBatch): Object containing state, action, reward,
@@ -577,6 +589,32 @@ def _env_runner(
     active_episodes: Dict[str, MultiAgentEpisode] = \
         NewEpisodeDefaultDict(new_episode)
 
+    # Single-agent VectorEnvs (with a single, non-recurrent policy only
+    # looking at the current observation) can skip the per-env/per-agent
+    # dict plumbing below and are evaluated on one contiguous obs array.
+    if vectorized_sampling and not render and _supports_vectorized_fast_path(
+            base_env=base_env,
+            policies=policies,
+            observation_fn=observation_fn,
+            sample_collector=sample_collector):
+        yield from _vectorized_env_runner(
+            worker=worker,
+            base_env=base_env,
+            policies=policies,
+            active_episodes=active_episodes,
+            horizon=horizon,
+            preprocessors=preprocessors,
+            obs_filters=obs_filters,
+            clip_actions=clip_actions,
+            multiple_episodes_in_batch=multiple_episodes_in_batch,
+            callbacks=callbacks,
+            perf_stats=perf_stats,
+            soft_horizon=soft_horizon,
+            no_done_at_end=no_done_at_end,
+            sample_collector=sample_collector,
+        )
+        return
+
     while True:
         perf_stats.iters += 1
         t0 = time.time()
@@ -675,6 +713,288 @@ def _env_runner(
             perf_stats.env_render_time += time.time() - t5
 
 
+def _supports_vectorized_fast_path(
+        *,
+        base_env: BaseEnv,
+        policies: Dict[PolicyID, Policy],
+        observation_fn: Optional["ObservationFunction"],
+        sample_collector: SampleCollector,
+) -> bool:
+    """Returns whether `_vectorized_env_runner` can be used for sampling.
+
+    This is the case for single-agent VectorEnvs, a single policy that is
+    not recurrent and whose model only requires the current observation for
+    computing actions, no custom observation function, and a
+    SimpleListCollector (or subclass) for collecting samples.
+    """
+    if not isinstance(base_env, _VectorEnvToBaseEnv) or \
+            observation_fn is not None or len(policies) != 1 or \
+            not isinstance(sample_collector, SimpleListCollector):
+        return False
+    policy = next(iter(policies.values()))
+    if policy.is_recurrent():
+        return False
+    view_reqs = policy.model.view_requirements if \
+        getattr(policy, "model", None) else policy.view_requirements
+    inference_cols = [
+        k for k, v in view_reqs.items() if v.used_for_compute_actions
+    ]
+    if inference_cols != [SampleBatch.OBS]:
+        return False
+    obs_req = view_reqs[SampleBatch.OBS]
+    return obs_req.data_col in [None, SampleBatch.OBS] and \
+        obs_req.shift == 0 and obs_req.shift_from is None
+
+
+def _vectorized_env_runner(
+        *,
+        worker: "RolloutWorker",
+        base_env: "_VectorEnvToBaseEnv",
+        policies: Dict[PolicyID, Policy],
+        active_episodes: Dict[str, MultiAgentEpisode],
+        horizon: int,
+        preprocessors: Dict[PolicyID, Preprocessor],
+        obs_filters: Dict[PolicyID, Filter],
+        clip_actions: bool,
+        multiple_episodes_in_batch: bool,
+        callbacks: "DefaultCallbacks",
+        perf_stats: _PerfStats,
+        soft_horizon: bool,
+        no_done_at_end: bool,
+        sample_collector: SimpleListCollector,
+) -> Iterable[SampleBatchType]:
+    """Fast path of `_env_runner` for single-agent VectorEnvs.
+
+    Talks to the underlying VectorEnv directly (lists indexed by env slot
+    instead of doubly keyed env-id/agent-id dicts), preprocesses the
+    observations of all sub-envs with one `Preprocessor.transform_batch()`
+    call per step, keeps the filtered observations of all sub-envs in one
+    contiguous array, computes actions for all sub-envs with a single call
+    on (a view of) this array and scatters the resulting actions back into
+    the action vector for `vector_step()`. Episode bookkeeping, callbacks
+    and sample collection are the same as in `_process_observations()` and
+    `_process_policy_eval_results()`.
+
+    See `_env_runner` for the args.
+
+    Yields:
+        rollout (SampleBatch): Object containing state, action, reward,
+            terminal condition, and other fields as dictated by `policy`.
+    """
+    vector_env = base_env.vector_env
+    num_envs = vector_env.num_envs
+    agent_id = _DUMMY_AGENT_ID
+    policy_id, policy = next(iter(policies.items()))
+    preprocessor = _get_or_raise(preprocessors, policy_id)
+    obs_filter = _get_or_raise(obs_filters, policy_id)
+    view_requirements = policy.view_requirements
+    all_env_ids = np.arange(num_envs)
+    # Filtered observations of all sub-envs (lazily allocated once the first
+    # observation's shape/dtype is known).
+    obs_batch: Optional[np.ndarray] = None
+
+    def process_obs(env_id, prep_obs):
+        nonlocal obs_batch
+        filtered_obs = obs_filter(prep_obs)
+        if obs_batch is None:
+            filtered_obs = np.asarray(filtered_obs)
+            obs_batch = np.zeros(
+                (num_envs, ) + filtered_obs.shape, dtype=filtered_obs.dtype)
+            if log_once("filtered_obs"):
+                logger.info("Filtered obs: {}".format(summarize(filtered_obs)))
+        obs_batch[env_id] = filtered_obs
+        return filtered_obs
+
+    t0 = time.time()
+    new_obs = vector_env.vector_reset()
+    rewards = [None] * num_envs
+    dones = [False] * num_envs
+    infos = [None] * num_envs
+    perf_stats.env_wait_time += time.time() - t0
+
+    while True:
+        perf_stats.iters += 1
+
+        # Process observations and prepare for policy evaluation.
+        t1 = time.time()
+        outputs: List[Union[RolloutMetrics, SampleBatchType]] = []
+        to_eval: List[int] = []
+        prep_obs_batch = preprocessor.transform_batch(new_obs)
+        for env_id in range(num_envs):
+            is_new_episode: bool = env_id not in active_episodes
+            episode: MultiAgentEpisode = active_episodes[env_id]
+
+            if not is_new_episode:
+                sample_collector.episode_step(episode)
+                episode._add_agent_rewards({agent_id: rewards[env_id]})
+
+            # Check episode termination conditions.
+            done = dones[env_id]
+            if done or episode.length >= horizon:
+                hit_horizon = episode.length >= horizon and not done
+                all_agents_done = True
+                atari_metrics: List[RolloutMetrics] = _fetch_atari_metrics(
+                    base_env)
+                if atari_metrics is not None:
+                    for m in atari_metrics:
+                        outputs.append(
+                            m._replace(custom_metrics=episode.custom_metrics))
+                else:
+                    outputs.append(
+                        RolloutMetrics(episode.length, episode.total_reward,
+                                       dict(episode.agent_rewards),
+                                       episode.custom_metrics, {},
+                                       episode.hist_data, episode.media))
+            else:
+                hit_horizon = False
+                all_agents_done = False
+
+            last_observation: EnvObsType = episode.last_observation_for(
+                agent_id)
+            # A new agent (initial obs) is already done -> Skip entirely.
+            if last_observation is not None or not all_agents_done:
+                raw_obs = new_obs[env_id]
+                policy_id = episode.policy_for(agent_id)
+                filtered_obs = process_obs(env_id, prep_obs_batch[env_id])
+                episode._set_last_observation(agent_id, filtered_obs)
+                episode._set_last_raw_obs(agent_id, raw_obs)
+                agent_infos = infos[env_id]
+                episode._set_last_info(agent_id, agent_infos)
+
+                if last_observation is None:
+                    sample_collector.add_init_obs(
+                        episode, agent_id, env_id, policy_id,
+                        episode.length - 1, filtered_obs)
+                else:
+                    values_dict = {
+                        "t": episode.length - 1,
+                        "env_id": env_id,
+                        "agent_index": episode._agent_index(agent_id),
+                        "actions": episode.last_action_for(agent_id),
+                        "rewards": rewards[env_id],
+                        "dones": (False if (no_done_at_end or
+                                            (hit_horizon and soft_horizon))
+                                  else all_agents_done),
+                        "new_obs": filtered_obs,
+                    }
+                    for key, value in episode.last_pi_info_for(
+                            agent_id).items():
+                        if key in view_requirements:
+                            values_dict[key] = value
+                    if "infos" in view_requirements:
+                        values_dict["infos"] = agent_infos
+                    sample_collector.add_action_reward_next_obs(
+                        episode.episode_id, agent_id, env_id, policy_id,
+                        all_agents_done, values_dict)
+
+                if not all_agents_done:
+                    to_eval.append(env_id)
+
+            if episode.length > 0:
+                callbacks.on_episode_step(
+                    worker=worker,
+                    base_env=base_env,
+                    episode=episode,
+                    env_index=env_id)
+
+            if all_agents_done:
+                check_dones = done and not no_done_at_end
+                ma_sample_batch = sample_collector.postprocess_episode(
+                    episode,
+                    is_done=done or (hit_horizon and not soft_horizon),
+                    check_dones=check_dones,
+                    build=not multiple_episodes_in_batch)
+                if ma_sample_batch:
+                    outputs.append(ma_sample_batch)
+
+                for p in policies.values():
+                    if getattr(p, "exploration", None) is not None:
+                        p.exploration.on_episode_end(
+                            policy=p,
+                            environment=base_env,
+                            episode=episode,
+                            tf_sess=getattr(p, "_sess", None))
+                callbacks.on_episode_end(
+                    worker=worker,
+                    base_env=base_env,
+                    policies=policies,
+                    episode=episode,
+                    env_index=env_id,
+                )
+                if hit_horizon and soft_horizon:
+                    episode.soft_reset()
+                    prep_obs = prep_obs_batch[env_id]
+                else:
+                    del active_episodes[env_id]
+                    prep_obs = preprocessor.transform(
+                        vector_env.reset_at(env_id))
+                new_episode: MultiAgentEpisode = active_episodes[env_id]
+                policy_id = new_episode.policy_for(agent_id)
+                filtered_obs = process_obs(env_id, prep_obs)
+                new_episode._set_last_observation(agent_id, filtered_obs)
+                sample_collector.add_init_obs(new_episode, agent_id, env_id,
+                                              policy_id,
+                                              new_episode.length - 1,
+                                              filtered_obs)
+                to_eval.append(env_id)
+
+        if multiple_episodes_in_batch:
+            sample_batches = (sample_collector.
+                              try_build_truncated_episode_multi_agent_batch())
+            if sample_batches:
+                outputs.extend(sample_batches)
+        perf_stats.raw_obs_processing_time += time.time() - t1
+        for o in outputs:
+            yield o
+
+        # Compute actions for all sub-envs at once, directly on the obs
+        # array (instead of gathering the inputs from the collector).
+        t2 = time.time()
+        # Note: The obs array is reused, so always hand out a copy.
+        if len(to_eval) == num_envs:
+            eval_env_ids = all_env_ids
+            input_obs = obs_batch.copy()
+        else:
+            eval_env_ids = np.array(to_eval, dtype=np.int64)
+            input_obs = obs_batch[eval_env_ids]
+        input_dict = SampleBatch({SampleBatch.OBS: input_obs})
+        sample_collector._reset_inference_calls(policy_id)
+        actions, _, pi_info_cols = policy.compute_actions_from_input_dict(
+            input_dict,
+            timestep=policy.global_timestep,
+            episodes=[active_episodes[i] for i in eval_env_ids])
+        perf_stats.inference_time += time.time() - t2
+
+        # Scatter actions back to the sub-envs and update episode state.
+        t3 = time.time()
+        actions = convert_to_numpy(actions)
+        if isinstance(actions, list):
+            actions = np.array(actions)
+        # Clipping works on the whole batch at once (Box bounds broadcast
+        # over the batch dim).
+        clipped_actions = clip_action(actions, policy.action_space_struct) \
+            if clip_actions else actions
+        if isinstance(actions, np.ndarray):
+            actions, clipped_actions = list(actions), list(clipped_actions)
+        else:
+            actions = unbatch(actions)
+            clipped_actions = unbatch(clipped_actions)
+        action_vector = [None] * num_envs
+        for i, env_id in enumerate(eval_env_ids):
+            episode = active_episodes[env_id]
+            episode._set_rnn_state(agent_id, [])
+            episode._set_last_pi_info(
+                agent_id, {k: v[i]
+                           for k, v in pi_info_cols.items()})
+            episode._set_last_action(agent_id, actions[i])
+            action_vector[env_id] = clipped_actions[i]
+        perf_stats.action_processing_time += time.time() - t3
+
+        t4 = time.time()
+        new_obs, rewards, dones, infos = vector_env.vector_step(action_vector)
+        perf_stats.env_wait_time += time.time() - t4
+
+
 def _process_observations(
         *,
         worker: "RolloutWorker",
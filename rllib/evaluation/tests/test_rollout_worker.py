@@ -6,11 +6,18 @@ import os
 import random
 import time
 import unittest
+from unittest.mock import patch
 
 import ray
-from ray.rllib.agents.pg import PGTrainer
+from ray.rllib.agents.pg import PGTFPolicy, PGTorchPolicy, PGTrainer
 from ray.rllib.agents.a3c import A2CTrainer
+from ray.rllib.env.subproc_vector_env import SubprocVectorEnv
 from ray.rllib.env.vector_env import VectorEnv
+from ray.rllib.evaluation import sampler
+from ray.rllib.evaluation.collectors.preallocated_collector import \
+    PreallocatedCollector
+from ray.rllib.evaluation.collectors.simple_list_collector import \
+    SimpleListCollector
 from ray.rllib.evaluation.rollout_worker import RolloutWorker
 from ray.rllib.evaluation.metrics import collect_metrics
 from ray.rllib.evaluation.postprocessing import compute_advantages
@@ -22,6 +29,7 @@ from ray.rllib.execution.common import STEPS_SAMPLED_COUNTER, \
 from ray.rllib.policy.policy import Policy
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, MultiAgentBatch, \
     SampleBatch
+from ray.rllib.policy.view_requirement import ViewRequirement
 from ray.rllib.utils.annotations import override
 from ray.rllib.utils.test_utils import check, framework_iterator
 from ray.tune.registry import register_env
@@ -51,6 +59,33 @@ class MockPolicy(RandomPolicy):
             batch, 100.0, 0.9, use_gae=False, use_critic=False)
 
 
+class ConstantActionPolicy(MockPolicy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Like most models, compute actions from the observations only, so
+        # that all other columns are created from the first collected values.
+        for col, view_req in self.view_requirements.items():
+            if col != SampleBatch.OBS:
+                view_req.used_for_compute_actions = False
+        self.view_requirements["prev_obs"] = ViewRequirement(
+            data_col=SampleBatch.OBS,
+            shift=-1,
+            space=self.observation_space,
+            used_for_compute_actions=False)
+
+    @override(MockPolicy)
+    def compute_actions(self,
+                        obs_batch,
+                        state_batches=None,
+                        prev_action_batch=None,
+                        prev_reward_batch=None,
+                        episodes=None,
+                        explore=None,
+                        timestep=None,
+                        **kwargs):
+        return np.ones(len(obs_batch), dtype=np.int64), [], {}
+
+
 class BadPolicy(RandomPolicy):
     @override(RandomPolicy)
     def compute_actions(self,
@@ -109,6 +144,20 @@ class MockVectorEnv(VectorEnv):
         return self.envs
 
 
+class _StepRewardEnv(MockEnv2):
+    """MockEnv2 with reward=ts (optionally NaN on the first step)."""
+
+    def __init__(self, episode_length, nan_on_first_step=False):
+        super().__init__(episode_length)
+        self.nan_on_first_step = nan_on_first_step
+
+    def step(self, action):
+        obs, _, done, info = super().step(action)
+        if self.nan_on_first_step and self.i == 1:
+            return obs, float("nan"), done, info
+        return obs, float(self.i), done, info
+
+
 class TestRolloutWorker(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -477,6 +526,144 @@ class TestRolloutWorker(unittest.TestCase):
         self.assertEqual(result["episodes_this_iter"], 4)
         ev.stop()
 
+    def test_preallocated_collector(self):
+        workers = [
+            RolloutWorker(
+                env_creator=lambda _: MockEnv2(episode_length=7),
+                policy_spec=MockPolicy,
+                policy_config={"sample_collector": collector_cls},
+                batch_mode="truncate_episodes",
+                rollout_fragment_length=5,
+                num_envs=4)
+            for collector_cls in [SimpleListCollector, PreallocatedCollector]
+        ]
+        self.assertIsInstance(workers[1].sampler.sample_collector,
+                              PreallocatedCollector)
+        for _ in range(10):
+            expected, batch = [ev.sample() for ev in workers]
+            self.assertEqual(batch.count, 20)
+            for key in ["obs", "new_obs", "rewards", "dones", "advantages"]:
+                check(batch[key], expected[key])
+        for ev in workers:
+            ev.stop()
+
+    def test_preallocated_collector_prev_actions_rewards(self):
+        # The first obs, action (1) and reward (100.0) are nonzero and must
+        # not leak into the 0-padded prev obs/actions/rewards of later
+        # episodes.
+        workers = [
+            RolloutWorker(
+                env_creator=lambda _: MockEnv2(episode_length=3),
+                policy_spec=ConstantActionPolicy,
+                policy_config={"sample_collector": collector_cls},
+                batch_mode="truncate_episodes",
+                rollout_fragment_length=5,
+                num_envs=4)
+            for collector_cls in [SimpleListCollector, PreallocatedCollector]
+        ]
+        for _ in range(5):
+            expected, batch = [ev.sample() for ev in workers]
+            for key in [
+                    "actions", "rewards", "prev_obs", "prev_actions",
+                    "prev_rewards"
+            ]:
+                self.assertEqual(batch[key].dtype, expected[key].dtype)
+            # Note: SimpleListCollector pads Python float rewards with the
+            # episode's first reward (instead of 0.0).
+            for key in ["actions", "rewards", "prev_obs", "prev_actions"]:
+                check(batch[key], expected[key])
+            episode_start = batch["t"] == 0
+            self.assertTrue(episode_start.any())
+            check(batch["prev_obs"][episode_start], 0.0)
+            check(batch["prev_actions"][episode_start], 0)
+            check(batch["prev_actions"][~episode_start], 1)
+            check(batch["prev_rewards"][episode_start], 0.0)
+            check(batch["prev_rewards"][~episode_start], 100.0)
+        for ev in workers:
+            ev.stop()
+
+    def test_subprocess_vectorization(self):
+        workers = [
+            RolloutWorker(
+                env_creator=lambda _: MockEnv2(episode_length=7),
+                policy_spec=MockPolicy,
+                batch_mode="truncate_episodes",
+                rollout_fragment_length=5,
+                num_envs=4,
+                remote_worker_envs=remote_worker_envs)
+            for remote_worker_envs in [False, "subprocess"]
+        ]
+        self.assertIsInstance(workers[1].async_env.vector_env,
+                              SubprocVectorEnv)
+        for _ in range(10):
+            expected, batch = [ev.sample() for ev in workers]
+            self.assertEqual(batch.count, 20)
+            for key in ["obs", "new_obs", "rewards", "dones"]:
+                check(batch[key], expected[key])
+        result = collect_metrics(workers[1], [])
+        self.assertEqual(result["episodes_this_iter"], 28)
+        processes = workers[1].async_env.vector_env._processes
+        for ev in workers:
+            ev.stop()
+        for process in processes:
+            self.assertFalse(process.is_alive())
+
+    def test_subprocess_vector_env_bad_reward(self):
+        env = SubprocVectorEnv(
+            lambda i: _StepRewardEnv(7, nan_on_first_step=i == 0),
+            num_envs=4,
+            observation_space=Discrete(100),
+            action_space=Discrete(2),
+            num_processes=2)
+        env.vector_reset()
+        with self.assertRaisesRegex(ValueError, "Reward should be finite"):
+            env.vector_step([0] * 4)
+        # The replies of the other process were not left in its pipe.
+        for t in [2, 3]:
+            obs, rewards, _, _ = env.vector_step([0] * 4)
+            self.assertEqual(list(obs), [t] * 4)
+            self.assertEqual(rewards, [float(t)] * 4)
+        env.stop()
+
+    def test_vectorized_fast_path(self):
+        for fw in framework_iterator(frameworks=("torch", "tf")):
+            # Only the second worker uses the vectorized fast path.
+            workers = [
+                RolloutWorker(
+                    env_creator=lambda _: MockEnv2(episode_length=7),
+                    policy_spec=PGTorchPolicy
+                    if fw == "torch" else PGTFPolicy,
+                    policy_config={
+                        "explore": False,
+                        "framework": fw,
+                        "vectorized_sampling": vectorized_sampling
+                    },
+                    batch_mode="truncate_episodes",
+                    rollout_fragment_length=5,
+                    num_envs=4) for vectorized_sampling in [False, True]
+            ]
+            workers[1].set_weights(workers[0].get_weights())
+            self.assertTrue(
+                sampler._supports_vectorized_fast_path(
+                    base_env=workers[1].async_env,
+                    policies=workers[1].policy_map,
+                    observation_fn=None,
+                    sample_collector=workers[1].sampler.sample_collector))
+            with patch.object(
+                    sampler, "_vectorized_env_runner",
+                    wraps=sampler._vectorized_env_runner) as fast_path:
+                # The env runner decides on its first step which path to take.
+                for ev in workers:
+                    ev.sample()
+                self.assertEqual(fast_path.call_count, 1)
+            for _ in range(10):
+                expected, batch = [ev.sample() for ev in workers]
+                self.assertEqual(batch.count, 20)
+                for key in ["obs", "actions", "rewards", "dones"]:
+                    check(batch[key], expected[key])
+            for ev in workers:
+                ev.stop()
+
     def test_vector_env_support(self):
         ev = RolloutWorker(
             env_creator=lambda _: MockVectorEnv(episode_length=20, num_envs=8),
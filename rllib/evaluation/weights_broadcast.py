@@ -0,0 +1,409 @@
+import numpy as np
+import time
+import tree  # pip install dm_tree
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import ray
+from ray.actor import ActorHandle
+from ray.rllib.utils.annotations import DeveloperAPI
+from ray.rllib.utils.typing import ModelWeights, PolicyID
+
+# A relay tree: List of (worker, the worker's own relay tree) tuples.
+RelayTree = List[Tuple[ActorHandle, Any]]
+
+
+@DeveloperAPI
+class PolicyWeightsUpdate:
+    """A (possibly partial and compressed) version of a policy's weights.
+
+    The weights are stored as a dict mapping indices into the flattened
+    (`tree.flatten`) weights structure to the new values of these leaves.
+    A full update contains all leaves, a delta update only the leaves that
+    changed since version `base_seq_no`.
+    """
+
+    def __init__(self,
+                 seq_no: int,
+                 leaves: Dict[int, Any],
+                 base_seq_no: Optional[int] = None,
+                 dtypes: Optional[Dict[int, np.dtype]] = None):
+        """Initializes a PolicyWeightsUpdate.
+
+        Args:
+            seq_no (int): The version of the weights after this update.
+            leaves (Dict[int, Any]): Flattened leaf index to new leaf value.
+            base_seq_no (Optional[int]): The version this update is a delta
+                against. None for full updates.
+            dtypes (Optional[Dict[int, np.dtype]]): The original dtypes of
+                the leaves that were cast to a smaller dtype for sending.
+        """
+        self.seq_no = seq_no
+        self.leaves = leaves
+        self.base_seq_no = base_seq_no
+        self.dtypes = dtypes or {}
+
+    def decode(self, current: ModelWeights) -> ModelWeights:
+        """Applies this update to a policy's current weights.
+
+        Args:
+            current (ModelWeights): The weights (as returned by
+                `Policy.get_weights()`) to apply the update to. Defines the
+                structure of the returned weights.
+
+        Returns:
+            ModelWeights: The updated weights.
+        """
+        flat = tree.flatten(current)
+        for i, leaf in self.leaves.items():
+            if i in self.dtypes:
+                leaf = leaf.astype(self.dtypes[i])
+            flat[i] = leaf
+        return tree.unflatten_as(current, flat)
+
+    def size_bytes(self) -> int:
+        return sum(
+            leaf.nbytes for leaf in self.leaves.values()
+            if isinstance(leaf, np.ndarray))
+
+
+@DeveloperAPI
+class WeightsUpdate:
+    """A weights update for (some of) the policies of a RolloutWorker."""
+
+    def __init__(self,
+                 policies: Dict[PolicyID, PolicyWeightsUpdate],
+                 full_update: Optional["ray.ObjectRef"] = None):
+        """Initializes a WeightsUpdate.
+
+        Args:
+            policies (Dict[PolicyID, PolicyWeightsUpdate]): The per-policy
+                updates.
+            full_update (Optional[ray.ObjectRef]): If some of the policy
+                updates are deltas, a reference to a WeightsUpdate holding
+                the full weights of the same version. Workers that do not
+                hold the base version of a delta fetch this instead. An
+                empty delta against its own version checks that a worker
+                still holds that version.
+        """
+        self.policies = policies
+        self.full_update = full_update
+
+    def size_bytes(self) -> int:
+        return sum(u.size_bytes() for u in self.policies.values())
+
+
+@DeveloperAPI
+class WeightsBroadcaster:
+    """Broadcasts the local worker's weights to the remote workers.
+
+    Each broadcast version gets a sequence number per policy, and the
+    version each remote worker holds is tracked, so that:
+
+    - With `delta=True`, the weights are compared against the previously
+      broadcast version. If nothing changed, no weights are sent to workers
+      that hold that version (they only check their version). Otherwise only
+      the changed tensors are sent to workers that hold the previous version.
+    - With `dtype` set (e.g. "float16"), floating point tensors are cast to
+      that dtype for sending and cast back on the workers.
+    - With `fanout > 0`, the driver only sends the update to `fanout`
+      workers, each of which forwards it to up to `fanout` other workers,
+      and so on, so that the driver's egress no longer grows with the
+      number of workers.
+
+    Without any of these options, a broadcast is a plain
+    `set_weights.remote()` on all workers.
+
+    The versions held by the workers are verified by the workers themselves,
+    which reset them whenever their weights are set by other means (e.g.
+    `set_weights()` or `restore()`). Call `invalidate()` to send the full
+    weights to workers that may have changed their weights in other ways.
+    """
+
+    def __init__(self,
+                 delta: bool = False,
+                 dtype: Optional[str] = None,
+                 fanout: int = 0):
+        """Initializes a WeightsBroadcaster.
+
+        Args:
+            delta (bool): Whether to only send changed tensors and skip
+                up-to-date workers.
+            dtype (Optional[str]): Floating point dtype to cast weights to
+                for sending. None for no casting.
+            fanout (int): Fanout of the relay tree. 0 to send to all workers
+                from the driver.
+        """
+        if dtype is not None and \
+                not np.issubdtype(np.dtype(dtype), np.floating):
+            raise ValueError(
+                "`weights_sync_dtype` must be a floating point dtype (e.g. "
+                "'float16') or None, got {}!".format(dtype))
+        if fanout < 0:
+            raise ValueError("`weights_sync_fanout` must be >= 0, got "
+                             "{}!".format(fanout))
+        self.delta = delta
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.fanout = fanout
+
+        # Current version and last broadcast (flattened) weights per policy.
+        self._seq_nos = defaultdict(int)
+        self._snapshots = {}
+        # The changed leaf indices (None for all) of the current version of
+        # each policy w.r.t. the previous version (seq_no - 1).
+        self._changed = {}
+        # Worker -> the version of each policy it holds.
+        self._worker_seq_nos = {}
+        # The versions and object store reference of the last full update.
+        self._full_update_seq_nos = None
+        self._full_update_ref = None
+
+        self._reset_metrics()
+
+    def broadcast(self,
+                  local_worker: "RolloutWorker",
+                  remote_workers: List[ActorHandle],
+                  policies: Optional[List[PolicyID]] = None,
+                  global_vars: Optional[dict] = None) -> None:
+        """Sends the local worker's weights to the given remote workers.
+
+        Args:
+            local_worker (RolloutWorker): The worker to get the weights from.
+            remote_workers (List[ActorHandle]): The workers to update.
+            policies (Optional[List[PolicyID]]): The policies to sync. None
+                for all policies.
+            global_vars (Optional[dict]): Global vars to set on the remote
+                workers along with the weights.
+        """
+        start = time.perf_counter()
+        weights = local_worker.get_weights(policies)
+
+        if not self.delta and self.dtype is None and not self.fanout:
+            weights_ref = ray.put(weights)
+            for w in remote_workers:
+                w.set_weights.remote(weights_ref, global_vars)
+            nbytes = sum(
+                leaf.nbytes for leaf in tree.flatten(weights)
+                if isinstance(leaf, np.ndarray))
+            self._metrics["num_full_updates"] += len(remote_workers)
+            self._record(start, nbytes * len(remote_workers),
+                         len(remote_workers), 0)
+            return
+
+        flat = {}
+        for pid, w in weights.items():
+            flat[pid] = tree.flatten(w)
+            self._update_version(pid, flat[pid])
+
+        # Drop workers that are no longer part of the WorkerSet.
+        self._worker_seq_nos = {
+            w: self._worker_seq_nos.get(w, {})
+            for w in remote_workers
+        }
+        # Group the workers by the update they need: Per policy, either
+        # nothing (None), a delta ("delta") or the full weights ("full").
+        groups = defaultdict(list)
+        for w in remote_workers:
+            held = self._worker_seq_nos[w]
+            key = []
+            for pid in weights:
+                if held.get(pid) == self._seq_nos[pid]:
+                    key.append(None)
+                elif self._changed[pid] is not None and \
+                        held.get(pid) == self._seq_nos[pid] - 1:
+                    key.append("delta")
+                else:
+                    key.append("full")
+            groups[tuple(key)].append(w)
+
+        full_updates = {}
+        nbytes = 0
+        num_updated = num_skipped = 0
+        for key, workers in groups.items():
+            updates = {}
+            for pid, kind in zip(weights, key):
+                if kind is None:
+                    # An empty delta against the current version, for the
+                    # workers to check that they still hold it.
+                    updates[pid] = PolicyWeightsUpdate(
+                        self._seq_nos[pid], {}, self._seq_nos[pid])
+                elif kind == "delta":
+                    updates[pid] = self._encode(pid, flat[pid],
+                                                self._changed[pid],
+                                                self._seq_nos[pid] - 1)
+                    self._metrics["num_delta_updates"] += len(workers)
+                elif kind == "full":
+                    if pid not in full_updates:
+                        full_updates[pid] = self._encode(pid, flat[pid])
+                    updates[pid] = full_updates[pid]
+                    self._metrics["num_full_updates"] += len(workers)
+            if not updates:
+                if global_vars:
+                    for w in workers:
+                        w.set_global_vars.remote(global_vars)
+                continue
+
+            # Workers that don't hold the base version of a delta (e.g.
+            # because their weights were set by other means in the meantime)
+            # fall back to fetching the full weights.
+            full_update_ref = None
+            if any(kind != "full" for kind in key):
+                full_update_ref = self._put_full_update(flat, full_updates)
+            update = WeightsUpdate(updates, full_update_ref)
+            update_ref = ray.put(update)
+            if self.fanout:
+                relay_tree = _build_relay_tree(workers, self.fanout)
+            else:
+                relay_tree = [(w, None) for w in workers]
+            for w, children in relay_tree:
+                w.apply_weights_update.remote(update_ref, global_vars,
+                                              children)
+            nbytes += update.size_bytes() * len(relay_tree)
+            if all(kind is None for kind in key):
+                num_skipped += len(workers)
+            else:
+                num_updated += len(workers)
+            for w in workers:
+                held = self._worker_seq_nos[w]
+                for pid in updates:
+                    held[pid] = self._seq_nos[pid]
+
+        self._record(start, nbytes, num_updated, num_skipped)
+
+    def invalidate(self, workers: Optional[List[ActorHandle]] = None) -> None:
+        """Forgets the versions held by the given workers.
+
+        The next broadcast sends them the full weights.
+
+        Args:
+            workers (Optional[List[ActorHandle]]): The workers whose
+                weights may have been changed. None for all workers.
+        """
+        if workers is None:
+            self._worker_seq_nos.clear()
+        else:
+            for w in workers:
+                self._worker_seq_nos.pop(w, None)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Returns broadcast stats collected since the last call.
+
+        Returns:
+            Dict[str, float]: The number of broadcasts, their mean and max
+                time on the driver, the number of bytes sent by the driver,
+                and the number of updated and skipped workers, as well as
+                full and delta updates.
+        """
+        metrics = dict(self._metrics)
+        num_syncs = max(metrics["num_syncs"], 1)
+        metrics["mean_sync_time_ms"] = \
+            1000 * metrics.pop("sync_time_s") / num_syncs
+        metrics["max_sync_time_ms"] = 1000 * metrics.pop("max_sync_time_s")
+        self._reset_metrics()
+        return metrics
+
+    def _update_version(self, pid: PolicyID, leaves: List[Any]) -> None:
+        prev = self._snapshots.get(pid)
+        if not self.delta or prev is None or len(prev) != len(leaves):
+            changed = None
+        else:
+            changed = [
+                i for i, (a, b) in enumerate(zip(prev, leaves))
+                if not _leaf_equal(a, b)
+            ]
+            if not changed:
+                return
+        self._seq_nos[pid] += 1
+        self._changed[pid] = changed
+        if self.delta:
+            # Copy, as e.g. torch CPU weights share memory with the model.
+            self._snapshots[pid] = [
+                np.copy(leaf) if isinstance(leaf, np.ndarray) else leaf
+                for leaf in leaves
+            ]
+
+    def _put_full_update(self, flat: Dict[PolicyID, List[Any]],
+                         full_updates: Dict[PolicyID, PolicyWeightsUpdate]
+                         ) -> "ray.ObjectRef":
+        # Reuse the last full update while none of the policies changed.
+        seq_nos = {pid: self._seq_nos[pid] for pid in flat}
+        if seq_nos != self._full_update_seq_nos:
+            for pid in flat:
+                if pid not in full_updates:
+                    full_updates[pid] = self._encode(pid, flat[pid])
+            self._full_update_ref = ray.put(
+                WeightsUpdate({pid: full_updates[pid]
+                               for pid in flat}))
+            self._full_update_seq_nos = seq_nos
+        return self._full_update_ref
+
+    def _encode(self,
+                pid: PolicyID,
+                leaves: List[Any],
+                indices: Optional[List[int]] = None,
+                base_seq_no: Optional[int] = None) -> PolicyWeightsUpdate:
+        if indices is None:
+            indices = range(len(leaves))
+        encoded = {}
+        dtypes = {}
+        for i in indices:
+            leaf = leaves[i]
+            if self.dtype is not None and isinstance(leaf, np.ndarray) \
+                    and np.issubdtype(leaf.dtype, np.floating) \
+                    and leaf.dtype.itemsize > self.dtype.itemsize:
+                dtypes[i] = leaf.dtype
+                leaf = leaf.astype(self.dtype)
+            encoded[i] = leaf
+        return PolicyWeightsUpdate(self._seq_nos[pid], encoded, base_seq_no,
+                                   dtypes)
+
+    def _record(self, start: float, nbytes: int, num_updated: int,
+                num_skipped: int) -> None:
+        elapsed = time.perf_counter() - start
+        self._metrics["num_syncs"] += 1
+        self._metrics["sync_time_s"] += elapsed
+        self._metrics["max_sync_time_s"] = max(
+            self._metrics["max_sync_time_s"], elapsed)
+        self._metrics["bytes_sent"] += nbytes
+        self._metrics["num_workers_updated"] += num_updated
+        self._metrics["num_workers_skipped"] += num_skipped
+
+    def _reset_metrics(self) -> None:
+        self._metrics = {
+            "num_syncs": 0,
+            "sync_time_s": 0.0,
+            "max_sync_time_s": 0.0,
+            "bytes_sent": 0,
+            "num_workers_updated": 0,
+            "num_workers_skipped": 0,
+            "num_full_updates": 0,
+            "num_delta_updates": 0,
+        }
+
+
+def _leaf_equal(a: Any, b: Any) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and \
+            a.shape == b.shape and a.dtype == b.dtype and \
+            np.array_equal(a, b)
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _build_relay_tree(workers: List[ActorHandle], fanout: int) -> RelayTree:
+    """Arranges workers into a tree with the driver as (implicit) root.
+
+    Worker i (0-based) relays to workers fanout * (i + 1) to
+    fanout * (i + 2) - 1, i.e. the driver sends to the first `fanout`
+    workers only.
+    """
+
+    def subtree(i):
+        first = fanout * (i + 1)
+        return [(workers[j], subtree(j))
+                for j in range(first, min(first + fanout, len(workers)))]
+
+    return [(workers[i], subtree(i)) for i in range(min(fanout,
+                                                        len(workers)))]
@@ -8,8 +8,9 @@ from ray.actor import ActorHandle
 from ray.rllib.utils.annotations import DeveloperAPI
 from ray.rllib.evaluation.rollout_worker import RolloutWorker, \
     _validate_multiagent_config
+from ray.rllib.evaluation.weights_broadcast import WeightsBroadcaster
 from ray.rllib.offline import NoopOutput, JsonReader, MixedInput, JsonWriter, \
-    ShuffledInput, D4RLReader
+    ShuffledInput, D4RLReader, PrefetchedInput
 from ray.rllib.env.env_context import EnvContext
 from ray.rllib.policy import Policy
 from ray.rllib.utils import merge_dicts
@@ -64,6 +65,10 @@ class WorkerSet:
         self._policy_class = policy_class
         self._remote_config = trainer_config
         self._logdir = logdir
+        self._weights_broadcaster = WeightsBroadcaster(
+            delta=trainer_config.get("weights_sync_delta", False),
+            dtype=trainer_config.get("weights_sync_dtype"),
+            fanout=trainer_config.get("weights_sync_fanout", 0))
 
         if _setup:
             self._local_config = merge_dicts(
@@ -107,12 +112,30 @@ class WorkerSet:
         """Return a list of remote rollout workers."""
         return self._remote_workers
 
-    def sync_weights(self) -> None:
-        """Syncs weights of remote workers with the local worker."""
+    def sync_weights(self,
+                     policies: Optional[List[PolicyID]] = None,
+                     global_vars: Optional[dict] = None) -> None:
+        """Syncs weights of remote workers with the local worker.
+
+        Depending on the `weights_sync_*` settings of the trainer config,
+        only changed weights are sent, weights are cast to a smaller dtype,
+        and/or relayed through a tree of remote workers (see
+        WeightsBroadcaster).
+
+        Args:
+            policies (Optional[List[PolicyID]]): The policies to sync. None
+                for all policies.
+            global_vars (Optional[dict]): Optional global vars to set on the
+                remote workers along with the weights.
+        """
         if self.remote_workers():
-            weights = ray.put(self.local_worker().get_weights())
-            for e in self.remote_workers():
-                e.set_weights.remote(weights)
+            self._weights_broadcaster.broadcast(self.local_worker(),
+                                                self.remote_workers(),
+                                                policies, global_vars)
+
+    def get_weights_sync_metrics(self) -> Dict[str, float]:
+        """Returns stats of the weights syncs since the last call."""
+        return self._weights_broadcaster.get_metrics()
 
     def add_workers(self, num_workers: int) -> None:
         """Creates and add a number of remote workers to this worker set.
@@ -141,6 +164,7 @@ class WorkerSet:
     def reset(self, new_remote_workers: List[ActorHandle]) -> None:
         """Called to change the set of remote workers."""
         self._remote_workers = new_remote_workers
+        self._weights_broadcaster.invalidate()
 
     def stop(self) -> None:
         """Stop all rollout workers."""
@@ -161,6 +185,8 @@ class WorkerSet:
         local_result = [func(self.local_worker())]
         remote_results = ray.get(
             [w.apply.remote(func) for w in self.remote_workers()])
+        # `func` may have changed the weights of the remote workers.
+        self._weights_broadcaster.invalidate()
         return local_result + remote_results
 
     @DeveloperAPI
@@ -175,6 +201,7 @@ class WorkerSet:
             w.apply.remote(func, i + 1)
             for i, w in enumerate(self.remote_workers())
         ])
+        self._weights_broadcaster.invalidate()
         return local_result + remote_results
 
     @DeveloperAPI
@@ -195,6 +222,7 @@ class WorkerSet:
             res = ray.get(
                 worker.apply.remote(lambda w: w.foreach_policy(func)))
             remote_results.extend(res)
+        self._weights_broadcaster.invalidate()
         return local_results + remote_results
 
     @DeveloperAPI
@@ -222,6 +250,7 @@ class WorkerSet:
                 worker.apply.remote(
                     lambda w: w.foreach_trainable_policy(func)))
             remote_results.extend(res)
+        self._weights_broadcaster.invalidate()
         return local_results + remote_results
 
     @staticmethod
@@ -266,6 +295,12 @@ class WorkerSet:
         elif "d4rl" in config["input"]:
             env_name = config["input"].split(".")[1]
             input_creator = (lambda ioctx: D4RLReader(env_name, ioctx))
+        elif config["input_prefetch_num_threads"] > 0:
+            input_creator = (lambda ioctx: PrefetchedInput(
+                lambda: JsonReader(config["input"], ioctx),
+                num_threads=config["input_prefetch_num_threads"],
+                queue_size=config["input_prefetch_queue_size"],
+                shuffle_buffer_size=config["shuffle_buffer_size"]))
         else:
             input_creator = (
                 lambda ioctx: ShuffledInput(JsonReader(config["input"], ioctx),
@@ -18,6 +18,13 @@ parser.add_argument(
     "--no-train", action="store_true", help="Whether to disable training.")
 parser.add_argument(
     "--inference-mode", type=str, default="local", choices=["local", "remote"])
+parser.add_argument(
+    "--transport",
+    type=str,
+    default="http",
+    choices=["http", "tcp"],
+    help="Whether to send requests as HTTP POSTs or as binary frames over "
+    "a persistent TCP connection. Must match the server's transport.")
 parser.add_argument(
     "--off-policy",
     action="store_true",
@@ -32,7 +39,9 @@ if __name__ == "__main__":
     args = parser.parse_args()
     env = gym.make("CartPole-v0")
     client = PolicyClient(
-        "http://localhost:9900", inference_mode=args.inference_mode)
+        "http://localhost:9900",
+        inference_mode=args.inference_mode,
+        transport=args.transport)
 
     eid = client.start_episode(training_enabled=not args.no_train)
     obs = env.reset()
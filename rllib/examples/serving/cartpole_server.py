@@ -24,6 +24,13 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--run", type=str, default="DQN")
 parser.add_argument(
     "--framework", type=str, choices=["tf", "torch"], default="tf")
+parser.add_argument(
+    "--transport",
+    type=str,
+    default="http",
+    choices=["http", "tcp"],
+    help="Whether to serve clients over HTTP or with binary frames over "
+    "persistent TCP connections.")
 parser.add_argument(
     "--no-restore",
     action="store_true",
@@ -38,7 +45,8 @@ if __name__ == "__main__":
     connector_config = {
         # Use the connector server to generate experiences.
         "input": (
-            lambda ioctx: PolicyServerInput(ioctx, SERVER_ADDRESS, SERVER_PORT)
+            lambda ioctx: PolicyServerInput(
+                ioctx, SERVER_ADDRESS, SERVER_PORT, transport=args.transport)
         ),
         # Use a single worker process to run the server.
         "num_workers": 0,
@@ -13,6 +13,9 @@ AGENT_STEPS_TRAINED_COUNTER = "num_agent_steps_trained"
 LAST_TARGET_UPDATE_TS = "last_target_update_ts"
 NUM_TARGET_UPDATES = "num_target_updates"
 
+# Counter of bytes replayed from (remote) replay buffer actors.
+REPLAY_BYTES_COUNTER = "replay_bytes_transferred"
+
 # Performance timers (keys for metrics.timers).
 APPLY_GRADS_TIMER = "apply_grad"
 COMPUTE_GRADS_TIMER = "compute_grads"
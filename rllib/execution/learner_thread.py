@@ -5,13 +5,21 @@ from typing import Dict
 
 from ray.rllib.evaluation.metrics import get_learner_stats
 from ray.rllib.execution.minibatch_buffer import MinibatchBuffer
+from ray.rllib.policy.policy import Policy
+from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, \
+    LazyConcatSampleBatch, MultiAgentBatch, SampleBatch
 from ray.rllib.utils.framework import try_import_tf
 from ray.rllib.utils.timer import TimerStat
+from ray.rllib.utils.typing import SampleBatchType
 from ray.rllib.utils.window_stat import WindowStat
 from ray.rllib.evaluation.rollout_worker import RolloutWorker
 
 tf1, tf, tfv = try_import_tf()
 
+# How often (in seconds) the loader thread checks whether the learner thread
+# was stopped while waiting on a queue.
+LOADER_POLL_INTERVAL_S = 1.0
+
 
 class LearnerThread(threading.Thread):
     """Background thread that updates the local model from sample trajectories.
@@ -20,6 +28,11 @@ class LearnerThread(threading.Thread):
     is needed since Ray operations can only be run on the main thread. In
     addition, moving heavyweight gradient ops session runs off the main thread
     improves overall throughput.
+
+    Incoming batches are first prepared for learning (decompressed, padded,
+    converted to framework tensors) by a separate loader thread, such that
+    the next batch is loaded while the current one is being trained on.
+    Errors of the loader thread are raised by the learner thread.
     """
 
     def __init__(self, local_worker: RolloutWorker, minibatch_buffer_size: int,
@@ -43,8 +56,11 @@ class LearnerThread(threading.Thread):
         self.local_worker = local_worker
         self.inqueue = queue.Queue(maxsize=learner_queue_size)
         self.outqueue = queue.Queue()
+        # Batches already prepared by the loader thread. With a max size of
+        # 1, at most one batch is loaded ahead (double buffering).
+        self.loaded_queue = queue.Queue(maxsize=1)
         self.minibatch_buffer = MinibatchBuffer(
-            inqueue=self.inqueue,
+            inqueue=self.loaded_queue,
             size=minibatch_buffer_size,
             timeout=learner_queue_timeout,
             num_passes=num_sgd_iter,
@@ -58,20 +74,28 @@ class LearnerThread(threading.Thread):
         self.stats = {}
         self.stopped = False
         self.num_steps = 0
+        self.loader_thread = _LearnerLoaderThread(self)
 
     def run(self) -> None:
         # Switch on eager mode if configured.
         if self.local_worker.policy_config.get("framework") in ["tf2", "tfe"]:
             tf1.enable_eager_execution()
+        # Sub-classes (e.g. TFMultiGPULearner) may have already started their
+        # own loader thread(s).
+        if not self.loader_thread.is_alive():
+            self.loader_thread.start()
         while not self.stopped:
             self.step()
 
     def step(self) -> None:
-        with self.queue_timer:
+        with self.load_wait_timer:
             try:
                 batch, _ = self.minibatch_buffer.get()
             except queue.Empty:
                 return
+        # The loader thread passes on its error in place of a batch.
+        if isinstance(batch, Exception):
+            raise batch
 
         with self.grad_timer:
             fetches = self.local_worker.learn_on_batch(batch)
@@ -99,3 +123,65 @@ class LearnerThread(threading.Thread):
             }
         })
         return result
+
+
+class _LearnerLoaderThread(threading.Thread):
+    """Prepares the learner's next batch, while it trains on the current one.
+    """
+
+    def __init__(self, learner: LearnerThread):
+        threading.Thread.__init__(self)
+        self.learner = learner
+        self.daemon = True
+
+    def run(self) -> None:
+        try:
+            while not self.learner.stopped:
+                self._step()
+        except Exception as e:
+            self._put(e)
+
+    def _step(self) -> None:
+        s = self.learner
+        with s.queue_timer:
+            while True:
+                try:
+                    batch = s.inqueue.get(timeout=LOADER_POLL_INTERVAL_S)
+                    break
+                except queue.Empty:
+                    if s.stopped:
+                        return
+        with s.load_timer:
+            batch = _prepare_batch(s.local_worker, batch)
+        self._put(batch)
+
+    def _put(self, item) -> None:
+        s = self.learner
+        while not s.stopped:
+            try:
+                s.loaded_queue.put(item, timeout=LOADER_POLL_INTERVAL_S)
+                return
+            except queue.Full:
+                pass
+
+
+def _prepare_batch(local_worker: RolloutWorker,
+                   batch: SampleBatchType) -> SampleBatchType:
+    """Prepares the batches of the trained policies for learning."""
+    if isinstance(batch, MultiAgentBatch):
+        for pid, policy_batch in batch.policy_batches.items():
+            if pid not in local_worker.policies_to_train:
+                continue
+            batch.policy_batches[pid] = _prepare_policy_batch(
+                local_worker.policy_map[pid], policy_batch)
+        return batch
+    return _prepare_policy_batch(local_worker.policy_map[DEFAULT_POLICY_ID],
+                                 batch)
+
+
+def _prepare_policy_batch(policy: Policy, batch: SampleBatch) -> SampleBatch:
+    """Concatenates and decompresses `batch` and calls the policy's hook."""
+    if isinstance(batch, LazyConcatSampleBatch):
+        batch.materialize()
+    batch.decompress_if_needed()
+    return policy.prepare_batch_for_learning(batch)
@@ -110,6 +110,8 @@ class CollectMetrics:
         res["timers"] = timers
         res["info"] = info
         res["info"].update(counters)
+        res["info"]["weights_sync"] = \
+            self.workers.get_weights_sync_metrics()
         res["custom_metrics"] = res.get("custom_metrics", {})
         res["episode_media"] = res.get("episode_media", {})
         res["custom_metrics"].update(custom_metrics_from_info)
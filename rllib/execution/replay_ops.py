@@ -1,13 +1,15 @@
 from typing import List, Any, Optional
 import random
 
+import ray
 from ray.actor import ActorHandle
 from ray.util.iter import from_actors, LocalIterator, _NextValueNotReady
 from ray.util.iter_metrics import SharedMetrics
 from ray.rllib.execution.replay_buffer import LocalReplayBuffer, \
     warn_replay_buffer_size
 from ray.rllib.execution.common import \
-    STEPS_SAMPLED_COUNTER, _get_shared_metrics
+    REPLAY_BYTES_COUNTER, STEPS_SAMPLED_COUNTER, _get_shared_metrics
+from ray.rllib.utils.actors import split_colocated
 from ray.rllib.utils.typing import SampleBatchType
 
 
@@ -16,7 +18,8 @@ class StoreToReplayBuffer:
 
     If constructed with a local replay actor, data will be stored into that
     buffer. If constructed with a list of replay actor handles, data will
-    be stored randomly among those actors.
+    be stored randomly among those actors (if `prefer_colocated`, among
+    those on the same node as the calling process, if any).
 
     This should be used with the .for_each() operator on a rollouts iterator.
     The batch that was stored is returned.
@@ -32,7 +35,8 @@ class StoreToReplayBuffer:
     def __init__(self,
                  *,
                  local_buffer: LocalReplayBuffer = None,
-                 actors: List[ActorHandle] = None):
+                 actors: List[ActorHandle] = None,
+                 prefer_colocated: bool = False):
         if bool(local_buffer) == bool(actors):
             raise ValueError(
                 "Exactly one of local_buffer and replay_actors must be given.")
@@ -43,12 +47,21 @@ class StoreToReplayBuffer:
         else:
             self.local_actor = None
             self.replay_actors = actors
+        self.prefer_colocated = prefer_colocated
+        # Determined lazily, in the process this callable is executed in
+        # (e.g. a rollout worker).
+        self._candidate_actors = None
 
     def __call__(self, batch: SampleBatchType):
         if self.local_actor:
             self.local_actor.add_batch(batch)
         else:
-            actor = random.choice(self.replay_actors)
+            if self._candidate_actors is None:
+                self._candidate_actors = self.replay_actors
+                if self.prefer_colocated:
+                    local, _ = split_colocated(self.replay_actors)
+                    self._candidate_actors = local or self.replay_actors
+            actor = random.choice(self._candidate_actors)
             actor.add_batch.remote(batch)
         return batch
 
@@ -56,7 +69,8 @@ class StoreToReplayBuffer:
 def Replay(*,
            local_buffer: LocalReplayBuffer = None,
            actors: List[ActorHandle] = None,
-           num_async: int = 4) -> LocalIterator[SampleBatchType]:
+           num_async: int = 4,
+           shards_per_request: int = 1) -> LocalIterator[SampleBatchType]:
     """Replay experiences from the given buffer or actors.
 
     This should be combined with the StoreToReplayActors operation using the
@@ -69,6 +83,9 @@ def Replay(*,
             local_buffer can be specified.
         num_async (int): In async mode, the max number of async
             requests in flight per actor.
+        shards_per_request (int): If > 1, replay from this many actors
+            (shards) at once, receiving all their replay batches as a single
+            object.
 
     Examples:
         >>> actors = [ReplayActor.remote() for _ in range(4)]
@@ -81,10 +98,14 @@ def Replay(*,
         raise ValueError(
             "Exactly one of local_buffer and replay_actors must be given.")
 
-    if actors:
+    if actors and shards_per_request > 1:
+        return _batched_replay(actors, num_async, shards_per_request) \
+            .for_each(_record_replay_bytes)
+    elif actors:
         replay = from_actors(actors)
         return replay.gather_async(
-            num_async=num_async).filter(lambda x: x is not None)
+            num_async=num_async).filter(lambda x: x is not None) \
+            .for_each(_record_replay_bytes)
 
     def gen_replay(_):
         while True:
@@ -97,6 +118,62 @@ def Replay(*,
     return LocalIterator(gen_replay, SharedMetrics())
 
 
+@ray.remote(num_cpus=0)
+def _gather_replays(*batches: SampleBatchType) -> List[SampleBatchType]:
+    """Returns the given (resolved) replay batches as a single object."""
+    return list(batches)
+
+
+def _batched_replay(actors: List[ActorHandle], num_async: int,
+                    shards_per_request: int) -> LocalIterator[SampleBatchType]:
+    """Replays from groups of `shards_per_request` actors at a time.
+
+    Items are tagged with their source actor (for `zip_with_source_actor()`),
+    just like in `ParallelIterator.gather_async()`.
+    """
+    groups = [
+        actors[i:i + shards_per_request]
+        for i in range(0, len(actors), shards_per_request)
+    ]
+    # Forward reference to the returned iterator.
+    local_iter = None
+
+    def gen_replay(timeout=None):
+        futures = {}
+
+        def request(group):
+            futures[_gather_replays.remote(
+                *[a.replay.remote() for a in group])] = group
+
+        for _ in range(num_async):
+            for group in groups:
+                request(group)
+        while True:
+            ready, _ = ray.wait(list(futures), num_returns=1, timeout=timeout)
+            yielded = False
+            for obj_ref in ready:
+                group = futures.pop(obj_ref)
+                batches = ray.get(obj_ref)
+                request(group)
+                for actor, batch in zip(group, batches):
+                    if batch is not None:
+                        local_iter.shared_metrics.get().current_actor = actor
+                        yielded = True
+                        yield batch
+            # Don't block the calling iterator while the shards aren't ready.
+            if not yielded:
+                yield _NextValueNotReady()
+
+    local_iter = LocalIterator(gen_replay, SharedMetrics())
+    return local_iter
+
+
+def _record_replay_bytes(batch: SampleBatchType) -> SampleBatchType:
+    metrics = _get_shared_metrics()
+    metrics.counters[REPLAY_BYTES_COUNTER] += batch.size_bytes()
+    return batch
+
+
 class WaitUntilTimestepsElapsed:
     """Callable that returns True once a given number of timesteps are hit."""
 
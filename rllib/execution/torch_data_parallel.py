@@ -0,0 +1,180 @@
+import logging
+import numpy as np
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+import uuid
+
+import ray
+from ray.rllib.evaluation.metrics import LEARNER_STATS_KEY
+from ray.rllib.policy.policy import Policy
+from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, \
+    MultiAgentBatch, SampleBatch
+from ray.rllib.utils.annotations import DeveloperAPI
+from ray.rllib.utils.framework import try_import_torch
+from ray.rllib.utils.sgd import averaged
+from ray.rllib.utils.typing import ModelWeights, PolicyID, SampleBatchType
+
+torch, _ = try_import_torch()
+
+logger = logging.getLogger(__name__)
+
+
+class TorchLearner:
+    """Learner process holding a copy of the trainable torch policies.
+
+    All learners of a TorchLearnerGroup are members of the same gloo
+    collective group and run the same sequence of SGD minibatches, each one
+    on its own shard of every minibatch. Gradients are all-reduced (averaged)
+    in `TorchPolicy.learn_on_batch()`, so all learners apply the same
+    update and their weights stay in sync.
+    """
+
+    def __init__(self, policy_specs: Dict[PolicyID, tuple], rank: int,
+                 world_size: int, group_name: str):
+        from ray.util import collective
+
+        # One thread per learner process (scale via more learners instead).
+        torch.set_num_threads(1)
+        self.rank = rank
+        self.world_size = world_size
+        self.policy_map: Dict[PolicyID, Policy] = {}
+        for pid, (cls, obs_space, action_space, config) in \
+                policy_specs.items():
+            policy = cls(obs_space, action_space, config)
+            policy.distributed_world_size = world_size
+            policy.distributed_collective_group = group_name
+            self.policy_map[pid] = policy
+        collective.init_collective_group(
+            world_size, rank, backend="gloo", group_name=group_name)
+
+    def learn(self, samples: SampleBatchType,
+              weights: Dict[PolicyID, ModelWeights], global_vars: dict,
+              num_sgd_iter: int, sgd_minibatch_size: int,
+              seed: int) -> Tuple[dict, Optional[dict]]:
+        """Runs data-parallel minibatch SGD on `samples`.
+
+        Args:
+            samples (SampleBatchType): The (full) train batch.
+            weights (Dict[PolicyID, ModelWeights]): Weights to start from.
+            global_vars (dict): The current global vars.
+            num_sgd_iter (int): Number of epochs over `samples`.
+            sgd_minibatch_size (int): Size of the (overall) SGD minibatches,
+                sharded across all learners.
+            seed (int): Seed for shuffling `samples`, the same on all
+                learners.
+
+        Returns:
+            Tuple[dict, Optional[dict]]: This learner's averaged learner
+                stats (over the last epoch) per policy and, on rank 0 only,
+                the new weights.
+        """
+        for pid, w in weights.items():
+            self.policy_map[pid].set_weights(w)
+        for policy in self.policy_map.values():
+            policy.on_global_var_update(global_vars)
+        if isinstance(samples, SampleBatch):
+            samples = MultiAgentBatch({DEFAULT_POLICY_ID: samples},
+                                      samples.count)
+
+        rng = np.random.RandomState(seed)
+        fetches = {}
+        for pid, policy in self.policy_map.items():
+            if pid not in samples.policy_batches:
+                continue
+            batch = samples.policy_batches[pid]
+            minibatch_size = sgd_minibatch_size or batch.count
+            for _ in range(num_sgd_iter):
+                learner_stats = defaultdict(list)
+                permutation = rng.permutation(batch.count)
+                for start in range(0, batch.count, minibatch_size):
+                    rows = permutation[start:start + minibatch_size]
+                    # Every learner must take part in every allreduce: Skip
+                    # minibatches that can't be sharded (on all learners).
+                    if len(rows) < self.world_size:
+                        continue
+                    shard = np.array_split(rows, self.world_size)[self.rank]
+                    stats = policy.learn_on_batch(
+                        SampleBatch({k: v[shard]
+                                     for k, v in batch.items()}))
+                    for k, v in stats.get(LEARNER_STATS_KEY, {}).items():
+                        learner_stats[k].append(v)
+            fetches[pid] = {LEARNER_STATS_KEY: averaged(learner_stats)}
+
+        new_weights = None
+        if self.rank == 0:
+            new_weights = {
+                pid: self.policy_map[pid].get_weights()
+                for pid in weights
+            }
+        return fetches, new_weights
+
+    def foreach_policy(self, func: Callable[[Policy, PolicyID], None]):
+        for pid, policy in self.policy_map.items():
+            func(policy, pid)
+
+
+@DeveloperAPI
+class TorchLearnerGroup:
+    """A group of local TorchLearner actors for data-parallel (CPU) SGD.
+
+    Examples:
+        >>> group = TorchLearnerGroup(workers.local_worker(), 4, policies)
+        >>> fetches, weights = group.learn_on_batch(
+        ...     batch, local_worker.get_weights(policies), global_vars,
+        ...     num_sgd_iter=30, sgd_minibatch_size=128)
+    """
+
+    def __init__(self, local_worker: "RolloutWorker", num_learners: int,
+                 policies: List[PolicyID]):
+        """Creates the learner actors and their gloo collective group.
+
+        Args:
+            local_worker (RolloutWorker): The local worker, whose (trainable)
+                policies will be replicated in each learner.
+            num_learners (int): The number of learner actors (each one
+                requiring 1 CPU).
+            policies (List[PolicyID]): The policies to train.
+        """
+        policy_specs = {}
+        for pid in policies:
+            policy = local_worker.get_policy(pid)
+            policy_specs[pid] = (type(policy), policy.observation_space,
+                                 policy.action_space, policy.config)
+        group_name = "rllib_torch_learners_{}".format(uuid.uuid4().hex)
+        cls = ray.remote(num_cpus=1)(TorchLearner)
+        self.learners = [
+            cls.remote(policy_specs, rank, num_learners, group_name)
+            for rank in range(num_learners)
+        ]
+        logger.info("Created {} torch learners in collective group {}".format(
+            num_learners, group_name))
+
+    def learn_on_batch(self, samples: SampleBatchType,
+                       weights: Dict[PolicyID, ModelWeights],
+                       global_vars: dict, num_sgd_iter: int,
+                       sgd_minibatch_size: int) -> Tuple[dict, dict]:
+        """Trains all learners on `samples`, starting from `weights`.
+
+        Returns:
+            Tuple[dict, dict]: The learner stats (of rank 0) and the new
+                weights per policy.
+        """
+        samples_ref = ray.put(samples)
+        weights_ref = ray.put(weights)
+        seed = np.random.randint(2**31)
+        results = ray.get([
+            learner.learn.remote(samples_ref, weights_ref, global_vars,
+                                 num_sgd_iter, sgd_minibatch_size, seed)
+            for learner in self.learners
+        ])
+        return results[0]
+
+    def foreach_policy(self, func: Callable[[Policy, PolicyID], None]):
+        """Calls `func(policy, policy_id)` for each policy in each learner.
+
+        Use this to keep (non-weight) policy state, e.g. PPO's KL
+        coefficient, in sync with the local worker's policies.
+        """
+        ray.get([
+            learner.foreach_policy.remote(func) for learner in self.learners
+        ])
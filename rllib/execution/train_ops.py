@@ -4,7 +4,6 @@ import math
 import tree  # pip install dm_tree
 from typing import List, Tuple, Any
 
-import ray
 from ray.rllib.evaluation.metrics import extract_stats, get_learner_stats, \
     LEARNER_STATS_KEY
 from ray.rllib.evaluation.worker_set import WorkerSet
@@ -15,6 +14,7 @@ from ray.rllib.execution.common import \
     STEPS_TRAINED_COUNTER, WORKER_UPDATE_TIMER, _check_sample_batch_type, \
     _get_global_vars, _get_shared_metrics
 from ray.rllib.execution.multi_gpu_impl import LocalSyncParallelOptimizer
+from ray.rllib.execution.torch_data_parallel import TorchLearnerGroup
 from ray.rllib.policy.sample_batch import SampleBatch, DEFAULT_POLICY_ID, \
     MultiAgentBatch
 from ray.rllib.utils.framework import try_import_tf
@@ -83,10 +83,7 @@ class TrainOneStep:
         # workers.
         if self.workers.remote_workers():
             with metrics.timers[WORKER_UPDATE_TIMER]:
-                weights = ray.put(self.workers.local_worker().get_weights(
-                    self.policies))
-                for e in self.workers.remote_workers():
-                    e.set_weights.remote(weights, _get_global_vars())
+                self.workers.sync_weights(self.policies, _get_global_vars())
         # Also update global vars of the local worker.
         self.workers.local_worker().set_global_vars(_get_global_vars())
         return batch, info
@@ -243,15 +240,73 @@ class TrainTFMultiGPU:
         metrics.info[LEARNER_INFO] = fetches
         if self.workers.remote_workers():
             with metrics.timers[WORKER_UPDATE_TIMER]:
-                weights = ray.put(self.workers.local_worker().get_weights(
-                    self.policies))
-                for e in self.workers.remote_workers():
-                    e.set_weights.remote(weights, _get_global_vars())
+                self.workers.sync_weights(self.policies, _get_global_vars())
         # Also update global vars of the local worker.
         self.workers.local_worker().set_global_vars(_get_global_vars())
         return samples, fetches
 
 
+class TrainTorchDataParallel:
+    """Torch data-parallel (multi-process CPU) version of TrainOneStep.
+
+    Runs minibatch SGD on each train batch in `num_learners` TorchLearner
+    actors, which all-reduce their gradients via a gloo collective group
+    (requires `pygloo`). The learned weights are then set on the local
+    worker and broadcast to the remote workers.
+
+    This should be used with the .for_each() operator. A tuple of the input
+    and learner stats will be returned.
+
+    Examples:
+        >>> rollouts = ParallelRollouts(...)
+        >>> train_op = rollouts.for_each(TrainTorchDataParallel(
+        ...     workers=workers, num_learners=4, ...))
+        >>> print(next(train_op))  # This trains the policy on one batch.
+        SampleBatch(...), {"learner_stats": ...}
+
+    Updates the STEPS_TRAINED_COUNTER counter and LEARNER_INFO field in the
+    local iterator context.
+    """
+
+    def __init__(self,
+                 *,
+                 workers: WorkerSet,
+                 num_learners: int,
+                 sgd_minibatch_size: int,
+                 num_sgd_iter: int,
+                 policies: List[PolicyID] = frozenset([])):
+        self.workers = workers
+        self.policies = policies or workers.local_worker().policies_to_train
+        self.num_sgd_iter = num_sgd_iter
+        self.sgd_minibatch_size = sgd_minibatch_size
+        self.learner_group = TorchLearnerGroup(
+            workers.local_worker(), num_learners, self.policies)
+
+    def __call__(self,
+                 batch: SampleBatchType) -> (SampleBatchType, List[dict]):
+        _check_sample_batch_type(batch)
+        metrics = _get_shared_metrics()
+        learn_timer = metrics.timers[LEARN_ON_BATCH_TIMER]
+        lw = self.workers.local_worker()
+        with learn_timer:
+            info, weights = self.learner_group.learn_on_batch(
+                batch, lw.get_weights(self.policies), _get_global_vars(),
+                self.num_sgd_iter, self.sgd_minibatch_size)
+            lw.set_weights(weights)
+            learn_timer.push_units_processed(batch.count)
+        metrics.counters[STEPS_TRAINED_COUNTER] += batch.count
+        if isinstance(batch, MultiAgentBatch):
+            metrics.counters[
+                AGENT_STEPS_TRAINED_COUNTER] += batch.agent_steps()
+        metrics.info[LEARNER_INFO] = info
+        if self.workers.remote_workers():
+            with metrics.timers[WORKER_UPDATE_TIMER]:
+                self.workers.sync_weights(self.policies, _get_global_vars())
+        # Also update global vars of the local worker.
+        lw.set_global_vars(_get_global_vars())
+        return batch, info
+
+
 def all_tower_reduce(path, *tower_data):
     """Reduces stats across towers based on their stats-dict paths."""
     if len(path) == 1 and path[0] == "td_error":
@@ -337,10 +392,8 @@ class ApplyGradients:
         if self.update_all:
             if self.workers.remote_workers():
                 with metrics.timers[WORKER_UPDATE_TIMER]:
-                    weights = ray.put(self.workers.local_worker().get_weights(
-                        self.policies))
-                    for e in self.workers.remote_workers():
-                        e.set_weights.remote(weights, _get_global_vars())
+                    self.workers.sync_weights(self.policies,
+                                              _get_global_vars())
         else:
             if metrics.current_actor is None:
                 raise ValueError(
@@ -3,10 +3,12 @@ import cv2
 import logging
 import numpy as np
 import gym
+import tree  # pip install dm_tree
 from typing import Any, List
 
 from ray.rllib.utils.annotations import override, PublicAPI
 from ray.rllib.utils.spaces.repeated import Repeated
+from ray.rllib.utils.spaces.space_utils import unbatch
 from ray.rllib.utils.typing import TensorType
 
 ATARI_OBS_SHAPE = (210, 160, 3)
@@ -55,6 +57,30 @@ class Preprocessor:
         """Alternative to transform for more efficient flattening."""
         array[offset:offset + self._size] = self.transform(observation)
 
+    @PublicAPI
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        """Returns the preprocessed observations, stacked along axis 0.
+
+        Args:
+            observations (Any): A list (or array) of single observations, or
+                (for Dict/Tuple spaces) a dict/tuple of stacked numpy arrays,
+                e.g. the observations of all sub-envs of a VectorEnv.
+
+        Returns:
+            np.ndarray: Batch of preprocessed observations of shape
+                [batch size] + `self.shape`.
+        """
+        return np.array([self.transform(o) for o in _to_rows(observations)])
+
+    def write_batch(self, observations: Any, array: np.ndarray,
+                    offset: int) -> None:
+        """Alternative to transform_batch for more efficient flattening.
+
+        Writes row i of the batch to `array[i, offset:offset + self.size]`.
+        """
+        array[:, offset:offset + self._size] = np.reshape(
+            self.transform_batch(observations), (len(array), self._size))
+
     def check_shape(self, observation: Any) -> None:
         """Checks the shape of the given observation."""
         if self._i % OBS_VALIDATION_INTERVAL == 0:
@@ -72,6 +98,11 @@ class Preprocessor:
                     "should be an np.array, not a Python list.", observation)
         self._i += 1
 
+    def _check_batch_shape(self, observations: Any) -> None:
+        """Checks the shape of the first observation in the given batch."""
+        if _batch_size(observations) > 0:
+            self.check_shape(_first_row(observations))
+
     @property
     @PublicAPI
     def size(self) -> int:
@@ -105,7 +136,7 @@ class GenericPixelPreprocessor(Preprocessor):
         if self._grayscale:
             shape = (self._dim, self._dim, 1)
         else:
-            shape = (self._dim, self._dim, 3)
+            shape = (self._dim, self._dim, obs_space.shape[-1])
 
         return shape
 
@@ -113,18 +144,40 @@ class GenericPixelPreprocessor(Preprocessor):
     def transform(self, observation: TensorType) -> np.ndarray:
         """Downsamples images from (210, 160, 3) by the configured factor."""
         self.check_shape(observation)
-        scaled = observation[25:-25, :, :]
+        return self._normalize(self._resize(observation))
+
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        observations = np.asarray(observations)
+        self._check_batch_shape(observations)
+        # cv2 can only resize one image at a time, everything else is done
+        # on the whole batch (with the same math as in `transform`).
+        scaled = np.empty(
+            (len(observations), self._dim, self._dim,
+             observations.shape[-1]),
+            dtype=observations.dtype)
+        for i, image in enumerate(observations):
+            scaled[i] = self._resize(image)
+        return self._normalize(scaled)
+
+    def _resize(self, image: np.ndarray) -> np.ndarray:
+        scaled = image[25:-25, :, :]
         if self._dim < 84:
             scaled = cv2.resize(scaled, (84, 84))
         # OpenAI: Resize by half, then down to 42x42 (essentially mipmapping).
         # If we resize directly we lose pixels that, when mapped to 42x42,
         # aren't close enough to the pixel boundary.
         scaled = cv2.resize(scaled, (self._dim, self._dim))
+        # cv2 drops the channel axis of single-channel images.
+        return np.reshape(scaled, (self._dim, self._dim, image.shape[-1]))
+
+    def _normalize(self, scaled: np.ndarray) -> np.ndarray:
+        """Converts (a batch of) resized images to the output values."""
         if self._grayscale:
-            scaled = scaled.mean(2)
+            scaled = scaled.mean(-1, keepdims=True).astype(np.float32)
+        else:
+            # E.g. uint8 images, which would overflow below.
             scaled = scaled.astype(np.float32)
-            # Rescale needed for maintaining 1 channel
-            scaled = np.reshape(scaled, [self._dim, self._dim, 1])
         if self._zero_mean:
             scaled = (scaled - 128) / 128
         else:
@@ -142,6 +195,11 @@ class AtariRamPreprocessor(Preprocessor):
         self.check_shape(observation)
         return (observation.astype("float32") - 128) / 128
 
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        self._check_batch_shape(observations)
+        return (np.asarray(observations, dtype=np.float32) - 128) / 128
+
 
 class OneHotPreprocessor(Preprocessor):
     """One-hot preprocessor for Discrete and MultiDiscrete spaces.
@@ -176,6 +234,28 @@ class OneHotPreprocessor(Preprocessor):
               offset: int) -> None:
         array[offset:offset + self.size] = self.transform(observation)
 
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        array = np.zeros(
+            (_batch_size(observations), ) + self.shape, dtype=np.float32)
+        self.write_batch(observations, array, 0)
+        return array
+
+    @override(Preprocessor)
+    def write_batch(self, observations: Any, array: np.ndarray,
+                    offset: int) -> None:
+        self._check_batch_shape(observations)
+        observations = np.asarray(observations, dtype=np.int64)
+        rows = np.arange(len(observations))
+        array[:, offset:offset + self.size] = 0
+        if isinstance(self._obs_space, gym.spaces.Discrete):
+            array[rows, offset + observations] = 1
+        else:
+            # Start index of each sub-space's one-hot slot.
+            starts = offset + np.cumsum(self._obs_space.nvec) - \
+                self._obs_space.nvec
+            array[rows[:, None], starts + observations] = 1
+
 
 class NoPreprocessor(Preprocessor):
     @override(Preprocessor)
@@ -193,6 +273,17 @@ class NoPreprocessor(Preprocessor):
         array[offset:offset + self._size] = np.array(
             observation, copy=False).ravel()
 
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        self._check_batch_shape(observations)
+        return np.asarray(observations)
+
+    @override(Preprocessor)
+    def write_batch(self, observations: Any, array: np.ndarray,
+                    offset: int) -> None:
+        array[:, offset:offset + self._size] = np.reshape(
+            observations, (len(array), self._size))
+
     @property
     @override(Preprocessor)
     def observation_space(self) -> gym.Space:
@@ -233,6 +324,28 @@ class TupleFlatteningPreprocessor(Preprocessor):
             p.write(o, array, offset)
             offset += p.size
 
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        self._check_batch_shape(observations)
+        array = np.zeros(
+            (_batch_size(observations), ) + self.shape, dtype=np.float32)
+        self.write_batch(observations, array, 0)
+        return array
+
+    @override(Preprocessor)
+    def write_batch(self, observations: Any, array: np.ndarray,
+                    offset: int) -> None:
+        if isinstance(observations, tuple):
+            columns = observations
+        else:
+            columns = [[o[i] for o in observations]
+                       for i in range(len(self.preprocessors))]
+        assert len(columns) == len(self.preprocessors), \
+            (len(columns), len(self.preprocessors))
+        for c, p in zip(columns, self.preprocessors):
+            p.write_batch(c, array, offset)
+            offset += p.size
+
 
 class DictFlatteningPreprocessor(Preprocessor):
     """Preprocesses each dict value, then flattens it all into a vector.
@@ -270,6 +383,26 @@ class DictFlatteningPreprocessor(Preprocessor):
             p.write(o, array, offset)
             offset += p.size
 
+    @override(Preprocessor)
+    def transform_batch(self, observations: Any) -> np.ndarray:
+        self._check_batch_shape(observations)
+        array = np.zeros(
+            (_batch_size(observations), ) + self.shape, dtype=np.float32)
+        self.write_batch(observations, array, 0)
+        return array
+
+    @override(Preprocessor)
+    def write_batch(self, observations: Any, array: np.ndarray,
+                    offset: int) -> None:
+        keys = self._obs_space.spaces.keys()
+        if isinstance(observations, dict):
+            columns = [observations[k] for k in keys]
+        else:
+            columns = [[o[k] for o in observations] for k in keys]
+        for c, p in zip(columns, self.preprocessors):
+            p.write_batch(c, array, offset)
+            offset += p.size
+
 
 class RepeatedValuesPreprocessor(Preprocessor):
     """Pads and batches the variable-length list value."""
@@ -336,6 +469,27 @@ def get_preprocessor(space: gym.Space) -> type:
     return preprocessor
 
 
+def _batch_size(observations: Any) -> int:
+    """Returns the number of observations in a batch (list or struct)."""
+    if isinstance(observations, (dict, tuple)):
+        return len(tree.flatten(observations)[0])
+    return len(observations)
+
+
+def _first_row(observations: Any) -> Any:
+    """Returns the first observation of a batch (list or struct)."""
+    if isinstance(observations, (dict, tuple)):
+        return tree.map_structure(lambda c: c[0], observations)
+    return observations[0]
+
+
+def _to_rows(observations: Any) -> List[Any]:
+    """Converts a batch (list or struct) into a list of observations."""
+    if isinstance(observations, (dict, tuple)):
+        return unbatch(observations)
+    return observations
+
+
 def legacy_patch_shapes(space: gym.Space) -> List[int]:
     """Assigns shapes to spaces that don't have shapes.
 
@@ -1,9 +1,10 @@
 import gym
 from gym.spaces import Box, Dict, Discrete, MultiDiscrete, Tuple
 import numpy as np
+import tree  # pip install dm_tree
 import unittest
 
-from ray.rllib.models.catalog import ModelCatalog
+from ray.rllib.models.catalog import ModelCatalog, MODEL_DEFAULTS
 from ray.rllib.models.preprocessors import DictFlatteningPreprocessor, \
     get_preprocessor, NoPreprocessor, TupleFlatteningPreprocessor, \
     OneHotPreprocessor, AtariRamPreprocessor, GenericPixelPreprocessor
@@ -82,6 +83,62 @@ class TestPreprocessors(unittest.TestCase):
             pp.transform((np.array([0, 1, 3]), )),
             [1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0])
 
+    def test_transform_batch(self):
+        spaces = [
+            Discrete(5),
+            MultiDiscrete([2, 3, 4]),
+            Box(-1.0, 1.0, (2, 3)),
+            Box(0, 255, (128, ), dtype=np.uint8),
+            Tuple([Discrete(3), MultiDiscrete([2, 2])]),
+            Dict({
+                "a": Discrete(2),
+                "b": Tuple([Discrete(3), Box(-1.0, 1.0, (4, ))]),
+            }),
+        ]
+        for space in spaces:
+            pp = get_preprocessor(space)(space)
+            observations = [space.sample() for _ in range(10)]
+            expected = np.array([pp.transform(o) for o in observations])
+            check(pp.transform_batch(observations), expected)
+            # Struct of stacked arrays (as returned by batched envs).
+            if isinstance(space, (Dict, Tuple)):
+                struct = tree.map_structure(lambda *o: np.stack(o),
+                                            *observations)
+                check(pp.transform_batch(struct), expected)
+            # Write into a preallocated array at some offset.
+            array = np.ones((10, pp.size + 2), dtype=np.float32)
+            pp.write_batch(observations, array, 1)
+            check(array[:, 1:-1], expected.reshape((10, -1)))
+            check(array[:, [0, -1]], np.ones((10, 2)))
+
+    def test_pixel_transform_batch(self):
+        spaces = [
+            Box(0, 255, (210, 160, 3), dtype=np.uint8),
+            Box(0, 255, (210, 160, 1), dtype=np.uint8),
+            Box(0.0, 255.0, (210, 160, 3), dtype=np.float32),
+        ]
+        for space in spaces:
+            for grayscale in [False, True]:
+                for zero_mean in [False, True]:
+                    for dim in [42, 84]:
+                        options = dict(
+                            MODEL_DEFAULTS,
+                            grayscale=grayscale,
+                            zero_mean=zero_mean,
+                            dim=dim)
+                        pp = GenericPixelPreprocessor(space, options)
+                        observations = np.stack(
+                            [space.sample() for _ in range(3)])
+                        batch = pp.transform_batch(observations)
+                        self.assertEqual(batch.shape, (3, ) + pp.shape)
+                        self.assertEqual(batch.dtype, np.float32)
+                        low = -1.0 if zero_mean else 0.0
+                        self.assertTrue(np.all(batch >= low))
+                        self.assertTrue(np.all(batch <= 1.0))
+                        for i, o in enumerate(observations):
+                            np.testing.assert_array_equal(
+                                batch[i], pp.transform(o))
+
 
 if __name__ == "__main__":
     import pytest
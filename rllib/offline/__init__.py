@@ -5,6 +5,7 @@ from ray.rllib.offline.output_writer import OutputWriter, NoopOutput
 from ray.rllib.offline.input_reader import InputReader
 from ray.rllib.offline.mixed_input import MixedInput
 from ray.rllib.offline.shuffled_input import ShuffledInput
+from ray.rllib.offline.prefetched_input import PrefetchedInput
 from ray.rllib.offline.d4rl_reader import D4RLReader
 
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     "InputReader",
     "MixedInput",
     "ShuffledInput",
+    "PrefetchedInput",
     "D4RLReader",
 ]
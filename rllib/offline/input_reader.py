@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 import logging
 import numpy as np
 import threading
@@ -13,6 +14,11 @@ tf1, tf, tfv = try_import_tf()
 
 logger = logging.getLogger(__name__)
 
+# Stats reported by input readers (e.g., prefetching queue depth and read
+# throughput), summarized under "input_reader" in the trainer results.
+InputReaderMetrics = namedtuple("InputReaderMetrics",
+                                ["reader_name", "metrics"])
+
 
 @PublicAPI
 class InputReader(metaclass=ABCMeta):
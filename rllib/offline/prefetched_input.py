@@ -0,0 +1,169 @@
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Callable, List
+
+from ray.rllib.offline.input_reader import InputReader, InputReaderMetrics
+from ray.rllib.utils.annotations import override, DeveloperAPI
+from ray.rllib.utils.typing import SampleBatchType
+
+logger = logging.getLogger(__name__)
+
+
+@DeveloperAPI
+class PrefetchedInput(InputReader):
+    """Reads batches from child readers on background threads.
+
+    Each background thread owns its own child reader (created through
+    `reader_creator`) and pushes the read, parsed and decompressed batches
+    into a bounded queue. `next()` then only has to pop from this queue, so
+    the training loop does not wait on file I/O or JSON parsing as long as
+    the readers keep up. Batches can additionally be shuffled over a sliding
+    window buffer of N batches (same semantics as ShuffledInput).
+
+    Examples:
+        >>> reader = PrefetchedInput(
+        ...     lambda: JsonReader("/tmp/*.json", ioctx),
+        ...     num_threads=2, queue_size=16, shuffle_buffer_size=100)
+        >>> batch = reader.next()
+    """
+
+    @DeveloperAPI
+    def __init__(self,
+                 reader_creator: Callable[[], InputReader],
+                 num_threads: int = 1,
+                 queue_size: int = 16,
+                 shuffle_buffer_size: int = 0):
+        """Initialize a PrefetchedInput.
+
+        Args:
+            reader_creator (Callable[[], InputReader]): Function that creates
+                a new child input reader. Called once per background thread,
+                so the created readers do not have to be thread-safe.
+            num_threads (int): Number of background reader threads.
+            queue_size (int): Max number of prefetched batches to hold in
+                the queue before the reader threads block.
+            shuffle_buffer_size (int): If positive, shuffle input over this
+                many batches.
+        """
+        if num_threads < 1:
+            raise ValueError("`num_threads` must be >= 1, got {}!".format(
+                num_threads))
+        if queue_size < 1:
+            raise ValueError("`queue_size` must be >= 1, got {}!".format(
+                queue_size))
+        self.num_threads = num_threads
+        self.queue_size = queue_size
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.buffer = []
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stopped = threading.Event()
+        self._error = None
+
+        # Stats since the last call to `get_metrics()`.
+        self._stats_lock = threading.Lock()
+        self._stats_start = time.time()
+        self._num_batches_read = 0
+        self._num_steps_read = 0
+        self._queue_depth_sum = 0
+        self._num_next_calls = 0
+        self._wait_time = 0.0
+
+        self._threads = []
+        for i in range(num_threads):
+            t = threading.Thread(
+                target=self._run,
+                args=(reader_creator, ),
+                name="PrefetchedInput-{}".format(i))
+            t.daemon = True
+            t.start()
+            self._threads.append(t)
+
+    @override(InputReader)
+    def next(self) -> SampleBatchType:
+        if self.shuffle_buffer_size <= 1:
+            return self._pop()
+        if len(self.buffer) < self.shuffle_buffer_size:
+            logger.info("Filling shuffle buffer to {} batches".format(
+                self.shuffle_buffer_size))
+            while len(self.buffer) < self.shuffle_buffer_size:
+                self.buffer.append(self._pop())
+            logger.info("Shuffle buffer filled")
+        i = random.randint(0, len(self.buffer) - 1)
+        self.buffer[i] = self._pop()
+        return random.choice(self.buffer)
+
+    @DeveloperAPI
+    def get_metrics(self) -> List[InputReaderMetrics]:
+        """Returns prefetching stats collected since the last call.
+
+        Returns:
+            List[InputReaderMetrics]: A single-item list with the current
+                queue depth, the mean queue depth observed by `next()`, the
+                read throughput of the background threads (in batches and
+                timesteps per second) and the mean time `next()` had to wait
+                for a batch.
+        """
+        with self._stats_lock:
+            now = time.time()
+            elapsed = max(now - self._stats_start, 1e-6)
+            num_calls = max(self._num_next_calls, 1)
+            metrics = {
+                "queue_depth": self._queue.qsize(),
+                "mean_queue_depth": self._queue_depth_sum / num_calls,
+                "read_batches_per_s": self._num_batches_read / elapsed,
+                "read_steps_per_s": self._num_steps_read / elapsed,
+                "mean_wait_ms": 1000 * self._wait_time / num_calls,
+            }
+            self._stats_start = now
+            self._num_batches_read = 0
+            self._num_steps_read = 0
+            self._queue_depth_sum = 0
+            self._num_next_calls = 0
+            self._wait_time = 0.0
+        return [InputReaderMetrics("prefetch", metrics)]
+
+    @DeveloperAPI
+    def stop(self) -> None:
+        """Signals all background reader threads to exit."""
+        self._stopped.set()
+
+    def _pop(self) -> SampleBatchType:
+        depth = self._queue.qsize()
+        start = time.time()
+        while True:
+            try:
+                batch = self._queue.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if self._error is not None:
+                    raise self._error
+        wait = time.time() - start
+        with self._stats_lock:
+            self._queue_depth_sum += depth
+            self._num_next_calls += 1
+            self._wait_time += wait
+        return batch
+
+    def _run(self, reader_creator: Callable[[], InputReader]) -> None:
+        try:
+            reader = reader_creator()
+            while not self._stopped.is_set():
+                batch = reader.next()
+                with self._stats_lock:
+                    self._num_batches_read += 1
+                    self._num_steps_read += batch.count
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put(batch, timeout=1.0)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as e:
+            logger.exception("Error reading from input")
+            # Surface the error in `next()` once the queue has been drained.
+            self._error = e
+            self._stopped.set()
@@ -352,6 +352,25 @@ class Policy(metaclass=ABCMeta):
         """
         return sample_batch
 
+    @DeveloperAPI
+    def prepare_batch_for_learning(self, samples: SampleBatch) -> SampleBatch:
+        """Prepares a train batch for a subsequent `learn_on_batch()` call.
+
+        Does all per-batch work that doesn't touch the model (e.g. padding or
+        conversion into framework tensors), so that it can be done in a
+        separate (loader) thread, while the model is still being trained on
+        the previous batch.
+
+        Args:
+            samples (SampleBatch): The SampleBatch object to prepare. May be
+                altered in place.
+
+        Returns:
+            SampleBatch: The prepared SampleBatch to pass into
+                `learn_on_batch()`.
+        """
+        return samples
+
     @DeveloperAPI
     def learn_on_batch(self, samples: SampleBatch) -> Dict[str, TensorType]:
         """Fused compute gradients and apply gradients call.
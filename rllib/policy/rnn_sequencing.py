@@ -64,7 +64,7 @@ def pad_batch_to_sequences_of_same_size(
         meets_divisibility_reqs = (
             len(batch[SampleBatch.CUR_OBS]) % batch_divisibility_req == 0
             # not multiagent
-            and max(batch[SampleBatch.AGENT_INDEX]) == 0)
+            and np.max(batch[SampleBatch.AGENT_INDEX]) == 0)
     else:
         meets_divisibility_reqs = True
 
@@ -236,47 +236,39 @@ def chop_into_sequences(*,
     """
 
     if seq_lens is None or len(seq_lens) == 0:
-        prev_id = None
-        seq_lens = []
-        seq_len = 0
         unique_ids = np.add(
             np.add(episode_ids, agent_indices),
             np.array(unroll_ids, dtype=np.int64) << 32)
-        for uid in unique_ids:
-            if (prev_id is not None and uid != prev_id) or \
-                    seq_len >= max_seq_len:
-                seq_lens.append(seq_len)
-                seq_len = 0
-            seq_len += 1
-            prev_id = uid
-        if seq_len:
-            seq_lens.append(seq_len)
-        seq_lens = np.array(seq_lens, dtype=np.int32)
-    assert sum(seq_lens) == len(feature_columns[0])
+        seq_lens = _seq_lens_from_ids(unique_ids, max_seq_len)
+    else:
+        seq_lens = np.asarray(seq_lens)
+    assert np.sum(seq_lens) == len(feature_columns[0])
 
     # Dynamically shrink max len as needed to optimize memory usage
     if dynamic_max:
-        max_seq_len = max(seq_lens) + _extra_padding
+        max_seq_len = int(np.max(seq_lens)) + _extra_padding
+
+    # Start index of each sequence in the (unpadded) input and the
+    # position of each input timestep in the padded output.
+    seq_starts = np.cumsum(seq_lens) - seq_lens
+    pad_indices = np.arange(np.sum(seq_lens)) + np.repeat(
+        np.arange(len(seq_lens)) * max_seq_len - seq_starts, seq_lens)
+    length = len(seq_lens) * max_seq_len
 
     feature_sequences = []
     for f in feature_columns:
         # Save unnecessary copy.
         if not isinstance(f, np.ndarray):
             f = np.array(f)
-        length = len(seq_lens) * max_seq_len
+        assert len(f) == len(pad_indices), f
         if f.dtype == np.object or f.dtype.type is np.str_:
             f_pad = [None] * length
+            for i, v in zip(pad_indices, f):
+                f_pad[i] = v
         else:
             # Make sure type doesn't change.
             f_pad = np.zeros((length, ) + np.shape(f)[1:], dtype=f.dtype)
-        seq_base = 0
-        i = 0
-        for len_ in seq_lens:
-            for seq_offset in range(len_):
-                f_pad[seq_base + seq_offset] = f[i]
-                i += 1
-            seq_base += max_seq_len
-        assert i == len(f), f
+            f_pad[pad_indices] = f
         feature_sequences.append(f_pad)
 
     if states_already_reduced_to_init:
@@ -287,12 +279,7 @@ def chop_into_sequences(*,
             # Skip unnecessary copy.
             if not isinstance(s, np.ndarray):
                 s = np.array(s)
-            s_init = []
-            i = 0
-            for len_ in seq_lens:
-                s_init.append(s[i])
-                i += len_
-            initial_states.append(np.array(s_init))
+            initial_states.append(s[seq_starts])
 
     if shuffle:
         permutation = np.random.permutation(len(seq_lens))
@@ -310,6 +297,28 @@ def chop_into_sequences(*,
     return feature_sequences, initial_states, seq_lens
 
 
+def _seq_lens_from_ids(unique_ids: np.ndarray, max_seq_len: int) -> np.ndarray:
+    """Returns the lengths of the runs of equal ids, split at `max_seq_len`.
+
+    Examples:
+        >>> _seq_lens_from_ids(np.array([1, 1, 5, 5, 5, 5]), 3)
+        [2, 3, 1]
+    """
+    if len(unique_ids) == 0:
+        return np.array([], dtype=np.int32)
+    # Lengths of the runs of equal (consecutive) ids.
+    run_starts = np.flatnonzero(unique_ids[1:] != unique_ids[:-1]) + 1
+    run_lens = np.diff(
+        np.concatenate([[0], run_starts, [len(unique_ids)]]))
+    # Split each run into ceil(run_len / max_seq_len) sequences, all but the
+    # last of which are max_seq_len long.
+    num_seqs = -(-run_lens // max_seq_len)
+    seq_lens = np.full(np.sum(num_seqs), max_seq_len, dtype=np.int32)
+    seq_lens[np.cumsum(num_seqs) - 1] = \
+        run_lens - (num_seqs - 1) * max_seq_len
+    return seq_lens
+
+
 def timeslice_along_seq_lens_with_overlap(
         sample_batch,
         seq_lens=None,
@@ -5,11 +5,12 @@ import itertools
 from typing import Dict, List, Set, Union
 
 from ray.util import log_once
-from ray.rllib.utils.annotations import PublicAPI, DeveloperAPI
+from ray.rllib.utils.annotations import override, PublicAPI, \
+    DeveloperAPI
 from ray.rllib.utils.compression import pack, unpack, is_compressed
 from ray.rllib.utils.deprecation import deprecation_warning
 from ray.rllib.utils.framework import try_import_tf, try_import_torch
-from ray.rllib.utils.memory import concat_aligned
+from ray.rllib.utils.memory import aligned_array, concat_aligned
 from ray.rllib.utils.typing import PolicyID, TensorType
 
 tf1, tf, tfv = try_import_tf()
@@ -118,19 +119,27 @@ class SampleBatch(dict):
 
     @staticmethod
     @PublicAPI
-    def concat_samples(samples: List["SampleBatch"]) -> \
+    def concat_samples(samples: List["SampleBatch"], lazy: bool = False) -> \
             Union["SampleBatch", "MultiAgentBatch"]:
         """Concatenates n data dicts or MultiAgentBatches.
 
+        Each output column is allocated once (at its final size) and the
+        input columns are copied into it.
+
         Args:
             samples (List[Dict[TensorType]]]): List of dicts of data (numpy).
+            lazy (bool): If True, return a LazyConcatSampleBatch, which only
+                concatenates a column once it is read. Columns that are never
+                read (e.g. "new_obs" for on-policy losses) are never copied.
+                Only use this if the batch is not passed to dm-tree (see
+                LazyConcatSampleBatch).
 
         Returns:
             Union[SampleBatch, MultiAgentBatch]: A new (compressed)
                 SampleBatch or MultiAgentBatch.
         """
         if isinstance(samples[0], MultiAgentBatch):
-            return MultiAgentBatch.concat_samples(samples)
+            return MultiAgentBatch.concat_samples(samples, lazy=lazy)
         seq_lens = []
         concat_samples = []
         zero_padded = samples[0].zero_padded
@@ -144,11 +153,24 @@ class SampleBatch(dict):
                 if s.get("seq_lens") is not None:
                     seq_lens.extend(s["seq_lens"])
 
+        if lazy:
+            return LazyConcatSampleBatch(
+                concat_samples,
+                seq_lens=seq_lens,
+                _time_major=concat_samples[0].time_major,
+                _zero_padded=zero_padded,
+                _max_seq_len=max_seq_len,
+            )
+
+        # Plain dicts of the input columns (w/o going through
+        # `__getitem__` for each column of each batch).
+        columns = [_get_columns(s) for s in concat_samples]
         out = {}
         for k in concat_samples[0].keys():
-            out[k] = concat_aligned(
-                [s[k] for s in concat_samples],
-                time_major=concat_samples[0].time_major)
+            if k == "seq_lens":
+                continue
+            out[k] = _concat_column([c[k] for c in columns],
+                                    concat_samples[0].time_major)
         return SampleBatch(
             out,
             seq_lens=seq_lens,
@@ -640,6 +662,112 @@ class SampleBatch(dict):
         return SampleBatch(input_dict, seq_lens=np.array([1], dtype=np.int32))
 
 
+@DeveloperAPI
+class LazyConcatSampleBatch(SampleBatch):
+    """A SampleBatch view onto a list of SampleBatches to be concatenated.
+
+    Behaves like the result of `SampleBatch.concat_samples(samples)`, but
+    each column is only concatenated (and then cached) when it is first read,
+    e.g. via `batch[key]`, `batch.items()` or when the batch is pickled
+    (pickling works via `items()`).
+    The input batches must not be modified while the view is in use and are
+    kept alive until all columns were read.
+
+    Note: Not yet concatenated columns are stored as None in the underlying
+    dict, which dm-tree (`tree.flatten()`, `tree.map_structure()`) reads
+    directly. Call `batch.materialize()` to concatenate all columns before
+    passing the batch to dm-tree.
+
+    Examples:
+        >>> b1 = SampleBatch({"a": [1, 2], "b": [0, 0]})
+        >>> b2 = SampleBatch({"a": [3, 4, 5], "b": [0, 0, 0]})
+        >>> batch = SampleBatch.concat_samples([b1, b2], lazy=True)
+        >>> print(batch.count, batch["a"])  # Does not touch column "b".
+        5 [1, 2, 3, 4, 5]
+    """
+
+    def __init__(self, samples: List[SampleBatch], **kwargs):
+        """Initializes a LazyConcatSampleBatch.
+
+        Args:
+            samples (List[SampleBatch]): The (non-empty) batches to
+                concatenate.
+            kwargs: Same kwargs as for the SampleBatch constructor (e.g.
+                `seq_lens`, `_time_major`).
+        """
+        keys = [k for k in samples[0].keys() if k != "seq_lens"]
+        self._samples = samples
+        self._pending = set()
+        # Add placeholders for the not yet concatenated columns.
+        super().__init__(dict.fromkeys(keys), **kwargs)
+        # Names of the columns that have not been concatenated yet.
+        self._pending = set(keys)
+        if self.get("seq_lens") is None:
+            self.count = sum(s.count for s in samples)
+
+    def _materialize(self, key: str) -> None:
+        self._pending.discard(key)
+        items = [
+            s[key] if s.get_interceptor or isinstance(
+                s, LazyConcatSampleBatch) else dict.__getitem__(s, key)
+            for s in self._samples
+        ]
+        dict.__setitem__(self, key, _concat_column(items, self.time_major))
+        if not self._pending:
+            self._samples = None
+
+    def materialize(self) -> "LazyConcatSampleBatch":
+        """Concatenates all not yet concatenated columns.
+
+        Returns:
+            LazyConcatSampleBatch: This very batch.
+        """
+        for key in list(self._pending):
+            self._materialize(key)
+        return self
+
+    @override(SampleBatch)
+    def __getitem__(self, key: str) -> TensorType:
+        if key in self._pending:
+            self._materialize(key)
+        return super().__getitem__(key)
+
+    @override(SampleBatch)
+    def __setitem__(self, key, item) -> None:
+        # Called w/o `_pending` when unpickling (all columns are
+        # materialized then).
+        if getattr(self, "_pending", None):
+            self._pending.discard(key)
+        super().__setitem__(key, item)
+
+    @override(SampleBatch)
+    def __delitem__(self, key):
+        self._pending.discard(key)
+        super().__delitem__(key)
+
+    def __iter__(self):
+        # Also makes `dict(batch)` and `{**batch}` use `__getitem__`.
+        return iter(self.keys())
+
+    def pop(self, key, *args):
+        if key in self._pending:
+            self._materialize(key)
+        return super().pop(key, *args)
+
+    def items(self):
+        self.materialize()
+        return super().items()
+
+    def values(self):
+        self.materialize()
+        return super().values()
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._pending.difference_update(other.keys())
+        super().update(other)
+
+
 @PublicAPI
 class MultiAgentBatch:
     """A batch of experiences from multiple agents in the environment.
@@ -773,12 +901,15 @@ class MultiAgentBatch:
 
     @staticmethod
     @PublicAPI
-    def concat_samples(samples: List["MultiAgentBatch"]) -> "MultiAgentBatch":
+    def concat_samples(samples: List["MultiAgentBatch"],
+                       lazy: bool = False) -> "MultiAgentBatch":
         """Concatenates a list of MultiAgentBatches into a new MultiAgentBatch.
 
         Args:
             samples (List[MultiAgentBatch]): List of MultiagentBatch objects
                 to concatenate.
+            lazy (bool): Whether to lazily concatenate the policy batches
+                (see `SampleBatch.concat_samples()`).
 
         Returns:
             MultiAgentBatch: A new MultiAgentBatch consisting of the
@@ -796,7 +927,7 @@ class MultiAgentBatch:
             env_steps += s.env_steps()
         out = {}
         for key, batches in policy_batches.items():
-            out[key] = SampleBatch.concat_samples(batches)
+            out[key] = SampleBatch.concat_samples(batches, lazy=lazy)
         return MultiAgentBatch(out, env_steps)
 
     @PublicAPI
@@ -856,3 +987,43 @@ class MultiAgentBatch:
     def __repr__(self):
         return "MultiAgentBatch({}, env_steps={})".format(
             str(self.policy_batches), self.count)
+
+
+def _get_columns(batch: SampleBatch) -> Dict[str, TensorType]:
+    """Returns the columns of `batch` (after its get-interceptor, if any)."""
+    if batch.get_interceptor is None and \
+            not isinstance(batch, LazyConcatSampleBatch):
+        return dict(batch)
+    return {k: batch[k] for k in batch.keys()}
+
+
+def _concat_column(items: List[TensorType],
+                   time_major: bool = None) -> TensorType:
+    """Concatenates `items` into a single, preallocated array.
+
+    Float and uint8 arrays are 64-byte aligned (see `concat_aligned()`).
+    Non-numpy or mixed dtype/shape items fall back to `concat_aligned()`.
+    """
+    if len(items) == 1:
+        return items[0]
+    first = items[0]
+    axis = 1 if time_major else 0
+    try:
+        dtypes = {i.dtype for i in items}
+        shape = list(first.shape)
+        shape[axis] = sum(i.shape[axis] for i in items)
+    except (AttributeError, IndexError):
+        dtypes = None
+    # Mixed dtypes: Let numpy figure out the output dtype.
+    if dtypes is None or len(dtypes) > 1 or \
+            not isinstance(first, np.ndarray):
+        return concat_aligned(items, time_major=time_major)
+    if first.dtype in [np.float32, np.float64, np.uint8]:
+        out = aligned_array(int(np.prod(shape)), first.dtype).reshape(shape)
+    else:
+        out = np.empty(shape, dtype=first.dtype)
+    try:
+        return np.concatenate(items, axis=axis, out=out)
+    # Shapes of the items don't match (other than in the batch axis).
+    except ValueError:
+        return concat_aligned(items, time_major=time_major)
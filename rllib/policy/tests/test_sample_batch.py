@@ -1,8 +1,11 @@
 import numpy as np
+import pickle
 import unittest
 
 import ray
-from ray.rllib.policy.sample_batch import SampleBatch
+from ray.rllib.policy.sample_batch import LazyConcatSampleBatch, \
+    SampleBatch
+from ray.rllib.utils.test_utils import check
 
 
 class TestSampleBatch(unittest.TestCase):
@@ -43,6 +46,37 @@ class TestSampleBatch(unittest.TestCase):
         del batch["c"]
         assert batch.deleted_keys == {"c"}, batch.deleted_keys
 
+    def test_concat_samples(self):
+        b1 = SampleBatch({
+            "a": np.array([1, 2]),
+            "b": np.array([[0.1, 0.2], [0.3, 0.4]], dtype=np.float32),
+        })
+        b2 = SampleBatch({
+            "a": np.array([3, 4, 5]),
+            "b": np.ones((3, 2), dtype=np.float32),
+        })
+        b3 = SampleBatch({"a": np.array([]), "b": np.array([])})
+        expected = {
+            "a": [1, 2, 3, 4, 5],
+            "b": [[0.1, 0.2], [0.3, 0.4], [1, 1], [1, 1], [1, 1]],
+        }
+
+        batch = SampleBatch.concat_samples([b1, b3, b2])
+        self.assertEqual(batch.count, 5)
+        check(dict(batch), expected)
+        self.assertEqual(batch["b"].dtype, np.float32)
+
+        # Lazy: Columns get concatenated once they are accessed.
+        batch = SampleBatch.concat_samples([b1, b3, b2], lazy=True)
+        self.assertTrue(isinstance(batch, LazyConcatSampleBatch))
+        self.assertEqual(batch.count, 5)
+        self.assertEqual(dict.__getitem__(batch, "a"), None)
+        check(batch["a"], expected["a"])
+        self.assertEqual(dict.__getitem__(batch, "b"), None)
+        check(dict(batch), expected)
+        batch = SampleBatch.concat_samples([b1, b2], lazy=True)
+        check(dict(pickle.loads(pickle.dumps(batch))), expected)
+
 
 if __name__ == "__main__":
     import pytest
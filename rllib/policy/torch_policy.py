@@ -198,6 +198,9 @@ class TorchPolicy(Policy):
 
         # If set, means we are using distributed allreduce during learning.
         self.distributed_world_size = None
+        # If set, the name of the (gloo) `ray.util.collective` group to
+        # allreduce gradients in (instead of the torch.distributed one).
+        self.distributed_collective_group = None
 
         self.max_seq_len = max_seq_len
         self.batch_divisibility_req = get_batch_divisibility_req(self) if \
@@ -439,6 +442,38 @@ class TorchPolicy(Policy):
 
             return log_likelihoods
 
+    @override(Policy)
+    @DeveloperAPI
+    def prepare_batch_for_learning(
+            self, postprocessed_batch: SampleBatch) -> SampleBatch:
+        # Pad once (instead of on each `compute_gradients()` call).
+        if not postprocessed_batch.zero_padded:
+            pad_batch_to_sequences_of_same_size(
+                postprocessed_batch,
+                max_seq_len=self.max_seq_len,
+                shuffle=False,
+                batch_divisibility_req=self.batch_divisibility_req,
+                view_requirements=self.view_requirements,
+            )
+            postprocessed_batch.zero_padded = True
+
+        # Multi-GPU: Batch gets sliced (per tower) first, so keep on the CPU.
+        device = self.device if len(self.devices) == 1 else None
+        pin = torch.cuda.is_available() and (device is None
+                                             or device.type == "cuda")
+        for key, value in list(postprocessed_batch.items()):
+            # Leave (small) seq_lens as numpy, e.g. for `SampleBatch.slice()`.
+            if key == "seq_lens" or not isinstance(value, np.ndarray) or \
+                    value.dtype == np.object_:
+                continue
+            tensor = convert_to_torch_tensor(value)
+            if pin:
+                tensor = tensor.pin_memory()
+            if device is not None:
+                tensor = tensor.to(device, non_blocking=True)
+            postprocessed_batch[key] = tensor
+        return postprocessed_batch
+
     @with_lock
     @override(Policy)
     @DeveloperAPI
@@ -818,7 +853,10 @@ class TorchPolicy(Policy):
 
                         if self.distributed_world_size:
                             start = time.time()
-                            if torch.cuda.is_available():
+                            if self.distributed_collective_group:
+                                _collective_allreduce(
+                                    grads, self.distributed_collective_group)
+                            elif torch.cuda.is_available():
                                 # Sadly, allreduce_coalesced does not work with
                                 # CUDA yet.
                                 for g in grads:
@@ -953,3 +991,19 @@ class DirectStepOptimizer:
 
 
 _directStepOptimizerSingleton = DirectStepOptimizer()
+
+
+def _collective_allreduce(grads: List[TensorType], group_name: str) -> None:
+    """Sums `grads` (in place) over a `ray.util.collective` group.
+
+    All gradients are copied into one flat buffer first, so that only a single
+    allreduce call (instead of one per gradient tensor) is needed.
+    """
+    from ray.util import collective
+
+    flat = torch.cat([g.reshape(-1) for g in grads])
+    collective.allreduce(flat, group_name=group_name)
+    offset = 0
+    for g in grads:
+        g.copy_(flat[offset:offset + g.numel()].view_as(g))
+        offset += g.numel()
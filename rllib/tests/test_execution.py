@@ -4,11 +4,15 @@ import gym
 import queue
 
 import ray
+from ray.rllib.agents.dqn.apex import _store_rollouts_op, \
+    create_replay_shards_near_workers
+from ray.rllib.agents.dqn.learner_thread import LearnerThread
 from ray.rllib.agents.ppo.ppo_tf_policy import PPOTFPolicy
 from ray.rllib.evaluation.worker_set import WorkerSet
 from ray.rllib.evaluation.rollout_worker import RolloutWorker
-from ray.rllib.execution.common import STEPS_SAMPLED_COUNTER, \
-    STEPS_TRAINED_COUNTER
+from ray.rllib.evaluation.weights_broadcast import WeightsBroadcaster
+from ray.rllib.execution.common import REPLAY_BYTES_COUNTER, \
+    STEPS_SAMPLED_COUNTER, STEPS_TRAINED_COUNTER
 from ray.rllib.execution.concurrency_ops import Concurrently, Enqueue, Dequeue
 from ray.rllib.execution.metric_ops import StandardMetricsReporting
 from ray.rllib.execution.replay_ops import StoreToReplayBuffer, Replay
@@ -19,6 +23,7 @@ from ray.rllib.execution.train_ops import TrainOneStep, ComputeGradients, \
 from ray.rllib.execution.replay_buffer import LocalReplayBuffer, \
     ReplayActor
 from ray.rllib.policy.sample_batch import DEFAULT_POLICY_ID, SampleBatch
+from ray.rllib.utils.test_utils import check
 from ray.util.iter import LocalIterator, from_range
 from ray.util.iter_metrics import SharedMetrics
 
@@ -145,7 +150,10 @@ def test_concat_batches(ray_start_regular_shared):
     workers = make_workers(0)
     a = ParallelRollouts(workers, mode="async")
     b = a.combine(ConcatBatches(1000))
-    assert next(b).count == 1000
+    batch = next(b)
+    assert batch.count == 1000
+    # Train batches are concatenated eagerly (no lazy view).
+    assert type(batch) is SampleBatch
     timers = b.shared_metrics.get().timers
     assert "sample" in timers
 
@@ -185,6 +193,74 @@ def test_train_one_step(ray_start_regular_shared):
     workers.stop()
 
 
+def test_sync_weights_delta(ray_start_regular_shared):
+    workers = make_workers(3)
+    local = workers.local_worker()
+    broadcaster = WeightsBroadcaster(delta=True, dtype="float16")
+
+    def check_weights():
+        expected = local.get_weights()[DEFAULT_POLICY_ID]
+        for w in workers.remote_workers():
+            weights = ray.get(w.get_weights.remote())[DEFAULT_POLICY_ID]
+            for k, v in expected.items():
+                assert np.allclose(weights[k], v, atol=0.01), k
+
+    broadcaster.broadcast(local, workers.remote_workers())
+    check_weights()
+    assert broadcaster.get_metrics()["num_full_updates"] == 3
+    # Nothing changed: All workers are skipped.
+    broadcaster.broadcast(local, workers.remote_workers())
+    assert broadcaster.get_metrics()["num_workers_skipped"] == 3
+    # Only the changed tensor is sent (as float16).
+    weights = local.get_weights()
+    name = sorted(weights[DEFAULT_POLICY_ID])[0]
+    weights[DEFAULT_POLICY_ID][name] = weights[DEFAULT_POLICY_ID][name] + 1.0
+    local.set_weights(weights)
+    broadcaster.broadcast(local, workers.remote_workers())
+    metrics = broadcaster.get_metrics()
+    assert metrics["num_delta_updates"] == 3
+    assert metrics["bytes_sent"] == \
+        3 * 2 * weights[DEFAULT_POLICY_ID][name].size
+    check_weights()
+    workers.stop()
+
+
+def test_sync_weights_delta_stale_workers(ray_start_regular_shared):
+    workers = make_workers(2)
+    workers._weights_broadcaster = WeightsBroadcaster(delta=True)
+    local = workers.local_worker()
+    expected = local.get_weights()[DEFAULT_POLICY_ID]
+    stale = {k: v + 1.0 for k, v in expected.items()}
+
+    def check_weights():
+        for w in workers.remote_workers():
+            weights = ray.get(w.get_weights.remote())[DEFAULT_POLICY_ID]
+            for k, v in expected.items():
+                assert np.array_equal(weights[k], v), k
+
+    workers.sync_weights()
+    check_weights()
+    workers.get_weights_sync_metrics()
+    # Weights set outside the WorkerSet: The worker notices and fetches the
+    # full weights, although no weights are sent to it by the driver.
+    ray.get(workers.remote_workers()[0].set_weights.remote({
+        DEFAULT_POLICY_ID: stale
+    }))
+    workers.sync_weights()
+    check_weights()
+    metrics = workers.get_weights_sync_metrics()
+    assert metrics["num_workers_skipped"] == 2
+    assert metrics["bytes_sent"] == 0
+    # Weights set through the WorkerSet (without the workers noticing): The
+    # full weights are sent.
+    workers.foreach_worker_with_index(
+        lambda w, i: i > 0 and w.get_policy().set_weights(stale))
+    workers.sync_weights()
+    check_weights()
+    assert workers.get_weights_sync_metrics()["num_full_updates"] == 2
+    workers.stop()
+
+
 def test_compute_gradients(ray_start_regular_shared):
     workers = make_workers(0)
     a = ParallelRollouts(workers, mode="bulk_sync")
@@ -252,6 +328,59 @@ def test_store_to_replay_actor(ray_start_regular_shared):
     assert next(replay_op).count == 100
 
 
+def test_batched_replay_from_actors(ray_start_regular_shared):
+    actors = [
+        ReplayActor.remote(
+            num_shards=2,
+            learning_starts=200,
+            buffer_size=1000,
+            replay_batch_size=100,
+            prioritized_replay_alpha=0.6,
+            prioritized_replay_beta=0.4,
+            prioritized_replay_eps=0.0001) for _ in range(2)
+    ]
+
+    workers = make_workers(0)
+    a = ParallelRollouts(workers, mode="bulk_sync")
+    # All actors are on this node.
+    b = a.for_each(StoreToReplayBuffer(actors=actors, prefer_colocated=True))
+    for _ in range(4):
+        next(b)
+
+    replay_op = Replay(actors=actors, shards_per_request=2) \
+        .zip_with_source_actor()
+    items = replay_op.take(4)
+    assert all(batch.count == 100 for _, batch in items)
+    assert all(actor in actors for actor, _ in items)
+    metrics = replay_op.shared_metrics.get()
+    assert metrics.counters[REPLAY_BYTES_COUNTER] == sum(
+        batch.size_bytes() for _, batch in items)
+
+
+def test_apex_store_on_workers(ray_start_regular_shared):
+    workers = make_workers(1)
+    # `replay_buffer_shards_colocated_with_driver=False`.
+    actors = create_replay_shards_near_workers(
+        workers, [1, 200, 1000, 100, 0.6, 0.4, 0.0001, "independent", 1], 1)
+    learner_thread = LearnerThread(workers.local_worker())
+    store_op = _store_rollouts_op(
+        workers,
+        actors,
+        learner_thread,
+        store_on_workers=True,
+        max_weight_sync_delay=100)
+    store_op.take(3)
+    # The worker stored its batches itself, only step counts were reported.
+    metrics = store_op.shared_metrics.get()
+    assert metrics.counters[STEPS_SAMPLED_COUNTER] == 300
+    # Each (integer) count of 100 steps triggered a weight sync.
+    assert metrics.counters["num_weight_syncs"] == 3
+    check(
+        ray.get(workers.remote_workers()[0].get_weights.remote()),
+        workers.local_worker().get_weights())
+    assert ray.get(actors[0].replay.remote()).count == 100
+
+
 if __name__ == "__main__":
     import pytest
     import sys
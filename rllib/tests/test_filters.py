@@ -104,6 +104,29 @@ class FilterManagerTest(unittest.TestCase):
         self.assertEqual(obs_f.rs.n, filt1.rs.n)
         self.assertEqual(obs_f.buffer.n, filt1.buffer.n)
 
+    def test_synchronize_tree(self):
+        """Remote filter buffers are merged in a tree before being applied"""
+        filt1 = MeanStdFilter(())
+        RemoteWorker = ray.remote(_MockWorker)
+        remotes = [RemoteWorker.remote(sample_count=10) for _ in range(5)]
+        ray.get([r.sample.remote() for r in remotes])
+        all_filters = ray.get([r.get_filters.remote() for r in remotes])
+
+        FilterManager.synchronize({
+            "obs_filter": filt1,
+            "rew_filter": filt1.copy()
+        }, remotes)
+
+        self.assertEqual(filt1.rs.n, 50)
+        expected = RunningStat(())
+        for f in all_filters:
+            expected.update(f["obs_filter"].buffer)
+        self.assertTrue(np.allclose(filt1.rs.mean, expected.mean))
+        self.assertTrue(np.allclose(filt1.rs.std, expected.std))
+        for filters in ray.get([r.get_filters.remote() for r in remotes]):
+            self.assertEqual(filters["obs_filter"].rs.n, 50)
+            self.assertEqual(filters["obs_filter"].buffer.n, 0)
+
 
 if __name__ == "__main__":
     import pytest
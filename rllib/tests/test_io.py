@@ -14,7 +14,8 @@ from ray.tune.registry import register_env
 from ray.rllib.agents.pg import PGTrainer
 from ray.rllib.agents.pg.pg_tf_policy import PGTFPolicy
 from ray.rllib.examples.env.multi_agent import MultiAgentCartPole
-from ray.rllib.offline import IOContext, JsonWriter, JsonReader
+from ray.rllib.offline import IOContext, JsonWriter, JsonReader, \
+    PrefetchedInput
 from ray.rllib.offline.json_writer import _to_json
 from ray.rllib.policy.sample_batch import SampleBatch
 from ray.rllib.utils.test_utils import framework_iterator
@@ -297,6 +298,34 @@ class JsonIOTest(unittest.TestCase):
         self.assertGreater(len(seen_o), 90)
         self.assertLess(len(seen_o), 101)
 
+    def test_prefetched_read(self):
+        ioctx = IOContext(self.test_dir, {}, 0, None)
+        writer = JsonWriter(
+            self.test_dir, ioctx, max_file_size=5000, compress_columns=["obs"])
+        for i in range(100):
+            writer.write(make_sample_batch(i))
+        reader = PrefetchedInput(
+            lambda: JsonReader(self.test_dir + "/*.json"),
+            num_threads=2,
+            queue_size=4,
+            shuffle_buffer_size=10)
+        seen_a = set()
+        for i in range(1000):
+            batch = reader.next()
+            self.assertEqual(batch["actions"][0], batch["obs"][0])
+            seen_a.add(batch["actions"][0])
+        self.assertGreater(len(seen_a), 90)
+        self.assertLess(len(seen_a), 101)
+        metrics = reader.get_metrics()[0].metrics
+        self.assertLessEqual(metrics["queue_depth"], 4)
+        self.assertGreater(metrics["read_steps_per_s"], 0)
+        reader.stop()
+
+    def test_prefetched_read_error(self):
+        reader = PrefetchedInput(
+            lambda: JsonReader([self.test_dir + "/empty"]))
+        self.assertRaises(Exception, lambda: reader.next())
+
     def test_skips_over_empty_lines_and_files(self):
         open(self.test_dir + "/empty", "w").close()
         with open(self.test_dir + "/f1", "w") as f:
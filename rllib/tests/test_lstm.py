@@ -103,6 +103,24 @@ class TestLSTMUtils(unittest.TestCase):
         self.assertEqual([s.tolist() for s in s_init], [[1, 1]])
         self.assertEqual(seq_lens.tolist(), [1, 2])
 
+    def test_long_episodes(self):
+        eps_ids = [1] * 7 + [2] * 3
+        f = [list(range(10)), ["a"] * 10]
+        s = [list(range(100, 110))]
+        f_pad, s_init, seq_lens = chop_into_sequences(
+            episode_ids=eps_ids,
+            unroll_ids=np.ones_like(eps_ids),
+            agent_indices=np.zeros_like(eps_ids),
+            feature_columns=f,
+            state_columns=s,
+            max_seq_len=3,
+            dynamic_max=False)
+        self.assertEqual(f_pad[0].tolist(),
+                         [0, 1, 2, 3, 4, 5, 6, 0, 0, 7, 8, 9])
+        self.assertEqual(f_pad[1], ["a"] * 7 + [None] * 2 + ["a"] * 3)
+        self.assertEqual(s_init[0].tolist(), [100, 103, 106, 107])
+        self.assertEqual(seq_lens.tolist(), [3, 3, 1, 3])
+
 
 class TestRNNSequencing(unittest.TestCase):
     def setUp(self) -> None:
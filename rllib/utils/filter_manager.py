@@ -1,5 +1,6 @@
 import ray
 from ray.rllib.utils.annotations import DeveloperAPI
+from ray.rllib.utils.filter import MeanStdFilter, NoFilter
 
 
 @DeveloperAPI
@@ -15,13 +16,25 @@ class FilterManager:
 
         Local copy is updated and then broadcasted to all remote evaluators.
 
+        For MeanStdFilters (and NoFilters), the buffers of the remote filters
+        are merged pairwise in a tree of (zero-CPU) tasks, so that only the
+        final aggregate (instead of one filter per remote) reaches the
+        driver.
+
         Args:
             local_filters (dict): Filters to be synchronized.
             remotes (list): Remote evaluators with filters.
             update_remote (bool): Whether to push updates to remote filters.
         """
-        remote_filters = ray.get(
-            [r.get_filters.remote(flush_after=True) for r in remotes])
+        remote_filters = [
+            r.get_filters.remote(flush_after=True) for r in remotes
+        ]
+        if len(remote_filters) > 2 and all(
+                isinstance(f, (MeanStdFilter, NoFilter))
+                for f in local_filters.values()):
+            remote_filters = [ray.get(_tree_merge_buffers(remote_filters))]
+        else:
+            remote_filters = ray.get(remote_filters)
         for rf in remote_filters:
             for k in local_filters:
                 local_filters[k].apply_changes(rf[k], with_buffer=False)
@@ -29,3 +42,25 @@ class FilterManager:
             copies = {k: v.as_serializable() for k, v in local_filters.items()}
             remote_copy = ray.put(copies)
             [r.sync_filters.remote(remote_copy) for r in remotes]
+
+
+@ray.remote(num_cpus=0)
+def _merge_buffers(left, right):
+    """Merges the buffers of the `right` filters into the `left` ones."""
+    for k, f in left.items():
+        if isinstance(f, MeanStdFilter):
+            f.buffer.update(right[k].buffer)
+    return left
+
+
+def _tree_merge_buffers(filter_refs):
+    """Reduces the given filter dicts (refs) pairwise to a single one."""
+    while len(filter_refs) > 1:
+        reduced = [
+            _merge_buffers.remote(filter_refs[i], filter_refs[i + 1])
+            for i in range(0, len(filter_refs) - 1, 2)
+        ]
+        if len(filter_refs) % 2:
+            reduced.append(filter_refs[-1])
+        filter_refs = reduced
+    return filter_refs[0]